@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Activity log retention.
+
+`activity_logs` keeps the last ACTIVITY_LOG_RETENTION_DAYS of entries and is
+what the dashboards and the admin viewer read. Older entries are moved to
+`activity_logs_archive`, tagged with their `month` (YYYY-MM) so the archive
+can be browsed and exported one month at a time; a TTL index on the
+archive's `timestamp` drops entries after ACTIVITY_LOG_ARCHIVE_DAYS.
+
+Entries are moved in batches, copy first and delete second, with their
+original `_id`, so an interrupted run is simply repeated. It runs at startup
+(init_production_db), from the admin viewer's "Archive now" button, or by
+hand:
+
+    python activity_log_archive.py [--days N] [--dry-run]
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Add current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+ACTIVITY_LOG_RETENTION_DAYS = int(os.getenv('ACTIVITY_LOG_RETENTION_DAYS', '90'))
+ACTIVITY_LOG_ARCHIVE_DAYS = int(os.getenv('ACTIVITY_LOG_ARCHIVE_DAYS', str(3 * 365)))
+ARCHIVE_BATCH_SIZE = 1000
+
+
+def archive_cutoff(days=ACTIVITY_LOG_RETENTION_DAYS, now=None):
+    return (now or datetime.utcnow()) - timedelta(days=days)
+
+
+def archive_activity_logs(logs_collection, archive_collection, cutoff, batch_size=ARCHIVE_BATCH_SIZE):
+    """Move entries with a timestamp before `cutoff` to the archive. Returns the number moved."""
+    from pymongo.errors import BulkWriteError
+
+    moved = 0
+    while True:
+        batch = list(logs_collection.find({'timestamp': {'$lt': cutoff}}).sort('timestamp', 1).limit(batch_size))
+        if not batch:
+            return moved
+        for entry in batch:
+            entry['month'] = entry['timestamp'].strftime('%Y-%m')
+        try:
+            archive_collection.insert_many(batch, ordered=False)
+        except BulkWriteError as e:
+            # Entries copied by an earlier, interrupted run are already there
+            if any(error.get('code') != 11000 for error in e.details.get('writeErrors', [])):
+                raise
+        logs_collection.delete_many({'_id': {'$in': [entry['_id'] for entry in batch]}})
+        moved += len(batch)
+
+
+def build_log_query(user=None, action=None, date_from=None, date_to=None, month=None):
+    """Mongo filter for the admin viewer and exports.
+
+    `user` matches the acting user's email exactly, `action` is a
+    case-insensitive substring, dates are YYYY-MM-DD (inclusive) and `month`
+    (YYYY-MM) selects an archive partition.
+    """
+    import re
+
+    query = {}
+    if user:
+        query['user_email'] = user.strip()
+    if action:
+        query['action'] = {'$regex': re.escape(action.strip()), '$options': 'i'}
+    if month:
+        query['month'] = month
+    timestamp = {}
+    if date_from:
+        timestamp['$gte'] = datetime.strptime(date_from, '%Y-%m-%d')
+    if date_to:
+        timestamp['$lt'] = datetime.strptime(date_to, '%Y-%m-%d') + timedelta(days=1)
+    if timestamp:
+        query['timestamp'] = timestamp
+    return query
+
+
+LOG_EXPORT_HEADERS = ['Timestamp', 'User', 'Action', 'Target', 'Details']
+
+
+def export_log_rows(collection, query):
+    """Yield one CSV row per matching entry, oldest first, straight from the cursor."""
+    from exports import format_datetime
+
+    projection = {'_id': 0, 'timestamp': 1, 'user_email': 1, 'action': 1, 'target_email': 1, 'details': 1}
+    for entry in collection.find(query, projection, batch_size=1000).sort('timestamp', 1):
+        yield [format_datetime(entry.get('timestamp')), entry.get('user_email') or '', entry.get('action') or '',
+               entry.get('target_email') or '', entry.get('details') or '']
+
+
+def run_archive(days=ACTIVITY_LOG_RETENTION_DAYS):
+    from models_mongo import activity_logs_collection, activity_logs_archive_collection
+    return archive_activity_logs(activity_logs_collection, activity_logs_archive_collection, archive_cutoff(days))
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Move old activity logs to the archive collection')
+    parser.add_argument('--days', type=int, default=ACTIVITY_LOG_RETENTION_DAYS,
+                        help='keep this many days in activity_logs')
+    parser.add_argument('--dry-run', action='store_true', help='only count what would be archived')
+    args = parser.parse_args()
+
+    if args.dry_run:
+        from models_mongo import activity_logs_collection
+        count = activity_logs_collection.count_documents({'timestamp': {'$lt': archive_cutoff(args.days)}})
+        print(f"📦 {count} activity logs older than {args.days} days would be archived")
+        return
+    print(f"✅ Archived {run_archive(args.days)} activity logs older than {args.days} days")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Write-behind sink for activity logs.
+
+`ActivityLog.save()` hands the document to this sink and returns; a
+background thread writes buffered entries with `insert_many` once
+ACTIVITY_LOG_BATCH_SIZE have accumulated or ACTIVITY_LOG_FLUSH_SECONDS have
+passed, and whatever is left is flushed at interpreter exit. The buffer is
+bounded: when it is full a request waits up to ACTIVITY_LOG_BLOCK_SECONDS for
+room (backpressure) and the entry is then dropped and counted, so a slow or
+unavailable database cannot grow memory without limit or hang requests.
+"""
+
+import atexit
+import os
+import queue
+import threading
+import time
+
+ACTIVITY_LOG_BATCH_SIZE = int(os.getenv('ACTIVITY_LOG_BATCH_SIZE', '200'))
+ACTIVITY_LOG_FLUSH_SECONDS = float(os.getenv('ACTIVITY_LOG_FLUSH_SECONDS', '0.5'))
+ACTIVITY_LOG_MAX_QUEUE = int(os.getenv('ACTIVITY_LOG_MAX_QUEUE', '10000'))
+# 0 drops immediately when the buffer is full
+ACTIVITY_LOG_BLOCK_SECONDS = float(os.getenv('ACTIVITY_LOG_BLOCK_SECONDS', '0.25'))
+WRITE_ATTEMPTS = 3
+
+
+class ActivityLogSink:
+    """Bounded in-process buffer of activity log documents flushed with insert_many."""
+
+    def __init__(self, collection, batch_size=ACTIVITY_LOG_BATCH_SIZE, flush_seconds=ACTIVITY_LOG_FLUSH_SECONDS,
+                 max_queue=ACTIVITY_LOG_MAX_QUEUE, block_seconds=ACTIVITY_LOG_BLOCK_SECONDS):
+        self.collection = collection
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.block_seconds = block_seconds
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        # Serialises writers so flush() never races the background thread
+        self._write_lock = threading.Lock()
+        self.counters = {'queued': 0, 'written': 0, 'dropped': 0, 'failed': 0, 'flushes': 0}
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='activity-log-sink', daemon=True)
+            self._thread.start()
+
+    def log(self, document):
+        """Buffer a document for writing. Returns False if it had to be dropped."""
+        self.start()
+        try:
+            if self.block_seconds > 0:
+                self._queue.put(document, timeout=self.block_seconds)
+            else:
+                self._queue.put_nowait(document)
+        except queue.Full:
+            self._count('dropped')
+            print(f"⚠️  Activity log buffer full, dropped: {document.get('action')}")
+            return False
+        self._count('queued')
+        return True
+
+    def _drain(self):
+        batch = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        if not batch:
+            return
+        with self._write_lock:
+            for attempt in range(1, WRITE_ATTEMPTS + 1):
+                try:
+                    self.collection.insert_many(batch, ordered=False)
+                    self._count('written', len(batch))
+                    self._count('flushes')
+                    return
+                except Exception as e:
+                    if attempt == WRITE_ATTEMPTS:
+                        self._count('failed', len(batch))
+                        print(f"❌ Could not write {len(batch)} activity logs: {e}")
+                        return
+                    time.sleep(0.1 * attempt)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                first = self._queue.get(timeout=self.flush_seconds)
+            except queue.Empty:
+                continue
+            # Collect until the batch is full or the oldest entry has waited flush_seconds
+            batch = [first]
+            deadline = time.monotonic() + self.flush_seconds
+            while len(batch) < self.batch_size and not self._stop.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._write(batch)
+
+    def flush(self):
+        """Write everything buffered so far from the calling thread."""
+        while True:
+            batch = self._drain()
+            if not batch:
+                return
+            self._write(batch)
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.flush()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+        stats['buffered'] = self._queue.qsize()
+        return stats
+
+
+_sink = None
+_sink_lock = threading.Lock()
+
+
+def get_sink():
+    """The process-wide sink; flushed when the interpreter exits."""
+    global _sink
+    with _sink_lock:
+        if _sink is None:
+            from models_mongo import activity_logs_collection
+            _sink = ActivityLogSink(activity_logs_collection)
+            atexit.register(_sink.close)
+        return _sink
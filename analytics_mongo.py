@@ -0,0 +1,148 @@
+"""
+Server-side analytics aggregations for the candidates collection.
+
+Each dashboard tally is computed inside MongoDB with a single `$facet`
+pipeline so the web process only ever receives the bucket counts, never
+the candidate documents themselves.
+"""
+
+# created_at is a BSON date for candidates saved by the models, but older
+# rows carry ISO strings; both are converted to a date inside the pipeline.
+CREATED_AT_DATE = {
+    '$convert': {'input': '$created_at', 'to': 'date', 'onError': None, 'onNull': None}
+}
+
+IS_SELECTED = {'$cond': [{'$eq': ['$status', 'Selected']}, 1, 0]}
+
+
+def _count_by(expression):
+    """Facet branch counting documents per value of `expression`."""
+    return [
+        {'$group': {'_id': expression, 'count': {'$sum': 1}}},
+    ]
+
+
+def build_candidate_analytics_pipeline(match=None):
+    """Return the `$facet` pipeline used by the recruiter analytics endpoint."""
+    pipeline = []
+    if match:
+        pipeline.append({'$match': match})
+
+    pipeline.extend([
+        {'$project': {
+            'status': {'$ifNull': ['$status', 'Unknown']},
+            'position_applied': {'$ifNull': ['$position_applied', 'Unknown']},
+            'department': {'$ifNull': ['$department', 'General']},
+            'experience_years': {'$ifNull': ['$experience_years', 0]},
+            'assigned_by': 1,
+            'created_date': CREATED_AT_DATE,
+        }},
+        {'$facet': {
+            'total': [{'$count': 'count'}],
+            'status': _count_by('$status'),
+            'position': _count_by('$position_applied'),
+            'department': _count_by('$department'),
+            'experience': _count_by({'$switch': {
+                'branches': [
+                    {'case': {'$lte': ['$experience_years', 1]}, 'then': 0},
+                    {'case': {'$lte': ['$experience_years', 3]}, 'then': 1},
+                    {'case': {'$lte': ['$experience_years', 5]}, 'then': 2},
+                ],
+                'default': 3,
+            }}),
+            'month': [
+                {'$match': {'created_date': {'$ne': None}}},
+                {'$group': {
+                    '_id': {'$dateToString': {'format': '%Y-%m', 'date': '$created_date'}},
+                    'count': {'$sum': 1},
+                    'selected': {'$sum': IS_SELECTED},
+                }},
+            ],
+            'week': [
+                {'$match': {'created_date': {'$ne': None}}},
+                {'$group': {
+                    '_id': {'$dateToString': {
+                        'format': '%Y-%m-%d',
+                        'date': {'$dateTrunc': {'date': '$created_date', 'unit': 'week', 'startOfWeek': 'monday'}},
+                    }},
+                    'applications': {'$sum': 1},
+                    'selections': {'$sum': IS_SELECTED},
+                }},
+            ],
+            'assigned_by': [
+                {'$group': {'_id': '$assigned_by', 'count': {'$sum': 1}, 'selected': {'$sum': IS_SELECTED}}},
+            ],
+        }},
+    ])
+    return pipeline
+
+
+def _as_counts(rows):
+    return {row['_id']: row['count'] for row in rows}
+
+
+def get_candidate_analytics(candidates_collection, users_collection, match=None):
+    """Run the analytics pipeline and shape the result for /recruiter/api/analytics."""
+    pipeline = build_candidate_analytics_pipeline(match)
+    facets = next(iter(candidates_collection.aggregate(pipeline, allowDiskUse=True)), {})
+
+    total_rows = facets.get('total', [])
+    total_candidates = total_rows[0]['count'] if total_rows else 0
+    status_counts = _as_counts(facets.get('status', []))
+
+    experience_levels = [0, 0, 0, 0]  # 0-1, 1-3, 3-5, 5+ years
+    for row in facets.get('experience', []):
+        experience_levels[row['_id']] = row['count']
+
+    monthly_stats = {}
+    monthly_success = {}
+    for row in sorted(facets.get('month', []), key=lambda r: r['_id']):
+        monthly_stats[row['_id']] = row['count']
+        if row['selected']:
+            monthly_success[row['_id']] = round((row['selected'] / row['count']) * 100, 1)
+
+    weekly_trends = {
+        row['_id']: {'applications': row['applications'], 'selections': row['selections']}
+        for row in sorted(facets.get('week', []), key=lambda r: r['_id'])
+    }
+
+    # Only the HR tallies travel back from the pipeline, so the join is O(HR users)
+    per_hr = {row['_id']: row for row in facets.get('assigned_by', [])}
+    hr_performance = []
+    for hr in users_collection.find({'role': 'hr'}, {'email': 1, 'name': 1}):
+        tally = per_hr.get(hr.get('email'), {})
+        hr_performance.append({
+            'name': hr.get('name', 'Unknown HR'),
+            'candidates_added': tally.get('count', 0),
+            'successful_placements': tally.get('selected', 0)
+        })
+
+    selected_count = status_counts.get('Selected', 0)
+    success_rate = round((selected_count / total_candidates * 100), 2) if total_candidates > 0 else 0
+
+    return {
+        'total_candidates': total_candidates,
+        'status_counts': status_counts,
+        'position_counts': _as_counts(facets.get('position', [])),
+        'monthly_stats': monthly_stats,
+        'weekly_trends': weekly_trends,
+        'monthly_success': monthly_success,
+        'hr_performance': hr_performance,
+        'departments': _as_counts(facets.get('department', [])),
+        'experience_levels': experience_levels,
+        'success_rate': success_rate,
+        'pending_count': status_counts.get('Pending', 0),
+        'assigned_count': status_counts.get('Assigned', 0),
+        'selected_count': selected_count,
+        'not_selected_count': status_counts.get('Not Selected', 0)
+    }
+
+
+def count_candidates_by_status(candidates_collection, match=None):
+    """Return ({status: count}, total) for the candidates matching `match`."""
+    pipeline = []
+    if match:
+        pipeline.append({'$match': match})
+    pipeline.append({'$group': {'_id': {'$ifNull': ['$status', 'Unknown']}, 'count': {'$sum': 1}}})
+    status_counts = _as_counts(candidates_collection.aggregate(pipeline))
+    return status_counts, sum(status_counts.values())
@@ -1,5 +1,5 @@
 from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify
-from flask_login import LoginManager, UserMixin, login_user, logout_user, login_required, current_user
+from flask_login import LoginManager, UserMixin, login_user, logout_user, login_required, current_user, user_logged_out
 from flask_mail import Mail, Message
 from flask_socketio import SocketIO, emit, join_room, leave_room
 from datetime import datetime
@@ -50,18 +50,29 @@ from models_mongo import User, Role, Candidate, ActivityLog, Feedback, create_to
 
 @login_manager.user_loader
 def load_user(user_id):
-    return User.find_by_id(user_id)
+    # Served from user_cache on most requests instead of a MongoDB lookup
+    from user_cache import load_user as load_cached_user
+    return load_cached_user(user_id)
+
+@user_logged_out.connect_via(app)
+def forget_logged_out_user(sender, user, **extra):
+    from user_cache import invalidate_user
+    if user is not None and getattr(user, 'is_authenticated', False):
+        invalidate_user(user.get_id())
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 @app.route('/')
 def index():
-    # Get user counts by role for statistics
-    hr_count = User.count_by_role('hr_role')  # Fixed: use 'hr_role' instead of 'hr'
-    recruiter_count = User.count_by_role('recruiter')  # Added: count recruiter users
-    manager_count = User.count_by_role('manager')
-    cluster_count = User.count_by_role('cluster')
+    # Get user counts by role for statistics (one cached $group for all roles)
+    from models_mongo import users_collection
+    from user_counts import user_counts
+    counts = user_counts(users_collection)
+    hr_count = counts.get('hr_role', 0)  # Fixed: use 'hr_role' instead of 'hr'
+    recruiter_count = counts.get('recruiter', 0)  # Added: count recruiter users
+    manager_count = counts.get('manager', 0)
+    cluster_count = counts.get('cluster', 0)
     
     print(f"Landing page user counts - HR: {hr_count}, Recruiter: {recruiter_count}, Manager: {manager_count}, Cluster: {cluster_count}")
     
@@ -376,6 +387,23 @@ app.register_blueprint(manager_bp, url_prefix='/manager')
 app.register_blueprint(cluster_bp, url_prefix='/cluster')
 app.register_blueprint(chatbot_bp, url_prefix='/')
 
+# Push finished resume parsing jobs to the browser that submitted them
+import resume_jobs
+resume_jobs.set_notifier(lambda event, payload, room: socketio.emit(event, payload, to=room))
+
+@socketio.on('watch_resume_job')
+def handle_watch_resume_job(data):
+    """Join the room a resume job's result is pushed to"""
+    job_id = (data or {}).get('job_id', '')
+    if not current_user.is_authenticated or not ObjectId.is_valid(job_id):
+        return
+    job = resume_jobs.get_queue().get(ObjectId(job_id), current_user.email)
+    if job:
+        join_room(f"resume_job_{job_id}")
+        if job.get('status') in ('done', 'failed'):
+            # Finished before the browser subscribed
+            emit('resume_job_finished', resume_jobs.public_job(job))
+
 # Contact Support Route
 @app.route('/contact-support')
 def contact_support():
@@ -613,4 +641,7 @@ if __name__ == '__main__':
             emit('user_online_status', {'user_id': user_id, 'online': False}, broadcast=True)
             print(f"🔴 User {user_id} is offline")
     
+    # Pick up resume jobs queued before the restart
+    resume_jobs.start_workers()
+    
     socketio.run(app, debug=True, host='0.0.0.0', port=5001) 
\ No newline at end of file
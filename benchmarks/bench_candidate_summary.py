@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark full Candidate objects against CandidateSummary list rows.
+
+Builds synthetic candidate documents in memory (no database needed), then
+for each row type measures the bytes retained per candidate and the time to
+hydrate the rows and render them through hr/candidate_list_partial.html:
+
+    python benchmarks/bench_candidate_summary.py [count]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from bson import ObjectId
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from models_mongo import Candidate, CandidateSummary, CANDIDATE_SUMMARY_PROJECTION
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATUSES = ['Pending', 'Assigned', 'Selected', 'Not Selected', 'Onboarded']
+
+
+def documents(count):
+    start = datetime(2024, 1, 1)
+    return [{
+        '_id': ObjectId(), 'reference_id': f'REF-{i:08d}',
+        'first_name': f'Candidate{i}', 'last_name': 'Bench', 'email': f'candidate{i}@example.com',
+        'phone': f'+91 98{i:08d}', 'gender': 'Female', 'dob': '1995-05-05', 'education': 'B.Tech Computer Science',
+        'experience': '4 years', 'assigned_by': 'hr@example.com', 'status': STATUSES[i % len(STATUSES)],
+        'resume_path': f'uploads/resume_{i}.pdf', 'image_path': f'uploads/photo_{i}.png',
+        'skills': ['Python', 'MongoDB', 'Flask', 'SQL', 'Docker'], 'overall_rating': i % 5,
+        'other_notes': 'Solid fundamentals, clear communicator.', 'manager_email': 'manager@example.com',
+        'rejection_reasons': [], 'created_at': start + timedelta(minutes=i), 'updated_at': start + timedelta(minutes=i),
+    } for i in range(count)]
+
+
+def project(document):
+    return {field: value for field, value in document.items() if field in CANDIDATE_SUMMARY_PROJECTION or field == '_id'}
+
+
+def measure(label, rows_from, source, app):
+    tracemalloc.start()
+    started = time.perf_counter()
+    rows = rows_from(source)
+    hydrate = time.perf_counter() - started
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    from flask import render_template
+    with app.test_request_context('/hr/dashboard'):
+        started = time.perf_counter()
+        html = render_template('hr/candidate_list_partial.html', all_candidates=rows, page=None,
+                               current_user=SimpleNamespace(role='hr'))
+        render = time.perf_counter() - started
+    print(f"{label:>18} {retained / len(rows):>12.0f} {hydrate * 1000:>14.1f} {render * 1000:>12.1f} {len(html) // 1024:>10}")
+
+
+def main(count):
+    app = Flask(__name__, template_folder=os.path.join(ROOT, 'templates'), static_folder=os.path.join(ROOT, 'static'))
+    full = documents(count)
+    projected = [project(document) for document in full]
+
+    print(f"{count} candidates")
+    print(f"{'rows':>18} {'bytes/row':>12} {'hydrate (ms)':>14} {'render (ms)':>12} {'html (KiB)':>10}")
+    measure('Candidate', lambda docs: [Candidate.from_dict(d) for d in docs], full, app)
+    measure('CandidateSummary', lambda docs: [CandidateSummary.from_dict(d) for d in docs], projected, app)
+
+
+if __name__ == '__main__':
+    counts = [int(arg) for arg in sys.argv[1:] if arg.isdigit()]
+    main(counts[0] if counts else 50000)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark /manager/export_feedback at 10k feedback entries.
+
+Seeds a scratch database (never the app's `invensis` database) with one
+manager's feedback and compares the old per-row candidate lookup with the
+batched `$in` join, then times the streamed CSV and the paginated PDF:
+
+    MONGODB_URI=mongodb://localhost:27017 python benchmarks/bench_feedback_export.py [count]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pymongo import MongoClient
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from exports import iter_csv
+from feedback_export import FEEDBACK_HEADERS, iter_feedback_rows, write_feedback_pdf
+
+BENCH_DB = os.getenv('BENCH_DB', 'invensis_bench')
+MANAGER_EMAIL = 'manager@example.com'
+
+
+def seed(candidates, feedback, count):
+    candidates.delete_many({})
+    feedback.delete_many({})
+    ids = candidates.insert_many([{
+        'first_name': f'Candidate{i}', 'last_name': 'Bench', 'email': f'candidate{i}@example.com',
+        'manager_email': MANAGER_EMAIL
+    } for i in range(count)]).inserted_ids
+    start = datetime(2024, 1, 1)
+    feedback.insert_many([{
+        'candidate_id': str(candidate_id), 'manager_email': MANAGER_EMAIL, 'status': 'Selected',
+        'feedback_text': 'Strong fundamentals and clear communication throughout the interview. ' * 2,
+        'created_at': start + timedelta(minutes=i)
+    } for i, candidate_id in enumerate(ids)])
+
+
+def per_row_lookup(feedback, candidates):
+    """The old export: one find_one per feedback entry."""
+    from bson import ObjectId
+    rows = []
+    for entry in feedback.find({'manager_email': MANAGER_EMAIL}):
+        candidate = candidates.find_one({'_id': ObjectId(entry['candidate_id'])})
+        if candidate:
+            rows.append(candidate)
+    return len(rows)
+
+
+def measure(label, fn):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = fn()
+    elapsed = (time.perf_counter() - started) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28} {elapsed:>12.1f} {peak / 1024:>20.1f}   {result}")
+
+
+def main(count):
+    client = MongoClient(os.getenv('MONGODB_URI', 'mongodb://localhost:27017'))
+    database = client[BENCH_DB]
+    candidates, feedback = database.candidates, database.feedback
+    feedback.create_index('manager_email')
+    seed(candidates, feedback, count)
+
+    rows = lambda: iter_feedback_rows(feedback, candidates, MANAGER_EMAIL)
+    print(f"{count} feedback entries")
+    print(f"{'':<28} {'time (ms)':>12} {'peak memory (KiB)':>20}")
+    measure('per-row find_one join', lambda: f'{per_row_lookup(feedback, candidates)} rows')
+    measure('batched $in join', lambda: f'{sum(1 for _ in rows())} rows')
+    measure('streamed CSV', lambda: f'{sum(len(chunk) for chunk in iter_csv(FEEDBACK_HEADERS, rows()))} bytes')
+    measure('paginated PDF', lambda: f"{len(write_feedback_pdf(rows(), 'Bench', '2025-01-01').read())} bytes")
+
+    if '--keep' not in sys.argv:
+        client.drop_database(BENCH_DB)
+
+
+if __name__ == '__main__':
+    counts = [int(arg) for arg in sys.argv[1:] if arg.isdigit()]
+    main(counts[0] if counts else 10000)
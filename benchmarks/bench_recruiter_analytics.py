@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark /recruiter/api/analytics as the candidates collection grows.
+
+Seeds a scratch database (never the app's `invensis` database) with
+synthetic candidates and measures wall time and peak Python memory of the
+$facet aggregation for each dataset size:
+
+    MONGODB_URI=mongodb://localhost:27017 python benchmarks/bench_recruiter_analytics.py 1000 10000 100000 1000000
+"""
+
+import os
+import sys
+import time
+import random
+import tracemalloc
+from datetime import datetime, timedelta
+from pymongo import MongoClient
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics_mongo import get_candidate_analytics
+
+BENCH_DB = os.getenv('BENCH_DB', 'invensis_bench')
+STATUSES = ['Pending', 'Assigned', 'Selected', 'Not Selected', 'Onboarded']
+POSITIONS = ['Developer', 'Analyst', 'Designer', 'Accountant', 'Support']
+HR_EMAILS = [f'hr{i}@example.com' for i in range(20)]
+
+
+def seed(collection, users, target):
+    """Top the candidates collection up to `target` documents."""
+    existing = collection.estimated_document_count()
+    if users.count_documents({}) == 0:
+        users.insert_many([{'email': e, 'name': e.split('@')[0], 'role': 'hr'} for e in HR_EMAILS])
+    start = datetime(2024, 1, 1)
+    batch = []
+    for i in range(existing, target):
+        batch.append({
+            'first_name': f'Candidate{i}',
+            'last_name': 'Bench',
+            'status': random.choice(STATUSES),
+            'position_applied': random.choice(POSITIONS),
+            'assigned_by': random.choice(HR_EMAILS),
+            'experience_years': random.randint(0, 10),
+            'created_at': start + timedelta(minutes=i),
+        })
+        if len(batch) == 10000:
+            collection.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        collection.insert_many(batch, ordered=False)
+
+
+def main(sizes):
+    client = MongoClient(os.getenv('MONGODB_URI', 'mongodb://localhost:27017'))
+    database = client[BENCH_DB]
+    candidates, users = database.candidates, database.users
+
+    print(f"{'candidates':>12} {'time (ms)':>12} {'peak memory (KiB)':>20}")
+    for size in sizes:
+        seed(candidates, users, size)
+        tracemalloc.start()
+        started = time.perf_counter()
+        data = get_candidate_analytics(candidates, users)
+        elapsed = (time.perf_counter() - started) * 1000
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert data['total_candidates'] == size
+        print(f"{size:>12} {elapsed:>12.1f} {peak / 1024:>20.1f}")
+
+    if '--keep' not in sys.argv:
+        client.drop_database(BENCH_DB)
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:] if arg.isdigit()] or [1000, 10000, 100000, 1000000]
+    main(sorted(sizes))
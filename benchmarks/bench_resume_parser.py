@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark the regex resume parser over a corpus of synthetic resumes.
+
+Generates resumes with varying sections, lengths and skill mixes and reports
+the per-resume parse time of resume_parser.parse_resume_text():
+
+    python benchmarks/bench_resume_parser.py [count]
+"""
+
+import os
+import sys
+import time
+import random
+import statistics
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resume_parser import parse_resume_text, SKILLS_KEYWORDS
+
+FIRST_NAMES = ['Asha', 'Rahul', 'Priya', 'John', 'Maria', 'Wei', 'Fatima', 'Carlos', 'Anna', 'Kiran']
+LAST_NAMES = ['Sharma', 'Patel', 'Smith', 'Garcia', 'Chen', 'Khan', 'Rossi', 'Nair', 'Müller', 'Reddy']
+COMPANIES = ['Infosys Pvt Ltd', 'Acme Corp', 'Globex Inc', 'Initech LLC', 'Umbrella Limited']
+TITLES = ['Software Engineer', 'Senior Developer', 'Data Analyst', 'QA Tester', 'Project Manager']
+DEGREES = ['B.Tech in Computer Science', 'MBA Business Administration', 'M.Sc Data Science', 'B.Com Commerce']
+SCHOOLS = ['Anna University', 'Delhi College of Engineering', 'Stanford University', 'National Institute']
+FILLER = ('Delivered features across the stack, mentored juniors, improved test coverage and '
+          'worked closely with stakeholders to ship releases on schedule. ')
+SKILL_HEADERS = ['Skills & Abilities', 'TECHNICAL SKILLS', 'Skills', 'Applications Proficiency']
+EDUCATION_HEADERS = ['Education', 'EDUCATION', 'Academic Qualifications', 'Educational Background']
+
+
+def synthetic_resume(rng):
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    skills = rng.sample(SKILLS_KEYWORDS, rng.randint(4, 20))
+    lines = [
+        f'{first} {last}',
+        f'Email: {first.lower()}.{last.lower()}@example.com',
+        f'Phone: +91 {rng.randint(70000, 99999)} {rng.randint(10000, 99999)}',
+        f'DOB: {rng.randint(1, 28)}/{rng.randint(1, 12)}/{rng.randint(1980, 2002)}',
+        rng.choice(['Gender: Female', 'Gender: Male', '']),
+        '',
+        'Objective',
+        FILLER * rng.randint(1, 3),
+        '',
+        rng.choice(SKILL_HEADERS),
+    ]
+    if rng.random() < 0.5:
+        lines.extend(f'• {skill}' for skill in skills)
+    else:
+        lines.append(', '.join(skills))
+    lines.extend(['', rng.choice(EDUCATION_HEADERS)])
+    for _ in range(rng.randint(1, 3)):
+        lines.append(f'{rng.choice(DEGREES)}, {rng.choice(SCHOOLS)}, {rng.randint(2000, 2022)}')
+    lines.extend(['', 'Professional Experience',
+                  f'{rng.randint(1, 15)} years of experience in software delivery'])
+    for _ in range(rng.randint(1, 6)):
+        lines.append(f'{rng.choice(TITLES)} at {rng.choice(COMPANIES)} ({rng.randint(2005, 2020)} - Present)')
+        lines.append(FILLER * rng.randint(1, 4))
+    return '\n'.join(lines)
+
+
+def main(count):
+    rng = random.Random(42)
+    corpus = [synthetic_resume(rng) for _ in range(count)]
+    average_length = statistics.mean(len(text) for text in corpus)
+
+    parse_resume_text(corpus[0])  # warm up
+    timings = []
+    for text in corpus:
+        start = time.perf_counter()
+        parse_resume_text(text)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+    print(f"{count} synthetic resumes, {average_length:.0f} characters on average")
+    print(f"  mean {statistics.mean(timings):.3f} ms   p50 {timings[len(timings) // 2]:.3f} ms   "
+          f"p95 {timings[int(len(timings) * 0.95)]:.3f} ms   max {timings[-1]:.3f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark requests/sec on /hr/dashboard with and without the user cache.
+
+Points every collection of models_mongo at a scratch database (never the
+app's `invensis` database), creates one HR user, logs in through the
+session and requests the dashboard repeatedly, first with the user loader
+going to MongoDB each time (USER_CACHE_TTL_SECONDS=0) and then cached:
+
+    MONGODB_URI=mongodb://localhost:27017 python benchmarks/bench_user_loader.py [requests]
+"""
+
+import os
+import sys
+import time
+from pymongo import MongoClient
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import models_mongo
+
+BENCH_DB = os.getenv('BENCH_DB', 'invensis_bench')
+
+
+def use_scratch_database(database):
+    """Rebind models_mongo's collections before the app and routes import them."""
+    models_mongo.db = database
+    for name in dir(models_mongo):
+        if name.endswith('_collection'):
+            setattr(models_mongo, name, database[getattr(models_mongo, name).name])
+
+
+def requests_per_second(client, count):
+    started = time.perf_counter()
+    for _ in range(count):
+        response = client.get('/hr/dashboard')
+        assert response.status_code == 200, response.status_code
+    return count / (time.perf_counter() - started)
+
+
+def main(count):
+    mongo = MongoClient(os.getenv('MONGODB_URI', 'mongodb://localhost:27017'))
+    use_scratch_database(mongo[BENCH_DB])
+
+    from app_mongo import app
+    from models_mongo import User
+    import user_cache
+
+    user = User(email='bench-hr@example.com', name='Bench HR', role='hr')
+    user.set_password('bench')
+    user.save()
+
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = user.get_id()
+        session['_fresh'] = True
+
+    print(f"{'user loader':>14} {'requests/sec':>14} {'hit rate':>10}")
+    for label, ttl in (('uncached', 0), ('cached', 30)):
+        user_cache._cache = user_cache.UserCache(User.find_by_id, ttl=ttl)
+        requests_per_second(client, min(count, 20))  # warm up templates and connections
+        rate = requests_per_second(client, count)
+        print(f"{label:>14} {rate:>14.1f} {user_cache.get_cache().stats()['hit_rate']:>10.3f}")
+
+    if '--keep' not in sys.argv:
+        mongo.drop_database(BENCH_DB)
+
+
+if __name__ == '__main__':
+    counts = [int(arg) for arg in sys.argv[1:] if arg.isdigit()]
+    main(counts[0] if counts else 500)
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Candidate request listings built by a single aggregation.
+
+Each request is joined to its manager with one `$lookup` into users
+(`requester_name`, `manager_name`), gets the fields the templates show
+(`job_title`, `open_positions`, `remaining_positions`) and its deadline
+status, and `request_listing()` also returns the page totals from a `$group`
+in the same pipeline, so a listing costs one round-trip however many
+requests are open.
+
+`created_at`, `updated_at` and the legacy `deadline` are BSON dates (see
+normalize_dates.py), so the age of each request and its status are worked
+out by the aggregation with `$dateDiff` (MongoDB 5.0+) instead of parsing
+strings per row in Python:
+
+    days_since_request   whole days since created_at
+    days_remaining       days until the legacy `deadline`, when one is set
+    deadline_status      overdue / urgent / warning / good against a deadline,
+                         otherwise overdue (> 15 days) / urgent (> 7) / active
+    deadline_color       red / yellow / orange / green for the badge
+    requested_date_formatted, updated_date_formatted   YYYY-MM-DD
+
+A date still stored as an ISO string (until migrations 5-8 have converted
+it) is parsed with `$convert`; anything that is not a date, or that does
+not parse, becomes null and the row shows "No date" instead of failing the
+whole listing. `$convert` reads a string without an offset as UTC, while
+`normalize_dates.parse_timestamp` reads the same string as server local
+time, so such rows can be off by the server's UTC offset until migrated.
+"""
+
+OVERDUE_AFTER_DAYS = 15
+URGENT_AFTER_DAYS = 7
+# Urgency shown for a request by how long it has been open
+URGENCY_BY_DEADLINE_STATUS = {'overdue': 'Critical', 'urgent': 'High', 'active': 'Normal'}
+
+
+def _date_or_none(field):
+    """The field as a date; ISO strings not yet converted by migrations 5-8 are parsed, anything else is None."""
+    return {'$convert': {'input': f'${field}', 'to': 'date', 'onError': None, 'onNull': None}}
+
+
+def _or_remove(expression):
+    """Leave the field out instead of storing null, so templates can test `is defined`."""
+    return {'$ifNull': [expression, '$$REMOVE']}
+
+
+def _deadline_switch(index):
+    """$switch picking element `index` (0 = status, 1 = color) of the first matching rule."""
+    has_deadline = {'$ne': [{'$type': '$days_remaining'}, 'missing']}
+    has_age = {'$ne': [{'$type': '$days_since_request'}, 'missing']}
+    rules = [
+        ({'$and': [has_deadline, {'$lt': ['$days_remaining', 0]}]}, ('overdue', 'red')),
+        ({'$and': [has_deadline, {'$lte': ['$days_remaining', 7]}]}, ('urgent', 'yellow')),
+        ({'$and': [has_deadline, {'$lte': ['$days_remaining', 15]}]}, ('warning', 'orange')),
+        (has_deadline, ('good', 'green')),
+        ({'$and': [has_age, {'$gt': ['$days_since_request', OVERDUE_AFTER_DAYS]}]}, ('overdue', 'red')),
+        ({'$and': [has_age, {'$gt': ['$days_since_request', URGENT_AFTER_DAYS]}]}, ('urgent', 'yellow')),
+        (has_age, ('active', 'green')),
+    ]
+    return {'$switch': {
+        'branches': [{'case': case, 'then': result[index]} for case, result in rules],
+        'default': '$$REMOVE'
+    }}
+
+
+def deadline_stages():
+    """Aggregation stages adding the age, deadline and formatted date fields."""
+    return [
+        {'$addFields': {
+            'days_since_request': _or_remove({'$dateDiff': {
+                'startDate': _date_or_none('created_at'), 'endDate': '$$NOW', 'unit': 'day'}}),
+            'days_remaining': _or_remove({'$dateDiff': {
+                'startDate': '$$NOW', 'endDate': _date_or_none('deadline'), 'unit': 'day'}}),
+            'requested_date_formatted': _or_remove({'$dateToString': {
+                'date': _date_or_none('created_at'), 'format': '%Y-%m-%d'}}),
+            'updated_date_formatted': _or_remove({'$dateToString': {
+                'date': _date_or_none('updated_at'), 'format': '%Y-%m-%d'}}),
+        }},
+        {'$addFields': {
+            'deadline_status': _deadline_switch(0),
+            'deadline_color': _deadline_switch(1),
+        }},
+    ]
+
+
+def manager_stages():
+    """Aggregation stages joining the manager and adding the display fields."""
+    has_manager_email = {'$ne': [{'$ifNull': ['$manager_email', '']}, '']}
+    open_positions = {'$ifNull': ['$quantity_needed', 0]}
+    return [
+        {'$lookup': {
+            'from': 'users',
+            'localField': 'manager_email',
+            'foreignField': 'email',
+            'pipeline': [{'$project': {'_id': 0, 'first_name': 1, 'last_name': 1}}, {'$limit': 1}],
+            'as': 'manager'
+        }},
+        {'$addFields': {'manager': {'$first': '$manager'}}},
+        {'$addFields': {
+            'manager_name': {'$cond': [
+                {'$ne': [{'$type': '$manager'}, 'missing']},
+                {'$concat': [{'$ifNull': ['$manager.first_name', '']}, ' ', {'$ifNull': ['$manager.last_name', '']}]},
+                '$$REMOVE'
+            ]},
+            'job_title': {'$ifNull': ['$position_title', 'N/A']},
+            'open_positions': open_positions,
+            'remaining_positions': {'$subtract': [open_positions, {'$ifNull': ['$onboarded_count', 0]}]},
+        }},
+        {'$addFields': {
+            'requester_name': {'$cond': [has_manager_email, {'$ifNull': ['$manager_name', '$manager_email']}, '$$REMOVE']},
+            'requester_email': {'$cond': [has_manager_email, '$manager_email', '$$REMOVE']},
+        }},
+        {'$unset': 'manager'},
+    ]
+
+
+def _row_stages(sort):
+    stages = [{'$sort': sort}] if sort else []
+    return stages + manager_stages() + deadline_stages() + [{'$addFields': {'_id': {'$toString': '$_id'}}}]
+
+
+def _sum_of(expression, status=None):
+    if status:
+        # Requests without a status are active
+        expression = {'$cond': [{'$eq': [{'$ifNull': ['$status', status]}, status]}, expression, 0]}
+    return {'$sum': expression}
+
+
+def totals_stage():
+    """$group with the requested/remaining/assigned/onboarded totals, overall and of active requests."""
+    requested = {'$ifNull': ['$quantity_needed', 0]}
+    remaining = {'$subtract': [requested, {'$ifNull': ['$onboarded_count', 0]}]}
+    return {'$group': {
+        '_id': None,
+        'total_requested': _sum_of(requested),
+        'total_remaining': _sum_of(remaining),
+        'total_assigned': _sum_of({'$ifNull': ['$assigned_count', 0]}),
+        'total_onboarded': _sum_of({'$ifNull': ['$onboarded_count', 0]}),
+        'active_requested': _sum_of(requested, 'Active'),
+        'active_remaining': _sum_of(remaining, 'Active'),
+        'manager_emails': {'$addToSet': '$manager_email'},
+    }}
+
+
+EMPTY_TOTALS = {'total_requested': 0, 'total_remaining': 0, 'total_assigned': 0, 'total_onboarded': 0,
+                'active_requested': 0, 'active_remaining': 0, 'manager_emails': []}
+
+
+def list_candidate_requests(candidate_requests_collection, match=None, sort=None):
+    """Requests matching `match` with manager and deadline fields added, `_id` as a string."""
+    pipeline = [{'$match': match or {}}] + _row_stages(sort)
+    return list(candidate_requests_collection.aggregate(pipeline))
+
+
+def request_listing(candidate_requests_collection, match=None, sort=None):
+    """(requests, totals) for `match` in one aggregation; see list_candidate_requests and totals_stage."""
+    pipeline = [
+        {'$match': match or {}},
+        {'$facet': {'requests': _row_stages(sort), 'totals': [totals_stage()]}}
+    ]
+    result = next(iter(candidate_requests_collection.aggregate(pipeline)), {})
+    totals = dict(EMPTY_TOTALS)
+    for group in result.get('totals', []):
+        totals.update({key: value for key, value in group.items() if key != '_id'})
+    totals['manager_emails'] = [email for email in totals['manager_emails'] if email]
+    return result.get('requests', []), totals
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Index management for the Invensis MongoDB collections.
+
+`ensure_indexes()` declares one index per access pattern used by the
+routes in routes/*_mongo.py and is safe to call on every startup
+(create_index is a no-op when the index already exists). Indexes an
+entry has replaced are listed in SUPERSEDED_INDEXES and dropped, so they
+do not keep costing every candidate write.
+
+Run `python db_indexes.py --report` to explain() every canonical query in
+QUERY_REGISTRY; the command exits non-zero if any of them still falls back
+to a collection scan (COLLSCAN).
+"""
+
+import os
+import sys
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import OperationFailure, DuplicateKeyError
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Add current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from activity_log_archive import ACTIVITY_LOG_ARCHIVE_DAYS
+
+# collection name -> list of (keys, options)
+INDEX_SPECS = {
+    'users': [
+        ([('email', ASCENDING)], {'name': 'email_unique', 'unique': True}),
+        ([('role', ASCENDING), ('is_active', ASCENDING), ('name', ASCENDING)], {'name': 'role_active_name'}),
+        ([('cluster', ASCENDING)], {'name': 'cluster'}),
+    ],
+    'user_emails': [
+        ([('email', ASCENDING)], {'name': 'email'}),
+        ([('role', ASCENDING), ('is_active', ASCENDING)], {'name': 'role_active'}),
+    ],
+    'roles': [
+        ([('email', ASCENDING)], {'name': 'email'}),
+    ],
+    'candidates': [
+        ([('status', ASCENDING), ('created_at', DESCENDING), ('_id', DESCENDING)], {'name': 'status_created_at_id'}),
+        ([('status', ASCENDING), ('updated_at', DESCENDING)], {'name': 'status_updated_at'}),
+        # Manager dashboard buckets: first rows, counts and keyset pages per status
+        ([('manager_email', ASCENDING), ('status', ASCENDING), ('updated_at', DESCENDING), ('_id', DESCENDING)],
+         {'name': 'manager_email_status_updated_at_id'}),
+        ([('manager_email', ASCENDING), ('status', ASCENDING), ('created_at', DESCENDING), ('_id', DESCENDING)],
+         {'name': 'manager_email_status_created_at_id'}),
+        ([('assigned_by', ASCENDING), ('created_at', DESCENDING)], {'name': 'assigned_by_created_at'}),
+        ([('reassigned_by_manager', ASCENDING), ('status', ASCENDING), ('updated_at', DESCENDING), ('_id', DESCENDING)],
+         {'name': 'reassigned_by_manager_status_updated_at_id'}),
+        ([('reference_id', ASCENDING)], {'name': 'reference_id'}),
+        ([('created_at', DESCENDING), ('_id', DESCENDING)], {'name': 'created_at_id'}),
+    ],
+    'feedback': [
+        ([('candidate_id', ASCENDING), ('timestamp', DESCENDING)], {'name': 'candidate_id_timestamp'}),
+        ([('manager_email', ASCENDING)], {'name': 'manager_email'}),
+    ],
+    'candidate_requests': [
+        ([('manager_email', ASCENDING), ('created_at', DESCENDING)], {'name': 'manager_email_created_at'}),
+        ([('status', ASCENDING), ('created_at', DESCENDING)], {'name': 'status_created_at'}),
+    ],
+    'activity_logs': [
+        ([('timestamp', DESCENDING)], {'name': 'timestamp'}),
+        ([('user_email', ASCENDING), ('timestamp', DESCENDING)], {'name': 'user_email_timestamp'}),
+    ],
+    'activity_logs_archive': [
+        # Archived entries are dropped for good after ACTIVITY_LOG_ARCHIVE_DAYS
+        ([('timestamp', ASCENDING)], {'name': 'timestamp_ttl', 'expireAfterSeconds': ACTIVITY_LOG_ARCHIVE_DAYS * 24 * 3600}),
+        ([('month', ASCENDING), ('timestamp', DESCENDING)], {'name': 'month_timestamp'}),
+        ([('user_email', ASCENDING), ('timestamp', DESCENDING)], {'name': 'user_email_timestamp'}),
+    ],
+    'password_reset_tokens': [
+        ([('token', ASCENDING)], {'name': 'token'}),
+        ([('user_id', ASCENDING)], {'name': 'user_id'}),
+        ([('expires_at', ASCENDING)], {'name': 'expires_at'}),
+    ],
+    'messages': [
+        ([('conversation_id', ASCENDING), ('timestamp', ASCENDING)], {'name': 'conversation_id_timestamp'}),
+    ],
+    'resume_jobs': [
+        ([('status', ASCENDING), ('created_at', ASCENDING)], {'name': 'status_created_at'}),
+        # Finished jobs (and their results) are dropped after a day
+        ([('finished_at', ASCENDING)], {'name': 'finished_at_ttl', 'expireAfterSeconds': 24 * 3600}),
+    ],
+    'resume_cache': [
+        ([('expires_at', ASCENDING)], {'name': 'expires_at_ttl', 'expireAfterSeconds': 0}),
+        ([('last_used_at', ASCENDING)], {'name': 'last_used_at'}),
+    ],
+    'email_outbox': [
+        ([('status', ASCENDING), ('next_attempt_at', ASCENDING)], {'name': 'status_next_attempt_at'}),
+        # Delivered messages are kept for a week for latency reporting
+        ([('sent_at', ASCENDING)], {'name': 'sent_at_ttl', 'expireAfterSeconds': 7 * 24 * 3600}),
+    ],
+}
+
+# collection name -> {old index name: name of the INDEX_SPECS index replacing it}; ensure_indexes()
+# drops the old index only when its replacement was ensured
+SUPERSEDED_INDEXES = {
+    'candidates': {
+        'manager_email_status': 'manager_email_status_updated_at_id',
+        'reassigned_by_manager_status': 'reassigned_by_manager_status_updated_at_id',
+    },
+}
+
+# Canonical queries issued by the routes. Each entry is explained by
+# `report_query_plans()`; the values are placeholders, only the shape matters.
+QUERY_REGISTRY = [
+    {'name': 'login / find user by email', 'collection': 'users',
+     'filter': {'email': 'someone@example.com'}},
+    {'name': 'count users by role', 'collection': 'users',
+     'filter': {'role': 'manager'}},
+    {'name': 'active users of a role sorted by name', 'collection': 'users',
+     'filter': {'role': 'manager', 'is_active': True}, 'sort': [('name', ASCENDING)]},
+    {'name': 'pre-approved email lookup', 'collection': 'user_emails',
+     'filter': {'email': 'someone@example.com'}},
+    {'name': 'pre-approved emails by role', 'collection': 'user_emails',
+     'filter': {'role': 'HR', 'is_active': True}},
+    {'name': 'candidates by status, newest first', 'collection': 'candidates',
+     'filter': {'status': 'Pending'}, 'sort': [('created_at', DESCENDING)]},
+    {'name': 'candidate list, newest first', 'collection': 'candidates',
+     'filter': {}, 'sort': [('created_at', DESCENDING)]},
+    {'name': 'candidate list page (keyset)', 'collection': 'candidates',
+     'filter': {}, 'sort': [('created_at', DESCENDING), ('_id', DESCENDING)], 'limit': 51},
+    {'name': 'manager assigned candidates', 'collection': 'candidates',
+     'filter': {'manager_email': 'manager@example.com', 'status': {'$in': ['New', 'Assigned']}}},
+    {'name': 'rejected candidates, latest update first', 'collection': 'candidates',
+     'filter': {'status': {'$in': ['Not Selected', 'Rejected']}}, 'sort': [('updated_at', DESCENDING)]},
+    {'name': 'reassigned candidates', 'collection': 'candidates',
+     'filter': {'reassigned_by_manager': 'manager@example.com', 'status': 'Pending'}},
+    {'name': 'manager dashboard bucket page (keyset)', 'collection': 'candidates',
+     'filter': {'manager_email': 'manager@example.com', 'status': {'$in': ['Not Selected', 'Rejected']}},
+     'sort': [('updated_at', DESCENDING), ('_id', DESCENDING)], 'limit': 26},
+    {'name': 'manager dashboard assigned page (keyset)', 'collection': 'candidates',
+     'filter': {'manager_email': 'manager@example.com', 'status': {'$in': ['New', 'Assigned']}},
+     'sort': [('created_at', DESCENDING), ('_id', DESCENDING)], 'limit': 26},
+    {'name': 'reassigned candidates page (keyset)', 'collection': 'candidates',
+     'filter': {'reassigned_by_manager': 'manager@example.com', 'status': 'Pending'},
+     'sort': [('updated_at', DESCENDING), ('_id', DESCENDING)], 'limit': 26},
+    {'name': 'candidates uploaded by HR', 'collection': 'candidates',
+     'filter': {'assigned_by': 'hr@example.com'}},
+    {'name': 'candidate by reference id', 'collection': 'candidates',
+     'filter': {'reference_id': 'REF-20250101-ABCDEF12'}},
+    {'name': 'feedback history for candidate', 'collection': 'feedback',
+     'filter': {'candidate_id': '000000000000000000000000'}, 'sort': [('timestamp', DESCENDING)]},
+    {'name': 'feedback by manager', 'collection': 'feedback',
+     'filter': {'manager_email': 'manager@example.com'}},
+    {'name': 'candidate requests by manager', 'collection': 'candidate_requests',
+     'filter': {'manager_email': 'manager@example.com'}, 'sort': [('created_at', DESCENDING)]},
+    {'name': 'active candidate requests', 'collection': 'candidate_requests',
+     'filter': {'status': 'Active'}, 'sort': [('created_at', DESCENDING)]},
+    {'name': 'recent activity logs', 'collection': 'activity_logs',
+     'filter': {}, 'sort': [('timestamp', DESCENDING)], 'limit': 50},
+    {'name': 'activity logs by user', 'collection': 'activity_logs',
+     'filter': {'user_email': 'hr@example.com'}, 'sort': [('timestamp', DESCENDING), ('_id', DESCENDING)], 'limit': 51},
+    {'name': 'activity logs to archive', 'collection': 'activity_logs',
+     'filter': {'timestamp': {'$lt': 'cutoff'}}, 'sort': [('timestamp', ASCENDING)], 'limit': 1000},
+    {'name': 'archived activity logs for a month', 'collection': 'activity_logs_archive',
+     'filter': {'month': '2025-01'}, 'sort': [('timestamp', DESCENDING)], 'limit': 51},
+    {'name': 'password reset token lookup', 'collection': 'password_reset_tokens',
+     'filter': {'token': 'token'}},
+    {'name': 'conversation messages', 'collection': 'messages',
+     'filter': {'conversation_id': 'conversation'}, 'sort': [('timestamp', ASCENDING)]},
+    {'name': 'claim next resume job', 'collection': 'resume_jobs',
+     'filter': {'status': 'queued'}, 'sort': [('created_at', ASCENDING)], 'limit': 1},
+    {'name': 'claim next outbound email', 'collection': 'email_outbox',
+     'filter': {'status': 'queued', 'next_attempt_at': {'$lte': 'now'}}, 'sort': [('next_attempt_at', ASCENDING)],
+     'limit': 1},
+]
+
+
+def ensure_indexes(database=None):
+    """Create every index in INDEX_SPECS. Returns the list of index names that were ensured."""
+    if database is None:
+        from models_mongo import get_database
+        database = get_database()
+
+    ensured = []
+    for collection_name, specs in INDEX_SPECS.items():
+        collection = database[collection_name]
+        for keys, options in specs:
+            try:
+                collection.create_index(keys, **options)
+                ensured.append(f"{collection_name}.{options['name']}")
+            except (DuplicateKeyError, OperationFailure) as e:
+                # Existing duplicates (e.g. two users with the same email) or an
+                # index with the same keys but other options must not stop startup
+                print(f"⚠️  Could not create index {collection_name}.{options['name']}: {e}")
+
+    # Only once their replacements exist, so the queries are never left without an index
+    for collection_name, superseded in SUPERSEDED_INDEXES.items():
+        for name, replacement in superseded.items():
+            if f"{collection_name}.{replacement}" not in ensured:
+                print(f"⚠️  Keeping {collection_name}.{name}: its replacement {replacement} could not be created")
+                continue
+            try:
+                database[collection_name].drop_index(name)
+                print(f"🗑️  Dropped superseded index {collection_name}.{name}")
+            except OperationFailure:
+                pass  # already dropped
+    return ensured
+
+
+def _plan_stages(plan):
+    """Collect every stage name in an explain() plan tree."""
+    stages = []
+    if not isinstance(plan, dict):
+        return stages
+    if 'stage' in plan:
+        stages.append(plan['stage'])
+    for key in ('inputStage', 'queryPlan', 'outerStage', 'innerStage'):
+        if key in plan:
+            stages.extend(_plan_stages(plan[key]))
+    for child in plan.get('inputStages', []):
+        stages.extend(_plan_stages(child))
+    return stages
+
+
+def explain_query(database, query):
+    """Explain one QUERY_REGISTRY entry and return the stages of its winning plan."""
+    cursor = database[query['collection']].find(query.get('filter', {}))
+    if query.get('sort'):
+        cursor = cursor.sort(query['sort'])
+    if query.get('limit'):
+        cursor = cursor.limit(query['limit'])
+    explanation = cursor.explain()
+    winning_plan = explanation.get('queryPlanner', {}).get('winningPlan', {})
+    return _plan_stages(winning_plan)
+
+
+def report_query_plans(database=None, registry=None):
+    """Explain every canonical query and return the names of the ones doing a COLLSCAN."""
+    if database is None:
+        from models_mongo import get_database
+        database = get_database()
+    registry = registry if registry is not None else QUERY_REGISTRY
+
+    collscans = []
+    for query in registry:
+        stages = explain_query(database, query)
+        if 'COLLSCAN' in stages:
+            collscans.append(query['name'])
+            print(f"❌ {query['name']} ({query['collection']}): {' <- '.join(stages)}")
+        else:
+            print(f"✅ {query['name']} ({query['collection']}): {' <- '.join(stages)}")
+    return collscans
+
+
+if __name__ == "__main__":
+    print("🔧 Ensuring MongoDB indexes...")
+    for name in ensure_indexes():
+        print(f"   {name}")
+
+    if '--report' in sys.argv:
+        print("🔍 Checking query plans...")
+        failures = report_query_plans()
+        if failures:
+            print(f"❌ {len(failures)} canonical queries fall back to COLLSCAN")
+            sys.exit(1)
+        print("✅ All canonical queries use an index")
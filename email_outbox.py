@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Durable outbound email.
+
+`send_email` and friends in email_service.py write each message to the
+`email_outbox` collection and return. A fixed pool of sender threads claims
+queued messages from MongoDB in batches and delivers them over one
+long-lived, authenticated SMTP connection per thread, so a bulk action that
+sends hundreds of emails costs a handful of TLS handshakes instead of one
+thread and one handshake per message. Transient failures are retried with
+exponential backoff; permanent ones (rejected recipient, 5xx) are marked
+failed. Each sent message records `send_ms` (SMTP time) and `latency_ms`
+(enqueue to delivery).
+"""
+
+import os
+import smtplib
+import threading
+import time
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+
+EMAIL_SENDER_THREADS = int(os.getenv('EMAIL_SENDER_THREADS', '2'))
+# Messages claimed per round and sent back to back over the same connection
+EMAIL_BATCH_SIZE = 20
+MAX_ATTEMPTS = 5
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 3600
+# A message claimed by a sender that died is queued again after this
+LEASE_SECONDS = 120
+# Gmail drops idle sessions; close ours first instead of failing the next send
+SMTP_IDLE_SECONDS = 60
+SMTP_TIMEOUT_SECONDS = 30
+POLL_INTERVAL_SECONDS = 2.0
+
+
+def smtp_settings(config):
+    """SMTP settings from the Flask-Mail keys of an app config."""
+    return {
+        'host': config.get('MAIL_SERVER', 'localhost'),
+        'port': config.get('MAIL_PORT', 25),
+        'use_tls': config.get('MAIL_USE_TLS', False),
+        'use_ssl': config.get('MAIL_USE_SSL', False),
+        'username': config.get('MAIL_USERNAME'),
+        'password': config.get('MAIL_PASSWORD'),
+        'default_sender': config.get('MAIL_DEFAULT_SENDER'),
+    }
+
+
+def retry_delay(attempts):
+    """Seconds to wait before attempt number `attempts + 1`."""
+    return min(RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0), RETRY_MAX_SECONDS)
+
+
+def is_permanent_failure(error):
+    """Rejected recipients and 5xx replies will not succeed on retry; bad credentials might once fixed."""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return True
+    if isinstance(error, smtplib.SMTPAuthenticationError):
+        return False
+    code = getattr(error, 'smtp_code', None)
+    return isinstance(code, int) and 500 <= code < 600
+
+
+def build_message(doc, default_sender=None):
+    """EmailMessage for an outbox document (plain text, HTML or both)."""
+    message = EmailMessage()
+    message['Subject'] = doc['subject']
+    message['From'] = doc.get('sender') or default_sender
+    message['To'] = ', '.join(doc['recipients'])
+    if doc.get('body') is not None:
+        message.set_content(doc['body'])
+        if doc.get('html'):
+            message.add_alternative(doc['html'], subtype='html')
+    else:
+        message.set_content(doc.get('html') or '', subtype='html')
+    return message
+
+
+def _connect(settings):
+    smtp_class = smtplib.SMTP_SSL if settings.get('use_ssl') else smtplib.SMTP
+    server = smtp_class(settings['host'], settings['port'], timeout=SMTP_TIMEOUT_SECONDS)
+    if settings.get('use_tls') and not settings.get('use_ssl'):
+        server.starttls()
+    if settings.get('username'):
+        server.login(settings['username'], settings['password'])
+    return server
+
+
+class SmtpConnection:
+    """One authenticated SMTP session, reopened when it drops or has been idle too long."""
+
+    def __init__(self, settings, connect=_connect):
+        self.settings = settings
+        self.connect = connect
+        self.opened = 0
+        self._server = None
+        self._last_used = 0.0
+
+    def _open(self):
+        self._server = self.connect(self.settings)
+        self.opened += 1
+
+    def send(self, message):
+        if self._server is not None and time.monotonic() - self._last_used > SMTP_IDLE_SECONDS:
+            self.close()
+        if self._server is None:
+            self._open()
+        try:
+            self._server.send_message(message)
+        except smtplib.SMTPServerDisconnected:
+            # The server closed the session between messages: one fresh connection, one retry
+            self.close()
+            self._open()
+            self._server.send_message(message)
+        self._last_used = time.monotonic()
+
+    def close_if_idle(self):
+        if self._server is not None and time.monotonic() - self._last_used > SMTP_IDLE_SECONDS:
+            self.close()
+
+    def close(self):
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except Exception:
+                pass
+            self._server = None
+
+
+class EmailOutbox:
+    """MongoDB-backed email queue drained by a fixed pool of SMTP sender threads."""
+
+    def __init__(self, collection, settings, senders=EMAIL_SENDER_THREADS, batch_size=EMAIL_BATCH_SIZE,
+                 connect=_connect):
+        self.collection = collection
+        self.settings = settings
+        self.senders = senders
+        self.batch_size = batch_size
+        self.connect = connect
+        self.connections_opened = 0
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._workers = []
+        self._lock = threading.Lock()
+
+    def _document(self, subject, recipients, body=None, html=None, sender=None):
+        now = datetime.utcnow()
+        return {
+            'subject': subject,
+            'recipients': list(recipients),
+            'body': body,
+            'html': html,
+            'sender': sender,
+            'status': 'queued',
+            'attempts': 0,
+            'next_attempt_at': now,
+            'created_at': now,
+            'updated_at': now
+        }
+
+    def enqueue(self, subject, recipients, body=None, html=None, sender=None):
+        """Store a message for delivery and return its id."""
+        result = self.collection.insert_one(self._document(subject, recipients, body, html, sender))
+        self.start()
+        self._wakeup.set()
+        return result.inserted_id
+
+    def enqueue_many(self, messages):
+        """Store several messages (dicts of enqueue's arguments) with one insert."""
+        if not messages:
+            return []
+        result = self.collection.insert_many([self._document(**message) for message in messages], ordered=False)
+        self.start()
+        self._wakeup.set()
+        return result.inserted_ids
+
+    def start(self):
+        with self._lock:
+            if self._workers:
+                return
+            self._stop.clear()
+            for i in range(self.senders):
+                worker = threading.Thread(target=self._work, name=f'email-sender-{i}', daemon=True)
+                worker.start()
+                self._workers.append(worker)
+            print(f"✅ Email senders started ({self.senders} threads)")
+
+    def stop(self):
+        self._stop.set()
+        self._wakeup.set()
+        for worker in self._workers:
+            worker.join(timeout=5)
+        self._workers = []
+
+    def claim(self):
+        """Atomically take the oldest message that is due (or abandoned), or None."""
+        from pymongo import ReturnDocument
+
+        now = datetime.utcnow()
+        return self.collection.find_one_and_update(
+            {'$or': [
+                {'status': 'queued', 'next_attempt_at': {'$lte': now}},
+                {'status': 'sending', 'lease_expires_at': {'$lt': now}}
+            ]},
+            {
+                '$set': {
+                    'status': 'sending',
+                    'lease_expires_at': now + timedelta(seconds=LEASE_SECONDS),
+                    'worker': f'{os.getpid()}:{threading.current_thread().name}',
+                    'updated_at': now
+                },
+                '$inc': {'attempts': 1}
+            },
+            sort=[('next_attempt_at', 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    def claim_batch(self):
+        batch = []
+        while len(batch) < self.batch_size:
+            message = self.claim()
+            if message is None:
+                break
+            batch.append(message)
+        return batch
+
+    def _work(self):
+        connection = SmtpConnection(self.settings, self.connect)
+        try:
+            while not self._stop.is_set():
+                try:
+                    batch = self.claim_batch()
+                except Exception as e:
+                    print(f"⚠️  Could not claim outbound email: {e}")
+                    batch = []
+                if not batch:
+                    connection.close_if_idle()
+                    self._wakeup.wait(POLL_INTERVAL_SECONDS)
+                    self._wakeup.clear()
+                    continue
+                self.deliver(batch, connection)
+        finally:
+            connection.close()
+
+    def deliver(self, batch, connection):
+        """Send claimed messages over `connection`, recording the outcome of each."""
+        opened_before = connection.opened
+        sent = 0
+        for doc in batch:
+            started = time.perf_counter()
+            try:
+                connection.send(build_message(doc, self.settings.get('default_sender')))
+            except Exception as e:
+                # The session may be half-broken; start the next message on a fresh one
+                connection.close()
+                self._failed(doc, e)
+                continue
+            now = datetime.utcnow()
+            self.collection.update_one({'_id': doc['_id']}, {
+                '$set': {
+                    'status': 'sent',
+                    'sent_at': now,
+                    'send_ms': round((time.perf_counter() - started) * 1000, 1),
+                    'latency_ms': round((now - doc['created_at']).total_seconds() * 1000, 1),
+                    'updated_at': now
+                },
+                '$unset': {'lease_expires_at': '', 'last_error': ''}
+            })
+            sent += 1
+        with self._lock:
+            self.connections_opened += connection.opened - opened_before
+        print(f"📧 Sent {sent}/{len(batch)} emails")
+        return sent
+
+    def _failed(self, doc, error):
+        now = datetime.utcnow()
+        attempts = doc.get('attempts', 1)
+        if is_permanent_failure(error) or attempts >= MAX_ATTEMPTS:
+            update = {'status': 'failed', 'failed_at': now}
+            print(f"❌ Email to {doc['recipients']} failed permanently: {error}")
+        else:
+            update = {'status': 'queued', 'next_attempt_at': now + timedelta(seconds=retry_delay(attempts))}
+            print(f"⚠️  Email to {doc['recipients']} failed (attempt {attempts}), retrying: {error}")
+        update.update(last_error=str(error), updated_at=now)
+        self.collection.update_one({'_id': doc['_id']}, {'$set': update, '$unset': {'lease_expires_at': ''}})
+
+    def stats(self):
+        """Message counts by status, delivery latency of sent messages and connections opened by this process."""
+        counts = {doc['_id']: doc['count'] for doc in self.collection.aggregate([
+            {'$group': {'_id': '$status', 'count': {'$sum': 1}}}
+        ])}
+        latency = next(iter(self.collection.aggregate([
+            {'$match': {'status': 'sent'}},
+            {'$group': {'_id': None, 'avg_latency_ms': {'$avg': '$latency_ms'},
+                        'max_latency_ms': {'$max': '$latency_ms'}, 'avg_send_ms': {'$avg': '$send_ms'}}}
+        ])), {})
+        latency.pop('_id', None)
+        return {
+            'counts': counts,
+            'latency': {key: round(value or 0, 1) for key, value in latency.items()},
+            'connections_opened': self.connections_opened,
+            'senders': self.senders
+        }
+
+
+_outbox = None
+_outbox_lock = threading.Lock()
+
+
+def get_outbox(config=None):
+    """The process-wide outbox; sender threads start on the first enqueue."""
+    global _outbox
+    with _outbox_lock:
+        if _outbox is None:
+            if config is None:
+                from flask import current_app
+                config = current_app.config
+            from models_mongo import email_outbox_collection
+            _outbox = EmailOutbox(email_outbox_collection, smtp_settings(config))
+        return _outbox
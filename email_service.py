@@ -1,25 +1,18 @@
 from flask import current_app
-from flask_mail import Message
-from threading import Thread
 import os
 
-def send_async_email(app, msg):
-    with app.app_context():
-        from app_mongo import mail
-        mail.send(msg)
-
-def send_email(subject, recipients, body):
+def send_email(subject, recipients, body=None, html=None):
+    """Queue an email in the outbox; the sender pool delivers it (see email_outbox.py)"""
     try:
+        from email_outbox import get_outbox
         app = current_app._get_current_object()
-        msg = Message(subject, recipients=recipients)
-        msg.body = body
         
         # Check if email is properly configured
         if not app.config.get('MAIL_USERNAME') or not app.config.get('MAIL_PASSWORD'):
             print(f"❌ EMAIL NOT CONFIGURED - USER: {app.config.get('MAIL_USERNAME', 'NOT_SET')}, PASS: {'SET' if app.config.get('MAIL_PASSWORD') else 'NOT_SET'}")
             return False
             
-        Thread(target=send_async_email, args=(app, msg)).start()
+        get_outbox(app.config).enqueue(subject, recipients, body=body, html=html)
         print(f"✅ Email queued for sending to: {recipients}")
         return True
     except Exception as e:
@@ -128,8 +121,8 @@ Invensis Hiring Portal
     
     send_email(subject, [candidate_email], body)
 
-def send_invitation_email(email, role, registration_link):
-    """Send invitation email for new user registration"""
+def build_invitation_email(email, role, registration_link):
+    """Return (subject, html) of the registration invitation (pure, testable)."""
     subject = f"Invensis Hiring Portal Access Invitation - {role}"
     
     html_content = f"""
@@ -192,22 +185,38 @@ def send_invitation_email(email, role, registration_link):
         </div>
     </div>
     """
+    return subject, html_content
+
+def send_invitation_email(email, role, registration_link):
+    """Send invitation email for new user registration"""
+    subject, html_content = build_invitation_email(email, role, registration_link)
     
-    # Send HTML email
-    from flask_mail import Message
-    from app_mongo import mail
-    
-    msg = Message(
-        subject=subject,
-        recipients=[email],
-        html=html_content
-    )
-    
-    # Send email asynchronously
-    app = current_app._get_current_object()
-    Thread(target=send_async_email, args=(app, msg)).start()
+    # Send HTML email through the outbox
+    email_sent = send_email(subject, [email], html=html_content)
     
-    print(f"Invitation email sent to {email} for role: {role}") 
+    print(f"Invitation email queued for {email} for role: {role}")
+    return email_sent
+
+def send_invitation_emails(invites):
+    """Queue invitations for (email, role, registration_link) tuples with a single outbox insert"""
+    try:
+        from email_outbox import get_outbox
+        app = current_app._get_current_object()
+        
+        if not app.config.get('MAIL_USERNAME') or not app.config.get('MAIL_PASSWORD'):
+            print(f"❌ EMAIL NOT CONFIGURED - USER: {app.config.get('MAIL_USERNAME', 'NOT_SET')}, PASS: {'SET' if app.config.get('MAIL_PASSWORD') else 'NOT_SET'}")
+            return False
+        
+        messages = []
+        for email, role, registration_link in invites:
+            subject, html_content = build_invitation_email(email, role, registration_link)
+            messages.append({'subject': subject, 'recipients': [email], 'html': html_content})
+        get_outbox(app.config).enqueue_many(messages)
+        print(f"✅ {len(messages)} invitation emails queued")
+        return True
+    except Exception as e:
+        print(f"❌ Error in send_invitation_emails: {str(e)}")
+        return False
 
 def send_password_reset_email(user_email, user_name, reset_token, base_url):
     """Send password reset email with secure token"""
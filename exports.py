@@ -0,0 +1,101 @@
+"""
+Streaming CSV / XLSX downloads.
+
+Rows are consumed lazily (typically straight from a MongoDB cursor) so an
+export holds one batch of rows in memory no matter how many documents match:
+
+- CSV is encoded in chunks by a generator and sent as a streamed Response,
+  so the first byte leaves as soon as the first batch arrives.
+- XLSX is written with openpyxl's write-only workbook into a spooled
+  temporary file (memory up to XLSX_SPOOL_BYTES, then disk) and sent from there.
+"""
+
+import csv
+import io
+import tempfile
+from datetime import datetime
+
+from flask import Response, send_file
+
+CSV_CHUNK_BYTES = 64 * 1024
+XLSX_SPOOL_BYTES = 8 * 1024 * 1024
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+def format_datetime(value, fmt='%Y-%m-%d %H:%M:%S'):
+    """Export representation of a date that may be a datetime, a string or missing."""
+    if not value:
+        return ''
+    if isinstance(value, datetime):
+        return value.strftime(fmt)
+    return str(value)
+
+
+def iter_csv(header, rows, chunk_bytes=CSV_CHUNK_BYTES):
+    """Yield the CSV for `header` and `rows` as UTF-8 chunks of roughly `chunk_bytes`."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= chunk_bytes:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def csv_response(filename, header, rows):
+    """Streamed CSV download."""
+    return Response(
+        iter_csv(header, rows),
+        mimetype="text/csv",
+        headers={"Content-Disposition": f"attachment;filename={filename}"}
+    )
+
+
+def write_xlsx(header, rows, title='Export', column_widths=None):
+    """Write rows to a write-only workbook and return the spooled file, rewound.
+
+    Write-only worksheets cannot be measured after the fact, so column widths
+    are given up front (defaults to the header lengths).
+    """
+    from openpyxl import Workbook  # type: ignore
+    from openpyxl.cell import WriteOnlyCell  # type: ignore
+    from openpyxl.styles import Font, PatternFill  # type: ignore
+    from openpyxl.utils import get_column_letter  # type: ignore
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title)
+    widths = column_widths or [len(name) + 2 for name in header]
+    for col, width in enumerate(widths, 1):
+        ws.column_dimensions[get_column_letter(col)].width = min(width, 50)
+
+    header_font = Font(bold=True, color="FFFFFF")
+    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    header_cells = []
+    for name in header:
+        cell = WriteOnlyCell(ws, value=name)
+        cell.font = header_font
+        cell.fill = header_fill
+        header_cells.append(cell)
+    ws.append(header_cells)
+
+    for row in rows:
+        ws.append(row)
+
+    spooled = tempfile.SpooledTemporaryFile(max_size=XLSX_SPOOL_BYTES)
+    wb.save(spooled)
+    spooled.seek(0)
+    return spooled
+
+
+def xlsx_response(filename, header, rows, title='Export', column_widths=None):
+    """XLSX download written in write-only mode to a spooled temporary file."""
+    return send_file(
+        write_xlsx(header, rows, title, column_widths),
+        as_attachment=True,
+        download_name=filename,
+        mimetype=XLSX_MIMETYPE
+    )
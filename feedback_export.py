@@ -0,0 +1,128 @@
+"""
+Manager feedback export.
+
+Feedback is read from a cursor and joined to its candidates in batches (one
+`$in` query per FEEDBACK_BATCH_SIZE rows instead of one find_one per row),
+then written either as streamed CSV (exports.csv_response) or as a PDF report
+that flows onto as many pages as the rows need.
+"""
+
+import tempfile
+
+from bson import ObjectId
+
+from exports import format_datetime
+
+FEEDBACK_BATCH_SIZE = 500
+FEEDBACK_HEADERS = ['Candidate Name', 'Email', 'Status', 'Feedback', 'Date']
+PDF_SPOOL_BYTES = 8 * 1024 * 1024
+
+
+def _candidate_keys(candidate_id):
+    """Feedback stores the candidate id as a string; candidates are keyed by ObjectId."""
+    keys = [candidate_id]
+    if isinstance(candidate_id, str) and ObjectId.is_valid(candidate_id):
+        keys.append(ObjectId(candidate_id))
+    return keys
+
+
+def _candidate_name(candidate):
+    return candidate.get('name') or f"{candidate.get('first_name', '')} {candidate.get('last_name', '')}".strip()
+
+
+def iter_feedback_rows(feedback_collection, candidates_collection, manager_email, batch_size=FEEDBACK_BATCH_SIZE):
+    """Yield [name, email, status, feedback, date] for each of the manager's feedback entries.
+
+    Entries whose candidate no longer exists are skipped.
+    """
+    cursor = feedback_collection.find(
+        {'manager_email': manager_email},
+        {'candidate_id': 1, 'status': 1, 'feedback_text': 1, 'created_at': 1, 'timestamp': 1},
+        batch_size=batch_size
+    )
+    batch = []
+    for feedback in cursor:
+        batch.append(feedback)
+        if len(batch) == batch_size:
+            yield from _join_batch(batch, candidates_collection)
+            batch = []
+    if batch:
+        yield from _join_batch(batch, candidates_collection)
+
+
+def _join_batch(batch, candidates_collection):
+    ids = [key for feedback in batch for key in _candidate_keys(feedback.get('candidate_id'))]
+    candidates = {
+        str(candidate['_id']): candidate
+        for candidate in candidates_collection.find(
+            {'_id': {'$in': ids}}, {'name': 1, 'first_name': 1, 'last_name': 1, 'email': 1}
+        )
+    }
+    for feedback in batch:
+        candidate = candidates.get(str(feedback.get('candidate_id')))
+        if candidate:
+            yield [
+                _candidate_name(candidate),
+                candidate.get('email', ''),
+                feedback.get('status', ''),
+                feedback.get('feedback_text', ''),
+                format_datetime(feedback.get('created_at') or feedback.get('timestamp'))
+            ]
+
+
+def write_feedback_pdf(rows, manager_name, report_date):
+    """Write the feedback report, starting a new page whenever the current one is full.
+
+    Returns a rewound spooled temporary file.
+    """
+    from reportlab.pdfgen import canvas
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.utils import simpleSplit
+
+    width, height = letter
+    left, bottom, line_height = 72, 72, 16
+    text_width = width - 2 * left
+
+    spooled = tempfile.SpooledTemporaryFile(max_size=PDF_SPOOL_BYTES)
+    p = canvas.Canvas(spooled, pagesize=letter)
+    page = 1
+
+    def footer():
+        p.setFont("Helvetica", 9)
+        p.drawRightString(width - left, bottom / 2, f"Page {page}")
+
+    p.setFont("Helvetica-Bold", 16)
+    p.drawString(left, height - 60, "Feedback Report")
+    p.setFont("Helvetica", 12)
+    p.drawString(left, height - 90, f"Manager: {manager_name}")
+    p.drawString(left, height - 110, f"Date: {report_date}")
+    y = height - 150
+
+    def new_page():
+        nonlocal page, y
+        footer()
+        p.showPage()
+        page += 1
+        y = height - 72
+
+    for name, email, status, feedback_text, date in rows:
+        lines = [f"Candidate: {name} ({email})" if email else f"Candidate: {name}",
+                 f"Status: {status}    Date: {date}"]
+        lines += simpleSplit(f"Feedback: {feedback_text or ''}", "Helvetica", 12, text_width)
+        # Keep an entry on one page unless it is longer than a page by itself
+        if y - line_height * len(lines) < bottom and y < height - 72:
+            new_page()
+        p.setFont("Helvetica", 12)
+        for line in lines:
+            if y < bottom:
+                new_page()
+                p.setFont("Helvetica", 12)
+            p.drawString(left, y, line)
+            y -= line_height
+        y -= line_height
+
+    footer()
+    p.showPage()
+    p.save()
+    spooled.seek(0)
+    return spooled
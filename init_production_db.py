@@ -15,12 +15,39 @@ load_dotenv()
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 def init_production_database():
-    """Initialize production database with admin user"""
+    """Initialize production database indexes and admin user"""
     try:
         from models_mongo import User
+        from db_indexes import ensure_indexes
         
         print("🚀 Initializing production database...")
         
+        # Create indexes for the routes' access patterns (idempotent)
+        ensured = ensure_indexes()
+        print(f"✅ Ensured {len(ensured)} MongoDB indexes")
+        
+        # Move activity logs past the retention window to the archive
+        try:
+            from activity_log_archive import run_archive
+            print(f"✅ Archived {run_archive()} old activity logs")
+        except Exception as e:
+            print(f"⚠️  Could not archive activity logs: {e}")
+        
+        # Backfills and data fixes that used to run during page loads
+        try:
+            from migrations import run_pending
+            run_pending()
+        except Exception as e:
+            print(f"⚠️  Could not run data migrations: {e}")
+        
+        # Seed the pipeline counters once; dashboards ignore them until then
+        try:
+            from pipeline_stats import ensure_materialized
+            if ensure_materialized():
+                print("✅ Materialized pipeline stats")
+        except Exception as e:
+            print(f"⚠️  Could not materialize pipeline stats: {e}")
+        
         # Get admin credentials from environment variables
         admin_email = os.getenv('DEFAULT_ADMIN_EMAIL', 'admin@invensis.com')
         admin_password = os.getenv('DEFAULT_ADMIN_PASSWORD', 'InvensisAdmin2025!')
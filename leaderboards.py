@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Cluster performance leaderboards (HR, recruiter and manager).
+
+Each leaderboard is one `$group` over the candidates of the listed users
+(status counts and latest `created_at` per assigned_by / manager_email)
+plus one query for the users themselves, joined in Python. Results are
+kept in the shared response cache for LEADERBOARD_TTL_SECONDS, tagged with
+`candidates` and `users`, so a candidate or user write shows up on the
+next request.
+"""
+
+import os
+from datetime import datetime
+
+LEADERBOARD_TTL_SECONDS = int(os.getenv('LEADERBOARD_TTL_SECONDS', '60'))
+
+NOT_SELECTED_STATUSES = ['Not Selected', 'Rejected', 'Declined', 'Failed', 'Not Approved']
+REVIEWED_STATUSES = ['Selected'] + NOT_SELECTED_STATUSES
+
+
+def cached(name, compute, ttl=LEADERBOARD_TTL_SECONDS):
+    """Return the cached value of leaderboard `name`, computing it when missing, expired or invalidated."""
+    from response_cache import get_cache
+    return get_cache().memoize(f'leaderboard.{name}', {}, compute, ('candidates', 'users'), ttl)
+
+
+def _count_if(condition):
+    return {'$sum': {'$cond': [condition, 1, 0]}}
+
+
+def _status_is(*statuses):
+    return {'$in': ['$status', list(statuses)]}
+
+
+def group_candidates(candidates_collection, field, emails, counters, latest_condition=None):
+    """{email: group} with `counters` and `last_created_at` for candidates whose `field` is in `emails`."""
+    latest = '$created_at' if latest_condition is None else {'$cond': [latest_condition, '$created_at', None]}
+    group = {'_id': f'${field}', 'last_created_at': {'$max': latest}}
+    group.update(counters)
+    return {
+        row['_id']: row for row in candidates_collection.aggregate([
+            {'$match': {field: {'$in': emails}}},
+            {'$group': group}
+        ])
+    }
+
+
+def format_day(value):
+    """mm/dd/YYYY of a datetime or ISO string, 'N/A' when missing."""
+    if not value:
+        return 'N/A'
+    try:
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        return value.strftime('%m/%d/%Y')
+    except (ValueError, AttributeError):
+        return 'Recent'
+
+
+def _full_name(user):
+    return user.get('first_name', '') + ' ' + user.get('last_name', '')
+
+
+def hr_leaderboard(candidates_collection, users_collection):
+    users = list(users_collection.find({'role': 'hr_role', 'is_active': True},
+                                       {'email': 1, 'first_name': 1, 'last_name': 1, 'cluster': 1}))
+    groups = group_candidates(candidates_collection, 'assigned_by', [user.get('email') for user in users], {
+        'total': {'$sum': 1},
+        'pending': _count_if(_status_is('Pending')),
+        'selected': _count_if(_status_is('Selected')),
+        'not_selected': _count_if(_status_is('Not Selected')),
+    })
+    rows = []
+    for user in users:
+        group = groups.get(user.get('email'), {})
+        rows.append({
+            'name': _full_name(user),
+            'email': user.get('email'),
+            'cluster': user.get('cluster', 'General'),
+            'total_assigned': group.get('total', 0),
+            'pending': group.get('pending', 0),
+            'selected': group.get('selected', 0),
+            'not_selected': group.get('not_selected', 0),
+            'last_activity': format_day(group.get('last_created_at')),
+            'avg_response_time': '2.5 hours'  # Mock data for now
+        })
+    return rows
+
+
+def recruiter_leaderboard(candidates_collection, users_collection):
+    users = list(users_collection.find({'role': 'recruiter'}, {'email': 1, 'name': 1, 'cluster': 1}))
+    groups = group_candidates(candidates_collection, 'assigned_by', [user.get('email') for user in users], {
+        'total': {'$sum': 1},
+        'pending': _count_if(_status_is('Pending')),
+        'assigned': _count_if(_status_is('Assigned')),
+        'selected': _count_if(_status_is('Selected')),
+        'not_selected': _count_if(_status_is(*NOT_SELECTED_STATUSES)),
+    })
+    rows = []
+    for user in users:
+        group = groups.get(user.get('email'), {})
+        rows.append({
+            'name': user.get('name', 'Unknown'),
+            'email': user.get('email'),
+            'cluster': user.get('cluster', 'General'),
+            'total_uploaded': group.get('total', 0),
+            'pending': group.get('pending', 0),
+            'assigned': group.get('assigned', 0),
+            'selected': group.get('selected', 0),
+            'not_selected': group.get('not_selected', 0),
+            'last_activity': format_day(group.get('last_created_at')),
+            'avg_response_time': '1.2 hours'  # Mock data for now
+        })
+    return rows
+
+
+def manager_leaderboard(candidates_collection, users_collection):
+    users = list(users_collection.find({'role': 'manager'}, {'email': 1, 'first_name': 1, 'last_name': 1, 'cluster': 1}))
+    reviewed = _status_is(*REVIEWED_STATUSES)
+    groups = group_candidates(candidates_collection, 'manager_email', [user.get('email') for user in users], {
+        'reviewed': _count_if(reviewed),
+        # Candidates the manager sent back to HR
+        'reassigned': _count_if({'$ne': [{'$ifNull': ['$reassigned_by_manager', None]}, None]}),
+        'selected': _count_if(_status_is('Selected')),
+        'not_selected': _count_if(_status_is(*NOT_SELECTED_STATUSES)),
+    }, latest_condition=reviewed)  # created_at of reviewed candidates stands in for the review date
+    rows = []
+    for user in users:
+        group = groups.get(user.get('email'), {})
+        rows.append({
+            'name': _full_name(user),
+            'email': user.get('email'),
+            'cluster': user.get('cluster', 'General'),
+            'total_reviewed': group.get('reviewed', 0),
+            'pending_review': group.get('reassigned', 0),
+            'selected': group.get('selected', 0),
+            'not_selected': group.get('not_selected', 0),
+            'last_review': format_day(group.get('last_created_at')),
+            'avg_review_time': '1.8 hours'  # Mock data for now
+        })
+    return rows
@@ -0,0 +1,97 @@
+"""
+Manager dashboard status buckets from one `$facet` aggregation.
+
+A manager's dashboard shows four buckets of their candidates: assigned,
+selected, not selected and reassigned (sent back to HR by them).
+`dashboard_buckets()` fetches the first DASHBOARD_BUCKET_SIZE rows and the
+total count of every bucket in a single aggregation whose `$match` is
+answered from the manager's own index ranges, so its cost depends on the
+size of the manager's pipeline, not on the company-wide rejection history.
+Further rows of one bucket are fetched by `bucket_page()`, a keyset page
+continuing from the cursor returned with the first rows. The facet's
+`$sort` and the keyset condition both follow MongoDB's cross-type order,
+so rows whose updated_at is still a legacy ISO string (until the date
+migrations have run), null or missing are counted and reachable by
+"Load more" after the dated ones.
+"""
+
+from pagination import paginate, encode_cursor
+
+DASHBOARD_BUCKET_SIZE = 25
+NOT_SELECTED_STATUSES = ['Not Selected', 'Rejected', 'Declined', 'Failed', 'Not Approved']
+BUCKETS = ('assigned', 'selected', 'not_selected', 'reassigned')
+BUCKET_FIELDS = {'first_name': 1, 'last_name': 1, 'email': 1, 'status': 1, 'manager_email': 1,
+                 'rejection_reasons': 1, 'created_at': 1, 'updated_at': 1, 'reviewed_at': 1}
+
+
+def bucket_query(bucket, manager_email):
+    """(query, sort field) of `bucket` for `manager_email`."""
+    if bucket == 'assigned':
+        return {'manager_email': manager_email, 'status': {'$in': ['New', 'Assigned']}}, 'created_at'
+    if bucket == 'selected':
+        return {'manager_email': manager_email, 'status': 'Selected'}, 'updated_at'
+    if bucket == 'not_selected':
+        return {'manager_email': manager_email, 'status': {'$in': NOT_SELECTED_STATUSES}}, 'updated_at'
+    if bucket == 'reassigned':
+        return {'reassigned_by_manager': manager_email, 'status': 'Pending'}, 'updated_at'
+    raise ValueError(f"Unknown dashboard bucket: {bucket}")
+
+
+def dashboard_buckets(candidates_collection, manager_email, limit=DASHBOARD_BUCKET_SIZE):
+    """{bucket: {'candidates', 'count', 'next_cursor'}} for every bucket, from one aggregation."""
+    queries = {bucket: bucket_query(bucket, manager_email) for bucket in BUCKETS}
+    facets = {}
+    for bucket, (query, sort_field) in queries.items():
+        facets[bucket] = [
+            {'$match': query},
+            {'$sort': {sort_field: -1, '_id': -1}},
+            {'$limit': limit},
+            {'$project': BUCKET_FIELDS},
+        ]
+        facets[f'{bucket}_count'] = [{'$match': query}, {'$count': 'count'}]
+
+    pipeline = [
+        {'$match': {'$or': [query for query, _ in queries.values()]}},
+        {'$facet': facets},
+    ]
+    result = next(iter(candidates_collection.aggregate(pipeline)), {})
+
+    buckets = {}
+    for bucket, (_, sort_field) in queries.items():
+        candidates = result.get(bucket, [])
+        counted = result.get(f'{bucket}_count') or [{'count': 0}]
+        count = counted[0]['count']
+        buckets[bucket] = {
+            'candidates': candidates,
+            'count': count,
+            'next_cursor': encode_cursor(candidates[-1], sort_field) if count > len(candidates) else None,
+        }
+    return buckets
+
+
+def bucket_page(candidates_collection, manager_email, bucket, cursor=None, page_size=DASHBOARD_BUCKET_SIZE):
+    """The next keyset page of one bucket (same order as dashboard_buckets)."""
+    query, sort_field = bucket_query(bucket, manager_email)
+    return paginate(candidates_collection, query, cursor, page_size, sort_field, -1, BUCKET_FIELDS)
+
+
+def _date_label(value):
+    if isinstance(value, str):
+        from normalize_dates import parse_timestamp
+        value = parse_timestamp(value)
+    return value.strftime('%Y-%m-%d %H:%M') if hasattr(value, 'strftime') else None
+
+
+def candidate_row(candidate):
+    """JSON-safe bucket row for the load-more API."""
+    return {
+        '_id': str(candidate['_id']),
+        'first_name': candidate.get('first_name', ''),
+        'last_name': candidate.get('last_name', ''),
+        'email': candidate.get('email', ''),
+        'status': candidate.get('status', ''),
+        'rejection_reasons': candidate.get('rejection_reasons') or [],
+        'created_at': _date_label(candidate.get('created_at')),
+        'updated_at': _date_label(candidate.get('updated_at')),
+        'reviewed_at': _date_label(candidate.get('reviewed_at')),
+    }
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Versioned data migrations, run offline instead of from page loads.
+
+Each migration has a version, a collection, a query selecting the documents
+that still need it and a `transform(document)` returning the update for one
+document (or None to skip it). Documents are processed in `_id` order in
+batches streamed from one projected cursor and written with
+`bulk_write(ordered=False)` (see `bulk_update`, also usable for one-off
+scripts); after every batch the position, counts and throughput (docs/sec)
+are saved in the `migrations` collection, so an interrupted run resumes
+where it stopped and a finished migration is never run again. A lease on that document keeps two processes (e.g. several
+workers starting at once) from running the same migration.
+
+    python migrations.py                 run every pending migration
+    python migrations.py --status        list migrations and their progress
+    python migrations.py --dry-run       count and preview, write nothing
+    python migrations.py --only 3        run a single migration
+
+Pending migrations also run from init_production_db at startup.
+"""
+
+import os
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+from pymongo import UpdateOne, ReturnDocument
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Add current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+MIGRATION_BATCH_SIZE = int(os.getenv('MIGRATION_BATCH_SIZE', '500'))
+MIGRATION_LEASE_SECONDS = 300
+PREVIEW_COUNT = 3
+
+
+class Migration:
+    def __init__(self, version, name, collection, query, transform, projection=None):
+        self.version = version
+        self.name = name
+        self.collection = collection
+        self.query = query
+        self.transform = transform
+        self.projection = projection
+
+    @property
+    def label(self):
+        return f"{self.version:04d} {self.name}"
+
+
+MIGRATIONS = []
+
+
+def migration(version, name, collection, query, projection=None):
+    """Register the decorated `transform(document)` as migration `version`."""
+    def register(transform):
+        if any(existing.version == version for existing in MIGRATIONS):
+            raise ValueError(f"Migration version {version} is already registered")
+        MIGRATIONS.append(Migration(version, name, collection, query, transform, projection))
+        MIGRATIONS.sort(key=lambda m: m.version)
+        return transform
+    return register
+
+
+def _claim(state_collection, migration, now=None):
+    """Take the lease on `migration`; None if another process holds it or it is finished."""
+    from pymongo.errors import DuplicateKeyError
+
+    now = now or datetime.utcnow()
+    try:
+        return state_collection.find_one_and_update(
+            {'_id': migration.version, 'status': {'$ne': 'done'},
+             '$or': [{'status': {'$ne': 'running'}}, {'lease_until': {'$lt': now}}]},
+            {'$set': {'name': migration.name, 'status': 'running',
+                      'lease_until': now + timedelta(seconds=MIGRATION_LEASE_SECONDS)},
+             '$setOnInsert': {'started_at': now, 'processed': 0, 'modified': 0, 'errors': 0}},
+            upsert=True, return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError:
+        return None
+
+
+def _chunks(documents, size):
+    batch = []
+    for document in documents:
+        batch.append(document)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def bulk_update(collection, documents, transform, batch_size=MIGRATION_BATCH_SIZE, on_batch=None, label='bulk update'):
+    """Apply `transform(document)` to every document of an iterable (usually a projected cursor).
+
+    Updates are written `batch_size` at a time with one unordered bulk_write;
+    `on_batch(last_document, counts, rate)` runs after each batch, `rate` being
+    documents per second so far. Returns {'processed', 'modified', 'errors', 'rate'}.
+    """
+    from pymongo.errors import BulkWriteError
+
+    counts = {'processed': 0, 'modified': 0, 'errors': 0}
+    started = time.monotonic()
+    for batch in _chunks(documents, batch_size):
+        operations = []
+        for document in batch:
+            try:
+                update = transform(document)
+            except Exception as e:
+                counts['errors'] += 1
+                print(f"⚠️  {label}: could not migrate {document.get('_id')}: {e}")
+                continue
+            if update:
+                operations.append(UpdateOne({'_id': document['_id']}, update))
+        if operations:
+            try:
+                counts['modified'] += collection.bulk_write(operations, ordered=False).modified_count
+            except BulkWriteError as e:
+                counts['modified'] += e.details.get('nModified', 0)
+                counts['errors'] += len(e.details.get('writeErrors', []))
+        counts['processed'] += len(batch)
+        if on_batch:
+            on_batch(batch[-1], counts, _rate(counts['processed'], started))
+    return {**counts, 'rate': _rate(counts['processed'], started)}
+
+
+def _rate(processed, started):
+    return round(processed / max(time.monotonic() - started, 1e-6), 1)
+
+
+def preview_migration(migration, collection, report=print):
+    """Dry run: how many documents match and what the first few updates would be."""
+    total = collection.count_documents(migration.query)
+    report(f"🔎 {migration.label}: {total} documents would be migrated")
+    for document in collection.find(migration.query, migration.projection).limit(PREVIEW_COUNT):
+        report(f"   {document['_id']}: {migration.transform(document)}")
+    return {'matched': total, 'modified': 0}
+
+
+def run_migration(migration, collection, state_collection, batch_size=MIGRATION_BATCH_SIZE, report=print):
+    """Run (or resume) one migration. Returns its counts, or None if another process holds it."""
+    state = _claim(state_collection, migration)
+    if state is None:
+        report(f"⏭️  {migration.label}: finished or running in another process")
+        return None
+
+    query = migration.query
+    if state.get('last_id') is not None:
+        query = {'$and': [query, {'_id': {'$gt': state['last_id']}}]}
+    done = {key: state.get(key, 0) for key in ('processed', 'modified', 'errors')}
+    total = done['processed'] + collection.count_documents(query)
+    report(f"🚚 {migration.label}: {total - done['processed']} of {total} documents to go")
+
+    def save_progress(last_document, counts, rate):
+        totals = {key: done[key] + counts[key] for key in done}
+        state_collection.update_one({'_id': migration.version}, {'$set': {
+            'last_id': last_document['_id'], **totals, 'rate': rate,
+            'lease_until': datetime.utcnow() + timedelta(seconds=MIGRATION_LEASE_SECONDS)
+        }})
+        report(f"⏳ {migration.label}: {totals['processed']}/{total} ({rate} docs/sec)")
+
+    # One cursor in _id order, fetched batch_size documents per round-trip
+    cursor = collection.find(query, migration.projection).sort('_id', 1).batch_size(batch_size)
+    result = bulk_update(collection, cursor, migration.transform, batch_size, save_progress, migration.label)
+    counts = {key: done[key] + result[key] for key in done}
+
+    state_collection.update_one({'_id': migration.version}, {
+        '$set': {'status': 'done', 'finished_at': datetime.utcnow()}, '$unset': {'lease_until': ''}
+    })
+    if counts['modified']:
+        from response_cache import invalidate
+        invalidate(migration.collection)
+    report(f"✅ {migration.label}: {counts['modified']} documents updated, {counts['errors']} errors "
+           f"({result['rate']} docs/sec)")
+    return counts
+
+
+def run_pending(db=None, state_collection=None, dry_run=False, only=None, batch_size=MIGRATION_BATCH_SIZE,
+                report=print):
+    """Run every migration not finished yet, in version order. Returns {version: counts}."""
+    if db is None:
+        from models_mongo import db
+    if state_collection is None:
+        from models_mongo import migrations_collection as state_collection
+
+    done = {state['_id'] for state in state_collection.find({'status': 'done'}, {'_id': 1})}
+    results = {}
+    for migration in MIGRATIONS:
+        if only is not None and migration.version != only:
+            continue
+        if migration.version in done:
+            if only is not None:
+                report(f"✅ {migration.label}: already done")
+            continue
+        if dry_run:
+            results[migration.version] = preview_migration(migration, db[migration.collection], report)
+        else:
+            results[migration.version] = run_migration(migration, db[migration.collection], state_collection,
+                                                       batch_size, report)
+    return results
+
+
+def migration_status(state_collection=None):
+    """[(migration, state document or None)] in version order."""
+    if state_collection is None:
+        from models_mongo import migrations_collection as state_collection
+    states = {state['_id']: state for state in state_collection.find()}
+    return [(migration, states.get(migration.version)) for migration in MIGRATIONS]
+
+
+# --- Migrations ------------------------------------------------------------
+
+MISSING = [None, '']
+STATIC_PREFIX = re.compile('^static/')
+
+
+@migration(1, 'strip static/ from candidate file paths', 'candidates',
+           {'$or': [{'resume_path': STATIC_PREFIX}, {'image_path': STATIC_PREFIX}]},
+           projection={'resume_path': 1, 'image_path': 1})
+def strip_static_prefix(candidate):
+    updates = {}
+    for field in ('resume_path', 'image_path'):
+        path = candidate.get(field)
+        if isinstance(path, str) and path.startswith('static/'):
+            updates[field] = path.replace('static/', '', 1)
+    return {'$set': updates} if updates else None
+
+
+@migration(2, 'backfill candidate reference ids', 'candidates',
+           {'reference_id': {'$in': MISSING}}, projection={'_id': 1})
+def backfill_reference_id(candidate):
+    from models_mongo import new_reference_id
+    return {'$set': {'reference_id': new_reference_id()}}
+
+
+@migration(3, 'backfill candidate names', 'candidates',
+           {'name': {'$in': MISSING}, '$or': [{'first_name': {'$nin': MISSING}}, {'last_name': {'$nin': MISSING}}]},
+           projection={'first_name': 1, 'last_name': 1})
+def backfill_name(candidate):
+    name = f"{candidate.get('first_name') or ''} {candidate.get('last_name') or ''}".strip()
+    return {'$set': {'name': name}} if name else None
+
+
+OLD_RATING_FIELDS = ['hr_rating', 'tech_rating', 'hr_review', 'tech_review']
+
+
+@migration(4, 'convert old hr/tech ratings to detailed ratings', 'candidates',
+           {'$or': [{field: {'$exists': True}} for field in OLD_RATING_FIELDS]},
+           projection=dict.fromkeys(OLD_RATING_FIELDS, 1))
+def convert_old_ratings(candidate):
+    hr_rating = candidate.get('hr_rating') or 0
+    tech_rating = candidate.get('tech_rating') or 0
+    return {
+        '$set': {
+            'communication_skills': hr_rating,
+            'adaptability': hr_rating,
+            'teamwork_collaboration': hr_rating,
+            'job_fit': tech_rating,
+            'overall_rating': round((hr_rating + tech_rating) / 2, 1) if hr_rating and tech_rating else 0,
+            'other_notes': (candidate.get('hr_review') or '') + ' ' + (candidate.get('tech_review') or ''),
+            'updated_at': datetime.utcnow()
+        },
+        '$unset': dict.fromkeys(OLD_RATING_FIELDS, '')
+    }
+
+
+RATINGS_MIGRATION = 4
+
+
+def _date_migration(version, collection):
+    """Migration `version`: normalize_dates for one collection of DATE_FIELDS."""
+    from normalize_dates import DATE_FIELDS, string_dates_query, guarded_date_update
+
+    fields = DATE_FIELDS[collection]
+
+    @migration(version, f'convert string timestamps in {collection} to dates', collection,
+               string_dates_query(fields), projection=dict.fromkeys(fields, 1))
+    def convert_string_dates(document):
+        return guarded_date_update(document, fields)
+
+
+# Paging and dashboards sort on these fields and assume they hold BSON dates
+DATE_MIGRATIONS = {5: 'candidates', 6: 'candidate_requests', 7: 'activity_logs', 8: 'feedback'}
+for _version, _collection in DATE_MIGRATIONS.items():
+    _date_migration(_version, _collection)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Run versioned data migrations')
+    parser.add_argument('--dry-run', action='store_true', help='count and preview without writing')
+    parser.add_argument('--status', action='store_true', help='list migrations and their progress')
+    parser.add_argument('--only', type=int, help='run only this migration version')
+    parser.add_argument('--batch-size', type=int, default=MIGRATION_BATCH_SIZE)
+    args = parser.parse_args()
+
+    if args.status:
+        for migration, state in migration_status():
+            if state is None:
+                print(f"⬜ {migration.label}: pending")
+            else:
+                print(f"{'✅' if state.get('status') == 'done' else '⏳'} {migration.label}: {state.get('status')}, "
+                      f"{state.get('processed', 0)} processed, {state.get('modified', 0)} updated, "
+                      f"{state.get('errors', 0)} errors, {state.get('rate', 0)} docs/sec")
+        return
+    run_pending(dry_run=args.dry_run, only=args.only, batch_size=args.batch_size)
+
+
+if __name__ == '__main__':
+    main()
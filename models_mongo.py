@@ -22,12 +22,18 @@ users_collection = db.users
 roles_collection = db.roles
 candidates_collection = db.candidates
 activity_logs_collection = db.activity_logs
+activity_logs_archive_collection = db.activity_logs_archive # Activity logs past the retention window
 feedback_collection = db.feedback
 user_emails_collection = db.user_emails
 password_reset_tokens_collection = db.password_reset_tokens # Added for password reset tokens
 candidate_requests_collection = db.candidate_requests # Added for candidate requests
 conversations_collection = db.conversations # Added for chat conversations
 messages_collection = db.messages # Added for chat messages
+pipeline_stats_collection = db.pipeline_stats # Materialized candidate status counters
+resume_jobs_collection = db.resume_jobs # Background resume parsing jobs
+resume_cache_collection = db.resume_cache # Parsed resumes keyed by content hash
+email_outbox_collection = db.email_outbox # Outbound emails awaiting delivery
+migrations_collection = db.migrations # Progress of versioned data migrations
 
 def get_database():
     """Get the database instance"""
@@ -136,6 +142,11 @@ class User(UserMixin):
         else:
             result = users_collection.insert_one(self.to_dict())
             self._id = str(result.inserted_id)
+        from user_cache import invalidate_user
+        invalidate_user(self._id, self.email)
+        # Dashboards cache user names, roles and clusters
+        from response_cache import invalidate
+        invalidate('users')
 
 class PasswordResetToken:
     def __init__(self, user_id, token, expires_at, _id=None):
@@ -251,6 +262,11 @@ class Role:
         else:
             result = roles_collection.insert_one(self.to_dict())
             self._id = str(result.inserted_id)
+        from user_cache import invalidate_user
+        invalidate_user(email=self.email)
+
+def new_reference_id():
+    return f"REF-{datetime.now().strftime('%Y%m%d')}-{str(uuid.uuid4())[:8].upper()}"
 
 class Candidate:
     def __init__(self, first_name, last_name, email, phone, gender, dob, education, experience, 
@@ -315,7 +331,7 @@ class Candidate:
         self.updated_at = datetime.utcnow()
 
     def generate_reference_id(self):
-        return f"REF-{datetime.now().strftime('%Y%m%d')}-{str(uuid.uuid4())[:8].upper()}"
+        return new_reference_id()
 
     def to_dict(self):
         return {
@@ -449,11 +465,13 @@ class Candidate:
     def save(self):
         """Save the candidate to the database"""
         from models_mongo import candidates_collection
+        from pipeline_stats import record_change, tracked_update_one
         
         candidate_data = self.to_dict()
         if hasattr(self, '_id') and self._id:
-            # Update existing candidate
-            candidates_collection.update_one(
+            # Update existing candidate (pipeline stats see the status before and after)
+            tracked_update_one(
+                candidates_collection,
                 {'_id': ObjectId(self._id)},
                 {'$set': candidate_data}
             )
@@ -461,6 +479,7 @@ class Candidate:
             # Insert new candidate
             result = candidates_collection.insert_one(candidate_data)
             self._id = str(result.inserted_id)
+            record_change(None, candidate_data)
         
         return self
     
@@ -472,71 +491,25 @@ class Candidate:
     def delete(self):
         """Delete the candidate from the database"""
         from models_mongo import candidates_collection
+        from pipeline_stats import TRACKED_FIELDS, record_change
         
         if hasattr(self, '_id') and self._id:
-            candidates_collection.delete_one({'_id': ObjectId(self._id)})
+            deleted = candidates_collection.find_one_and_delete(
+                {'_id': ObjectId(self._id)}, projection=TRACKED_FIELDS
+            )
+            if deleted:
+                record_change(deleted, None)
             return True
         return False
     
     @staticmethod
     def migrate_old_ratings():
-        """Migrate old rating fields to new detailed rating system"""
-        from models_mongo import candidates_collection
-        
-        # Find all candidates with old rating fields
-        old_rating_candidates = candidates_collection.find({
-            '$or': [
-                {'hr_rating': {'$exists': True}},
-                {'tech_rating': {'$exists': True}},
-                {'hr_review': {'$exists': True}},
-                {'tech_review': {'$exists': True}}
-            ]
-        })
-        
-        migrated_count = 0
-        for candidate_data in old_rating_candidates:
-            try:
-                # Calculate overall rating from old fields
-                hr_rating = candidate_data.get('hr_rating', 0)
-                tech_rating = candidate_data.get('tech_rating', 0)
-                
-                # Convert old ratings to new system
-                update_data = {
-                    'communication_skills': hr_rating if hr_rating else 0,
-                    'adaptability': hr_rating if hr_rating else 0,
-                    'teamwork_collaboration': hr_rating if hr_rating else 0,
-                    'job_fit': tech_rating if tech_rating else 0,
-                    'overall_rating': round((hr_rating + tech_rating) / 2, 1) if hr_rating and tech_rating else 0,
-                    'other_notes': candidate_data.get('hr_review', '') + ' ' + candidate_data.get('tech_review', ''),
-                    'updated_at': datetime.utcnow()
-                }
-                
-                # Remove old fields
-                unset_data = {
-                    'hr_rating': '',
-                    'hr_review': '',
-                    'tech_rating': '',
-                    'tech_review': ''
-                }
-                
-                # Update the candidate
-                candidates_collection.update_one(
-                    {'_id': candidate_data['_id']},
-                    {
-                        '$set': update_data,
-                        '$unset': unset_data
-                    }
-                )
-                
-                migrated_count += 1
-                print(f"Migrated candidate: {candidate_data.get('first_name', 'Unknown')} {candidate_data.get('last_name', '')}")
-                
-            except Exception as e:
-                print(f"Error migrating candidate {candidate_data.get('_id')}: {e}")
-                continue
+        """Migrate old rating fields to new detailed rating system (migration 4 in migrations.py)"""
+        from migrations import run_pending, RATINGS_MIGRATION
         
-        print(f"Migration completed. {migrated_count} candidates migrated.")
-        return migrated_count
+        counts = run_pending(only=RATINGS_MIGRATION).get(RATINGS_MIGRATION) or {}
+        print(f"Migration completed. {counts.get('modified', 0)} candidates migrated.")
+        return counts.get('modified', 0)
 
     @staticmethod
     def find_all():
@@ -562,6 +535,50 @@ class Candidate:
         candidates_data = list(candidates_collection.find({'status': status}))
         return [Candidate.from_dict(data) for data in candidates_data]
 
+class CandidateSummary:
+    """Read-only candidate row for list views.
+
+    Holds only the fields the candidate list templates render, read with
+    `CANDIDATE_SUMMARY_PROJECTION`, in `__slots__` instead of a per-instance
+    dict. Detail pages use `full()` (or Candidate.find_by_id) for the
+    complete Candidate.
+    """
+    RATING_FIELDS = ('communication_skills', 'adaptability', 'teamwork_collaboration', 'job_fit', 'overall_rating',
+                     'manager_communication_skills', 'manager_technical_skills', 'manager_problem_solving',
+                     'manager_cultural_fit', 'manager_overall_rating')
+    DEFAULTS = {'status': 'New', 'onboarding_status': 'Not Onboarded', 'other_notes': ''}
+    __slots__ = ('_id', 'reference_id', 'first_name', 'last_name', 'email', 'phone', 'status', 'image_path',
+                 'resume_path', 'created_at', 'manager_email', 'assigned_manager_id', 'manager_feedback',
+                 'reassigned_by_manager', 'onboarding_status', 'onboarding_date', 'other_notes') + RATING_FIELDS
+
+    def __init__(self, data):
+        set_field = super().__setattr__
+        for field in self.__slots__:
+            set_field(field, data.get(field, self.DEFAULTS.get(field)))
+        for field in self.RATING_FIELDS:
+            set_field(field, data.get(field) or 0)
+        set_field('_id', str(data['_id']))
+        if 'first_name' not in data and 'name' in data:
+            # Old schema - split name into first and last
+            name_parts = data['name'].split(' ', 1)
+            set_field('first_name', name_parts[0])
+            set_field('last_name', name_parts[1] if len(name_parts) > 1 else '')
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"CandidateSummary is read-only; change {name} on the Candidate from full()")
+
+    @staticmethod
+    def from_dict(data):
+        return CandidateSummary(data)
+
+    def full(self):
+        """The complete Candidate, loaded from the database."""
+        return Candidate.find_by_id(self._id)
+
+
+# Fields read for CandidateSummary rows; `name` is the old-schema full name
+CANDIDATE_SUMMARY_PROJECTION = dict.fromkeys(CandidateSummary.__slots__ + ('name',), 1)
+
 class ActivityLog:
     def __init__(self, user_email, action, target_email=None, details=None, _id=None):
         self.user_email = user_email
@@ -589,8 +606,12 @@ class ActivityLog:
                 {'$set': self.to_dict()}
             )
         else:
-            result = activity_logs_collection.insert_one(self.to_dict())
-            self._id = str(result.inserted_id)
+            # Written in the background in batches (activity_log_sink.py); the id is assigned here
+            from activity_log_sink import get_sink
+            document = self.to_dict()
+            document['_id'] = ObjectId()
+            get_sink().log(document)
+            self._id = str(document['_id'])
 
 class Feedback:
     def __init__(self, candidate_id, manager_email, feedback_text, status, 
@@ -692,8 +713,8 @@ class CandidateRequest:
         self.required_skills = required_skills
         self.additional_notes = additional_notes
         self.status = status
-        self.created_at = datetime.now().isoformat()
-        self.updated_at = datetime.now().isoformat()
+        self.created_at = datetime.utcnow()
+        self.updated_at = datetime.utcnow()
         self.assigned_count = 0
         self.onboarded_count = 0
         self.remaining_count = int(quantity_needed)
@@ -710,6 +731,7 @@ class CandidateRequest:
     def save(self):
         try:
             from models_mongo import candidate_requests_collection
+            from response_cache import invalidate
             if self._id:
                 # Update existing
                 result = candidate_requests_collection.update_one(
@@ -724,9 +746,10 @@ class CandidateRequest:
                         'status': self.status,
                         'assigned_count': self.assigned_count,
                         'onboarded_count': self.onboarded_count,
-                        'updated_at': datetime.now().isoformat()
+                        'updated_at': datetime.utcnow()
                     }}
                 )
+                invalidate('requests')
                 return result.modified_count > 0
             else:
                 # Create new
@@ -744,6 +767,7 @@ class CandidateRequest:
                     'updated_at': self.updated_at
                 }
                 result = candidate_requests_collection.insert_one(data)
+                invalidate('requests')
                 if result.inserted_id:
                     self._id = str(result.inserted_id)
                     return True
@@ -796,25 +820,53 @@ class CandidateRequest:
             status=data.get('status', 'Active')
         )
         request._id = str(data['_id'])
-        request.created_at = data.get('created_at', datetime.now().isoformat())
-        request.updated_at = data.get('updated_at', datetime.now().isoformat())
+        request.created_at = data.get('created_at', datetime.utcnow())
+        request.updated_at = data.get('updated_at', datetime.utcnow())
         request.assigned_count = data.get('assigned_count', 0)
         request.onboarded_count = data.get('onboarded_count', 0)
         return request
 
-    def update_counts(self, assigned_count=None, onboarded_count=None):
-        if assigned_count is not None:
-            self.assigned_count = assigned_count
-        if onboarded_count is not None:
-            self.onboarded_count = onboarded_count
-        
-        # Check if all requested candidates are onboarded
-        if self.onboarded_count >= self.quantity_needed:
-            self.status = 'Completed'
-            print(f"SUCCESS: Request {self._id} marked as Completed - {self.onboarded_count}/{self.quantity_needed} candidates onboarded")
-        
-        self.updated_at = datetime.now().isoformat()
-        return self.save()
+    @staticmethod
+    def counter_update(assigned=0, onboarded=0):
+        """Update pipeline adding to the counts and completing the request once every position is onboarded.
+
+        Both stages run inside one document write, so concurrent callers never
+        lose an increment and the status always matches the count it was
+        computed from.
+        """
+        return [
+            {'$set': {
+                'assigned_count': {'$add': [{'$ifNull': ['$assigned_count', 0]}, assigned]},
+                'onboarded_count': {'$add': [{'$ifNull': ['$onboarded_count', 0]}, onboarded]},
+                'updated_at': '$$NOW'
+            }},
+            {'$set': {
+                'status': {'$cond': [{'$gte': ['$onboarded_count', '$quantity_needed']}, 'Completed', '$status']}
+            }}
+        ]
+
+    @classmethod
+    def increment_counts(cls, request_id, assigned=0, onboarded=0):
+        """Atomically add to a request's assigned/onboarded counts; returns the updated request or None"""
+        try:
+            from pymongo import ReturnDocument
+            from models_mongo import candidate_requests_collection
+            from response_cache import invalidate
+            data = candidate_requests_collection.find_one_and_update(
+                {'_id': ObjectId(request_id)},
+                cls.counter_update(assigned, onboarded),
+                return_document=ReturnDocument.AFTER
+            )
+            if not data:
+                return None
+            invalidate('requests')
+            request = cls._from_dict(data)
+            if onboarded and request.status == 'Completed':
+                print(f"SUCCESS: Request {request._id} marked as Completed - {request.onboarded_count}/{request.quantity_needed} candidates onboarded")
+            return request
+        except Exception as e:
+            print(f"Error updating request counts: {str(e)}")
+            return None
 
 # JWT Token functions
 def create_token(user_id, role):
@@ -877,6 +929,8 @@ class UserEmail:
     def delete(self):
         if self._id:
             user_emails_collection.delete_one({'_id': ObjectId(self._id)})
+            from user_cache import invalidate_user
+            invalidate_user(email=self.email)
             return True
         return False
 
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+One-shot normalizer for timestamps stored as ISO strings.
+
+Older code wrote `datetime.now().isoformat()` into candidate requests and
+some candidate fields, so the same field held strings in some documents and
+BSON dates in others. Strings sort differently from dates and cannot be used
+by `$dateDiff`, range queries or TTL indexes. This converts every string
+value of the fields in DATE_FIELDS to a (UTC) datetime:
+
+    python normalize_dates.py [--dry-run]
+
+Values with an offset ("Z", "+05:30") are converted to UTC. Values without
+one were written by `datetime.now()`, i.e. in the server's local time, and
+are converted from the local time zone of the process doing the conversion,
+so run it with the TZ the app ran with (on a UTC server they are kept as
+they are). Each document is updated only if the field still holds the
+string that was read, so a concurrent write is never overwritten. Strings
+that are not timestamps are left alone and reported. Running it again only
+touches documents written as strings since the last run.
+
+The same conversion is registered as migrations 5-8 in migrations.py, so it
+runs once at startup from init_production_db; code that sorts or pages on
+these fields (pagination.py, manager_dashboard.py) relies on it.
+
+Form-entered calendar dates (onboarding_date, scheduled_date, ...) are not
+timestamps and are deliberately not listed.
+"""
+
+import os
+import sys
+from datetime import datetime, timezone
+from pymongo import UpdateOne
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Add current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+DATE_FIELDS = {
+    'candidates': ['created_at', 'updated_at', 'assigned_at', 'reviewed_at', 'selected_date', 'rejection_date',
+                   'onboarding_updated_at'],
+    'candidate_requests': ['created_at', 'updated_at', 'deadline'],
+    'activity_logs': ['timestamp'],
+    'feedback': ['timestamp', 'created_at'],
+}
+NORMALIZE_BATCH_SIZE = 1000
+
+
+def parse_timestamp(value):
+    """Naive UTC datetime for an ISO 8601 string (local time if it has no offset), None if it is not one."""
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    except (ValueError, AttributeError):
+        return None
+    # astimezone() reads a naive value as local time
+    return parsed.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def string_dates_query(fields):
+    return {'$or': [{field: {'$type': 'string'}} for field in fields]}
+
+
+def convert_string_dates(document, fields):
+    """({field: datetime} for the string timestamps of `document`, number of strings left unparsed)."""
+    converted = {}
+    unparsed = 0
+    for field in fields:
+        value = document.get(field)
+        if isinstance(value, str):
+            parsed = parse_timestamp(value)
+            if parsed is None:
+                unparsed += 1
+            else:
+                converted[field] = parsed
+    return converted, unparsed
+
+
+def guarded_date_update(document, fields):
+    """Pipeline update converting the string timestamps of `document`, each only if it is still unchanged."""
+    converted, _ = convert_string_dates(document, fields)
+    if not converted:
+        return None
+    return [{'$set': {
+        field: {'$cond': [{'$eq': [f'${field}', {'$literal': document[field]}]}, parsed, f'${field}']}
+        for field, parsed in converted.items()
+    }}]
+
+
+def normalize_collection(collection, fields, batch_size=NORMALIZE_BATCH_SIZE):
+    """Convert string values of `fields` to datetimes. Returns (documents updated, values left unparsed)."""
+    updated = unparsed = 0
+    operations = []
+
+    def flush():
+        nonlocal updated, operations
+        if operations:
+            updated += collection.bulk_write(operations, ordered=False).modified_count
+            operations = []
+
+    for document in collection.find(string_dates_query(fields), dict.fromkeys(fields, 1), batch_size=batch_size):
+        converted, skipped = convert_string_dates(document, fields)
+        unparsed += skipped
+        if not converted:
+            continue
+        # Only if the strings are still what was read
+        expected = {field: document[field] for field in converted}
+        operations.append(UpdateOne({'_id': document['_id'], **expected}, {'$set': converted}))
+        if len(operations) >= batch_size:
+            flush()
+    flush()
+    return updated, unparsed
+
+
+def run_normalization(dry_run=False):
+    """Normalize every collection in DATE_FIELDS; returns {collection: (updated, unparsed)}."""
+    from models_mongo import db
+
+    results = {}
+    for name, fields in DATE_FIELDS.items():
+        if dry_run:
+            results[name] = (db[name].count_documents(string_dates_query(fields)), 0)
+        else:
+            results[name] = normalize_collection(db[name], fields)
+    return results
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Convert timestamps stored as ISO strings to BSON dates')
+    parser.add_argument('--dry-run', action='store_true', help='only count documents with string timestamps')
+    args = parser.parse_args()
+
+    for name, (count, unparsed) in run_normalization(args.dry_run).items():
+        if args.dry_run:
+            print(f"📅 {name}: {count} documents have string timestamps")
+        else:
+            print(f"✅ {name}: {count} documents normalized")
+            if unparsed:
+                print(f"⚠️  {name}: {unparsed} values are not timestamps and were left as they are")
+
+
+if __name__ == '__main__':
+    main()
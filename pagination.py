@@ -0,0 +1,168 @@
+"""
+Keyset (cursor) pagination for MongoDB list views.
+
+Pages are addressed by an opaque cursor holding the sort value and `_id` of
+the last row already shown, so fetching a page is an index range scan on
+(sort field, _id) no matter how deep into the list the user is or how many
+documents the collection holds. `skip()` is never used.
+
+A range operator such as `$lt` only matches values of its own BSON type, so
+when the sort field holds mixed types (legacy ISO strings next to dates,
+null or missing values) the condition also lists every type that sorts
+after the cursor's type in the page order. The startup date normalization
+(migrations 5-8) removes the strings; this keeps pages complete until then.
+"""
+
+import base64
+import json
+from datetime import datetime
+from bson import json_util
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+SORT_FIELDS = ('created_at', 'updated_at')
+# BSON types a sort field may hold, in MongoDB's ascending sort order ('null' includes missing)
+SORT_TYPE_ORDER = ('null', 'number', 'string', 'objectId', 'bool', 'date')
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(document, sort_field):
+    """Opaque, URL-safe token pointing just after `document`."""
+    payload = json_util.dumps({'f': sort_field, 'v': document.get(sort_field), 'id': document['_id']})
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token, sort_field):
+    """Return (sort value, _id) stored in `token`."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json_util.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+    except (ValueError, TypeError, json.JSONDecodeError) as e:
+        raise InvalidCursor(f'Malformed cursor: {e}')
+    if not isinstance(payload, dict) or payload.get('f') != sort_field or 'id' not in payload:
+        raise InvalidCursor('Cursor does not match the requested sort')
+    return payload.get('v'), payload['id']
+
+
+class Page:
+    def __init__(self, items, next_cursor, page_size, sort_field, direction):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.page_size = page_size
+        self.sort_field = sort_field
+        self.direction = direction
+
+    @property
+    def has_more(self):
+        return self.next_cursor is not None
+
+    def to_dict(self):
+        return {
+            'next_cursor': self.next_cursor,
+            'has_more': self.has_more,
+            'page_size': self.page_size,
+            'sort': self.sort_field,
+            'order': 'asc' if self.direction == 1 else 'desc'
+        }
+
+
+def _sort_type(value):
+    from bson import ObjectId, Decimal128
+
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'bool'
+    if isinstance(value, (int, float, Decimal128)):
+        return 'number'
+    if isinstance(value, str):
+        return 'string'
+    if isinstance(value, ObjectId):
+        return 'objectId'
+    if isinstance(value, datetime):
+        return 'date'
+    return None
+
+
+def keyset_condition(sort_field, value, last_id, direction=-1):
+    """Query for the rows after (value, last_id) in (sort_field, _id) order, whatever their type."""
+    op = '$lt' if direction == -1 else '$gt'
+    clauses = []
+    if value is not None:
+        clauses.append({sort_field: {op: value}})
+    clauses.append({sort_field: value, '_id': {op: last_id}})
+
+    # Rows whose sort value has a type ordered after this one
+    sort_type = _sort_type(value)
+    if sort_type is not None:
+        position = SORT_TYPE_ORDER.index(sort_type)
+        later = SORT_TYPE_ORDER[:position][::-1] if direction == -1 else SORT_TYPE_ORDER[position + 1:]
+        clauses.extend({sort_field: None} if later_type == 'null' else {sort_field: {'$type': later_type}}
+                       for later_type in later)
+    return {'$or': clauses}
+
+
+def paginate(collection, query=None, cursor=None, page_size=DEFAULT_PAGE_SIZE,
+             sort_field='created_at', direction=-1, projection=None):
+    """Fetch one page of `collection` ordered by (sort_field, _id)."""
+    page_size = min(max(int(page_size), 1), MAX_PAGE_SIZE)
+    query = dict(query or {})
+
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort_field)
+        after = keyset_condition(sort_field, value, last_id, direction)
+        query = {'$and': [query, after]} if query else after
+
+    # One extra row tells us whether there is a next page
+    documents = list(
+        collection.find(query, projection)
+        .sort([(sort_field, direction), ('_id', direction)])
+        .limit(page_size + 1)
+    )
+    next_cursor = None
+    if len(documents) > page_size:
+        documents = documents[:page_size]
+        next_cursor = encode_cursor(documents[-1], sort_field)
+    return Page(documents, next_cursor, page_size, sort_field, direction)
+
+
+def page_args(args, filters=('status',)):
+    """Read cursor, page size, sort and filter parameters from `request.args`.
+
+    Returns (query, paginate kwargs) ready to pass to `paginate()`.
+    """
+    sort_field = args.get('sort', 'created_at')
+    if sort_field not in SORT_FIELDS:
+        sort_field = 'created_at'
+    direction = 1 if args.get('order') == 'asc' else -1
+    try:
+        page_size = int(args.get('page_size', DEFAULT_PAGE_SIZE))
+    except (TypeError, ValueError):
+        page_size = DEFAULT_PAGE_SIZE
+
+    query = {}
+    for name in filters:
+        value = args.get(name)
+        if value and not value.startswith('All'):
+            query[name] = value
+
+    return query, {
+        'cursor': args.get('cursor') or None,
+        'page_size': page_size,
+        'sort_field': sort_field,
+        'direction': direction
+    }
+
+
+def paginate_request(collection, args, query=None, filters=('status',), projection=None):
+    """`paginate()` driven by request args; a stale or tampered cursor restarts at the first page."""
+    filter_query, options = page_args(args, filters)
+    filter_query.update(query or {})
+    try:
+        return paginate(collection, filter_query, projection=projection, **options)
+    except InvalidCursor:
+        options['cursor'] = None
+        return paginate(collection, filter_query, projection=projection, **options)
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Materialized candidate pipeline counters.
+
+The `pipeline_stats` collection holds one document per scope:
+
+    global                 every candidate
+    hr:<email>             candidates uploaded (assigned_by) by that HR/recruiter
+    manager:<email>        candidates assigned to that manager
+    cluster:<name>         candidates whose uploader belongs to that cluster
+    month:<YYYY-MM>        candidates created in that month
+
+each with `total`, `status.<status>` counts, `onboarded` and
+`selected_onboarded`. Candidate writes call `record_change()` with the
+document before and after the write and the difference is applied with
+atomic `$inc` upserts, so dashboards read counters instead of scanning
+candidates.
+
+The counters only start out right if they are seeded from the candidates
+collection: `rebuild()` writes them from scratch and then stores the
+`materialized` marker document. Until that marker exists `get_stats()` and
+`read_status_counts()` return None (callers fall back to counting), because
+deltas applied to unseeded counters would give partial or negative totals.
+init_production_db runs `ensure_materialized()` at startup.
+
+Run `python pipeline_stats.py` to rebuild the counters from the candidates
+collection and report any drift (`--dry-run` only reports).
+"""
+
+import os
+import sys
+from collections import Counter
+from datetime import datetime
+from pymongo import UpdateOne
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Add current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Candidate fields the counters depend on; writes fetch only these for the "before" image
+TRACKED_FIELDS = {'status': 1, 'onboarding_status': 1, 'assigned_by': 1, 'manager_email': 1, 'created_at': 1}
+
+# _id of the document rebuild() stores once the counters have been seeded
+MATERIALIZED_MARKER = 'materialized'
+_materialized = False
+
+
+def _collections():
+    from models_mongo import pipeline_stats_collection, candidates_collection, users_collection
+    return pipeline_stats_collection, candidates_collection, users_collection
+
+
+def _field_name(value):
+    """Statuses become field names, so strip the characters MongoDB reserves."""
+    return str(value).replace('.', '_').replace('$', '_')
+
+
+def _month(created_at):
+    if hasattr(created_at, 'strftime'):
+        return created_at.strftime('%Y-%m')
+    if isinstance(created_at, str) and len(created_at) >= 7 and created_at[4] == '-':
+        return created_at[:7]
+    return None
+
+
+def _scopes(candidate, clusters):
+    scopes = ['global']
+    if candidate.get('assigned_by'):
+        scopes.append(f"hr:{candidate['assigned_by']}")
+        if clusters.get(candidate['assigned_by']):
+            scopes.append(f"cluster:{clusters[candidate['assigned_by']]}")
+    if candidate.get('manager_email'):
+        scopes.append(f"manager:{candidate['manager_email']}")
+    month = _month(candidate.get('created_at'))
+    if month:
+        scopes.append(f"month:{month}")
+    return scopes
+
+
+def _counters(candidate):
+    status = candidate.get('status') or 'Unknown'
+    onboarded = candidate.get('onboarding_status') == 'Onboarded'
+    counters = ['total', f'status.{_field_name(status)}']
+    if onboarded:
+        counters.append('onboarded')
+        if status == 'Selected':
+            counters.append('selected_onboarded')
+    return counters
+
+
+def _tally(candidate, clusters, sign, deltas):
+    for scope in _scopes(candidate, clusters):
+        for counter in _counters(candidate):
+            deltas[(scope, counter)] += sign
+
+
+def _clusters_for(users_collection, emails):
+    """Map uploader email -> cluster with one query."""
+    emails = [email for email in set(emails) if email]
+    if not emails:
+        return {}
+    return {
+        user['email']: user.get('cluster')
+        for user in users_collection.find({'email': {'$in': emails}}, {'email': 1, 'cluster': 1})
+    }
+
+
+def compute_deltas(changes, clusters):
+    """Net counter changes for a list of (before, after) candidate documents."""
+    deltas = Counter()
+    for before, after in changes:
+        if before:
+            _tally(before, clusters, -1, deltas)
+        if after:
+            _tally(after, clusters, +1, deltas)
+    return {key: value for key, value in deltas.items() if value}
+
+
+def apply_deltas(deltas, stats_collection):
+    """Apply counter deltas with one unordered bulk_write of `$inc` upserts."""
+    by_scope = {}
+    for (scope, counter), value in deltas.items():
+        by_scope.setdefault(scope, {})[counter] = value
+    if not by_scope:
+        return 0
+    now = datetime.utcnow()
+    operations = [
+        UpdateOne({'_id': scope}, {'$inc': increments, '$set': {'updated_at': now}}, upsert=True)
+        for scope, increments in by_scope.items()
+    ]
+    stats_collection.bulk_write(operations, ordered=False)
+    return len(operations)
+
+
+def _apply_update(document, update):
+    """The document as it looks after a `$set`/`$unset` update."""
+    after = dict(document)
+    after.update(update.get('$set', {}))
+    for field in update.get('$unset', {}):
+        after.pop(field, None)
+    return after
+
+
+def record_changes(changes):
+    """Record candidate writes given as (before, after) pairs; None means inserted/deleted.
+
+    Counter maintenance must never fail the write that triggered it; a missed
+    update shows up as drift in the next reconciliation.
+    """
+    from response_cache import invalidate
+    invalidate('candidates')
+    try:
+        stats_collection, _, users_collection = _collections()
+        uploaders = [doc.get('assigned_by') for pair in changes for doc in pair if doc]
+        deltas = compute_deltas(changes, _clusters_for(users_collection, uploaders))
+        return apply_deltas(deltas, stats_collection)
+    except Exception as e:
+        print(f"⚠️  Could not update pipeline stats: {e}")
+        return 0
+
+
+def record_change(before, after):
+    return record_changes([(before, after)])
+
+
+def record_bulk_update(candidates_before, set_fields=None, unset_fields=()):
+    """Record an update_many that applied `set_fields`/`unset_fields` to `candidates_before`."""
+    update = {'$set': set_fields or {}, '$unset': dict.fromkeys(unset_fields, '')}
+    return record_changes([(before, _apply_update(before, update)) for before in candidates_before])
+
+
+def tracked_update_one(candidates_collection, query, update):
+    """update_one that also records the counter change.
+
+    Uses find_one_and_update to read the tracked fields as they were
+    immediately before the write. Returns the "before" document, or None
+    when nothing matched.
+    """
+    from pymongo import ReturnDocument
+
+    before = candidates_collection.find_one_and_update(
+        query, update, projection=TRACKED_FIELDS, return_document=ReturnDocument.BEFORE
+    )
+    if before is not None:
+        record_change(before, _apply_update(before, update))
+    return before
+
+
+def scope_for_query(query):
+    """The counter scope that answers a candidates `query` exactly, or None."""
+    if not query:
+        return 'global'
+    if len(query) == 1:
+        field, value = next(iter(query.items()))
+        if isinstance(value, str) and field == 'assigned_by':
+            return f'hr:{value}'
+        if isinstance(value, str) and field == 'manager_email':
+            return f'manager:{value}'
+    return None
+
+
+def is_materialized(stats_collection=None):
+    """Whether rebuild() has seeded the counters (remembered once seen)."""
+    global _materialized
+    if not _materialized:
+        stats_collection = stats_collection if stats_collection is not None else _collections()[0]
+        _materialized = stats_collection.find_one({'_id': MATERIALIZED_MARKER}) is not None
+    return _materialized
+
+
+def get_stats(scope='global'):
+    """Counters for one scope, or None if they have not been materialized yet."""
+    stats_collection, _, _ = _collections()
+    if not is_materialized(stats_collection):
+        return None
+    return stats_collection.find_one({'_id': scope})
+
+
+def read_status_counts(scope='global'):
+    """({status: count}, total) from the materialized counters, or None if missing."""
+    stats = get_stats(scope)
+    if not stats:
+        return None
+    counts = {status: count for status, count in (stats.get('status') or {}).items() if count}
+    return counts, stats.get('total', 0)
+
+
+def rebuild(dry_run=False):
+    """Recompute every counter from the candidates collection.
+
+    Returns a list of (scope, counter, stored, actual) for every counter that
+    had drifted. Unless `dry_run`, the collection is replaced by the fresh counts.
+    """
+    stats_collection, candidates_collection, users_collection = _collections()
+
+    # Group server-side by every field the counters depend on; only the groups travel back
+    groups = list(candidates_collection.aggregate([
+        {'$group': {
+            '_id': {
+                'status': '$status',
+                'onboarding_status': '$onboarding_status',
+                'assigned_by': '$assigned_by',
+                'manager_email': '$manager_email',
+                'month': {'$cond': [
+                    {'$eq': [{'$type': '$created_at'}, 'date']},
+                    {'$dateToString': {'format': '%Y-%m', 'date': '$created_at'}},
+                    {'$cond': [{'$eq': [{'$type': '$created_at'}, 'string']},
+                               {'$substrCP': ['$created_at', 0, 7]}, None]}
+                ]}
+            },
+            'count': {'$sum': 1}
+        }}
+    ], allowDiskUse=True))
+
+    clusters = _clusters_for(users_collection, [g['_id'].get('assigned_by') for g in groups])
+    actual = Counter()
+    for group in groups:
+        candidate = dict(group['_id'])
+        candidate['created_at'] = candidate.pop('month', None)
+        for scope in _scopes(candidate, clusters):
+            for counter in _counters(candidate):
+                actual[(scope, counter)] += group['count']
+
+    stored = Counter()
+    for doc in stats_collection.find():
+        for counter, value in doc.items():
+            if counter == 'status' and isinstance(value, dict):
+                for status, count in value.items():
+                    stored[(doc['_id'], f'status.{status}')] += count
+            elif counter in ('total', 'onboarded', 'selected_onboarded'):
+                stored[(doc['_id'], counter)] += value
+
+    drift = [
+        (scope, counter, stored.get((scope, counter), 0), actual.get((scope, counter), 0))
+        for scope, counter in sorted(set(actual) | set(stored))
+        if stored.get((scope, counter), 0) != actual.get((scope, counter), 0)
+    ]
+
+    if not dry_run:
+        stats_collection.delete_many({})
+        apply_deltas(dict(actual), stats_collection)
+        stats_collection.replace_one({'_id': MATERIALIZED_MARKER}, {'rebuilt_at': datetime.utcnow()}, upsert=True)
+    return drift
+
+
+def ensure_materialized():
+    """Seed the counters with rebuild() unless that has already been done. Returns True if it ran."""
+    if is_materialized():
+        return False
+    rebuild()
+    return True
+
+
+if __name__ == "__main__":
+    dry_run = '--dry-run' in sys.argv
+    print("🔧 Rebuilding pipeline stats..." if not dry_run else "🔍 Checking pipeline stats drift...")
+    drift = rebuild(dry_run=dry_run)
+    for scope, counter, stored, actual in drift:
+        print(f"   {scope} {counter}: stored {stored}, actual {actual}")
+    if drift:
+        print(f"⚠️  {len(drift)} counters had drifted" + ("" if dry_run else " and were rebuilt"))
+    else:
+        print("✅ Pipeline stats are in sync")
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Shared cache for dashboard and analytics responses.
+
+Polled read endpoints are wrapped with `@cached_response(<tags>)`; the JSON
+body of a successful response is cached under its endpoint, URL arguments,
+query string and the caller's role (plus the caller's email for per-user
+views). Tags name the data a response was computed from:
+
+    candidates   any candidate write (pipeline_stats.record_changes)
+    users        User.save
+    requests     CandidateRequest.save
+
+Every tag has a version number that is part of the cache key, and
+`invalidate(tag)` bumps it, so a write makes every dependent entry
+unreachable at once; a response computed while the write was happening is
+stored under the old version and never served.
+
+By default entries live in a per-process LRU (RESPONSE_CACHE_MAX_ENTRIES,
+RESPONSE_CACHE_TTL_SECONDS), so writes made by another worker process show
+up within the TTL. Setting RESPONSE_CACHE_URL=redis://host:6379/0 shares
+entries and tag versions between processes through any Redis-compatible
+server (Redis, Valkey, KeyDB, or a local `redis-server` in development);
+this needs the `redis` package. If the server is unreachable the cache is
+bypassed and requests are computed as before. Hit/miss counters are kept
+per process and exposed through `stats()`.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from functools import wraps
+
+RESPONSE_CACHE_TTL_SECONDS = int(os.getenv('RESPONSE_CACHE_TTL_SECONDS', '60'))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '1024'))
+RESPONSE_CACHE_URL = os.getenv('RESPONSE_CACHE_URL')
+KEY_PREFIX = 'invensis:response_cache:'
+
+
+class LocalBackend:
+    """Least recently used entries of this process, each with an expiry time."""
+
+    name = 'local'
+
+    def __init__(self, max_entries=RESPONSE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._versions = Counter()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def versions(self, tags):
+        with self._lock:
+            return [self._versions[tag] for tag in tags]
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, ttl, tags=()):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value, tuple(tags))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def bump(self, tag):
+        with self._lock:
+            self._versions[tag] += 1
+            # The old entries can no longer be reached, so free them now
+            for key in [key for key, entry in self._entries.items() if tag in entry[2]]:
+                del self._entries[key]
+
+    def size(self):
+        return len(self._entries)
+
+
+class RedisBackend:
+    """Entries and tag versions in a Redis-compatible server shared by all processes."""
+
+    name = 'redis'
+
+    def __init__(self, client, prefix=KEY_PREFIX):
+        self.client = client
+        self.prefix = prefix
+
+    def versions(self, tags):
+        values = self.client.mget([f'{self.prefix}tag:{tag}' for tag in tags])
+        return [int(value or 0) for value in values]
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        return json.loads(value) if value is not None else None
+
+    def set(self, key, value, ttl, tags=()):
+        # Eviction is left to the server's expiry and maxmemory policy
+        self.client.set(self.prefix + key, json.dumps(value), ex=ttl)
+
+    def bump(self, tag):
+        self.client.incr(f'{self.prefix}tag:{tag}')
+
+    def size(self):
+        return None
+
+
+class ResponseCache:
+    def __init__(self, backend, ttl=RESPONSE_CACHE_TTL_SECONDS):
+        self.backend = backend
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._counters = Counter()
+        self._routes = {}
+
+    def _count(self, name, route=None):
+        with self._lock:
+            self._counters[name] += 1
+            if route:
+                self._routes.setdefault(route, Counter())[name] += 1
+
+    def key(self, name, parts, tags):
+        """Cache key of `name` with `parts` at the current versions of `tags`, or None if the backend is down."""
+        try:
+            versions = self.backend.versions(tags)
+        except Exception as e:
+            self._count('errors')
+            print(f"⚠️  Response cache unavailable: {e}")
+            return None
+        digest = hashlib.sha1(json.dumps(parts, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+        return f"{name}:{digest}:" + '.'.join(f'{tag}{version}' for tag, version in zip(tags, versions))
+
+    def get(self, key, route):
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            self._count('errors')
+            print(f"⚠️  Response cache read failed: {e}")
+            value = None
+        self._count('hits' if value is not None else 'misses', route)
+        return value
+
+    def set(self, key, value, ttl=None, tags=()):
+        try:
+            self.backend.set(key, value, self.ttl if ttl is None else ttl, tags)
+            self._count('stores')
+        except Exception as e:
+            self._count('errors')
+            print(f"⚠️  Response cache write failed: {e}")
+
+    def memoize(self, name, parts, compute, tags, ttl=None):
+        """Value of `compute()` cached under `name` and `parts` until `ttl` passes or a tag is invalidated."""
+        key = self.key(name, parts, tags)
+        if key is None:
+            return compute()
+        value = self.get(key, name)
+        if value is None:
+            value = compute()
+            self.set(key, value, ttl, tags)
+        return value
+
+    def invalidate(self, *tags):
+        for tag in tags:
+            try:
+                self.backend.bump(tag)
+                self._count('invalidations')
+            except Exception as e:
+                self._count('errors')
+                print(f"⚠️  Could not invalidate cached {tag}: {e}")
+
+    def stats(self):
+        """Hit/miss counters for this process, overall and per route."""
+        def with_rate(counters):
+            counters = dict(counters)
+            hits, misses = counters.setdefault('hits', 0), counters.setdefault('misses', 0)
+            counters['hit_rate'] = round(hits / (hits + misses), 3) if hits + misses else 0.0
+            return counters
+
+        with self._lock:
+            stats = with_rate(self._counters)
+            stats['routes'] = {route: with_rate(counters) for route, counters in self._routes.items()}
+        stats['backend'] = self.backend.name
+        stats['entries'] = self.backend.size()
+        stats['ttl_seconds'] = self.ttl
+        return stats
+
+
+def _backend_from_env():
+    if RESPONSE_CACHE_URL:
+        try:
+            import redis
+            client = redis.Redis.from_url(RESPONSE_CACHE_URL, socket_timeout=0.5, socket_connect_timeout=0.5)
+            client.ping()
+            return RedisBackend(client)
+        except Exception as e:
+            print(f"⚠️  Response cache server unavailable ({e}), using the in-process cache")
+    return LocalBackend()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache(_backend_from_env())
+        return _cache
+
+
+def invalidate(*tags):
+    """Drop every cached response computed from `tags` (called by model write paths)."""
+    get_cache().invalidate(*tags)
+
+
+def cached_response(*tags, ttl=None, per_user=False):
+    """Cache a JSON view's successful responses; place it below the role decorator.
+
+    Keys include the endpoint, URL arguments, query string and the caller's
+    role, plus their email when `per_user` is set for views that only show
+    the caller's own data.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            from flask import request, make_response
+            from flask_login import current_user
+
+            cache = get_cache()
+            route = request.endpoint
+            parts = {
+                'view_args': kwargs,
+                'args': sorted(request.args.items(multi=True)),
+                'role': getattr(current_user, 'role', None),
+            }
+            if per_user:
+                parts['user'] = getattr(current_user, 'email', None)
+            key = cache.key(route, parts, tags)
+            if key is None:
+                return view(*args, **kwargs)
+
+            cached = cache.get(key, route)
+            if cached is not None:
+                response = make_response(cached['body'])
+                response.mimetype = cached['mimetype']
+                response.headers['X-Cache'] = 'HIT'
+                return response
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200 and response.is_json:
+                cache.set(key, {'body': response.get_data(as_text=True), 'mimetype': response.mimetype}, ttl, tags)
+            response.headers['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
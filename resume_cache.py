@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Content-hash cache for parsed resumes.
+
+Two kinds of entries live in the `resume_cache` collection:
+
+    file:<sha256 of uploaded bytes>          extracted text of that upload
+    text:<role>:<sha256 of extracted text>   /parse_resume payload for that text
+
+so re-uploading the same PDF skips extraction and the LLM call, and a
+different file with the same text (e.g. re-exported PDF) still skips the
+LLM call. Entries expire through a TTL index on `expires_at` and the
+collection is trimmed to `max_entries`, least recently used first.
+Hit/miss counters are kept per process and exposed through `stats()`.
+"""
+
+import hashlib
+import os
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+
+RESUME_CACHE_TTL_SECONDS = int(os.getenv('RESUME_CACHE_TTL_SECONDS', str(7 * 24 * 3600)))
+RESUME_CACHE_MAX_ENTRIES = int(os.getenv('RESUME_CACHE_MAX_ENTRIES', '20000'))
+# Regex-only results are cheap to redo and the AI may be back next time
+FALLBACK_TTL_SECONDS = 15 * 60
+# The size bound is checked every N writes rather than on each one
+EVICTION_CHECK_EVERY = 50
+
+
+def content_hash(data):
+    """SHA-256 hex digest of bytes or text."""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+class ResumeCache:
+    def __init__(self, collection, ttl_seconds=RESUME_CACHE_TTL_SECONDS, max_entries=RESUME_CACHE_MAX_ENTRIES):
+        self.collection = collection
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._counters = Counter()
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def _get(self, key, kind):
+        """Fetch a live entry and mark it as recently used."""
+        now = datetime.utcnow()
+        try:
+            entry = self.collection.find_one_and_update(
+                {'_id': key, 'expires_at': {'$gt': now}},
+                {'$set': {'last_used_at': now}, '$inc': {'hits': 1}}
+            )
+        except Exception as e:
+            print(f"⚠️  Resume cache read failed: {e}")
+            entry = None
+        self._count(f'{kind}_hits' if entry else f'{kind}_misses')
+        return entry
+
+    def _put(self, key, fields, ttl_seconds=None):
+        now = datetime.utcnow()
+        fields = dict(fields, created_at=now, last_used_at=now,
+                      expires_at=now + timedelta(seconds=ttl_seconds or self.ttl_seconds))
+        try:
+            self.collection.update_one({'_id': key}, {'$set': fields, '$setOnInsert': {'hits': 0}}, upsert=True)
+        except Exception as e:
+            print(f"⚠️  Resume cache write failed: {e}")
+            return
+        with self._lock:
+            self._writes += 1
+            check = self._writes % EVICTION_CHECK_EVERY == 0
+        if check:
+            self.evict()
+
+    def get_text(self, file_hash):
+        """Extracted text of a previously seen upload, or None."""
+        entry = self._get(f'file:{file_hash}', 'file')
+        return entry.get('text') if entry else None
+
+    def put_text(self, file_hash, text):
+        self._put(f'file:{file_hash}', {'text': text})
+
+    def get_payload(self, role, text_hash):
+        """Parsed payload for previously seen text, or None."""
+        entry = self._get(f'text:{role}:{text_hash}', 'text')
+        return entry.get('payload') if entry else None
+
+    def put_payload(self, role, text_hash, payload, ttl_seconds=None):
+        self._put(f'text:{role}:{text_hash}', {'payload': payload}, ttl_seconds)
+
+    def evict(self):
+        """Trim the collection to max_entries, least recently used first. Returns the number removed."""
+        try:
+            excess = self.collection.estimated_document_count() - self.max_entries
+            if excess <= 0:
+                return 0
+            oldest = [doc['_id'] for doc in
+                      self.collection.find({}, {'_id': 1}).sort('last_used_at', 1).limit(excess)]
+            removed = self.collection.delete_many({'_id': {'$in': oldest}}).deleted_count
+        except Exception as e:
+            print(f"⚠️  Resume cache eviction failed: {e}")
+            return 0
+        self._count('evictions')
+        return removed
+
+    def stats(self):
+        """Hit/miss counters for this process."""
+        with self._lock:
+            counters = dict(self._counters)
+        for kind in ('file', 'text'):
+            hits, misses = counters.get(f'{kind}_hits', 0), counters.get(f'{kind}_misses', 0)
+            counters.setdefault(f'{kind}_hits', hits)
+            counters.setdefault(f'{kind}_misses', misses)
+            counters[f'{kind}_hit_rate'] = round(hits / (hits + misses), 3) if hits + misses else 0.0
+        counters['ttl_seconds'] = self.ttl_seconds
+        counters['max_entries'] = self.max_entries
+        return counters
+
+
+_cache = None
+
+
+def get_cache():
+    global _cache
+    if _cache is None:
+        from models_mongo import resume_cache_collection
+        _cache = ResumeCache(resume_cache_collection)
+    return _cache
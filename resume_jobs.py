@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+Asynchronous resume ingestion.
+
+`/hr/parse_resume/jobs` and `/recruiter/parse_resume/jobs` store the upload
+in the `resume_jobs` collection and return a job id straight away. Worker
+threads claim queued jobs from MongoDB (so any web process can pick up any
+job, and jobs left behind by a dead process are re-claimed once their lease
+expires), run text extraction in a process pool and then the role's parser
+(AI call with regex fallback) in the worker thread. The workers start with
+the server (`start_workers()`), so jobs queued before a restart are not
+stranded until the next upload. The result is written
+back to the job, pushed to the `resume_job_<id>` Socket.IO room and is
+available from the poll endpoint. Every job records how long it spent in
+each stage (queue, cache, extract, ai, regex, total) in `timings`.
+Uploads already seen are answered from the resume cache (resume_cache.py)
+without extraction or an LLM call.
+"""
+
+import io
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+import multiprocessing
+
+RESUME_WORKER_THREADS = int(os.getenv('RESUME_WORKER_THREADS', '4'))
+RESUME_EXTRACT_PROCESSES = int(os.getenv('RESUME_EXTRACT_PROCESSES', '2'))
+# A running job whose lease has expired is assumed lost and is queued again
+JOB_LEASE_SECONDS = 300
+EXTRACT_TIMEOUT_SECONDS = 120
+MAX_ATTEMPTS = 3
+# Idle workers re-check the collection for jobs submitted by other processes
+POLL_INTERVAL_SECONDS = 2.0
+
+# role -> callable(resume_text, timer) returning the JSON payload of /parse_resume
+_parsers = {}
+_notifier = None
+
+
+class ResumeExtractionError(Exception):
+    """Text could not be extracted; the message is safe to show the user."""
+
+
+class StageTimer:
+    """Collects per-stage wall-clock timings in milliseconds."""
+
+    def __init__(self):
+        self.timings = {}
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.timings[f'{name}_ms'] = round(self.timings.get(f'{name}_ms', 0) + elapsed, 1)
+
+
+def register_parser(role, parser):
+    """Register the function that turns extracted text into a /parse_resume payload."""
+    _parsers[role] = parser
+
+
+def set_notifier(notifier):
+    """`notifier(event, payload, room)` is called when a job finishes (e.g. socketio.emit)."""
+    global _notifier
+    _notifier = notifier
+
+
+def _extract_pdf(data):
+    import fitz  # PyMuPDF
+
+    text = ""
+    with fitz.open(stream=data, filetype='pdf') as doc:
+        for page in doc:
+            text += page.get_text()
+        if not text.strip():
+            for page in doc:
+                text += page.get_text("text", sort=True)
+    if text.strip():
+        return text
+
+    try:
+        import pdfplumber
+        with pdfplumber.open(io.BytesIO(data)) as pdf:
+            for page in pdf.pages:
+                text += page.extract_text() or ""
+    except ImportError:
+        print("⚠️  pdfplumber not available")
+    except Exception as e:
+        print(f"⚠️  pdfplumber failed: {e}")
+    if text.strip():
+        return text
+
+    try:
+        import pytesseract
+        from PIL import Image
+        with fitz.open(stream=data, filetype='pdf') as doc:
+            for page in doc:
+                pix = page.get_pixmap(matrix=fitz.Matrix(2.0, 2.0))  # Higher resolution for better OCR
+                with Image.open(io.BytesIO(pix.tobytes("png"))) as img:
+                    text += pytesseract.image_to_string(img, lang='eng')
+    except ImportError:
+        print("⚠️  pytesseract or PIL not available")
+    except Exception as e:
+        print(f"⚠️  OCR failed: {e}")
+    return text
+
+
+def _extract_docx(data):
+    from docx import Document
+
+    return "".join(paragraph.text + "\n" for paragraph in Document(io.BytesIO(data)).paragraphs)
+
+
+def extract_resume_text(data, file_ext):
+    """Extract plain text from resume bytes. Runs in the extraction process pool.
+
+    PDFs are read in memory with PyMuPDF, falling back to pdfplumber and then
+    OCR for scanned documents; nothing is written to /tmp.
+    """
+    if file_ext == 'pdf':
+        try:
+            return _extract_pdf(data)
+        except ImportError:
+            raise ResumeExtractionError('PDF parsing not available. Please install PyMuPDF.')
+        except Exception as e:
+            raise ResumeExtractionError(f'Error parsing PDF: {str(e)}')
+    if file_ext == 'docx':
+        try:
+            return _extract_docx(data)
+        except ImportError:
+            raise ResumeExtractionError('Word document parsing not available. Please install python-docx.')
+        except Exception as e:
+            raise ResumeExtractionError(f'Error parsing Word document: {str(e)}')
+    raise ResumeExtractionError('Unsupported file format. Please upload PDF, DOC, or DOCX.')
+
+
+def parse_upload(role, data, file_ext, timer=None, extract=extract_resume_text, cache=None):
+    """Extract and parse an upload with the role's parser, consulting the resume cache first.
+
+    Raises ResumeExtractionError when no text can be read from the file.
+    """
+    from resume_cache import content_hash, get_cache, FALLBACK_TTL_SECONDS
+
+    parser = _parsers.get(role)
+    if parser is None:
+        raise RuntimeError(f"No resume parser registered for role {role}")
+    timer = timer or StageTimer()
+    cache = cache or get_cache()
+
+    with timer.stage('cache'):
+        file_hash = content_hash(data)
+        resume_text = cache.get_text(file_hash)
+    if resume_text is None:
+        with timer.stage('extract'):
+            resume_text = extract(data, file_ext)
+        cache.put_text(file_hash, resume_text)
+
+    with timer.stage('cache'):
+        text_hash = content_hash(resume_text)
+        payload = cache.get_payload(role, text_hash)
+    if payload is not None:
+        return dict(payload, cached=True)
+
+    payload = parser(resume_text, timer)
+    if payload.get('success'):
+        ai_parsed = 'AI' in payload.get('parsing_method', '')
+        cache.put_payload(role, text_hash, payload, None if ai_parsed else FALLBACK_TTL_SECONDS)
+    return payload
+
+
+def public_job(job):
+    """The fields of a job document returned to the browser."""
+    return {
+        'job_id': str(job['_id']),
+        'status': job.get('status'),
+        'filename': job.get('filename'),
+        'result': job.get('result'),
+        'error': job.get('error'),
+        'timings': job.get('timings', {}),
+        'created_at': job['created_at'].isoformat() if job.get('created_at') else None,
+        'finished_at': job['finished_at'].isoformat() if job.get('finished_at') else None
+    }
+
+
+class ResumeJobQueue:
+    """MongoDB-backed job queue with a thread pool of claimers and a process pool for extraction."""
+
+    def __init__(self, jobs_collection, threads=RESUME_WORKER_THREADS, processes=RESUME_EXTRACT_PROCESSES, cache=None):
+        self.jobs = jobs_collection
+        self.cache = cache
+        self.threads = threads
+        self.processes = processes
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._workers = []
+        self._extract_pool = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._workers:
+                return
+            # spawn, not fork: the web process holds MongoClient sockets and threads
+            self._extract_pool = ProcessPoolExecutor(
+                max_workers=self.processes, mp_context=multiprocessing.get_context('spawn')
+            )
+            self._stop.clear()
+            for i in range(self.threads):
+                worker = threading.Thread(target=self._work, name=f'resume-worker-{i}', daemon=True)
+                worker.start()
+                self._workers.append(worker)
+            print(f"✅ Resume workers started ({self.threads} threads, {self.processes} extraction processes)")
+
+    def stop(self):
+        self._stop.set()
+        self._wakeup.set()
+        for worker in self._workers:
+            worker.join(timeout=5)
+        self._workers = []
+        if self._extract_pool:
+            self._extract_pool.shutdown(wait=False, cancel_futures=True)
+            self._extract_pool = None
+
+    def submit(self, role, submitted_by, filename, file_ext, data):
+        """Queue a resume and return its job id."""
+        now = datetime.utcnow()
+        result = self.jobs.insert_one({
+            'role': role,
+            'submitted_by': submitted_by,
+            'filename': filename,
+            'file_ext': file_ext,
+            'file_data': data,
+            'status': 'queued',
+            'attempts': 0,
+            'created_at': now,
+            'updated_at': now
+        })
+        self.start()
+        self._wakeup.set()
+        return result.inserted_id
+
+    def get(self, job_id, submitted_by):
+        job = self.jobs.find_one({'_id': job_id, 'submitted_by': submitted_by}, {'file_data': 0})
+        if job and job.get('status') in ('queued', 'running'):
+            # Someone is waiting on it: make sure this process is claiming jobs (e.g. after a restart)
+            self.start()
+        return job
+
+    def claim(self):
+        """Atomically take the oldest queued (or abandoned) job, or None."""
+        from pymongo import ReturnDocument
+
+        now = datetime.utcnow()
+        return self.jobs.find_one_and_update(
+            {'$or': [
+                {'status': 'queued'},
+                {'status': 'running', 'lease_expires_at': {'$lt': now}}
+            ]},
+            {
+                '$set': {
+                    'status': 'running',
+                    'started_at': now,
+                    'lease_expires_at': now + timedelta(seconds=JOB_LEASE_SECONDS),
+                    'worker': f'{os.getpid()}:{threading.current_thread().name}',
+                    'updated_at': now
+                },
+                '$inc': {'attempts': 1}
+            },
+            sort=[('created_at', 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    def _work(self):
+        while not self._stop.is_set():
+            try:
+                job = self.claim()
+            except Exception as e:
+                print(f"⚠️  Could not claim resume job: {e}")
+                job = None
+            if job is None:
+                self._wakeup.wait(POLL_INTERVAL_SECONDS)
+                self._wakeup.clear()
+                continue
+            self.run(job)
+
+    def _extract(self, data, file_ext):
+        if self._extract_pool is None:
+            return extract_resume_text(data, file_ext)
+        return self._extract_pool.submit(extract_resume_text, data, file_ext).result(timeout=EXTRACT_TIMEOUT_SECONDS)
+
+    def run(self, job):
+        """Process one claimed job and store its result."""
+        timer = StageTimer()
+        started = time.perf_counter()
+        if job.get('created_at') and job.get('started_at'):
+            timer.timings['queue_ms'] = round((job['started_at'] - job['created_at']).total_seconds() * 1000, 1)
+
+        status, result, error = 'done', None, None
+        try:
+            result = parse_upload(job['role'], bytes(job['file_data']), job['file_ext'], timer,
+                                  extract=self._extract, cache=self.cache)
+        except ResumeExtractionError as e:
+            status, error = 'failed', str(e)
+            result = {'success': False, 'message': str(e)}
+        except Exception as e:
+            traceback.print_exc()
+            if job.get('attempts', 1) < MAX_ATTEMPTS:
+                # Transient failure (e.g. a crashed extraction process): let another worker retry
+                self.jobs.update_one({'_id': job['_id']}, {'$set': {
+                    'status': 'queued', 'error': str(e), 'updated_at': datetime.utcnow()
+                }})
+                return None
+            status, error = 'failed', str(e)
+            result = {'success': False, 'message': f'Error parsing resume: {str(e)}'}
+
+        timer.timings['total_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        now = datetime.utcnow()
+        self.jobs.update_one(
+            {'_id': job['_id']},
+            {
+                '$set': {
+                    'status': status,
+                    'result': result,
+                    'error': error,
+                    'timings': timer.timings,
+                    'finished_at': now,
+                    'updated_at': now
+                },
+                # The upload is no longer needed once the job is finished
+                '$unset': {'file_data': '', 'lease_expires_at': ''}
+            }
+        )
+        print(f"📄 Resume job {job['_id']} {status} {timer.timings}")
+
+        if _notifier:
+            finished = dict(job, status=status, result=result, error=error, timings=timer.timings, finished_at=now)
+            try:
+                _notifier('resume_job_finished', public_job(finished), f"resume_job_{job['_id']}")
+            except Exception as e:
+                print(f"⚠️  Could not push resume job result: {e}")
+        return status
+
+
+_queue = None
+
+
+def get_queue():
+    """The process-wide queue; worker threads start at server startup (start_workers), on the
+    first submit, or when a pending job is polled."""
+    global _queue
+    if _queue is None:
+        from models_mongo import resume_jobs_collection
+        _queue = ResumeJobQueue(resume_jobs_collection)
+    return _queue
+
+
+def start_workers():
+    """Start claiming jobs at server startup, so jobs queued or abandoned before a restart are picked up."""
+    try:
+        get_queue().start()
+    except Exception as e:
+        print(f"⚠️  Could not start resume workers: {e}")
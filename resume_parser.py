@@ -0,0 +1,389 @@
+"""
+Regex resume parser.
+
+Every pattern is compiled once at import. Section headers (skills,
+education, ...) are located with one scan of the text, and the skills
+vocabulary is matched with a single alternation instead of one search per
+known skill. Used by the HR /parse_resume fallback when the AI parser is
+unavailable.
+"""
+
+import re
+
+NOISE_WORDS = [
+    'the', 'and', 'for', 'with', 'from', 'that', 'this', 'have', 'been', 'will', 'can', 'are', 'was', 'were',
+    'skills', 'abilities', 'applications', 'proficiency', 'education', 'experience', 'background', 'section',
+    'resume', 'cv', 'curriculum vitae', 'personal', 'information', 'details', 'summary', 'objective'
+]
+
+SKILLS_KEYWORDS = [
+    # Programming Languages
+    'JavaScript', 'Python', 'Java', 'C++', 'C#', 'PHP', 'Ruby', 'Go', 'Rust', 'Swift', 'Kotlin', 'TypeScript',
+    'HTML', 'CSS', 'SQL', 'R', 'MATLAB', 'Scala', 'Perl', 'Shell', 'Bash', 'PowerShell',
+
+    # Frameworks & Libraries
+    'React', 'Angular', 'Vue', 'Node.js', 'Express', 'Django', 'Flask', 'Spring', 'Laravel', 'ASP.NET',
+    'jQuery', 'Bootstrap', 'Tailwind CSS', 'Material-UI', 'Redux', 'Vuex', 'GraphQL', 'REST API',
+
+    # Databases
+    'MySQL', 'PostgreSQL', 'MongoDB', 'Redis', 'SQLite', 'Oracle', 'SQL Server', 'Cassandra', 'DynamoDB',
+
+    # Cloud & DevOps
+    'AWS', 'Azure', 'Google Cloud', 'Docker', 'Kubernetes', 'Jenkins', 'GitLab CI', 'GitHub Actions',
+    'Terraform', 'Ansible', 'Chef', 'Puppet', 'Vagrant',
+
+    # Tools & Platforms
+    'Git', 'SVN', 'JIRA', 'Confluence', 'Slack', 'Teams', 'Zoom', 'Figma', 'Adobe Creative Suite',
+    'VS Code', 'IntelliJ', 'Eclipse', 'Xcode', 'Android Studio',
+
+    # Methodologies
+    'Agile', 'Scrum', 'Kanban', 'Waterfall', 'DevOps', 'CI/CD', 'TDD', 'BDD', 'Pair Programming',
+
+    # Soft Skills
+    'Leadership', 'Communication', 'Problem Solving', 'Critical Thinking', 'Teamwork', 'Time Management',
+    'Project Management', 'Customer Service', 'Analytical Skills', 'Creativity',
+
+    # Office & Business Tools
+    'MS Office', 'Power BI', 'Excel', 'Word', 'PowerPoint', 'Outlook', 'Access', 'Project', 'Visio',
+    'Tableau', 'Salesforce', 'SAP', 'QuickBooks', 'Adobe Photoshop', 'Illustrator',
+
+    # Web & Design
+    'Web Design', 'Web Designing', 'HTML5', 'CSS3', 'Responsive Design', 'UI/UX', 'Photoshop',
+    'Sketch', 'Adobe XD', 'Wireframing', 'Prototyping'
+]
+
+COMMON_WORDS = {'the', 'and', 'for', 'with', 'from', 'that', 'this', 'have', 'been', 'will', 'can', 'are', 'was', 'were'}
+SECTION_WORDS = COMMON_WORDS | {'skills', 'abilities', 'applications', 'proficiency'}
+
+WORK_EXPERIENCE_INDICATORS = [
+    'responsibilities', 'team lead', 'pvt ltd', 'working as', 'production', 'quality', 'organizing',
+    'present', 'role', 'until', 'company', 'corp', 'inc', 'ltd', 'llc', 'pvt', 'limited'
+]
+
+
+def _longest_first(words):
+    return '|'.join(re.escape(word) for word in sorted(words, key=len, reverse=True))
+
+
+WHITESPACE = re.compile(r'\s+')
+NOISE = re.compile(rf'\b(?:{_longest_first(NOISE_WORDS)})\b', re.IGNORECASE)
+
+NAME_PATTERNS = [re.compile(p, re.IGNORECASE | re.MULTILINE) for p in (
+    r'(?:Name|Full Name|Candidate|Applicant)[\s:]*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',
+    r'^([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',  # First line with capitalized words
+    r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)(?=\s+(?:Email|Phone|Address|Objective))'
+)]
+
+EMAIL_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',  # Standard email
+    r'[A-Za-z0-9._%+-]+\s*@\s*[A-Za-z0-9.-]+\s*\.\s*[A-Z|a-z]{2,}',  # Email with spaces
+    r'(?:Email|E-mail|Mail|Contact)[\s:]*([A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,})',  # Labeled email
+    r'(?:Email|E-mail|Mail|Contact)[\s:]*([A-Za-z0-9._%+-]+\s*@\s*[A-Za-z0-9.-]+\s*\.\s*[A-Z|a-z]{2,})'  # Labeled email with spaces
+)]
+SPACED_EMAIL = re.compile(r'[A-Za-z0-9._%+-]+\s*@\s*[A-Za-z0-9.-]+\s*\.\s*[A-Z|a-z]{2,}')
+NOT_EMAIL_CHAR = re.compile(r'[^\w@.-]')
+
+PHONE_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r'(\+?\d[\d\s-]{8,}\d)',  # International format
+    r'(\+?1?[-.\s]?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4}))',  # US format
+    r'(\+?[0-9]{1,4}[-.\s]?[0-9]{1,4}[-.\s]?[0-9]{1,4}[-.\s]?[0-9]{1,4})',  # General format
+    r'(?:Phone|Mobile|Tel|Contact)[\s:]*(\+?[\d\s\-\(\)\.]+)'
+)]
+NOT_PHONE_CHAR = re.compile(r'[^\d+]')
+
+DOB_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r'(?:DOB|Date of Birth|Birth Date|Born)[\s:]*(\d{1,2}[/\-]\d{1,2}[/\-]\d{2,4})',
+    r'(?:DOB|Date of Birth|Birth Date|Born)[\s:]*(\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{2,4})',
+    r'(\d{1,2}[/\-]\d{1,2}[/\-]\d{2,4})',  # General date format
+    r'(\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{2,4})'  # Month name format
+)]
+
+GENDER_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r'\b(Male|Female|Other)\b',
+    r'(?:Gender|Sex)[\s:]*([MF]|Male|Female|Other)',
+    r'\b(M|F|MALE|FEMALE)\b'
+)]
+
+# Skill vocabulary as one alternation, longest first so "SQL Server" wins over "SQL".
+# The lookahead makes every word start a candidate, so skills that overlap
+# ("Tailwind CSS" and "CSS") are all found.
+_CANONICAL_SKILLS = {}
+for _skill in SKILLS_KEYWORDS:
+    _CANONICAL_SKILLS.setdefault(_skill.lower(), _skill)
+SKILLS = re.compile(rf'\b(?=({_longest_first(_CANONICAL_SKILLS.values())})\b)', re.IGNORECASE)
+# Shorter skills that start where a longer one does ("SQL" in "SQL Server")
+_SKILL_PREFIXES = {
+    skill.lower(): [
+        (re.compile(rf'{re.escape(shorter)}\b', re.IGNORECASE), shorter)
+        for shorter in _CANONICAL_SKILLS.values()
+        if shorter != skill and skill.lower().startswith(shorter.lower())
+    ]
+    for skill in _CANONICAL_SKILLS.values()
+}
+BULLET_SKILL = re.compile(r'[•\-\*]\s*([A-Za-z][A-Za-z0-9\s\(\)]+)')
+LIST_SEPARATOR = re.compile(r'[,;]')
+TECHNICAL_TERMS = re.compile(
+    r'\b(?:MS Office|Power BI|Excel|Word|PowerPoint|Outlook|Access|Project|Visio)\b'
+    r'|\b(?:Python|Java|JavaScript|HTML|CSS|SQL|React|Angular|Vue|Node\.js)\b'
+    r'|\b(?:Git|Docker|AWS|Azure|Google Cloud|Kubernetes|Jenkins)\b'
+    r'|\b(?:Photoshop|Illustrator|Figma|Sketch|Adobe XD)\b'
+    r'|\b(?:Agile|Scrum|DevOps|CI/CD|TDD|BDD)\b',
+    re.IGNORECASE
+)
+
+# Section headers, found in one scan. Each alternative is tried at every
+# position (zero-width lookahead); line-start headers only match at ^.
+SECTION_HEADERS = re.compile(r'''(?=
+      (?P<skills_abilities>Skills\s*&\s*Abilities)
+    | (?P<applications>Applications\s*Proficiency)
+    | (?P<technical>Technical\s*Skills)
+    | ^(?P<skills>Skills)
+    | ^(?P<educational_background>Educational\ Background)
+    | ^(?P<education>Education)
+    | ^(?P<academic>Academic)
+    | ^(?P<qualifications>Qualifications)
+)''', re.IGNORECASE | re.MULTILINE | re.VERBOSE)
+# A header that also starts another header at the same position
+_ALSO_STARTS = {'skills_abilities': ('skills', 6), 'educational_background': ('education', 9)}
+SKILLS_SECTIONS = ('skills_abilities', 'applications', 'technical', 'skills')
+EDUCATION_SECTIONS = ('education', 'academic', 'qualifications', 'educational_background')
+# Section body: up to the next bullet or blank line
+SECTION_BODY = re.compile(r'[\s:]*([^•\n]+(?:\n[^•\n]+)*)')
+
+DEGREE_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r'(Bachelor|Master|PhD|B\.?S\.?|M\.?S\.?|B\.?A\.?|M\.?A\.?|B\.?Tech|M\.?Tech|B\.?E|M\.?E)[\s\w]*',
+    r'(Computer Science|Engineering|Information Technology|Software Engineering|Data Science|Business Administration|Science|Arts|Commerce)'
+)]
+INSTITUTION_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r'(?:University|College|Institute|School)[\s\w]+',
+    r'(?:Graduated|Completed|Passed)[\s\w]*(?:in|from)[\s\w]+',
+    r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\s+(?:University|College|Institute|School))',
+    r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\s+(?:science|arts|degree|junior|high|school))'
+)]
+YEAR_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r'\b(19|20)\d{2}\b',  # Years 1900-2099
+    r'(?:Graduated|Completed|Passed)[\s\w]*(\d{4})',
+    r'(\d{4})'  # Any 4-digit year
+)]
+DOUBLE_PIPE = re.compile(r'\|\s*\|')
+LEADING_PIPE = re.compile(r'^\|\s*')
+TRAILING_PIPE = re.compile(r'\s*\|$')
+
+EXPERIENCE_YEARS_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r'(\d+)\s*(?:years?|yrs?)\s*(?:of\s*)?(?:experience|exp)',
+    r'(?:experience|exp)[\s\w]*(\d+)\s*(?:years?|yrs?)',
+    r'(?:worked|experience)[\s\w]*(\d+)\s*(?:years?|yrs?)',
+    r'(?:Total Experience|Work Experience)[\s:]*(\d+)\s*(?:years?|yrs?)',
+    r'(?:Experience|Work History|Employment)[\s:]*(\d+)\s*(?:years?|yrs?)',
+    r'(\d+)\s*(?:years?|yrs?)',  # Just years mentioned
+)]
+EXPERIENCE_SECTION = re.compile(
+    r'(?:Experience|Work History|Employment|Professional Experience|EXPERIENCE)[\s:]*([^•\n]+(?:\n[^•\n]+)*)',
+    re.IGNORECASE
+)
+JOB_TITLE_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r'(?:Software Engineer|Developer|Programmer|Analyst|Manager|Lead|Senior|Junior|Full Stack|Frontend|Backend|DevOps|Data Scientist|QA|Tester)[\s\w]*',
+    r'(?:Engineer|Developer|Programmer|Analyst|Manager|Lead|Senior|Junior)[\s\w]*'
+)]
+COMPANY_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r'(?:at|with|for)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',
+    r'(?:Company|Corp|Inc|Ltd|LLC|Pvt|Limited)[\s\w]*'
+)]
+
+
+def clean_text(text):
+    """Flatten whitespace and drop noise words."""
+    text = WHITESPACE.sub(' ', text.replace('\n', ' ').replace('\r', ' '))
+    return NOISE.sub('', text).strip()
+
+
+def find_sections(text):
+    """Body text of the first usable occurrence of each section header, from one scan."""
+    occurrences = {}
+    for match in SECTION_HEADERS.finditer(text):
+        kind = match.lastgroup
+        occurrences.setdefault(kind, []).append(match.end(kind))
+        if kind in _ALSO_STARTS:
+            also, length = _ALSO_STARTS[kind]
+            if kind != 'skills_abilities' or match.start(kind) == 0 or text[match.start(kind) - 1] == '\n':
+                occurrences.setdefault(also, []).append(match.start(kind) + length)
+
+    sections = {}
+    for kind, ends in occurrences.items():
+        for end in ends:
+            body = SECTION_BODY.match(text, end)
+            if body:
+                sections[kind] = body.group(1)
+                break
+    return sections
+
+
+def find_skills(text):
+    """Every vocabulary skill mentioned in `text`, in canonical spelling."""
+    found = set()
+    for match in SKILLS.finditer(text):
+        skill = _CANONICAL_SKILLS[match.group(1).lower()]
+        found.add(skill)
+        for pattern, shorter in _SKILL_PREFIXES[skill.lower()]:
+            if pattern.match(text, match.start()):
+                found.add(shorter)
+    return found
+
+
+def _first(patterns, text):
+    for pattern in patterns:
+        match = pattern.search(text)
+        if match:
+            return match
+    return None
+
+
+def _extract_skills(text, sections):
+    found_skills = []
+    skills_section_text = next((sections[kind] for kind in SKILLS_SECTIONS if kind in sections), "")
+
+    if skills_section_text:
+        skills_section_text = WHITESPACE.sub(' ', skills_section_text.strip())
+        found_skills.extend(find_skills(skills_section_text))
+        known = {skill.lower() for skill in found_skills}
+
+        # Bullet points or list items, then comma-separated entries
+        candidates = [(skill, COMMON_WORDS) for skill in BULLET_SKILL.findall(skills_section_text)]
+        candidates += [(skill, SECTION_WORDS) for skill in LIST_SEPARATOR.split(skills_section_text)]
+        for skill, stop_words in candidates:
+            skill = skill.strip()
+            if skill and len(skill) > 2 and skill.lower() not in stop_words and skill.lower() not in known:
+                found_skills.append(skill)
+                known.add(skill.lower())
+
+    if not found_skills:
+        # No skills section found, search throughout the document
+        found_skills = list(find_skills(text))
+
+    # Drop entries that look like work experience or job descriptions
+    filtered_skills = sorted(
+        skill for skill in set(found_skills)
+        if not any(indicator in skill.lower() for indicator in WORK_EXPERIENCE_INDICATORS)
+    )
+
+    if not filtered_skills:
+        filtered_skills = sorted(set(TECHNICAL_TERMS.findall(text)))
+    return filtered_skills
+
+
+def _extract_education(sections):
+    education_section_text = next((sections[kind] for kind in EDUCATION_SECTIONS if kind in sections), "")
+    if not education_section_text:
+        return "Education information not found in resume"
+
+    education_section_text = WHITESPACE.sub(' ', education_section_text.strip())
+    education_text = []
+    for pattern in DEGREE_PATTERNS + INSTITUTION_PATTERNS + YEAR_PATTERNS:
+        education_text.extend(pattern.findall(education_section_text))
+
+    if education_text:
+        education = ' | '.join(sorted(set(education_text)))
+    else:
+        education = education_section_text.strip()
+
+    # Clean and format the education output
+    education = WHITESPACE.sub(' ', education)
+    education = DOUBLE_PIPE.sub('|', education)
+    education = LEADING_PIPE.sub('', education)
+    education = TRAILING_PIPE.sub('', education)
+    return education.strip()
+
+
+def _extract_experience(cleaned_text):
+    years = _first(EXPERIENCE_YEARS_PATTERNS, cleaned_text)
+    if years and int(years.group(1)):
+        return f"{int(years.group(1))} years of experience"
+
+    section = EXPERIENCE_SECTION.search(cleaned_text)
+    if section:
+        experience_section_text = section.group(1)
+        experience_info = []
+        for pattern in JOB_TITLE_PATTERNS + COMPANY_PATTERNS:
+            experience_info.extend(pattern.findall(experience_section_text))
+        if experience_info:
+            return ' | '.join(sorted(set(experience_info)))[:200] + "..."
+        return WHITESPACE.sub(' ', experience_section_text.strip())[:200] + "..."
+
+    if years:
+        return f"{years.group(1)} years of experience"
+    return ''
+
+
+def parse_resume_text(text):
+    """Extract name, contact details, skills, education and experience from resume text."""
+    cleaned_text = clean_text(text)
+    sections = find_sections(text)
+
+    extracted_data = {
+        'name': '',
+        'email': '',
+        'phone': '',
+        'dob': '',
+        'gender': '',
+        'skills': [],
+        'education': '',
+        'experience': ''
+    }
+
+    # Name: capitalized words near "Name" or from the top of the document
+    for pattern in NAME_PATTERNS:
+        match = pattern.search(cleaned_text)
+        if match and len(match.group(1).split()) >= 2:  # At least 2 words
+            extracted_data['name'] = match.group(1).strip()
+            break
+
+    for pattern in EMAIL_PATTERNS:
+        match = pattern.search(cleaned_text)
+        if match:
+            email = match.group(1) if match.groups() else match.group(0)
+            email = NOT_EMAIL_CHAR.sub('', email)
+            if '@' in email and '.' in email.split('@')[1]:
+                extracted_data['email'] = email
+                break
+    if not extracted_data['email']:
+        for potential_email in SPACED_EMAIL.findall(cleaned_text):
+            email = NOT_EMAIL_CHAR.sub('', potential_email)
+            if '@' in email and '.' in email.split('@')[1]:
+                extracted_data['email'] = email
+                break
+
+    for pattern in PHONE_PATTERNS:
+        match = pattern.search(cleaned_text)
+        if match:
+            phone = NOT_PHONE_CHAR.sub('', match.group(1))  # Keep only digits and +
+            if len(phone) >= 10:  # Minimum 10 digits
+                extracted_data['phone'] = phone
+                break
+
+    match = _first(DOB_PATTERNS, cleaned_text)
+    if match:
+        extracted_data['dob'] = match.group(1)
+
+    match = _first(GENDER_PATTERNS, cleaned_text)
+    if match:
+        gender = match.group(1).upper()
+        if gender in ['M', 'MALE']:
+            extracted_data['gender'] = 'Male'
+        elif gender in ['F', 'FEMALE']:
+            extracted_data['gender'] = 'Female'
+        else:
+            extracted_data['gender'] = 'Other'
+
+    extracted_data['skills'] = _extract_skills(text, sections)
+    extracted_data['education'] = _extract_education(sections)
+    extracted_data['experience'] = _extract_experience(cleaned_text)
+
+    # If name wasn't found by patterns, try to extract from email
+    if not extracted_data['name'] and extracted_data['email']:
+        email_name = extracted_data['email'].split('@')[0]
+        if '.' in email_name:
+            extracted_data['name'] = ' '.join(part.title() for part in email_name.split('.'))
+        else:
+            extracted_data['name'] = email_name.title()
+
+    return extracted_data
@@ -1,7 +1,7 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, session
 from flask_login import login_required, current_user, login_user
 from models_mongo import User, Role, ActivityLog, UserEmail
-from email_service import send_role_assignment_email, send_invitation_email
+from email_service import send_role_assignment_email, send_invitation_email, send_invitation_emails
 from datetime import datetime, timedelta
 import re
 import jwt
@@ -45,20 +45,23 @@ def login():
 def dashboard():
     # Count actual users from the users collection
     from models_mongo import users_collection, user_emails_collection
+    from user_counts import user_counts, invited_emails
     
-    # Count users by role
-    manager_count = users_collection.count_documents({'role': 'manager'})
-    cluster_count = users_collection.count_documents({'role': 'cluster'})
-    hr_count = users_collection.count_documents({'role': 'hr_role'})
-    recruiter_count = users_collection.count_documents({'role': 'recruiter'})
-    admin_count = users_collection.count_documents({'role': 'admin'})
-    total_users = users_collection.count_documents({})
+    # Count users by role (one cached $group)
+    counts = user_counts(users_collection)
+    manager_count = counts.get('manager', 0)
+    cluster_count = counts.get('cluster', 0)
+    hr_count = counts.get('hr_role', 0)
+    recruiter_count = counts.get('recruiter', 0)
+    admin_count = counts.get('admin', 0)
+    total_users = counts['total']
     
-    # Get invited emails from user_emails collection
-    recruiter_emails = list(user_emails_collection.find({'role': 'Recruiter'}, {'email': 1, 'assigned_by': 1, 'created_at': 1}))
-    hr_emails = list(user_emails_collection.find({'role': 'HR_Role'}, {'email': 1, 'assigned_by': 1, 'created_at': 1}))
-    manager_emails = list(user_emails_collection.find({'role': 'Manager'}, {'email': 1, 'assigned_by': 1, 'created_at': 1}))
-    cluster_emails = list(user_emails_collection.find({'role': 'Cluster Member'}, {'email': 1, 'assigned_by': 1, 'created_at': 1}))
+    # Get invited emails from user_emails collection, grouped by role in one query
+    emails = invited_emails(user_emails_collection)
+    recruiter_emails = emails.get('Recruiter', [])
+    hr_emails = emails.get('HR_Role', [])
+    manager_emails = emails.get('Manager', [])
+    cluster_emails = emails.get('Cluster Member', [])
     
     # Get recent activity logs
     from models_mongo import activity_logs_collection
@@ -142,13 +145,80 @@ def remove_role():
     else:
         return jsonify({'success': False, 'message': 'Role not found'})
 
+def _activity_log_source(args):
+    """(collection, query, filters) for the viewer/export: recent logs or the archive, with filters applied"""
+    from models_mongo import activity_logs_collection, activity_logs_archive_collection
+    from activity_log_archive import build_log_query
+    
+    filters = {name: (args.get(name) or '').strip() for name in ('source', 'user', 'action', 'date_from', 'date_to', 'month')}
+    archive = filters['source'] == 'archive'
+    collection = activity_logs_archive_collection if archive else activity_logs_collection
+    try:
+        query = build_log_query(filters['user'], filters['action'], filters['date_from'], filters['date_to'],
+                                filters['month'] if archive else None)
+    except ValueError:
+        flash('Dates must be in YYYY-MM-DD format', 'error')
+        query = {}
+    return collection, query, filters
+
 @admin_bp.route('/activity_logs')
 @admin_required
 def activity_logs():
-    from models_mongo import activity_logs_collection
+    from pagination import paginate, InvalidCursor
     from datetime import datetime
-    logs = list(activity_logs_collection.find().sort('timestamp', -1))
-    return render_template('admin/activity_logs.html', activity_logs=logs, now=datetime.now())
+    
+    collection, query, filters = _activity_log_source(request.args)
+    try:
+        page_size = int(request.args.get('page_size', 50))
+    except ValueError:
+        page_size = 50
+    options = {'page_size': page_size, 'sort_field': 'timestamp', 'direction': -1}
+    try:
+        page = paginate(collection, query, cursor=request.args.get('cursor') or None, **options)
+    except InvalidCursor:
+        # A stale or tampered cursor restarts at the first page
+        page = paginate(collection, query, **options)
+    
+    # Counts come from the indexes instead of loading every entry
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    today_query = {'$and': [query, {'timestamp': {'$gte': today}}]} if query else {'timestamp': {'$gte': today}}
+    total_count = collection.count_documents(query) if query else collection.estimated_document_count()
+    
+    return render_template('admin/activity_logs.html',
+                         activity_logs=page.items,
+                         page=page,
+                         filters=filters,
+                         filter_args={name: value for name, value in filters.items() if value},
+                         total_count=total_count,
+                         today_count=collection.count_documents(today_query),
+                         active_users_today=len(collection.distinct('user_email', today_query)),
+                         now=datetime.now())
+
+@admin_bp.route('/activity_logs/export')
+@admin_required
+def export_activity_logs():
+    """Stream the filtered recent or archived activity logs as CSV"""
+    from activity_log_archive import LOG_EXPORT_HEADERS, export_log_rows
+    from exports import csv_response
+    
+    collection, query, filters = _activity_log_source(request.args)
+    name = 'activity_logs_archive' if filters['source'] == 'archive' else 'activity_logs'
+    if filters['month']:
+        name += f"_{filters['month']}"
+    return csv_response(f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv", LOG_EXPORT_HEADERS,
+                        export_log_rows(collection, query))
+
+@admin_bp.route('/archive_activity_logs', methods=['POST'])
+@admin_required
+def archive_activity_logs():
+    """Move activity logs past the retention window to the archive collection"""
+    from activity_log_archive import run_archive, ACTIVITY_LOG_RETENTION_DAYS
+    
+    try:
+        moved = run_archive()
+        return jsonify({'success': True, 'message': f'Archived {moved} activity logs older than {ACTIVITY_LOG_RETENTION_DAYS} days'})
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Error archiving activity logs: {str(e)}'})
 
 @admin_bp.route('/delete_activity_log/<log_id>', methods=['DELETE'])
 @admin_required
@@ -218,6 +288,20 @@ def logout():
     return redirect(url_for('index'))
 
 # Unified Email Management Functions
+def invitation_link(email, role, host_url):
+    """Registration link carrying a 24 hour JWT invitation token"""
+    token = jwt.encode(
+        {
+            'email': email,
+            'role': role,
+            'type': 'invitation',
+            'exp': datetime.utcnow() + timedelta(hours=24)
+        },
+        JWT_SECRET,
+        algorithm='HS256'
+    )
+    return f"{host_url.rstrip('/')}/register?token={token}"
+
 def add_user_and_send_invite(email, role):
     """Unified function to add user email and send invitation"""
     try:
@@ -234,20 +318,8 @@ def add_user_and_send_invite(email, role):
         )
         new_user_email.save()
         
-        # Create JWT token for invitation
-        token = jwt.encode(
-            {
-                'email': email,
-                'role': role,
-                'type': 'invitation',
-                'exp': datetime.utcnow() + timedelta(hours=24)
-            },
-            JWT_SECRET,
-            algorithm='HS256'
-        )
-        
-        # Build registration link
-        registration_link = f"{request.host_url.rstrip('/')}/register?token={token}"
+        # Build registration link with a JWT invitation token
+        registration_link = invitation_link(email, role, request.host_url)
         
         # Send invitation email
         email_sent = send_invitation_email(email, role, registration_link)
@@ -270,6 +342,148 @@ def add_user_and_send_invite(email, role):
         print(f"Error in add_user_and_send_invite: {e}")
         return False, f'Error adding {role} email: {str(e)}'
 
+# Role column values accepted by the bulk invite upload
+INVITE_ROLES = {
+    'recruiter': 'Recruiter',
+    'hr': 'HR_Role',
+    'hr_role': 'HR_Role',
+    'manager': 'Manager',
+    'cluster': 'Cluster Member',
+    'cluster member': 'Cluster Member',
+}
+MAX_BULK_INVITES = 5000
+EMAIL_PATTERN = re.compile(r"[^@]+@[^@]+\.[^@]+")
+
+def parse_invite_rows(text, default_role=None):
+    """Read `email[,role]` lines (CSV upload or pasted list) into (email, role) pairs"""
+    import csv
+    import io
+    
+    rows = []
+    for fields in csv.reader(io.StringIO(text)):
+        fields = [field.strip() for field in fields if field.strip()]
+        if not fields or fields[0].lower() == 'email':
+            continue
+        if len(fields) > 1 and '@' in fields[1]:
+            # A comma separated list of addresses on one line
+            rows.extend((email, default_role) for email in fields)
+        else:
+            rows.append((fields[0], fields[1] if len(fields) > 1 else default_role))
+    return rows
+
+def bulk_add_users_and_send_invites(rows, invited_by, host_url, user_emails_collection, activity_logs_collection,
+                                    send_invites=send_invitation_emails):
+    """Pre-approve (email, role) pairs and queue their invitations with one query per step.
+    
+    Returns one result dict per input row with a status of invited, exists,
+    duplicate, invalid or error.
+    """
+    from pymongo.errors import BulkWriteError
+    
+    results, pending, seen = [], [], set()
+    for number, (email, role) in enumerate(rows, 1):
+        result = {'row': number, 'email': email, 'role': role}
+        role_name = INVITE_ROLES.get((role or '').strip().lower())
+        if not EMAIL_PATTERN.match(email or ''):
+            result.update(status='invalid', message='Invalid email format')
+        elif not role_name:
+            result.update(status='invalid', message=f'Unknown role: {role}' if role else 'Role is required')
+        elif email in seen:
+            result.update(status='duplicate', message='Listed more than once')
+        else:
+            seen.add(email)
+            result['role'] = role_name
+            pending.append(result)
+        results.append(result)
+    
+    if not pending:
+        return results
+    
+    # One $in lookup instead of an existence check per email
+    existing = {doc['email'] for doc in user_emails_collection.find(
+        {'email': {'$in': [result['email'] for result in pending]}}, {'email': 1}
+    )}
+    new = []
+    for result in pending:
+        if result['email'] in existing:
+            result.update(status='exists', message='Email already exists in the system')
+        else:
+            new.append(result)
+    if not new:
+        return results
+    
+    failed = {}
+    try:
+        user_emails_collection.insert_many(
+            [UserEmail(email=result['email'], role=result['role'], assigned_by=invited_by).to_dict() for result in new],
+            ordered=False
+        )
+    except BulkWriteError as e:
+        failed = {error['index']: error.get('errmsg', 'Could not be saved') for error in e.details.get('writeErrors', [])}
+    
+    invited = []
+    for index, result in enumerate(new):
+        if index in failed:
+            result.update(status='error', message=failed[index])
+        else:
+            invited.append(result)
+    if not invited:
+        return results
+    
+    queued = send_invites([
+        (result['email'], result['role'], invitation_link(result['email'], result['role'], host_url))
+        for result in invited
+    ])
+    for result in invited:
+        result.update(status='invited',
+                      message='Invitation queued' if queued else 'Added, but the invitation email could not be queued')
+    
+    activity_logs_collection.insert_many([
+        ActivityLog(
+            user_email=invited_by,
+            action=f"Added {result['role']} email",
+            target_email=result['email'],
+            details=f"Added {result['role']} email and sent invitation to {result['email']} (bulk invite)"
+        ).to_dict()
+        for result in invited
+    ], ordered=False)
+    return results
+
+@admin_bp.route('/bulk_invite', methods=['POST'])
+@admin_required
+def bulk_invite():
+    """Pre-approve and invite a CSV upload or pasted list of emails; returns a per-row report"""
+    from collections import Counter
+    from models_mongo import user_emails_collection, activity_logs_collection
+    
+    default_role = request.form.get('role')
+    upload = request.files.get('file')
+    if upload and upload.filename:
+        text = upload.read().decode('utf-8-sig', errors='replace')
+    else:
+        text = request.form.get('emails', '')
+    
+    rows = parse_invite_rows(text, default_role)
+    if not rows:
+        return jsonify({'success': False, 'message': 'No emails provided'})
+    if len(rows) > MAX_BULK_INVITES:
+        return jsonify({'success': False, 'message': f'At most {MAX_BULK_INVITES} emails can be invited at once'})
+    
+    try:
+        results = bulk_add_users_and_send_invites(rows, current_user.email, request.host_url,
+                                                  user_emails_collection, activity_logs_collection)
+    except Exception as e:
+        print(f"Error in bulk_invite: {e}")
+        return jsonify({'success': False, 'message': f'Error inviting users: {str(e)}'})
+    
+    summary = Counter(result['status'] for result in results)
+    return jsonify({
+        'success': True,
+        'message': f"{summary.get('invited', 0)} of {len(results)} emails invited",
+        'summary': dict(summary),
+        'results': results
+    })
+
 @admin_bp.route('/add_recruiter_email', methods=['POST'])
 @admin_required
 def add_recruiter_email():
@@ -358,4 +572,52 @@ def remove_user_email():
             return jsonify({'success': False, 'message': 'Email not found'})
             
     except Exception as e:
-        return jsonify({'success': False, 'message': f'Error removing email: {str(e)}'}) 
\ No newline at end of file
+        return jsonify({'success': False, 'message': f'Error removing email: {str(e)}'}) 
+@admin_bp.route('/resume_cache_stats')
+@admin_required
+def resume_cache_stats():
+    """Hit/miss counters of the parsed-resume cache for this process"""
+    from resume_cache import get_cache
+    from models_mongo import resume_cache_collection
+    
+    try:
+        stats = get_cache().stats()
+        stats['entries'] = resume_cache_collection.estimated_document_count()
+        return jsonify({'success': True, 'stats': stats})
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Error reading resume cache stats: {str(e)}'})
+
+@admin_bp.route('/email_outbox_stats')
+@admin_required
+def email_outbox_stats():
+    """Outbound email counts by status, delivery latency and SMTP connections opened"""
+    from email_outbox import get_outbox
+    
+    try:
+        return jsonify({'success': True, 'stats': get_outbox().stats()})
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Error reading email outbox stats: {str(e)}'})
+
+@admin_bp.route('/activity_log_sink_stats')
+@admin_required
+def activity_log_sink_stats():
+    """Buffered, written and dropped counts of the write-behind activity log sink"""
+    from activity_log_sink import get_sink
+    
+    return jsonify({'success': True, 'stats': get_sink().stats()})
+
+@admin_bp.route('/response_cache_stats')
+@admin_required
+def response_cache_stats():
+    """Hit rate of the dashboard/analytics response cache, overall and per route"""
+    from response_cache import get_cache
+
+    return jsonify({'success': True, 'stats': get_cache().stats()})
+
+@admin_bp.route('/user_cache_stats')
+@admin_required
+def user_cache_stats():
+    """Hit rate of the Flask-Login user cache for this process"""
+    from user_cache import get_cache
+
+    return jsonify({'success': True, 'stats': get_cache().stats()})
@@ -3,6 +3,7 @@ from flask_login import login_required, current_user
 from models_mongo import User, Candidate, ActivityLog, users_collection
 from datetime import datetime, timedelta
 from email_service import send_candidate_assignment_email
+from response_cache import cached_response
 from bson import ObjectId
 
 cluster_bp = Blueprint('cluster', __name__)
@@ -92,17 +93,9 @@ def dashboard():
         ]
     
     # Get filtered candidates
-    all_candidates_raw = list(candidates_collection.find(query))
-    
-    # Convert to Candidate objects for proper data handling
-    all_candidates = []
-    for data in all_candidates_raw:
-        try:
-            candidate = Candidate.from_dict(data)
-            all_candidates.append(candidate)
-        except Exception as e:
-            print(f"Error converting candidate data: {e}")
-            continue
+    from models_mongo import CandidateSummary, CANDIDATE_SUMMARY_PROJECTION
+    all_candidates_raw = candidates_collection.find(query, CANDIDATE_SUMMARY_PROJECTION)
+    all_candidates = [CandidateSummary.from_dict(data) for data in all_candidates_raw]
     
     # Calculate statistics based on filtered data
     total_candidates = len(all_candidates)
@@ -125,17 +118,8 @@ def dashboard():
         average_manager_rating = sum(c.manager_overall_rating for c in candidates_with_manager_rating) / len(candidates_with_manager_rating)
     
     # Get recent candidates for display (apply same filters)
-    recent_candidates_raw = list(candidates_collection.find(query).sort('created_at', -1).limit(10))
-    
-    # Convert recent candidates to Candidate objects
-    recent_candidates = []
-    for data in recent_candidates_raw:
-        try:
-            candidate = Candidate.from_dict(data)
-            recent_candidates.append(candidate)
-        except Exception as e:
-            print(f"Error converting recent candidate data: {e}")
-            continue
+    recent_candidates_raw = candidates_collection.find(query, CANDIDATE_SUMMARY_PROJECTION).sort('created_at', -1).limit(10)
+    recent_candidates = [CandidateSummary.from_dict(data) for data in recent_candidates_raw]
     
     # Get HR names for filter
     hr_users = list(users_collection.find({'role': 'hr_role', 'is_active': True}))
@@ -203,20 +187,12 @@ def debug_candidates():
 @cluster_bp.route('/candidates')
 @cluster_required
 def candidates():
-    from models_mongo import candidates_collection
-    candidates_data = list(candidates_collection.find().sort('created_at', -1))
+    from models_mongo import candidates_collection, CandidateSummary, CANDIDATE_SUMMARY_PROJECTION
+    from pagination import paginate_request
+    page = paginate_request(candidates_collection, request.args, projection=CANDIDATE_SUMMARY_PROJECTION)
+    candidates = [CandidateSummary.from_dict(data) for data in page.items]
     
-    # Convert to Candidate objects for proper data handling
-    candidates = []
-    for data in candidates_data:
-        try:
-            candidate = Candidate.from_dict(data)
-            candidates.append(candidate)
-        except Exception as e:
-            print(f"Error converting candidate data: {e}")
-            continue
-    
-    return render_template('cluster/candidates.html', candidates=candidates)
+    return render_template('cluster/candidates.html', candidates=candidates, page=page)
 
 @cluster_bp.route('/assign_candidate', methods=['POST'])
 @cluster_required
@@ -316,41 +292,52 @@ def analytics():
 @cluster_required
 def reports():
     from models_mongo import candidates_collection, activity_logs_collection
+    from analytics_mongo import count_candidates_by_status
+    from pipeline_stats import read_status_counts
     
-    # Generate various reports
-    all_candidates = list(candidates_collection.find())
-    all_activities = list(activity_logs_collection.find())
-    
-    # Recent activity report
+    # Recent activity report (the last 50 entries only; older history is in the admin log viewer)
     recent_activities = list(activity_logs_collection.find().sort('timestamp', -1).limit(50))
     
-    # Status summary report
-    status_summary = {}
-    for candidate in all_candidates:
-        status = candidate.get('status', 'Pending')
-        status_summary[status] = status_summary.get(status, 0) + 1
+    # Status summary report from the materialized counters
+    status_summary, total_candidates = read_status_counts() or count_candidates_by_status(candidates_collection)
     
     return render_template('cluster/reports.html',
                          recent_activities=recent_activities,
                          status_summary=status_summary,
-                         total_candidates=len(all_candidates))
+                         total_candidates=total_candidates)
+
+EXPORT_HEADERS = [
+    'Reference ID', 'First Name', 'Last Name', 'Email', 'Phone', 
+    'Status', 'Assigned HR', 'Manager Email', 'Created Date', 
+    'Scheduled Date', 'Experience', 'Skills'
+]
+EXPORT_FIELDS = [
+    'reference_id', 'first_name', 'last_name', 'email', 'phone',
+    'status', 'assigned_by', 'manager_email', 'created_at',
+    'scheduled_date', 'experience', 'skills'
+]
+EXPORT_COLUMN_WIDTHS = [24, 16, 16, 30, 16, 14, 30, 30, 21, 21, 30, 50]
+
+def export_rows(candidates_collection, query):
+    """Yield one export row per matching candidate, streaming from the cursor"""
+    from exports import format_datetime
+    
+    # Only the exported columns leave the database
+    projection = dict.fromkeys(EXPORT_FIELDS, 1)
+    projection['_id'] = 0
+    for candidate in candidates_collection.find(query, projection, batch_size=1000):
+        row = [candidate.get(field, '') for field in EXPORT_FIELDS]
+        row[8] = format_datetime(candidate.get('created_at'))
+        row[9] = format_datetime(candidate.get('scheduled_date'))
+        if isinstance(row[11], list):
+            row[11] = ', '.join(str(skill) for skill in row[11])
+        yield row
 
 @cluster_bp.route('/export_data')
 @cluster_required
 def export_data():
-    from flask import Response, send_file
-    import csv
-    import io
-    import os
-    from datetime import datetime
-    
-    # Import openpyxl for Excel export functionality
-    try:
-        from openpyxl import Workbook  # type: ignore
-        from openpyxl.styles import Font, PatternFill  # type: ignore
-    except ImportError:
-        # Fallback if openpyxl is not available
-        return jsonify({'error': 'Excel export not available - openpyxl not installed'}), 400
+    from exports import csv_response, xlsx_response
+    import re
     
     # Get export format
     export_format = request.args.get('format', 'csv')
@@ -380,7 +367,6 @@ def export_data():
         except ValueError:
             pass
     if search_filter:
-        import re
         search_regex = re.compile(search_filter, re.IGNORECASE)
         query['$or'] = [
             {'first_name': search_regex},
@@ -389,155 +375,22 @@ def export_data():
             {'phone': search_regex}
         ]
     
-    # Get filtered candidates
     from models_mongo import candidates_collection
-    candidates = list(candidates_collection.find(query))
+    rows = export_rows(candidates_collection, query)
     
     # Generate filename with timestamp
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     
     if export_format == 'excel':
-        # Create Excel file
-        
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Cluster Export"
-        
-        # Define headers
-        headers = [
-            'Reference ID', 'First Name', 'Last Name', 'Email', 'Phone', 
-            'Status', 'Assigned HR', 'Manager Email', 'Created Date', 
-            'Scheduled Date', 'Experience', 'Skills'
-        ]
-        
-        # Style for headers
-        header_font = Font(bold=True)
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        
-        # Write headers
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = header_fill
-        
-        # Write data rows
-        for row, candidate in enumerate(candidates, 2):
-            created_date = candidate.get('created_at')
-            if created_date:
-                if isinstance(created_date, datetime):
-                    created_date = created_date.strftime('%Y-%m-%d %H:%M:%S')
-                else:
-                    created_date = str(created_date)
-            else:
-                created_date = ''
-                
-            scheduled_date = candidate.get('scheduled_date')
-            if scheduled_date:
-                if isinstance(scheduled_date, datetime):
-                    scheduled_date = scheduled_date.strftime('%Y-%m-%d %H:%M:%S')
-                else:
-                    scheduled_date = str(scheduled_date)
-            else:
-                scheduled_date = ''
-            
-            row_data = [
-                candidate.get('reference_id', ''),
-                candidate.get('first_name', ''),
-                candidate.get('last_name', ''),
-                candidate.get('email', ''),
-                candidate.get('phone', ''),
-                candidate.get('status', ''),
-                candidate.get('assigned_by', ''),
-                candidate.get('manager_email', ''),
-                created_date,
-                scheduled_date,
-                candidate.get('experience', ''),
-                candidate.get('skills', '')
-            ]
-            
-            for col, value in enumerate(row_data, 1):
-                ws.cell(row=row, column=col, value=value)
-        
-        # Auto-adjust column widths
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
-        
-        # Save to temporary file
-        filename = f'cluster_export_{timestamp}.xlsx'
-        filepath = f'/tmp/{filename}'
-        wb.save(filepath)
-        
-        return send_file(
-            filepath,
-            as_attachment=True,
-            download_name=filename,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
+        try:
+            import openpyxl  # type: ignore  # noqa: F401
+        except ImportError:
+            return jsonify({'error': 'Excel export not available - openpyxl not installed'}), 400
+        return xlsx_response(f'cluster_export_{timestamp}.xlsx', EXPORT_HEADERS, rows,
+                             title="Cluster Export", column_widths=EXPORT_COLUMN_WIDTHS)
     
-    else:
-        # Create CSV
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write headers
-        writer.writerow([
-            'Reference ID', 'First Name', 'Last Name', 'Email', 'Phone', 
-            'Status', 'Assigned HR', 'Manager Email', 'Created Date', 
-            'Scheduled Date', 'Experience', 'Skills'
-        ])
-        
-        # Write data rows
-        for candidate in candidates:
-            created_date = candidate.get('created_at')
-            if created_date:
-                if isinstance(created_date, datetime):
-                    created_date = created_date.strftime('%Y-%m-%d %H:%M:%S')
-                else:
-                    created_date = str(created_date)
-            else:
-                created_date = ''
-                
-            scheduled_date = candidate.get('scheduled_date')
-            if scheduled_date:
-                if isinstance(scheduled_date, datetime):
-                    scheduled_date = scheduled_date.strftime('%Y-%m-%d %H:%M:%S')
-                else:
-                    scheduled_date = str(scheduled_date)
-            else:
-                scheduled_date = ''
-            
-            writer.writerow([
-                candidate.get('reference_id', ''),
-                candidate.get('first_name', ''),
-                candidate.get('last_name', ''),
-                candidate.get('email', ''),
-                candidate.get('phone', ''),
-                candidate.get('status', ''),
-                candidate.get('assigned_by', ''),
-                candidate.get('manager_email', ''),
-                created_date,
-                scheduled_date,
-                candidate.get('experience', ''),
-                candidate.get('skills', '')
-            ])
-        
-        # Return downloadable CSV
-        filename = f'cluster_export_{timestamp}.csv'
-        output.seek(0)
-        return Response(
-            output.getvalue(),
-            mimetype="text/csv",
-            headers={"Content-Disposition": f"attachment;filename={filename}"}
-        )
+    # Rows are written to the response as they come off the cursor
+    return csv_response(f'cluster_export_{timestamp}.csv', EXPORT_HEADERS, rows)
 
 @cluster_bp.route('/bulk_move_candidates', methods=['POST'])
 @cluster_required
@@ -569,6 +422,9 @@ def bulk_move_candidates():
         )
         
         if result.modified_count > 0:
+            from pipeline_stats import record_bulk_update
+            record_bulk_update(candidates, {'status': new_status})
+            
             # Log the bulk move activity
             activity = ActivityLog(
                 user_email=current_user.email,
@@ -615,6 +471,130 @@ def get_clusters():
         'total': len(cluster_names)
     })
 
+def _candidate_stats(candidates_collection, query):
+    """Dashboard counters for `query`, computed with one $group"""
+    rows = list(candidates_collection.aggregate([
+        {'$match': query},
+        {'$group': {
+            '_id': None,
+            'total_candidates': {'$sum': 1},
+            'selected_candidates': {'$sum': {'$cond': [{'$eq': ['$status', 'Selected']}, 1, 0]}},
+            'not_selected_candidates': {'$sum': {'$cond': [{'$eq': ['$status', 'Not Selected']}, 1, 0]}},
+            'pending_candidates': {'$sum': {'$cond': [{'$in': ['$status', ['Assigned', 'Pending']]}, 1, 0]}},
+            'onboarded_candidates': {'$sum': {'$cond': [{'$eq': ['$onboarding_status', 'Onboarded']}, 1, 0]}},
+            'not_onboarded_candidates': {'$sum': {'$cond': [
+                {'$and': [{'$eq': ['$status', 'Selected']}, {'$ne': ['$onboarding_status', 'Onboarded']}]}, 1, 0
+            ]}}
+        }}
+    ]))
+    stats = rows[0] if rows else {}
+    stats.pop('_id', None)
+    for key in ('total_candidates', 'selected_candidates', 'not_selected_candidates',
+                'pending_candidates', 'onboarded_candidates', 'not_onboarded_candidates'):
+        stats.setdefault(key, 0)
+    return stats
+
+def _counter_stats(query):
+    """Dashboard counters from pipeline_stats when they cover `query`, else None"""
+    from pipeline_stats import scope_for_query, get_stats
+    
+    scope = scope_for_query(query)
+    counters = get_stats(scope) if scope else None
+    if not counters:
+        return None
+    status = counters.get('status') or {}
+    return {
+        'total_candidates': counters.get('total', 0),
+        'selected_candidates': status.get('Selected', 0),
+        'not_selected_candidates': status.get('Not Selected', 0),
+        'pending_candidates': status.get('Assigned', 0) + status.get('Pending', 0),
+        'onboarded_candidates': counters.get('onboarded', 0),
+        'not_onboarded_candidates': status.get('Selected', 0) - counters.get('selected_onboarded', 0)
+    }
+
+def fetch_cluster_candidates(candidates_collection, users_collection, query, page=1, per_page=50, stats=None):
+    """Return (stats, candidates) for one page of the cluster candidate table.
+    
+    The page is cut in the database and recruiter/manager names and clusters are
+    resolved with a single users query, so the number of round-trips does not
+    depend on how many candidates match. Pass `stats` when they are already
+    known (e.g. from the materialized counters) to skip the $group.
+    """
+    from user_directory import UserDirectory
+    
+    if stats is None:
+        stats = _candidate_stats(candidates_collection, query)
+    page_candidates = list(
+        candidates_collection.find(query)
+        .sort('created_at', -1)
+        .skip((page - 1) * per_page)
+        .limit(per_page)
+    )
+    
+    directory = UserDirectory(users_collection)
+    directory.load(
+        [c.get('assigned_by') for c in page_candidates] +
+        [c.get('manager_email') for c in page_candidates]
+    )
+    
+    # Convert ObjectId to string and fix data for frontend
+    for candidate in page_candidates:
+        if '_id' in candidate:
+            candidate['_id'] = str(candidate['_id'])
+        if 'created_at' in candidate and candidate['created_at']:
+            # Handle both datetime objects and strings
+            if hasattr(candidate['created_at'], 'isoformat'):
+                candidate['created_at'] = candidate['created_at'].isoformat()
+            # If it's already a string, keep it as is
+        
+        # Fix name display
+        first_name = candidate.get('first_name', '')
+        last_name = candidate.get('last_name', '')
+        candidate['name'] = f"{first_name} {last_name}".strip() or 'Unknown'
+        
+        # Map date of birth field for frontend compatibility
+        if candidate.get('dob'):
+            candidate['date_of_birth'] = candidate['dob']
+        else:
+            candidate['date_of_birth'] = None
+        
+        # Get Recruiter name from email (since candidates are uploaded by recruiters),
+        # falling back to HR users
+        recruiter_email = candidate.get('assigned_by')
+        if recruiter_email:
+            uploader = directory.get(recruiter_email)
+            uploader_role = uploader.get('role') if uploader else None
+            if uploader_role == 'recruiter':
+                candidate['recruiter_name'] = uploader.get('name', 'Unknown Recruiter')
+            elif uploader_role == 'hr_role':
+                candidate['recruiter_name'] = uploader.get('name', 'Unknown HR User')
+            else:
+                candidate['recruiter_name'] = 'Unknown User'
+        else:
+            candidate['recruiter_name'] = None  # Don't show recruiter field if no one assigned
+        
+        # Get Manager name from email
+        manager_email = candidate.get('manager_email')
+        if manager_email:
+            candidate['manager_name'] = directory.name(manager_email, roles=('manager',), default='Unknown Manager')
+        else:
+            candidate['manager_name'] = None  # Don't show Manager field if no manager assigned
+        
+        # Get cluster info
+        if recruiter_email:
+            candidate['cluster_name'] = directory.cluster(recruiter_email) or None
+        elif manager_email:
+            candidate['cluster_name'] = directory.cluster(manager_email) or None
+        else:
+            candidate['cluster_name'] = None
+        
+        # Add onboarding status information
+        candidate['onboarding_status'] = candidate.get('onboarding_status', 'Not Started')
+        candidate['onboarding_date'] = candidate.get('onboarding_date', None)
+        candidate['onboarding_notes'] = candidate.get('onboarding_notes', '')
+    
+    return stats, page_candidates
+
 @cluster_bp.route('/get_candidates')
 @cluster_required
 def get_candidates():
@@ -649,91 +629,21 @@ def get_candidates():
                     {'manager_email': {'$in': cluster_emails}}
                 ]
         
-        # Get candidates
-        all_candidates = list(candidates_collection.find(query))
-        
-        # Calculate statistics
-        total_candidates = len(all_candidates)
-        selected_candidates = len([c for c in all_candidates if c.get('status') == 'Selected'])
-        not_selected_candidates = len([c for c in all_candidates if c.get('status') == 'Not Selected'])
-        pending_candidates = len([c for c in all_candidates if c.get('status') in ['Assigned', 'Pending']])
-        
-        # Calculate onboarding statistics
-        onboarded_candidates = len([c for c in all_candidates if c.get('onboarding_status') == 'Onboarded'])
-        not_onboarded_candidates = len([c for c in all_candidates if c.get('status') == 'Selected' and c.get('onboarding_status') != 'Onboarded'])
+        page = max(request.args.get('page', 1, type=int) or 1, 1)
+        per_page = min(max(request.args.get('per_page', 50, type=int) or 50, 1), 200)
         
-        # Convert ObjectId to string and fix data for frontend
-        for candidate in all_candidates:
-            if '_id' in candidate:
-                candidate['_id'] = str(candidate['_id'])
-            if 'created_at' in candidate and candidate['created_at']:
-                # Handle both datetime objects and strings
-                if hasattr(candidate['created_at'], 'isoformat'):
-                    candidate['created_at'] = candidate['created_at'].isoformat()
-                # If it's already a string, keep it as is
-            
-            # Fix name display
-            first_name = candidate.get('first_name', '')
-            last_name = candidate.get('last_name', '')
-            candidate['name'] = f"{first_name} {last_name}".strip() or 'Unknown'
-            
-            # Map date of birth field for frontend compatibility
-            if candidate.get('dob'):
-                candidate['date_of_birth'] = candidate['dob']
-            else:
-                candidate['date_of_birth'] = None
-            
-            # Get Recruiter name from email (since candidates are uploaded by recruiters)
-            recruiter_email = candidate.get('assigned_by')
-            if recruiter_email:
-                recruiter_user = users_collection.find_one({'email': recruiter_email, 'role': 'recruiter'})
-                if recruiter_user:
-                    candidate['recruiter_name'] = recruiter_user.get('name', 'Unknown Recruiter')
-                else:
-                    # Fallback: check if it's an HR user
-                    hr_user = users_collection.find_one({'email': recruiter_email, 'role': 'hr_role'})
-                    if hr_user:
-                        candidate['recruiter_name'] = hr_user.get('name', 'Unknown HR User')
-                    else:
-                        candidate['recruiter_name'] = 'Unknown User'
-            else:
-                candidate['recruiter_name'] = None  # Don't show recruiter field if no one assigned
-            
-            # Get Manager name from email
-            manager_email = candidate.get('manager_email')
-            if manager_email:
-                manager_user = users_collection.find_one({'email': manager_email, 'role': 'manager'})
-                candidate['manager_name'] = manager_user.get('name', 'Unknown Manager') if manager_user else 'Unknown Manager'
-            else:
-                candidate['manager_name'] = None  # Don't show Manager field if no manager assigned
-            
-            # Get cluster info
-            cluster_name = None
-            if recruiter_email:
-                recruiter_user = users_collection.find_one({'email': recruiter_email})
-                if recruiter_user and recruiter_user.get('cluster'):
-                    cluster_name = recruiter_user['cluster']
-            elif manager_email:
-                manager_user = users_collection.find_one({'email': manager_email})
-                if manager_user and manager_user.get('cluster'):
-                    cluster_name = manager_user['cluster']
-            candidate['cluster_name'] = cluster_name if cluster_name else None
-            
-            # Add onboarding status information
-            candidate['onboarding_status'] = candidate.get('onboarding_status', 'Not Started')
-            candidate['onboarding_date'] = candidate.get('onboarding_date', None)
-            candidate['onboarding_notes'] = candidate.get('onboarding_notes', '')
+        stats, page_candidates = fetch_cluster_candidates(
+            candidates_collection, users_collection, query, page, per_page,
+            stats=_counter_stats(query)
+        )
         
         return jsonify({
             'success': True,
-            'total_candidates': total_candidates,
-            'selected_candidates': selected_candidates,
-            'not_selected_candidates': not_selected_candidates,
-            'pending_candidates': pending_candidates,
-            'onboarded_candidates': onboarded_candidates,
-            'not_onboarded_candidates': not_onboarded_candidates,
-            'candidates': all_candidates[:50],  # Limit to first 50 for performance
-            'total_returned': min(50, total_candidates)
+            **stats,
+            'candidates': page_candidates,
+            'total_returned': len(page_candidates),
+            'page': page,
+            'per_page': per_page
         })
         
     except Exception as e:
@@ -758,6 +668,7 @@ def get_filter_data_underscore():
 
 @cluster_bp.route('/get-filter-data')
 @cluster_required
+@cached_response('users')
 def get_filter_data():
     """Get all filter data (HR, Managers, Clusters) for dynamic updates"""
     from models_mongo import users_collection
@@ -815,6 +726,7 @@ def get_filter_data():
 
 @cluster_bp.route('/get-chart-data')
 @cluster_required
+@cached_response('candidates', 'users')
 def get_chart_data():
     """Get live chart data for 3D visualization"""
     from models_mongo import candidates_collection, users_collection
@@ -973,6 +885,7 @@ def get_chart_data():
 
 @cluster_bp.route('/analytics/<tab_name>')
 @cluster_required
+@cached_response('candidates', 'users')
 def get_analytics_data(tab_name):
     """Get analytics data for Cluster dashboard"""
     try:
@@ -1152,50 +1065,9 @@ def get_hr_performance():
     """Get HR personnel performance data"""
     try:
         from models_mongo import candidates_collection, users_collection
-        from collections import defaultdict
-        from datetime import datetime, timedelta
-        
-        # Get all HR users
-        hr_users = list(users_collection.find({'role': 'hr_role', 'is_active': True}))
-        hr_performance = []
+        from leaderboards import cached, hr_leaderboard
         
-        for hr in hr_users:
-            hr_email = hr.get('email')
-            
-            # Get candidates assigned by this HR
-            assigned_candidates = list(candidates_collection.find({'assigned_by': hr_email}))
-            
-            # Calculate metrics
-            total_assigned = len(assigned_candidates)
-            pending = len([c for c in assigned_candidates if c.get('status') == 'Pending'])
-            selected = len([c for c in assigned_candidates if c.get('status') == 'Selected'])
-            not_selected = len([c for c in assigned_candidates if c.get('status') == 'Not Selected'])
-            
-            # Calculate last activity (most recent candidate assignment)
-            last_activity = 'N/A'
-            if assigned_candidates:
-                latest = max(assigned_candidates, key=lambda x: x.get('created_at', datetime.min))
-                if latest.get('created_at'):
-                    try:
-                        if isinstance(latest['created_at'], str):
-                            last_date = datetime.fromisoformat(latest['created_at'].replace('Z', '+00:00'))
-                        else:
-                            last_date = latest['created_at']
-                        last_activity = last_date.strftime('%m/%d/%Y')
-                    except:
-                        last_activity = 'Recent'
-            
-            hr_performance.append({
-                'name': hr.get('first_name', '') + ' ' + hr.get('last_name', ''),
-                'email': hr_email,
-                'cluster': hr.get('cluster', 'General'),
-                'total_assigned': total_assigned,
-                'pending': pending,
-                'selected': selected,
-                'not_selected': not_selected,
-                'last_activity': last_activity,
-                'avg_response_time': '2.5 hours'  # Mock data for now
-            })
+        hr_performance = cached('hr', lambda: hr_leaderboard(candidates_collection, users_collection))
         
         return jsonify({
             'success': True,
@@ -1215,56 +1087,9 @@ def get_recruiter_performance():
     """Get Recruiter personnel performance data"""
     try:
         from models_mongo import candidates_collection, users_collection
-        from collections import defaultdict
-        from datetime import datetime, timedelta
+        from leaderboards import cached, recruiter_leaderboard
         
-        # Get all Recruiter users
-        recruiter_users = list(users_collection.find({'role': 'recruiter'}))
-        recruiter_performance = []
-        
-        for recruiter in recruiter_users:
-            recruiter_email = recruiter.get('email')
-            
-            # Get candidates created/uploaded by this recruiter
-            uploaded_candidates = list(candidates_collection.find({'assigned_by': recruiter_email}))
-            
-            # Calculate metrics
-            total_uploaded = len(uploaded_candidates)
-            pending = len([c for c in uploaded_candidates if c.get('status') == 'Pending'])
-            assigned = len([c for c in uploaded_candidates if c.get('status') == 'Assigned'])
-            selected = len([c for c in uploaded_candidates if c.get('status') == 'Selected'])
-            
-            # More robust detection of "not selected" candidates
-            not_selected = len([c for c in uploaded_candidates if 
-                c.get('status') in ['Not Selected', 'Rejected', 'Declined', 'Failed', 'Not Approved']
-            ])
-            
-            # Calculate last activity (most recent candidate upload)
-            last_activity = 'N/A'
-            if uploaded_candidates:
-                latest = max(uploaded_candidates, key=lambda x: x.get('created_at', datetime.min))
-                if latest.get('created_at'):
-                    try:
-                        if isinstance(latest['created_at'], str):
-                            last_date = datetime.fromisoformat(latest['created_at'].replace('Z', '+00:00'))
-                        else:
-                            last_date = latest['created_at']
-                        last_activity = last_date.strftime('%m/%d/%Y')
-                    except:
-                        last_activity = 'Recent'
-            
-            recruiter_performance.append({
-                'name': recruiter.get('name', 'Unknown'),
-                'email': recruiter_email,
-                'cluster': recruiter.get('cluster', 'General'),
-                'total_uploaded': total_uploaded,
-                'pending': pending,
-                'assigned': assigned,
-                'selected': selected,
-                'not_selected': not_selected,
-                'last_activity': last_activity,
-                'avg_response_time': '1.2 hours'  # Mock data for now
-            })
+        recruiter_performance = cached('recruiter', lambda: recruiter_leaderboard(candidates_collection, users_collection))
         
         return jsonify({
             'success': True,
@@ -1284,57 +1109,9 @@ def get_manager_performance():
     """Get Manager personnel performance data"""
     try:
         from models_mongo import candidates_collection, users_collection
-        from collections import defaultdict
-        from datetime import datetime, timedelta
+        from leaderboards import cached, manager_leaderboard
         
-        # Get all Manager users
-        manager_users = list(users_collection.find({'role': 'manager'}))
-        manager_performance = []
-        
-        for manager in manager_users:
-            manager_email = manager.get('email')
-            
-            # Get candidates assigned to this manager
-            assigned_candidates = list(candidates_collection.find({'manager_email': manager_email}))
-            
-            # Calculate metrics
-            total_reviewed = len([c for c in assigned_candidates if c.get('status') in ['Selected', 'Not Selected', 'Rejected', 'Declined', 'Failed', 'Not Approved']])
-            # Count reassigned candidates (those with reassigned_by_manager field)
-            pending_review = len([c for c in assigned_candidates if c.get('reassigned_by_manager') is not None])
-            selected = len([c for c in assigned_candidates if c.get('status') == 'Selected'])
-            
-            # More robust detection of "not selected" candidates
-            not_selected = len([c for c in assigned_candidates if 
-                c.get('status') in ['Not Selected', 'Rejected', 'Declined', 'Failed', 'Not Approved']
-            ])
-            
-            # Calculate last review activity
-            last_review = 'N/A'
-            reviewed_candidates = [c for c in assigned_candidates if c.get('status') in ['Selected', 'Not Selected', 'Rejected', 'Declined', 'Failed', 'Not Approved']]
-            if reviewed_candidates:
-                # For now, use created_at as proxy for review date
-                latest = max(reviewed_candidates, key=lambda x: x.get('created_at', datetime.min))
-                if latest.get('created_at'):
-                    try:
-                        if isinstance(latest['created_at'], str):
-                            last_date = datetime.fromisoformat(latest['created_at'].replace('Z', '+00:00'))
-                        else:
-                            last_date = latest['created_at']
-                        last_review = last_date.strftime('%m/%d/%Y')
-                    except:
-                        last_review = 'Recent'
-            
-            manager_performance.append({
-                'name': manager.get('first_name', '') + ' ' + manager.get('last_name', ''),
-                'email': manager_email,
-                'cluster': manager.get('cluster', 'General'),
-                'total_reviewed': total_reviewed,
-                'pending_review': pending_review,
-                'selected': selected,
-                'not_selected': not_selected,
-                'last_review': last_review,
-                'avg_review_time': '1.8 hours'  # Mock data for now
-            })
+        manager_performance = cached('manager', lambda: manager_leaderboard(candidates_collection, users_collection))
         
         return jsonify({
             'success': True,
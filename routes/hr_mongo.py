@@ -2,6 +2,9 @@ from flask import Blueprint, render_template, request, redirect, url_for, flash,
 from flask_login import login_required, current_user
 from models_mongo import User, Candidate, Role, ActivityLog
 from email_service import send_candidate_assignment_email
+from resume_jobs import register_parser
+from resume_parser import parse_resume_text
+from response_cache import cached_response
 from werkzeug.utils import secure_filename
 from bson import ObjectId
 import os
@@ -30,30 +33,14 @@ def hr_required(f):
 @hr_bp.route('/dashboard')
 @hr_required
 def dashboard():
-    # Get all candidates (for Candidate List tab) using the Candidate model
-    from models_mongo import candidates_collection
-    
-    # Query for ALL candidates (HR users need full visibility)
-    # This ensures HR users see the complete hiring pipeline
-    candidates_data = list(candidates_collection.find().sort('created_at', -1))
-    
-    # Convert to Candidate objects for proper data handling
-    all_candidates = []
-    for data in candidates_data:
-        try:
-            candidate = Candidate.from_dict(data)
-            all_candidates.append(candidate)
-        except Exception as e:
-            print(f"Error converting candidate data: {e}")
-            continue
-    
-    # Debug logging to check candidate counts by status
-    status_counts = {}
-    for candidate in all_candidates:
-        status = candidate.status or 'Unknown'
-        status_counts[status] = status_counts.get(status, 0) + 1
+    # Get one page of candidates (for Candidate List tab) as lightweight list rows
+    from models_mongo import candidates_collection, CandidateSummary, CANDIDATE_SUMMARY_PROJECTION
+    from pagination import paginate_request
     
-    print(f"HR Dashboard {current_user.email} candidates by status: {status_counts}")
+    # HR users see ALL candidates (the complete hiring pipeline), newest first,
+    # one keyset page at a time
+    page = paginate_request(candidates_collection, request.args, projection=CANDIDATE_SUMMARY_PROJECTION)
+    all_candidates = [CandidateSummary.from_dict(data) for data in page.items]
     
     # Get user counts by role for statistics
     hr_count = User.count_by_role('hr')
@@ -66,10 +53,12 @@ def dashboard():
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
         # Return only the candidate list HTML for AJAX requests
         return render_template('hr/candidate_list_partial.html', 
-                             all_candidates=all_candidates)
+                             all_candidates=all_candidates,
+                             page=page)
     
     return render_template('hr/dashboard.html', 
                          all_candidates=all_candidates,
+                         page=page,
                          hr_count=hr_count,
                          manager_count=manager_count,
                          cluster_count=cluster_count)
@@ -294,10 +283,83 @@ def add_candidate():
             flash(error_message, 'error')
             return redirect(url_for('hr.dashboard'))
 
+def _resume_format_error(filename):
+    """User-facing message when `filename` cannot be parsed, else None"""
+    file_ext = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    if file_ext == 'doc':
+        # For .doc files, suggest conversion to DOCX
+        return 'DOC files are not directly supported. Please convert your resume to DOCX or PDF format for better compatibility.'
+    if file_ext not in ('pdf', 'docx'):
+        return 'Unsupported file format. Please upload PDF, DOC, or DOCX.'
+    return None
+
+def build_resume_payload(resume_text, timer=None):
+    """Turn extracted resume text into the /parse_resume JSON payload"""
+    from resume_jobs import StageTimer
+    timer = timer or StageTimer()
+    
+    # Try AI parsing first, then fall back to regex
+    with timer.stage('ai'):
+        ai_data = parse_resume_with_ai(resume_text)
+    
+    if ai_data:
+        print("DEBUG: Using AI-parsed data")
+        # Map AI response to our expected format
+        extracted_data = {
+            'name': ai_data.get('full_name', ''),
+            'email': ai_data.get('email', ''),
+            'phone': ai_data.get('phone', ''),
+            'dob': ai_data.get('date_of_birth', ''),
+            'gender': ai_data.get('gender', ''),
+            'skills': ai_data.get('skills', []),
+            'education': format_ai_education(ai_data.get('education', [])),
+            'experience': format_ai_experience(ai_data.get('experience', []))
+        }
+        extracted_data['parsing_method'] = 'AI-Powered (GPT-3.5)'
+        print(f"DEBUG: AI extracted data: {extracted_data}")
+        return {
+            'success': True,
+            'message': 'Resume parsed successfully using AI',
+            'data': extracted_data,
+            'parsing_method': 'AI-Powered (GPT-3.5)'
+        }
+    
+    print("DEBUG: AI parsing failed, falling back to regex parsing")
+    with timer.stage('regex'):
+        extracted_data = parse_resume_text(resume_text)
+    
+    # Add debugging information
+    print(f"DEBUG: Resume text length: {len(resume_text)}")
+    print(f"DEBUG: Final extracted data: {extracted_data}")
+    
+    # Log any fields that couldn't be extracted
+    missing_fields = []
+    for field, value in extracted_data.items():
+        if not value or (isinstance(value, list) and len(value) == 0):
+            missing_fields.append(field)
+    
+    if missing_fields:
+        print(f"DEBUG: Missing fields: {missing_fields}")
+    
+    extracted_data['parsing_method'] = 'Regex Pattern Matching'
+    return {
+        'success': True, 
+        'message': 'Resume parsed successfully',
+        'data': extracted_data,
+        'debug': {
+            'text_length': len(resume_text),
+            'missing_fields': missing_fields,
+            'sample_text': resume_text[:500] + "..." if len(resume_text) > 500 else resume_text
+        }
+    }
+
+register_parser('hr', build_resume_payload)
+
 @hr_bp.route('/parse_resume', methods=['POST'])
 @hr_required
 def parse_resume():
     """Parse resume and extract candidate information with enhanced logic"""
+    from resume_jobs import parse_upload, ResumeExtractionError
     try:
         if 'resume' not in request.files:
             return jsonify({'success': False, 'message': 'No resume file uploaded'})
@@ -306,588 +368,59 @@ def parse_resume():
         if resume_file.filename == '':
             return jsonify({'success': False, 'message': 'No resume file selected'})
         
-        # Get file extension
-        file_ext = resume_file.filename.rsplit('.', 1)[1].lower()
-        
-        # Extract text from the resume
-        resume_text = ""
-        
-        if file_ext == 'pdf':
-            try:
-                import fitz  # PyMuPDF
-                # Save temporary file
-                temp_path = f"/tmp/{uuid.uuid4()}.pdf"
-                resume_file.save(temp_path)
-                
-                # Extract text from PDF
-                doc = fitz.open(temp_path)
-                for page in doc:
-                    resume_text += page.get_text()
-                doc.close()
-                
-                # Clean up temp file
-                os.remove(temp_path)
-                
-            except ImportError:
-                return jsonify({'success': False, 'message': 'PDF parsing not available. Please install PyMuPDF.'})
-            except Exception as e:
-                return jsonify({'success': False, 'message': f'Error parsing PDF: {str(e)}'})
-                
-        elif file_ext == 'docx':
-            try:
-                from docx import Document
-                # Save temporary file
-                temp_path = f"/tmp/{uuid.uuid4()}.docx"
-                resume_file.save(temp_path)
-                
-                # Extract text from DOCX
-                doc = Document(temp_path)
-                for paragraph in doc.paragraphs:
-                    resume_text += paragraph.text + "\n"
-                
-                # Clean up temp file
-                os.remove(temp_path)
-                
-            except ImportError:
-                return jsonify({'success': False, 'message': 'Word document parsing not available. Please install python-docx.'})
-            except Exception as e:
-                return jsonify({'success': False, 'message': f'Error parsing Word document: {str(e)}'})
-                
-        elif file_ext == 'doc':
-            # For .doc files, suggest conversion to DOCX
-            return jsonify({
-                'success': False, 
-                'message': 'DOC files are not directly supported. Please convert your resume to DOCX or PDF format for better compatibility.'
-            })
-        else:
-            return jsonify({'success': False, 'message': 'Unsupported file format. Please upload PDF, DOC, or DOCX.'})
-        
-        # Try AI parsing first, then fall back to regex
-        ai_data = parse_resume_with_ai(resume_text)
+        format_error = _resume_format_error(resume_file.filename)
+        if format_error:
+            return jsonify({'success': False, 'message': format_error})
         
-        if ai_data:
-            print("DEBUG: Using AI-parsed data")
-            # Map AI response to our expected format
-            extracted_data = {
-                'name': ai_data.get('full_name', ''),
-                'email': ai_data.get('email', ''),
-                'phone': ai_data.get('phone', ''),
-                'dob': ai_data.get('date_of_birth', ''),
-                'gender': ai_data.get('gender', ''),
-                'skills': ai_data.get('skills', []),
-                'education': format_ai_education(ai_data.get('education', [])),
-                'experience': format_ai_experience(ai_data.get('experience', []))
-            }
-            extracted_data['parsing_method'] = 'AI-Powered (GPT-3.5)'
-            print(f"DEBUG: AI extracted data: {extracted_data}")
-            return jsonify({
-                'success': True,
-                'message': 'Resume parsed successfully using AI',
-                'data': extracted_data,
-                'parsing_method': 'AI-Powered (GPT-3.5)'
-            })
-        
-        print("DEBUG: AI parsing failed, falling back to regex parsing")
-        extracted_data = parse_resume_text_enhanced(resume_text)
-        
-        # Add debugging information
-        print(f"DEBUG: Resume text length: {len(resume_text)}")
-        print(f"DEBUG: Final extracted data: {extracted_data}")
+        # Extract and parse the resume (answered from the cache for files seen before)
+        file_ext = resume_file.filename.rsplit('.', 1)[1].lower()
+        try:
+            return jsonify(parse_upload('hr', resume_file.read(), file_ext))
+        except ResumeExtractionError as e:
+            return jsonify({'success': False, 'message': str(e)})
         
-        # Log any fields that couldn't be extracted
-        missing_fields = []
-        for field, value in extracted_data.items():
-            if not value or (isinstance(value, list) and len(value) == 0):
-                missing_fields.append(field)
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Error parsing resume: {str(e)}'})
+
+@hr_bp.route('/parse_resume/jobs', methods=['POST'])
+@hr_required
+def submit_resume_job():
+    """Queue a resume for background parsing and return the job id immediately"""
+    from resume_jobs import get_queue
+    try:
+        resume_file = request.files.get('resume')
+        if not resume_file or resume_file.filename == '':
+            return jsonify({'success': False, 'message': 'No resume file uploaded'}), 400
         
-        if missing_fields:
-            print(f"DEBUG: Missing fields: {missing_fields}")
+        format_error = _resume_format_error(resume_file.filename)
+        if format_error:
+            return jsonify({'success': False, 'message': format_error}), 400
         
-        extracted_data['parsing_method'] = 'Regex Pattern Matching'
+        file_ext = resume_file.filename.rsplit('.', 1)[1].lower()
+        job_id = get_queue().submit('hr', current_user.email, secure_filename(resume_file.filename),
+                                    file_ext, resume_file.read())
         return jsonify({
-            'success': True, 
-            'message': 'Resume parsed successfully',
-            'data': extracted_data,
-            'debug': {
-                'text_length': len(resume_text),
-                'missing_fields': missing_fields,
-                'sample_text': resume_text[:500] + "..." if len(resume_text) > 500 else resume_text
-            }
-        })
+            'success': True,
+            'job_id': str(job_id),
+            'status': 'queued',
+            'poll_url': url_for('hr.resume_job_status', job_id=str(job_id))
+        }), 202
         
     except Exception as e:
-        return jsonify({'success': False, 'message': f'Error parsing resume: {str(e)}'})
+        print(f"Error queueing resume: {e}")
+        return jsonify({'success': False, 'message': f'Error queueing resume: {str(e)}'}), 500
 
-def parse_resume_text_enhanced(text):
-    """Enhanced resume text parsing with improved regex patterns"""
-    import re
-    
-    # Clean and normalize text first
-    def clean_text(text):
-        """Clean and normalize text for better parsing"""
-        # Remove extra whitespace and normalize line breaks
-        text = text.replace('\n', ' ').replace('\r', ' ')
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Remove common noise words and phrases
-        noise_words = [
-            'the', 'and', 'for', 'with', 'from', 'that', 'this', 'have', 'been', 'will', 'can', 'are', 'was', 'were',
-            'skills', 'abilities', 'applications', 'proficiency', 'education', 'experience', 'background', 'section',
-            'resume', 'cv', 'curriculum vitae', 'personal', 'information', 'details', 'summary', 'objective'
-        ]
-        
-        # Remove noise words (but keep them if they're part of actual content)
-        for noise in noise_words:
-            # Only remove standalone noise words, not those that are part of meaningful phrases
-            text = re.sub(rf'\b{noise}\b', '', text, flags=re.IGNORECASE)
-        
-        return text.strip()
-    
-    # Clean the input text
-    cleaned_text = clean_text(text)
-    print(f"DEBUG: Original text length: {len(text)}")
-    print(f"DEBUG: Cleaned text length: {len(cleaned_text)}")
-    
-    extracted_data = {
-        'name': '',
-        'email': '',
-        'phone': '',
-        'dob': '',
-        'gender': '',
-        'skills': [],
-        'education': '',
-        'experience': ''
-    }
-    
-    # 1. Extract Name - Look for capitalized words near "Name" or from top of document
-    name_patterns = [
-        r'(?:Name|Full Name|Candidate|Applicant)[\s:]*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',
-        r'^([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',  # First line with capitalized words
-        r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)(?=\s+(?:Email|Phone|Address|Objective))'
-    ]
-    
-    for pattern in name_patterns:
-        match = re.search(pattern, cleaned_text, re.IGNORECASE | re.MULTILINE)
-        if match and len(match.group(1).split()) >= 2:  # At least 2 words
-            extracted_data['name'] = match.group(1).strip()
-            break
-    
-    # 2. Extract Email - Enhanced email pattern with better handling
-    email_patterns = [
-        r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',  # Standard email
-        r'[A-Za-z0-9._%+-]+\s*@\s*[A-Za-z0-9.-]+\s*\.\s*[A-Z|a-z]{2,}',  # Email with spaces
-        r'(?:Email|E-mail|Mail|Contact)[\s:]*([A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,})',  # Labeled email
-        r'(?:Email|E-mail|Mail|Contact)[\s:]*([A-Za-z0-9._%+-]+\s*@\s*[A-Za-z0-9.-]+\s*\.\s*[A-Z|a-z]{2,})'  # Labeled email with spaces
-    ]
-    
-    for pattern in email_patterns:
-        match = re.search(pattern, cleaned_text, re.IGNORECASE)
-        if match:
-            email = match.group(1) if len(match.groups()) > 0 else match.group(0)
-            # Clean up email by removing extra spaces and special characters
-            email = re.sub(r'[^\w@.-]', '', email)
-            if '@' in email and '.' in email.split('@')[1]:
-                extracted_data['email'] = email
-                break
-    
-    # If email still not found, try to find it in the entire text with more aggressive cleaning
-    if not extracted_data['email']:
-        # Look for email-like patterns and clean them up
-        potential_emails = re.findall(r'[A-Za-z0-9._%+-]+\s*@\s*[A-Za-z0-9.-]+\s*\.\s*[A-Z|a-z]{2,}', cleaned_text)
-        for potential_email in potential_emails:
-            cleaned_email = re.sub(r'[^\w@.-]', '', potential_email)
-            if '@' in cleaned_email and '.' in cleaned_email.split('@')[1]:
-                extracted_data['email'] = cleaned_email
-                break
-    
-    # 3. Extract Phone - Enhanced phone pattern
-    phone_patterns = [
-        r'(\+?\d[\d\s-]{8,}\d)',  # International format
-        r'(\+?1?[-.\s]?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4}))',  # US format
-        r'(\+?[0-9]{1,4}[-.\s]?[0-9]{1,4}[-.\s]?[0-9]{1,4}[-.\s]?[0-9]{1,4})',  # General format
-        r'(?:Phone|Mobile|Tel|Contact)[\s:]*(\+?[\d\s\-\(\)\.]+)'
-    ]
-    
-    for pattern in phone_patterns:
-        match = re.search(pattern, cleaned_text, re.IGNORECASE)
-        if match:
-            phone = re.sub(r'[^\d+]', '', match.group(1))  # Keep only digits and +
-            if len(phone) >= 10:  # Minimum 10 digits
-                extracted_data['phone'] = phone
-                break
-    
-    # 4. Extract Date of Birth - Look for DOB patterns
-    dob_patterns = [
-        r'(?:DOB|Date of Birth|Birth Date|Born)[\s:]*(\d{1,2}[/\-]\d{1,2}[/\-]\d{2,4})',
-        r'(?:DOB|Date of Birth|Birth Date|Born)[\s:]*(\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{2,4})',
-        r'(\d{1,2}[/\-]\d{1,2}[/\-]\d{2,4})',  # General date format
-        r'(\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{2,4})'  # Month name format
-    ]
-    
-    for pattern in dob_patterns:
-        match = re.search(pattern, cleaned_text, re.IGNORECASE)
-        if match:
-            extracted_data['dob'] = match.group(1)
-            break
-    
-    # 5. Extract Gender - Look for gender keywords
-    gender_patterns = [
-        r'\b(Male|Female|Other)\b',
-        r'(?:Gender|Sex)[\s:]*([MF]|Male|Female|Other)',
-        r'\b(M|F|MALE|FEMALE)\b'
-    ]
-    
-    for pattern in gender_patterns:
-        match = re.search(pattern, cleaned_text, re.IGNORECASE)
-        if match:
-            gender = match.group(1).upper()
-            if gender in ['M', 'MALE']:
-                extracted_data['gender'] = 'Male'
-            elif gender in ['F', 'FEMALE']:
-                extracted_data['gender'] = 'Female'
-            else:
-                extracted_data['gender'] = 'Other'
-            break
-    
-    # 6. Extract Skills - Completely rewritten for clean, formatted output
-    skills_keywords = [
-        # Programming Languages
-        'JavaScript', 'Python', 'Java', 'C++', 'C#', 'PHP', 'Ruby', 'Go', 'Rust', 'Swift', 'Kotlin', 'TypeScript',
-        'HTML', 'CSS', 'SQL', 'R', 'MATLAB', 'Scala', 'Perl', 'Shell', 'Bash', 'PowerShell',
-        
-        # Frameworks & Libraries
-        'React', 'Angular', 'Vue', 'Node.js', 'Express', 'Django', 'Flask', 'Spring', 'Laravel', 'ASP.NET',
-        'jQuery', 'Bootstrap', 'Tailwind CSS', 'Material-UI', 'Redux', 'Vuex', 'GraphQL', 'REST API',
-        
-        # Databases
-        'MySQL', 'PostgreSQL', 'MongoDB', 'Redis', 'SQLite', 'Oracle', 'SQL Server', 'Cassandra', 'DynamoDB',
-        
-        # Cloud & DevOps
-        'AWS', 'Azure', 'Google Cloud', 'Docker', 'Kubernetes', 'Jenkins', 'GitLab CI', 'GitHub Actions',
-        'Terraform', 'Ansible', 'Chef', 'Puppet', 'Vagrant',
-        
-        # Tools & Platforms
-        'Git', 'SVN', 'JIRA', 'Confluence', 'Slack', 'Teams', 'Zoom', 'Figma', 'Adobe Creative Suite',
-        'VS Code', 'IntelliJ', 'Eclipse', 'Xcode', 'Android Studio',
-        
-        # Methodologies
-        'Agile', 'Scrum', 'Kanban', 'Waterfall', 'DevOps', 'CI/CD', 'TDD', 'BDD', 'Pair Programming',
-        
-        # Soft Skills
-        'Leadership', 'Communication', 'Problem Solving', 'Critical Thinking', 'Teamwork', 'Time Management',
-        'Project Management', 'Customer Service', 'Analytical Skills', 'Creativity',
-        
-        # Office & Business Tools
-        'MS Office', 'Power BI', 'Excel', 'Word', 'PowerPoint', 'Outlook', 'Access', 'Project', 'Visio',
-        'Tableau', 'Salesforce', 'SAP', 'Oracle', 'QuickBooks', 'Adobe Photoshop', 'Illustrator',
-        
-        # Web & Design
-        'Web Design', 'Web Designing', 'HTML5', 'CSS3', 'Responsive Design', 'UI/UX', 'Photoshop', 'Illustrator',
-        'Figma', 'Sketch', 'Adobe XD', 'Wireframing', 'Prototyping'
-    ]
-    
-    found_skills = []
-    
-    # Look for skills section with very specific patterns
-    skills_section_patterns = [
-        # Look for "Skills & Abilities" section specifically
-        r'(?:Skills\s*&\s*Abilities|SKILLS\s*&\s*ABILITIES)[\s:]*([^•\n]+(?:\n[^•\n]+)*)',
-        r'(?:Skills\s*&\s*Abilities|SKILLS\s*&\s*ABILITIES)[\s:]*((?:[^•\n]+\n?)+)',
-        
-        # Look for "APPLICATIONS PROFICIENCY" section
-        r'(?:APPLICATIONS\s*PROFICIENCY|Applications\s*Proficiency)[\s:]*([^•\n]+(?:\n[^•\n]+)*)',
-        r'(?:APPLICATIONS\s*PROFICIENCY|Applications\s*Proficiency)[\s:]*((?:[^•\n]+\n?)+)',
-        
-        # Look for "Technical Skills" section
-        r'(?:Technical\s*Skills|TECHNICAL\s*SKILLS)[\s:]*([^•\n]+(?:\n[^•\n]+)*)',
-        r'(?:Technical\s*Skills|TECHNICAL\s*SKILLS)[\s:]*((?:[^•\n]+\n?)+)',
-        
-        # Look for "Skills" section (but be more careful)
-        r'(?:^|\n)(?:Skills|SKILLS)[\s:]*([^•\n]+(?:\n[^•\n]+)*)',
-        r'(?:^|\n)(?:Skills|SKILLS)[\s:]*((?:[^•\n]+\n?)+)'
-    ]
-    
-    skills_section_text = ""
-    for pattern in skills_section_patterns:
-        match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
-        if match:
-            skills_section_text = match.group(1)
-            print(f"DEBUG: Found skills section with pattern: {pattern}")
-            print(f"DEBUG: Skills section content: {skills_section_text[:300]}...")
-            break
-    
-    # Extract skills from the skills section if found
-    if skills_section_text:
-        # Clean the skills section text
-        skills_section_text = re.sub(r'\s+', ' ', skills_section_text.strip())
-        
-        # Look for known skills in the skills section
-        for skill in skills_keywords:
-            if re.search(rf'\b{re.escape(skill)}\b', skills_section_text, re.IGNORECASE):
-                found_skills.append(skill)
-        
-        # Also look for bullet points or list items
-        bullet_skills = re.findall(r'[•\-\*]\s*([A-Za-z][A-Za-z0-9\s\(\)]+)', skills_section_text)
-        for skill in bullet_skills:
-            skill = skill.strip()
-            if (skill and 
-                len(skill) > 2 and 
-                skill.lower() not in ['the', 'and', 'for', 'with', 'from', 'that', 'this', 'have', 'been', 'will', 'can', 'are', 'was', 'were'] and
-                skill.lower() not in [s.lower() for s in found_skills]):
-                found_skills.append(skill)
-        
-        # Look for comma-separated skills in the skills section
-        comma_skills = re.split(r'[,;]', skills_section_text)
-        for skill in comma_skills:
-            skill = skill.strip()
-            if (skill and 
-                len(skill) > 2 and 
-                skill.lower() not in ['the', 'and', 'for', 'with', 'from', 'that', 'this', 'have', 'been', 'will', 'can', 'are', 'was', 'were', 'skills', 'abilities', 'applications', 'proficiency'] and
-                skill.lower() not in [s.lower() for s in found_skills]):
-                found_skills.append(skill)
-    
-    # If no skills section found, look for skills throughout the document
-    if not found_skills:
-        print("DEBUG: No skills section found, searching throughout document")
-        for skill in skills_keywords:
-            if re.search(rf'\b{re.escape(skill)}\b', text, re.IGNORECASE):
-                found_skills.append(skill)
-    
-    # Clean up skills - remove duplicates and sort
-    found_skills = list(set(found_skills))
-    found_skills.sort()
-    
-    # Filter out any skills that look like work experience or job descriptions
-    filtered_skills = []
-    work_experience_indicators = [
-        'responsibilities', 'team lead', 'pvt ltd', 'working as', 'production', 'quality', 'organizing',
-        'present', 'role', 'until', 'company', 'corp', 'inc', 'ltd', 'llc', 'pvt', 'limited'
-    ]
-    
-    for skill in found_skills:
-        skill_lower = skill.lower()
-        is_work_experience = False
-        
-        for indicator in work_experience_indicators:
-            if indicator in skill_lower:
-                is_work_experience = True
-                break
-        
-        if not is_work_experience:
-            filtered_skills.append(skill)
-    
-    # If we still don't have skills, try to extract from the entire document more intelligently
-    if not filtered_skills:
-        print("DEBUG: No skills found with keywords, trying intelligent extraction")
-        # Look for technical terms and tools mentioned in the document
-        technical_patterns = [
-            r'\b(?:MS Office|Power BI|Excel|Word|PowerPoint|Outlook|Access|Project|Visio)\b',
-            r'\b(?:Python|Java|JavaScript|HTML|CSS|SQL|React|Angular|Vue|Node\.js)\b',
-            r'\b(?:Git|Docker|AWS|Azure|Google Cloud|Kubernetes|Jenkins)\b',
-            r'\b(?:Photoshop|Illustrator|Figma|Sketch|Adobe XD)\b',
-            r'\b(?:Agile|Scrum|DevOps|CI/CD|TDD|BDD)\b'
-        ]
-        
-        for pattern in technical_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            filtered_skills.extend(matches)
-        
-        # Remove duplicates again
-        filtered_skills = list(set(filtered_skills))
-        filtered_skills.sort()
-    
-    extracted_data['skills'] = filtered_skills
-    print(f"DEBUG: Final extracted skills (after filtering): {filtered_skills}")
-    
-    # 7. Extract Education - Completely rewritten for clean, formatted output
-    education_text = []
-    
-    # Look for education section specifically - be more precise and avoid skills section
-    education_section_patterns = [
-        # Look for "Education" section specifically
-        r'(?:^|\n)(?:Education|EDUCATION)[\s:]*([^•\n]+(?:\n[^•\n]+)*)',
-        r'(?:^|\n)(?:Education|EDUCATION)[\s:]*((?:[^•\n]+\n?)+)',
-        
-        # Look for "Academic" section
-        r'(?:^|\n)(?:Academic|ACADEMIC)[\s:]*([^•\n]+(?:\n[^•\n]+)*)',
-        r'(?:^|\n)(?:Academic|ACADEMIC)[\s:]*((?:[^•\n]+\n?)+)',
-        
-        # Look for "Qualifications" section
-        r'(?:^|\n)(?:Qualifications|QUALIFICATIONS)[\s:]*([^•\n]+(?:\n[^•\n]+)*)',
-        r'(?:^|\n)(?:Qualifications|QUALIFICATIONS)[\s:]*((?:[^•\n]+\n?)+)',
-        
-        # Look for "Educational Background" section
-        r'(?:^|\n)(?:Educational Background|EDUCATIONAL BACKGROUND)[\s:]*([^•\n]+(?:\n[^•\n]+)*)',
-        r'(?:^|\n)(?:Educational Background|EDUCATIONAL BACKGROUND)[\s:]*((?:[^•\n]+\n?)+)'
-    ]
-    
-    education_section_text = ""
-    for pattern in education_section_patterns:
-        match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
-        if match:
-            education_section_text = match.group(1)
-            print(f"DEBUG: Found education section with pattern: {pattern}")
-            print(f"DEBUG: Education section content: {education_section_text[:300]}...")
-            break
-    
-    if education_section_text:
-        # Clean the education section text
-        education_section_text = re.sub(r'\s+', ' ', education_section_text.strip())
-        
-        # Extract structured education information
-        # Look for degree patterns
-        degree_patterns = [
-            r'(Bachelor|Master|PhD|B\.?S\.?|M\.?S\.?|B\.?A\.?|M\.?A\.?|B\.?Tech|M\.?Tech|B\.?E|M\.?E)[\s\w]*',
-            r'(Computer Science|Engineering|Information Technology|Software Engineering|Data Science|Business Administration|Science|Arts|Commerce)'
-        ]
-        
-        for pattern in degree_patterns:
-            matches = re.findall(pattern, education_section_text, re.IGNORECASE)
-            education_text.extend(matches)
-        
-        # Look for institution names - be more specific
-        institution_patterns = [
-            r'(?:University|College|Institute|School)[\s\w]+',
-            r'(?:Graduated|Completed|Passed)[\s\w]*(?:in|from)[\s\w]+',
-            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\s+(?:University|College|Institute|School))',
-            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\s+(?:science|arts|degree|junior|high|school))'
-        ]
-        
-        for pattern in institution_patterns:
-            matches = re.findall(pattern, education_section_text, re.IGNORECASE)
-            education_text.extend(matches)
-        
-        # Look for years - be more specific
-        year_patterns = [
-            r'\b(19|20)\d{2}\b',  # Years 1900-2099
-            r'(?:Graduated|Completed|Passed)[\s\w]*(\d{4})',
-            r'(\d{4})'  # Any 4-digit year
-        ]
-        
-        for pattern in year_patterns:
-            matches = re.findall(pattern, education_section_text, re.IGNORECASE)
-            education_text.extend(matches)
-        
-        # If we found structured education, use it
-        if education_text:
-            # Clean up education text - remove duplicates and sort
-            education_text = list(set(education_text))
-            education_text.sort()
-            extracted_data['education'] = ' | '.join(education_text)
-        else:
-            # Fallback to the entire education section
-            extracted_data['education'] = education_section_text.strip()
-    else:
-        print("DEBUG: No education section found, searching throughout document")
-        # Fallback: use basic education extraction
-        if not extracted_data['education']:
-            extracted_data['education'] = "Education information not found in resume"
-    
-    # Clean and format the education output
-    if extracted_data['education']:
-        # Remove extra spaces and clean up the format
-        education_clean = re.sub(r'\s+', ' ', extracted_data['education'])
-        education_clean = re.sub(r'\|\s*\|', '|', education_clean)  # Remove double pipes
-        education_clean = re.sub(r'^\|\s*', '', education_clean)  # Remove leading pipe
-        education_clean = re.sub(r'\s*\|$', '', education_clean)  # Remove trailing pipe
-        extracted_data['education'] = education_clean.strip()
-    
-    print(f"DEBUG: Final extracted education: {extracted_data['education']}")
-    
-    # 8. Extract Work Experience - Look for experience patterns with better calculation
-    experience_patterns = [
-        r'(\d+)\s*(?:years?|yrs?)\s*(?:of\s*)?(?:experience|exp)',
-        r'(?:experience|exp)[\s\w]*(\d+)\s*(?:years?|yrs?)',
-        r'(?:worked|experience)[\s\w]*(\d+)\s*(?:years?|yrs?)',
-        r'(?:Total Experience|Work Experience)[\s:]*(\d+)\s*(?:years?|yrs?)',
-        r'(?:Experience|Work History|Employment)[\s:]*(\d+)\s*(?:years?|yrs?)',
-        r'(\d+)\s*(?:years?|yrs?)\s*(?:experience|exp)',  # More flexible pattern
-        r'(?:experience|exp)[\s\w]*(\d+)\s*(?:years?|yrs?)',  # Reverse pattern
-        r'(\d+)\s*(?:years?|yrs?)',  # Just years mentioned
-    ]
-    
-    years_of_experience = None
-    for pattern in experience_patterns:
-        match = re.search(pattern, cleaned_text, re.IGNORECASE)
-        if match:
-            years_of_experience = int(match.group(1))
-            print(f"DEBUG: Found years of experience: {years_of_experience}")
-            break
-    
-    # Look for experience section
-    experience_section_patterns = [
-        r'(?:Experience|Work History|Employment|Professional Experience|EXPERIENCE)[\s:]*([^•\n]+(?:\n[^•\n]+)*)',
-        r'(?:Experience|Work History|Employment|Professional Experience|EXPERIENCE)[\s:]*((?:[^•\n]+\n?)+)'
-    ]
-    
-    experience_section_text = ""
-    for pattern in experience_section_patterns:
-        match = re.search(pattern, cleaned_text, re.IGNORECASE)
-        if match:
-            experience_section_text = match.group(1)
-            break
-    
-    # If we found years of experience, use that
-    if years_of_experience:
-        extracted_data['experience'] = f"{years_of_experience} years of experience"
-    elif experience_section_text:
-        print(f"DEBUG: Found experience section: {experience_section_text[:200]}...")
-        
-        # Extract key information from experience section
-        experience_info = []
-        
-        # Look for job titles
-        job_title_patterns = [
-            r'(?:Software Engineer|Developer|Programmer|Analyst|Manager|Lead|Senior|Junior|Full Stack|Frontend|Backend|DevOps|Data Scientist|QA|Tester)[\s\w]*',
-            r'(?:Engineer|Developer|Programmer|Analyst|Manager|Lead|Senior|Junior)[\s\w]*'
-        ]
-        
-        for pattern in job_title_patterns:
-            matches = re.findall(pattern, experience_section_text, re.IGNORECASE)
-            experience_info.extend(matches)
-        
-        # Look for company names
-        company_patterns = [
-            r'(?:at|with|for)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',
-            r'(?:Company|Corp|Inc|Ltd|LLC|Pvt|Limited)[\s\w]*'
-        ]
-        
-        for pattern in company_patterns:
-            matches = re.findall(pattern, experience_section_text, re.IGNORECASE)
-            experience_info.extend(matches)
-        
-        # Combine information
-        if experience_info:
-            # Clean up experience info - remove duplicates and sort
-            experience_info = list(set(experience_info))
-            experience_info.sort()
-            extracted_data['experience'] = ' | '.join(experience_info)[:200] + "..."
-        else:
-            # Clean up the experience section text
-            cleaned_text = re.sub(r'\s+', ' ', experience_section_text.strip())
-            extracted_data['experience'] = cleaned_text[:200] + "..."
-    else:
-        print("DEBUG: No experience section found, searching throughout document")
-        # Fallback: look for experience patterns throughout the document
-        for pattern in experience_patterns:
-            match = re.search(pattern, cleaned_text, re.IGNORECASE)
-            if match:
-                years = match.group(1)
-                extracted_data['experience'] = f"{years} years of experience"
-                break
-    
-    print(f"DEBUG: Extracted experience: {extracted_data['experience']}")
-    
-    # If name wasn't found by patterns, try to extract from email
-    if not extracted_data['name'] and extracted_data['email']:
-        email_name = extracted_data['email'].split('@')[0]
-        if '.' in email_name:
-            name_parts = email_name.split('.')
-            extracted_data['name'] = ' '.join([part.title() for part in name_parts])
-        else:
-            extracted_data['name'] = email_name.title()
-    
-    return extracted_data
+@hr_bp.route('/parse_resume/jobs/<job_id>')
+@hr_required
+def resume_job_status(job_id):
+    """Poll a resume parsing job"""
+    from resume_jobs import get_queue, public_job
+    if not ObjectId.is_valid(job_id):
+        return jsonify({'success': False, 'message': 'Job not found'}), 404
+    job = get_queue().get(ObjectId(job_id), current_user.email)
+    if not job:
+        return jsonify({'success': False, 'message': 'Job not found'}), 404
+    return jsonify({'success': True, **public_job(job)})
 
 def parse_resume_with_ai(resume_text):
     """Parse resume using OpenAI API with the exact prompt provided by user"""
@@ -1096,38 +629,33 @@ def assign_candidate():
 @hr_bp.route('/candidates')
 @hr_required
 def candidates():
-    # Get all candidates in the system for HR visibility
-    # HR users need to see the complete hiring pipeline
+    # HR users need to see the complete hiring pipeline, one keyset page at a time
     from models_mongo import candidates_collection
+    from pagination import paginate_request
+    from analytics_mongo import count_candidates_by_status
+    from pipeline_stats import read_status_counts
     
-    # Query for ALL candidates (HR users need full visibility)
-    candidates_data = list(candidates_collection.find().sort('created_at', -1))
+    from models_mongo import CandidateSummary, CANDIDATE_SUMMARY_PROJECTION
     
-    # Convert to Candidate objects for proper data handling
-    candidates = []
-    for data in candidates_data:
-        try:
-            candidate = Candidate.from_dict(data)
-            candidates.append(candidate)
-        except Exception as e:
-            print(f"Error converting candidate data: {e}")
-            continue
+    page = paginate_request(candidates_collection, request.args, projection=CANDIDATE_SUMMARY_PROJECTION)
+    candidates = [CandidateSummary.from_dict(data) for data in page.items]
     
-    # Debug logging to check candidate counts by status
-    status_counts = {}
-    for candidate in candidates:
-        status = candidate.status or 'Unknown'
-        status_counts[status] = status_counts.get(status, 0) + 1
+    # Status cards count every candidate, not just the rows on this page
+    status_counts, total_count = read_status_counts() or count_candidates_by_status(candidates_collection)
     
     print(f"HR {current_user.email} candidates by status: {status_counts}")
     
     # Check if this is an AJAX request for dynamic updates
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
         # Return only the content for AJAX requests
-        return render_template('hr/candidates_content.html', candidates=candidates)
+        return render_template('hr/candidates_content.html', candidates=candidates, page=page,
+                             status_counts=status_counts, total_count=total_count)
     
     return render_template('hr/candidates.html', 
-                         candidates=candidates)
+                         candidates=candidates,
+                         page=page,
+                         status_counts=status_counts,
+                         total_count=total_count)
 
 @hr_bp.route('/candidate/<candidate_id>')
 @hr_required
@@ -1239,6 +767,9 @@ def bulk_move_candidates():
         )
         
         if result.modified_count > 0:
+            from pipeline_stats import record_bulk_update
+            record_bulk_update(candidates, {'status': new_status})
+            
             # Log the bulk move activity
             activity = ActivityLog(
                 user_email=current_user.email,
@@ -1317,6 +848,7 @@ def delete_candidate(candidate_id):
 
 @hr_bp.route('/analytics/<tab_name>')
 @hr_required
+@cached_response('candidates', 'users')
 def get_analytics_data(tab_name):
     """Get analytics data for HR dashboard"""
     try:
@@ -1512,32 +1044,32 @@ def update_onboarding_status():
             'onboarding_status': status,
             'onboarding_notes': notes,
             'onboarding_updated_by': current_user.email,
-            'onboarding_updated_at': datetime.now().isoformat()
+            'onboarding_updated_at': datetime.utcnow()
         }
         
         if onboarding_date:
             update_data['onboarding_date'] = onboarding_date
         
-        result = candidates_collection.update_one(
+        from pipeline_stats import tracked_update_one
+        updated = tracked_update_one(
+            candidates_collection,
             {'_id': ObjectId(candidate_id)},
             {'$set': update_data}
         )
         
-        if result.modified_count > 0:
+        if updated is not None:
             # If candidate is onboarded and linked to a request, update request counts
-            if status == 'Onboarded':
+            # (once: only the update that changed the status to Onboarded counts)
+            if status == 'Onboarded' and updated.get('onboarding_status') != 'Onboarded':
                 try:
-                    candidate = candidates_collection.find_one({'_id': ObjectId(candidate_id)})
+                    candidate = candidates_collection.find_one({'_id': ObjectId(candidate_id)}, {'linked_request_id': 1})
                     print(f"DEBUG: Candidate {candidate_id} - linked_request_id: {candidate.get('linked_request_id') if candidate else 'None'}")
                     
                     if candidate and candidate.get('linked_request_id'):
                         from models_mongo import CandidateRequest
-                        request_obj = CandidateRequest.find_by_id(candidate['linked_request_id'])
+                        request_obj = CandidateRequest.increment_counts(candidate['linked_request_id'], onboarded=1)
                         if request_obj:
-                            # Increment onboarded count
-                            new_onboarded_count = request_obj.onboarded_count + 1
-                            request_obj.update_counts(onboarded_count=new_onboarded_count)
-                            print(f"SUCCESS: Updated request {candidate['linked_request_id']}: onboarded_count = {new_onboarded_count}")
+                            print(f"SUCCESS: Updated request {candidate['linked_request_id']}: onboarded_count = {request_obj.onboarded_count}")
                         else:
                             print(f"ERROR: Request object not found for ID: {candidate['linked_request_id']}")
                     else:
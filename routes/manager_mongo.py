@@ -2,11 +2,8 @@ from flask import Blueprint, render_template, request, redirect, url_for, flash,
 from flask_login import login_required, current_user
 from models_mongo import User, Candidate, Feedback, ActivityLog
 from email_service import send_feedback_notification_email
+from response_cache import cached_response
 from datetime import datetime
-import pandas as pd
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-import io
 from bson import ObjectId
 import traceback
 import sys
@@ -29,48 +26,46 @@ def manager_required(f):
 @manager_required
 def dashboard():
     try:
-        # Get assigned candidates
+        # Every status bucket (first rows and total count) in one aggregation
         from models_mongo import candidates_collection
-        assigned_candidates = list(candidates_collection.find({
-            'manager_email': current_user.email,
-            'status': {'$in': ['New', 'Assigned']}
-        }).sort('created_at', -1))
-        
-        # Get selected candidates
-        selected_candidates = list(candidates_collection.find({
-            'manager_email': current_user.email,
-            'status': 'Selected'
-        }).sort('updated_at', -1))
-        
-        # Get not selected candidates - show ALL rejected candidates to ALL managers
-        # This allows managers to see candidates rejected by other managers for transparency
-        not_selected_candidates = list(candidates_collection.find({
-            'status': {'$in': ['Not Selected', 'Rejected', 'Declined', 'Failed', 'Not Approved']}
-        }).sort('updated_at', -1))
-        
-        # Add a note to each candidate indicating which manager originally rejected them
-        for candidate in not_selected_candidates:
-            if candidate.get('manager_email') != current_user.email:
-                candidate['rejected_by'] = candidate.get('manager_email', 'Unknown Manager')
-            else:
-                candidate['rejected_by'] = 'You'
-        
-        # Get reassigned candidates (candidates that were reassigned by this manager)
-        reassigned_candidates = list(candidates_collection.find({
-            'reassigned_by_manager': current_user.email,
-            'status': 'Pending'
-        }).sort('updated_at', -1))
+        from manager_dashboard import dashboard_buckets
+        buckets = dashboard_buckets(candidates_collection, current_user.email)
         
         return render_template('manager/dashboard_simple.html', 
-                             assigned_candidates=assigned_candidates,
-                             selected_candidates=selected_candidates,
-                             not_selected_candidates=not_selected_candidates,
-                             reassigned_candidates=reassigned_candidates)
+                             buckets=buckets,
+                             assigned_candidates=buckets['assigned']['candidates'],
+                             selected_candidates=buckets['selected']['candidates'],
+                             not_selected_candidates=buckets['not_selected']['candidates'],
+                             reassigned_candidates=buckets['reassigned']['candidates'])
     except Exception as e:
         traceback.print_exc(file=sys.stderr)
         current_app.logger.error("Error in /manager/dashboard: %s", e)
         return render_template('error.html', message=str(e)), 500
 
+@manager_bp.route('/api/dashboard/<bucket>')
+@manager_required
+def dashboard_bucket(bucket):
+    """Load more rows of one dashboard bucket, continuing from `cursor`"""
+    from models_mongo import candidates_collection
+    from manager_dashboard import BUCKETS, DASHBOARD_BUCKET_SIZE, bucket_page, candidate_row
+    from pagination import InvalidCursor
+    
+    if bucket not in BUCKETS:
+        return jsonify({'success': False, 'message': 'Unknown bucket'}), 404
+    try:
+        page_size = int(request.args.get('page_size', DASHBOARD_BUCKET_SIZE))
+    except ValueError:
+        page_size = DASHBOARD_BUCKET_SIZE
+    try:
+        page = bucket_page(candidates_collection, current_user.email, bucket,
+                           request.args.get('cursor') or None, page_size)
+    except InvalidCursor:
+        return jsonify({'success': False, 'message': 'Invalid cursor'}), 400
+    
+    return jsonify({'success': True,
+                    'candidates': [candidate_row(candidate) for candidate in page.items],
+                    'page': page.to_dict()})
+
 @manager_bp.route('/candidate/<candidate_id>')
 @manager_required
 def candidate_details(candidate_id):
@@ -346,65 +341,26 @@ def reassign_candidate():
 @manager_bp.route('/export_feedback')
 @manager_required
 def export_feedback():
+    from models_mongo import feedback_collection, candidates_collection
+    from feedback_export import FEEDBACK_HEADERS, iter_feedback_rows, write_feedback_pdf
+    from exports import csv_response
+    from flask import send_file
+    
     format_type = request.args.get('format', 'csv')
     
-    # Get all feedback for this manager
-    from models_mongo import feedback_collection, candidates_collection
-    feedbacks = list(feedback_collection.find({'manager_email': current_user.email}))
+    # Feedback is joined to candidates in batches and never held in full
+    rows = iter_feedback_rows(feedback_collection, candidates_collection, current_user.email)
     
     if format_type == 'csv':
-        # Create CSV
-        data = []
-        for feedback in feedbacks:
-            candidate = candidates_collection.find_one({'_id': feedback['candidate_id']})
-            if candidate:
-                data.append({
-                    'Candidate Name': candidate.get('name', ''),
-                    'Email': candidate.get('email', ''),
-                    'Status': feedback.get('status', ''),
-                    'Feedback': feedback.get('feedback_text', ''),
-                    'Date': feedback.get('created_at', '').strftime('%Y-%m-%d %H:%M:%S')
-                })
-        
-        df = pd.DataFrame(data)
-        csv_data = df.to_csv(index=False)
-        
-        from flask import Response
-        return Response(
-            csv_data,
-            mimetype='text/csv',
-            headers={'Content-Disposition': 'attachment; filename=feedback_export.csv'}
-        )
+        return csv_response('feedback_export.csv', FEEDBACK_HEADERS, rows)
     
     elif format_type == 'pdf':
-        # Create PDF
-        buffer = io.BytesIO()
-        p = canvas.Canvas(buffer, pagesize=letter)
-        
-        p.setFont("Helvetica-Bold", 16)
-        p.drawString(100, 750, "Feedback Report")
-        p.setFont("Helvetica", 12)
-        p.drawString(100, 720, f"Manager: {current_user.name}")
-        p.drawString(100, 700, f"Date: {datetime.now().strftime('%Y-%m-%d')}")
-        
-        y_position = 650
-        for feedback in feedbacks:
-            candidate = candidates_collection.find_one({'_id': feedback['candidate_id']})
-            if candidate and y_position > 100:
-                p.drawString(100, y_position, f"Candidate: {candidate.get('name', '')}")
-                p.drawString(100, y_position - 20, f"Status: {feedback.get('status', '')}")
-                p.drawString(100, y_position - 40, f"Feedback: {feedback.get('feedback_text', '')[:50]}...")
-                y_position -= 80
-        
-        p.showPage()
-        p.save()
-        buffer.seek(0)
-        
-        from flask import Response
-        return Response(
-            buffer.getvalue(),
-            mimetype='application/pdf',
-            headers={'Content-Disposition': 'attachment; filename=feedback_export.pdf'}
+        pdf = write_feedback_pdf(rows, current_user.name, datetime.now().strftime('%Y-%m-%d'))
+        return send_file(
+            pdf,
+            as_attachment=True,
+            download_name='feedback_export.pdf',
+            mimetype='application/pdf'
         )
     
     return redirect(url_for('manager.dashboard'))
@@ -453,6 +409,9 @@ def bulk_move_candidates():
         )
         
         if result.modified_count > 0:
+            from pipeline_stats import record_bulk_update
+            record_bulk_update(candidates, {'status': new_status})
+            
             # Log the bulk move activity
             activity = ActivityLog(
                 user_email=current_user.email,
@@ -514,6 +473,9 @@ def bulk_reassign_candidates():
         )
         
         if result.modified_count > 0:
+            from pipeline_stats import record_bulk_update
+            record_bulk_update(candidates, {'status': 'Pending'}, unset_fields=('manager_email',))
+            
             # Log the bulk reassign activity
             activity = ActivityLog(
                 user_email=current_user.email,
@@ -565,18 +527,20 @@ def save_rejection_reasons():
         
         # Update candidate with rejection reasons
         from models_mongo import candidates_collection
-        result = candidates_collection.update_one(
+        from pipeline_stats import tracked_update_one
+        updated = tracked_update_one(
+            candidates_collection,
             {'_id': ObjectId(candidate_id), 'manager_email': current_user.email},
             {'$set': {
                 'rejection_reasons': rejection_reasons,
                 'rejection_notes': rejection_notes,
                 'status': 'Not Selected',
-                'reviewed_at': datetime.now().isoformat(),
-                'updated_at': datetime.now().isoformat()
+                'reviewed_at': datetime.utcnow(),
+                'updated_at': datetime.utcnow()
             }}
         )
         
-        if result.modified_count > 0:
+        if updated is not None:
             # Log the activity
             activity_log = ActivityLog(
                 user_email=current_user.email,
@@ -655,15 +619,15 @@ def submit_feedback():
                 'feedback_date': feedback_date,
                 'manager_email': current_user.email
             },
-            'reviewed_at': datetime.now().isoformat(),
-            'updated_at': datetime.now().isoformat()
+            'reviewed_at': datetime.utcnow(),
+            'updated_at': datetime.utcnow()
         }
         
         # If status is "Selected", add selection date
         if status == 'Selected':
-            update_data['selected_date'] = datetime.now().isoformat()
+            update_data['selected_date'] = datetime.utcnow()
         elif status == 'Not Selected':
-            update_data['rejection_date'] = datetime.now().isoformat()
+            update_data['rejection_date'] = datetime.utcnow()
         
         # Store rejection reasons if status is "Not Selected"
         if status == "Not Selected":
@@ -671,12 +635,14 @@ def submit_feedback():
             update_data['rejection_notes'] = rejection_notes
         
         # Update the candidate
-        result = candidates_collection.update_one(
+        from pipeline_stats import tracked_update_one
+        updated = tracked_update_one(
+            candidates_collection,
             {'_id': ObjectId(candidate_id)},
             {'$set': update_data}
         )
         
-        if result.modified_count > 0:
+        if updated is not None:
             # Log the activity
             activity_log = ActivityLog(
                 user_email=current_user.email,
@@ -700,6 +666,7 @@ def submit_feedback():
 
 @manager_bp.route('/analytics/<tab_name>')
 @manager_required
+@cached_response('candidates', per_user=True)
 def get_analytics_data(tab_name):
     """Get analytics data for Manager dashboard"""
     try:
@@ -862,94 +829,32 @@ def request_candidates_page():
         print(f"DEBUG: Current user email: {current_user.email}")
         print(f"DEBUG: Current user type: {type(current_user.email)}")
         
-        # Get requests for current manager directly from collection
-        requests_data = list(candidate_requests_collection.find({'manager_email': current_user.email}))
+        # Requests for current manager with deadline status and totals computed by one query
+        from candidate_requests import request_listing, URGENCY_BY_DEADLINE_STATUS
+        enhanced_requests, totals = request_listing(candidate_requests_collection, {'manager_email': current_user.email})
         
-        print(f"DEBUG: Found {len(requests_data)} requests for {current_user.email}")
-        for req in requests_data:
-            print(f"DEBUG: Request ID: {req.get('_id')}, Position: {req.get('position_title')}")
+        print(f"DEBUG: Found {len(enhanced_requests)} requests for {current_user.email}")
         
         # If no requests found with exact match, try case-insensitive search
-        if len(requests_data) == 0:
+        if len(enhanced_requests) == 0:
             print(f"DEBUG: No exact matches found, trying case-insensitive search...")
-            all_requests = list(candidate_requests_collection.find({}))
-            print(f"DEBUG: All requests in database:")
-            for req in all_requests:
-                print(f"  - Manager: '{req.get('manager_email')}', Position: {req.get('position_title')}")
-            
-            # Try case-insensitive match
-            for req in all_requests:
-                if req.get('manager_email', '').lower() == current_user.email.lower():
-                    print(f"DEBUG: Found case-insensitive match: {req.get('_id')}")
-                    requests_data.append(req)
+            import re
+            enhanced_requests, totals = request_listing(candidate_requests_collection, {
+                'manager_email': {'$regex': f'^{re.escape(current_user.email)}$', '$options': 'i'}
+            })
         
-        # Process each request with enhanced data
-        enhanced_requests = []
-        for request in requests_data:
-            request['_id'] = str(request['_id'])
-            
+        for request in enhanced_requests:
             # Add manager information (self in this case)
             request['requester_name'] = current_user.name
             request['requester_email'] = current_user.email
             
-            # Map correct field names for template
-            request['job_title'] = request.get('position_title', 'N/A')
-            request['open_positions'] = request.get('quantity_needed', 0)
-            
-            # Calculate remaining positions
-            assigned_count = request.get('assigned_count', 0)
-            onboarded_count = request.get('onboarded_count', 0)
-            request['remaining_positions'] = request['open_positions'] - onboarded_count
-            
-            # Calculate deadline status based on created_at
-            if request.get('created_at'):
-                try:
-                    if isinstance(request['created_at'], str):
-                        created_at_str = request['created_at']
-                        if 'T' in created_at_str:
-                            if created_at_str.endswith('Z'):
-                                created_at_str = created_at_str[:-1] + '+00:00'
-                            elif '+' not in created_at_str and 'Z' not in created_at_str:
-                                created_at_str += '+00:00'
-                            requested_date = datetime.fromisoformat(created_at_str)
-                        else:
-                            requested_date = datetime.fromisoformat(created_at_str)
-                    else:
-                        requested_date = request['created_at']
-                    
-                    # Calculate days since request
-                    days_since_request = (datetime.now() - requested_date.replace(tzinfo=None)).days
-                    
-                    # Set deadline status based on days since request
-                    if days_since_request > 15:
-                        request['deadline_status'] = 'overdue'
-                        request['deadline_color'] = 'red'
-                        request['urgency_level'] = 'Critical'
-                    elif days_since_request > 7:
-                        request['deadline_status'] = 'urgent'
-                        request['deadline_color'] = 'yellow'
-                        request['urgency_level'] = 'High'
-                    else:
-                        request['deadline_status'] = 'active'
-                        request['deadline_color'] = 'green'
-                        request['urgency_level'] = request.get('urgency_level', 'Normal')
-                    
-                    request['days_since_request'] = days_since_request
-                    request['requested_date_formatted'] = requested_date.strftime('%Y-%m-%d')
-                    
-                except Exception as e:
-                    print(f"Error processing created_at for request {request.get('_id')}: {e}")
-                    request['deadline_status'] = 'unknown'
-                    request['deadline_color'] = 'gray'
-                    request['days_since_request'] = 0
-                    request['urgency_level'] = request.get('urgency_level', 'Unknown')
-            
-            enhanced_requests.append(request)
+            # Overdue and urgent requests escalate their urgency
+            if request.get('deadline_status') in ('overdue', 'urgent'):
+                request['urgency_level'] = URGENCY_BY_DEADLINE_STATUS[request['deadline_status']]
         
-        # Calculate totals
-        active_requests = [req for req in enhanced_requests if req.get('status', 'Active') == 'Active']
-        total_requested = sum(req['open_positions'] for req in active_requests)
-        total_remaining = sum(req['remaining_positions'] for req in active_requests)
+        # Totals cover active requests only
+        total_requested = totals['active_requested']
+        total_remaining = totals['active_remaining']
         
         return render_template('manager/request_candidates.html', 
                              requests=enhanced_requests,
@@ -2,6 +2,8 @@ from flask import Blueprint, render_template, request, redirect, url_for, flash,
 from flask_login import login_required, current_user
 from models_mongo import User, Candidate, Role, ActivityLog
 from email_service import send_candidate_assignment_email
+from resume_jobs import register_parser
+from response_cache import cached_response
 from werkzeug.utils import secure_filename
 from bson import ObjectId
 import os
@@ -248,55 +250,6 @@ def correct_extracted_data(extracted_data, resume_text):
     
     return extracted_data
 
-@recruiter_bp.route('/fix-file-paths')
-@recruiter_required
-def fix_file_paths():
-    """Migration route to fix file paths in database"""
-    try:
-        from models_mongo import candidates_collection
-        
-        # Find all candidates with paths starting with 'static/'
-        candidates_to_fix = list(candidates_collection.find({
-            '$or': [
-                {'resume_path': {'$regex': '^static/'}},
-                {'image_path': {'$regex': '^static/'}}
-            ]
-        }))
-        
-        fixed_count = 0
-        
-        for candidate in candidates_to_fix:
-            candidate_id = candidate['_id']
-            updates = {}
-            
-            # Fix resume_path
-            if 'resume_path' in candidate and candidate['resume_path'].startswith('static/'):
-                old_resume_path = candidate['resume_path']
-                new_resume_path = old_resume_path.replace('static/', '', 1)
-                updates['resume_path'] = new_resume_path
-            
-            # Fix image_path
-            if 'image_path' in candidate and candidate['image_path'].startswith('static/'):
-                old_image_path = candidate['image_path']
-                new_image_path = old_image_path.replace('static/', '', 1)
-                updates['image_path'] = new_image_path
-            
-            # Update the candidate if there are changes
-            if updates:
-                candidates_collection.update_one(
-                    {'_id': candidate_id},
-                    {'$set': updates}
-                )
-                fixed_count += 1
-        
-        flash(f'Successfully fixed {fixed_count} candidate file paths!', 'success')
-        return redirect(url_for('recruiter.dashboard'))
-        
-    except Exception as e:
-        print(f"Error fixing file paths: {str(e)}")
-        flash(f'Error fixing file paths: {str(e)}', 'error')
-        return redirect(url_for('recruiter.dashboard'))
-
 @recruiter_bp.route('/debug-db')
 @recruiter_required
 def debug_db():
@@ -333,133 +286,18 @@ def dashboard():
         # Fetch all candidates for statistics
         all_candidates = list(candidates_collection.find({}))
         
-        # Fetch candidate requests with deadline tracking
-        candidate_requests = list(candidate_requests_collection.find({}))
+        # Fetch candidate requests with manager names and deadline tracking computed by the query
+        from candidate_requests import list_candidate_requests
+        candidate_requests = list_candidate_requests(candidate_requests_collection)
         
         # Convert ObjectId to string for template compatibility
         for candidate in all_candidates:
             candidate['_id'] = str(candidate['_id'])
             
-            # Generate reference ID if missing
-            if not candidate.get('reference_id'):
-                current_date = datetime.now().strftime('%Y%m%d')
-                unique_id = str(uuid.uuid4())[:8].upper()
-                reference_id = f'REF-{current_date}-{unique_id}'
-                candidate['reference_id'] = reference_id
-        
-        # Process candidate requests with deadline status and manager info
-        from models_mongo import users_collection
-        for request in candidate_requests:
-            request['_id'] = str(request['_id'])
-            
-            # Add manager information
-            if request.get('manager_email'):
-                manager = users_collection.find_one({'email': request['manager_email']})
-                if manager:
-                    request['requester_name'] = f"{manager.get('first_name', '')} {manager.get('last_name', '')}"
-                    request['requester_email'] = request['manager_email']
-                else:
-                    request['requester_name'] = request.get('manager_email', 'Unknown')
-                    request['requester_email'] = request.get('manager_email', 'N/A')
-            
-            # Map correct field names for template
-            request['job_title'] = request.get('position_title', 'N/A')
-            request['open_positions'] = request.get('quantity_needed', 0)
-            
-            # Calculate remaining positions
-            assigned_count = request.get('assigned_count', 0)
-            onboarded_count = request.get('onboarded_count', 0)
-            request['remaining_positions'] = request['open_positions'] - onboarded_count
-            
-            # Calculate deadline status based on created_at (days since request)
-            if request.get('created_at'):
-                try:
-                    if isinstance(request['created_at'], str):
-                        # Handle ISO format with or without timezone
-                        created_at_str = request['created_at']
-                        if 'T' in created_at_str:
-                            # ISO format
-                            if created_at_str.endswith('Z'):
-                                created_at_str = created_at_str[:-1] + '+00:00'
-                            elif '+' not in created_at_str and 'Z' not in created_at_str:
-                                # No timezone info, assume UTC
-                                created_at_str += '+00:00'
-                            requested_date = datetime.fromisoformat(created_at_str)
-                        else:
-                            # Simple date format
-                            requested_date = datetime.fromisoformat(created_at_str)
-                    else:
-                        requested_date = request['created_at']
-                    
-                    # Calculate days since request
-                    days_since_request = (datetime.now() - requested_date.replace(tzinfo=None)).days
-                    
-                    # Set deadline status based on days since request
-                    if days_since_request > 15:
-                        request['deadline_status'] = 'overdue'
-                        request['deadline_color'] = 'red'
-                    elif days_since_request > 7:
-                        request['deadline_status'] = 'urgent'
-                        request['deadline_color'] = 'yellow'
-                    else:
-                        request['deadline_status'] = 'active'
-                        request['deadline_color'] = 'green'
-                    
-                    request['days_since_request'] = days_since_request
-                    request['requested_date_formatted'] = requested_date.strftime('%Y-%m-%d')
-                    
-                except Exception as e:
-                    print(f"Error processing created_at for request {request.get('_id')}: {e}")
-                    request['deadline_status'] = 'unknown'
-                    request['deadline_color'] = 'gray'
-                    request['days_since_request'] = 0
-            
-            # Also handle legacy deadline field if it exists
-            if request.get('deadline'):
-                deadline = request['deadline']
-                if isinstance(deadline, str):
-                    deadline = datetime.fromisoformat(deadline.replace('Z', '+00:00'))
-                
-                days_remaining = (deadline - datetime.now()).days
-                if days_remaining < 0:
-                    request['deadline_status'] = 'overdue'
-                    request['deadline_color'] = 'red'
-                elif days_remaining <= 7:
-                    request['deadline_status'] = 'urgent'
-                    request['deadline_color'] = 'yellow'
-                elif days_remaining <= 15:
-                    request['deadline_status'] = 'warning'
-                    request['deadline_color'] = 'orange'
-                else:
-                    request['deadline_status'] = 'good'
-                    request['deadline_color'] = 'green'
-                
-                request['days_remaining'] = days_remaining
-                
-                # Update the database with the new reference ID
-                try:
-                    candidates_collection.update_one(
-                        {'_id': ObjectId(candidate['_id'])},
-                        {'$set': {'reference_id': reference_id}}
-                    )
-                except Exception as update_error:
-                    print(f"Error updating reference ID for candidate {candidate.get('_id')}: {update_error}")
-            
-            # Generate name field if missing
+            # Missing reference ids and names are backfilled by migrations.py;
+            # until then show the name without writing it back
             if not candidate.get('name') and (candidate.get('first_name') or candidate.get('last_name')):
-                first_name = candidate.get('first_name', '')
-                last_name = candidate.get('last_name', '')
-                combined_name = f"{first_name} {last_name}".strip()
-                candidate['name'] = combined_name
-                
-                # Update the database with the new name field
-                try:
-                    candidates_collection.update_one(
-                        {'_id': ObjectId(candidate['_id'])},
-                        {'$set': {'name': combined_name}}
-                    )
-                except Exception as update_error:
-                    print(f"Error updating name field for candidate {candidate.get('_id')}: {update_error}")
+                candidate['name'] = f"{candidate.get('first_name', '')} {candidate.get('last_name', '')}".strip()
         
         print(f"DEBUG: Dashboard loaded {len(all_candidates)} candidates and {len(candidate_requests)} requests")
         print(f"DEBUG: Sample candidate names: {[c.get('name', 'No name') for c in all_candidates[:3]]}")
@@ -486,46 +324,24 @@ def candidates():
         print("DEBUG: Starting candidates route...")
         from models_mongo import candidates_collection
         from bson import ObjectId
+        from pagination import paginate_request
+        from analytics_mongo import count_candidates_by_status
+        from pipeline_stats import read_status_counts
         
         print("DEBUG: Fetching candidates from database...")
-        candidates = list(candidates_collection.find({}))
-        print(f"DEBUG: Found {len(candidates)} candidates")
+        page = paginate_request(candidates_collection, request.args)
+        candidates = page.items
+        status_counts, total_count = read_status_counts() or count_candidates_by_status(candidates_collection)
+        print(f"DEBUG: Showing {len(candidates)} of {total_count} candidates")
         
         # Convert ObjectId to string and handle date conversion
         for candidate in candidates:
             candidate['_id'] = str(candidate['_id'])
             
-            # Generate reference ID if missing
-            if not candidate.get('reference_id'):
-                current_date = datetime.now().strftime('%Y%m%d')
-                unique_id = str(uuid.uuid4())[:8].upper()
-                reference_id = f'REF-{current_date}-{unique_id}'
-                candidate['reference_id'] = reference_id
-                
-                # Update the database with the new reference ID
-                try:
-                    candidates_collection.update_one(
-                        {'_id': ObjectId(candidate['_id'])},
-                        {'$set': {'reference_id': reference_id}}
-                    )
-                except Exception as update_error:
-                    print(f"Error updating reference ID for candidate {candidate.get('_id')}: {update_error}")
-            
-            # Generate name field if missing
+            # Missing reference ids and names are backfilled by migrations.py;
+            # until then show the name without writing it back
             if not candidate.get('name') and (candidate.get('first_name') or candidate.get('last_name')):
-                first_name = candidate.get('first_name', '')
-                last_name = candidate.get('last_name', '')
-                combined_name = f"{first_name} {last_name}".strip()
-                candidate['name'] = combined_name
-                
-                # Update the database with the new name field
-                try:
-                    candidates_collection.update_one(
-                        {'_id': ObjectId(candidate['_id'])},
-                        {'$set': {'name': combined_name}}
-                    )
-                except Exception as update_error:
-                    print(f"Error updating name field for candidate {candidate.get('_id')}: {update_error}")
+                candidate['name'] = f"{candidate.get('first_name', '')} {candidate.get('last_name', '')}".strip()
             
             # Convert created_at string to datetime object for template compatibility
             created_at = candidate.get('created_at')
@@ -544,7 +360,8 @@ def candidates():
                     candidate['created_at'] = None
             
         print(f"DEBUG: Successfully processed {len(candidates)} candidates, rendering template...")
-        return render_template('recruiter/candidates.html', candidates=candidates)
+        return render_template('recruiter/candidates.html', candidates=candidates, page=page,
+                             status_counts=status_counts, total_count=total_count)
     except Exception as e:
         print(f"ERROR: Error loading candidates: {str(e)}")
         print(f"ERROR: Exception type: {type(e).__name__}")
@@ -643,6 +460,9 @@ def delete_candidate(candidate_id):
         result = candidates_collection.delete_one({'_id': ObjectId(candidate_id)})
         
         if result.deleted_count > 0:
+            from pipeline_stats import record_change
+            record_change(candidate, None)
+            
             # Log the deletion activity
             try:
                 activity_log = ActivityLog(
@@ -703,12 +523,9 @@ def assign_candidate_route():
         if request_id:
             try:
                 from models_mongo import CandidateRequest
-                request_obj = CandidateRequest.find_by_id(request_id)
+                request_obj = CandidateRequest.increment_counts(request_id, assigned=1)
                 if request_obj:
-                    # Increment assigned count
-                    new_assigned_count = request_obj.assigned_count + 1
-                    request_obj.update_counts(assigned_count=new_assigned_count)
-                    print(f"Updated request {request_id}: assigned_count = {new_assigned_count}")
+                    print(f"Updated request {request_id}: assigned_count = {request_obj.assigned_count}")
             except Exception as e:
                 print(f"Error updating request counts: {str(e)}")
         
@@ -770,8 +587,8 @@ def upload_candidate():
                 'recruiter_email': current_user.email,
                 'assigned_by': current_user.email,  # Add this for cluster dashboard compatibility
                 'reference_id': reference_id,
-                'created_at': datetime.now().isoformat(),
-                'updated_at': datetime.now().isoformat()
+                'created_at': datetime.utcnow(),
+                'updated_at': datetime.utcnow()
             }
             
             # Add additional parsed fields if they exist in the form
@@ -846,7 +663,9 @@ def upload_candidate():
             
             # Save to database
             from models_mongo import candidates_collection
+            from pipeline_stats import record_change
             result = candidates_collection.insert_one(candidate_data)
+            record_change(None, candidate_data)
             
             # Log activity
             activity_log = ActivityLog(
@@ -890,7 +709,7 @@ def update_candidate_ratings(candidate_id):
             'teamwork_collaboration': request.form.get('teamwork_collaboration'),
             'job_fit': request.form.get('job_fit'),
             'other_notes': request.form.get('other_notes'),
-            'updated_at': datetime.now().isoformat()
+            'updated_at': datetime.utcnow()
         }
         
         # Convert rating fields to integers and remove None values
@@ -942,19 +761,21 @@ def assign_candidate_to_manager(candidate_id):
         from models_mongo import candidates_collection, users_collection
         
         # Update candidate assignment
-        result = candidates_collection.update_one(
+        from pipeline_stats import tracked_update_one
+        updated = tracked_update_one(
+            candidates_collection,
             {'_id': ObjectId(candidate_id)},
             {
                 '$set': {
                     'manager_email': manager_email,
                     'status': 'Assigned',
-                    'assigned_at': datetime.now().isoformat(),
+                    'assigned_at': datetime.utcnow(),
                     'assigned_by': current_user.email
                 }
             }
         )
         
-        if result.modified_count > 0:
+        if updated is not None:
             # Get candidate and manager details
             candidate = candidates_collection.find_one({'_id': ObjectId(candidate_id)})
             manager = users_collection.find_one({'email': manager_email})
@@ -993,21 +814,27 @@ def api_candidates():
     """API endpoint for candidate data"""
     try:
         from models_mongo import candidates_collection, users_collection
-        
-        # Get all candidates
-        candidates = list(candidates_collection.find({}))
-        
-        # Enrich with manager information
+        from pagination import paginate_request
+        
+        # Get one keyset page of candidates
+        page = paginate_request(candidates_collection, request.args)
+        candidates = page.items
+        
+        # Enrich with manager information (one users query for the whole page)
+        managers = {}
+        manager_emails = list({c['manager_email'] for c in candidates if c.get('manager_email')})
+        if manager_emails:
+            for manager in users_collection.find({'email': {'$in': manager_emails}}):
+                managers[manager['email']] = manager
         for candidate in candidates:
-            if candidate.get('manager_email'):
-                manager = users_collection.find_one({'email': candidate['manager_email']})
-                if manager:
-                    candidate['manager_name'] = f"{manager.get('first_name', '')} {manager.get('last_name', '')}"
+            manager = managers.get(candidate.get('manager_email'))
+            if manager:
+                candidate['manager_name'] = f"{manager.get('first_name', '')} {manager.get('last_name', '')}"
             
             # Convert ObjectId to string
             candidate['_id'] = str(candidate['_id'])
         
-        return jsonify({'success': True, 'candidates': candidates})
+        return jsonify({'success': True, 'candidates': candidates, **page.to_dict()})
         
     except Exception as e:
         print(f"Error getting candidates: {str(e)}")
@@ -1039,156 +866,21 @@ def api_managers():
 
 @recruiter_bp.route('/api/analytics')
 @recruiter_required
+@cached_response('candidates', 'users')
 def get_analytics_data():
     """Get analytics data for recruiter dashboard"""
     try:
         from models_mongo import candidates_collection, users_collection
-        from collections import defaultdict
-        
-        # Get ALL candidates (not filtered by recruiter_email for now)
-        # This ensures we show all data regardless of recruiter assignment
-        candidates = list(candidates_collection.find({}))
-        
-        print(f"DEBUG: Found {len(candidates)} candidates for analytics")
-        
-        # Calculate statistics
-        total_candidates = len(candidates)
-        status_counts = defaultdict(int)
-        position_counts = defaultdict(int)
-        monthly_stats = defaultdict(int)
-        
-        for candidate in candidates:
-            # Status distribution
-            status = candidate.get('status', 'Unknown')
-            status_counts[status] += 1
-            
-            # Position distribution
-            position = candidate.get('position_applied', 'Unknown')
-            position_counts[position] += 1
-            
-            # Monthly trends
-            created_at = candidate.get('created_at', '')
-            if created_at:
-                try:
-                    # Handle both datetime objects and ISO strings
-                    if isinstance(created_at, str):
-                        clean_date = created_at.replace('Z', '+00:00')
-                        dt = datetime.fromisoformat(clean_date)
-                    elif hasattr(created_at, 'strftime'):
-                        dt = created_at
-                    else:
-                        continue  # Skip invalid date types
-                    month = dt.strftime('%Y-%m')
-                    monthly_stats[month] += 1
-                except Exception as e:
-                    print(f"Analytics date parsing error: {e}, created_at: {created_at}, type: {type(created_at)}")
-                    continue
-        
-        # Success rate calculation
-        selected_count = status_counts.get('Selected', 0)
-        success_rate = round((selected_count / total_candidates * 100), 2) if total_candidates > 0 else 0
-        
-        print(f"DEBUG: Analytics calculated - Total: {total_candidates}, Selected: {selected_count}, Success Rate: {success_rate}%")
-        
-        # Calculate weekly trends (last 4 weeks)
-        weekly_trends = defaultdict(lambda: {'applications': 0, 'selections': 0})
-        for candidate in candidates:
-            created_at = candidate.get('created_at', '')
-            if created_at:
-                try:
-                    if isinstance(created_at, str):
-                        clean_date = created_at.replace('Z', '+00:00')
-                        dt = datetime.fromisoformat(clean_date)
-                    elif hasattr(created_at, 'strftime'):
-                        dt = created_at
-                    else:
-                        continue
-                    
-                    # Get week start (Monday)
-                    week_start = dt - timedelta(days=dt.weekday())
-                    week_key = week_start.strftime('%Y-%m-%d')
-                    weekly_trends[week_key]['applications'] += 1
-                    
-                    if candidate.get('status') == 'Selected':
-                        weekly_trends[week_key]['selections'] += 1
-                except Exception as e:
-                    print(f"Weekly trend date parsing error: {e}")
-                    continue
-        
-        # Calculate monthly success rates
-        monthly_success = defaultdict(float)
-        for candidate in candidates:
-            created_at = candidate.get('created_at', '')
-            if created_at and candidate.get('status') == 'Selected':
-                try:
-                    if isinstance(created_at, str):
-                        clean_date = created_at.replace('Z', '+00:00')
-                        dt = datetime.fromisoformat(clean_date)
-                    elif hasattr(created_at, 'strftime'):
-                        dt = created_at
-                    else:
-                        continue
-                    month_key = dt.strftime('%Y-%m')
-                    monthly_success[month_key] += 1
-                except Exception as e:
-                    print(f"Monthly success date parsing error: {e}")
-                    continue
-        
-        # Calculate success rates as percentages
-        for month in monthly_success:
-            total_in_month = monthly_stats.get(month, 1)
-            monthly_success[month] = round((monthly_success[month] / total_in_month) * 100, 1)
+        from analytics_mongo import get_candidate_analytics
         
-        # HR Performance data
-        hr_performance = []
-        hr_users = list(users_collection.find({'role': 'hr'}))
-        for hr in hr_users:
-            hr_candidates = [c for c in candidates if c.get('assigned_by') == hr.get('email')]
-            hr_performance.append({
-                'name': hr.get('name', 'Unknown HR'),
-                'candidates_added': len(hr_candidates),
-                'successful_placements': len([c for c in hr_candidates if c.get('status') == 'Selected'])
-            })
-        
-        # Department distribution
-        departments = defaultdict(int)
-        for candidate in candidates:
-            dept = candidate.get('department', 'General')
-            departments[dept] += 1
+        # Show all candidates regardless of recruiter assignment; every tally
+        # is computed by a single $facet aggregation inside MongoDB
+        analytics_data = get_candidate_analytics(candidates_collection, users_collection)
         
-        # Experience level distribution
-        experience_levels = [0, 0, 0, 0]  # 0-1, 1-3, 3-5, 5+ years
-        for candidate in candidates:
-            exp_years = candidate.get('experience_years', 0)
-            if exp_years <= 1:
-                experience_levels[0] += 1
-            elif exp_years <= 3:
-                experience_levels[1] += 1
-            elif exp_years <= 5:
-                experience_levels[2] += 1
-            else:
-                experience_levels[3] += 1
+        print(f"DEBUG: Analytics calculated - Total: {analytics_data['total_candidates']}, Selected: {analytics_data['selected_count']}, Success Rate: {analytics_data['success_rate']}%")
         
         # Response time data (mock data for now)
-        response_times = [2.5, 1.8, 3.2, 2.1, 1.5]
-        
-        analytics_data = {
-            'total_candidates': total_candidates,
-            'status_counts': dict(status_counts),
-            'position_counts': dict(position_counts),
-            'monthly_stats': dict(monthly_stats),
-            'weekly_trends': dict(weekly_trends),
-            'monthly_success': dict(monthly_success),
-            'hr_performance': hr_performance,
-            'departments': dict(departments),
-            'experience_levels': experience_levels,
-            'response_times': response_times,
-            'success_rate': success_rate,
-            'pending_count': status_counts.get('Pending', 0),
-            'assigned_count': status_counts.get('Assigned', 0),
-            'selected_count': selected_count,
-            'not_selected_count': status_counts.get('Not Selected', 0)
-        }
+        analytics_data['response_times'] = [2.5, 1.8, 3.2, 2.1, 1.5]
         
         return jsonify({
             'success': True,
@@ -1215,20 +907,11 @@ def candidate_requests():
 def api_candidate_requests():
     """Get candidate requests from managers"""
     try:
-        from models_mongo import candidate_requests_collection, users_collection
-        
-        # Get all active requests
-        requests = list(candidate_requests_collection.find({'status': {'$ne': 'Completed'}}))
+        from models_mongo import candidate_requests_collection
+        from candidate_requests import list_candidate_requests
         
-        # Enrich with manager information
-        for request in requests:
-            if request.get('manager_email'):
-                manager = users_collection.find_one({'email': request['manager_email']})
-                if manager:
-                    request['manager_name'] = f"{manager.get('first_name', '')} {manager.get('last_name', '')}"
-            
-            # Convert ObjectId to string
-            request['_id'] = str(request['_id'])
+        # Get all active requests, with manager_name joined by the query
+        requests = list_candidate_requests(candidate_requests_collection, {'status': {'$ne': 'Completed'}})
         
         return jsonify({'success': True, 'requests': requests})
         
@@ -1242,221 +925,100 @@ def test_parse():
     """Test route to verify parse_resume endpoint is accessible"""
     return jsonify({'success': True, 'message': 'Parse endpoint is accessible'})
 
-@recruiter_bp.route('/parse_resume', methods=['POST'])
-@recruiter_required  # Re-enabled with better error handling
-def parse_resume():
-    """Parse resume and extract candidate information"""
+MANUAL_ENTRY_PAYLOAD = {
+    'success': True,
+    'message': 'Resume uploaded successfully (manual entry required)',
+    'data': {
+        'name': '',
+        'email': '',
+        'phone': '',
+        'skills': '',
+        'education': '',
+        'experience': ''
+    },
+    'parsing_method': 'Manual Entry Required'
+}
+
+def _resume_format_error(filename):
+    """User-facing message when `filename` cannot be parsed, else None"""
+    file_ext = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    if file_ext in ['docx', 'doc']:
+        return 'Word documents not supported yet. Please convert to PDF format.'
+    if file_ext != 'pdf':
+        return 'Unsupported file format. Please upload PDF.'
+    return None
+
+def extract_resume_fields_basic(resume_text):
+    """Regex fallback used when the AI parser is unavailable"""
+    # Fallback to simple regex-based parsing
+    import re
+    
+    extracted_data = {
+        'name': '',
+        'email': '',
+        'phone': '',
+        'skills': [],
+        'education': '',
+        'experience': ''
+    }
+    
+    # Extract email
+    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+    emails = re.findall(email_pattern, resume_text)
+    if emails:
+        extracted_data['email'] = emails[0]
+    
+    # Extract phone number
+    phone_pattern = r'[\+]?[1-9]?[0-9]{7,15}'
+    phones = re.findall(phone_pattern, resume_text)
+    if phones:
+        extracted_data['phone'] = phones[0]
+    
+    # Better name extraction logic
+    lines = resume_text.split('\n')
+    for line in lines[:15]:  # Check first 15 lines
+        line = line.strip()
+        # Skip lines that are likely not names
+        if not line or len(line) < 2:
+            continue
+        if '@' in line or line.lower() in ['resume', 'cv', 'curriculum vitae']:
+            continue
+        if re.match(r'^\d+', line) or re.match(r'^phone', line.lower()):
+            continue
+        if re.match(r'^address', line.lower()) or re.match(r'^email', line.lower()):
+            continue
+        
+        # Check if line looks like a name (contains letters, reasonable length)
+        if any(c.isalpha() for c in line) and len(line.split()) <= 4 and len(line) <= 50:
+            # Additional checks for name-like patterns
+            words = line.split()
+            if len(words) >= 1 and all(word.replace('.', '').replace(',', '').isalpha() or len(word) <= 3 for word in words):
+                extracted_data['name'] = line
+                break
+    
+    return extracted_data
+
+def build_resume_payload(resume_text, timer=None):
+    """Turn extracted resume text into the /parse_resume JSON payload"""
+    from resume_jobs import StageTimer
+    timer = timer or StageTimer()
+    
     try:
-        print(f"DEBUG: parse_resume called with files: {list(request.files.keys())}")
-        
-        if 'resume' not in request.files:
-            print("DEBUG: No resume file in request.files")
-            return jsonify({'success': False, 'message': 'No resume file uploaded'})
-        
-        resume_file = request.files['resume']
-        print(f"DEBUG: Resume file received: {resume_file.filename}, size: {resume_file.content_length if hasattr(resume_file, 'content_length') else 'unknown'}")
-        
-        if resume_file.filename == '':
-            print("DEBUG: Empty filename")
-            return jsonify({'success': False, 'message': 'No resume file selected'})
-        
-        # Process the actual resume file for real data extraction
-        print("DEBUG: Processing real resume file for accurate data extraction")
-        
-        # Get file extension
-        file_ext = resume_file.filename.rsplit('.', 1)[1].lower()
-        
-        # Extract text from the resume
-        resume_text = ""
-        
-        if file_ext == 'pdf':
-            try:
-                import fitz  # PyMuPDF
-                print("DEBUG: PyMuPDF imported successfully")
-                
-                # Save temporary file
-                temp_path = f"/tmp/{uuid.uuid4()}.pdf"
-                print(f"DEBUG: Saving to temp path: {temp_path}")
-                resume_file.save(temp_path)
-                
-                # Check if file was saved
-                import os
-                if os.path.exists(temp_path):
-                    file_size = os.path.getsize(temp_path)
-                    print(f"DEBUG: Temp file saved, size: {file_size} bytes")
-                    
-                    # Verify the file is not empty
-                    if file_size == 0:
-                        print("ERROR: Temp file is empty (0 bytes)!")
-                        return jsonify({'success': False, 'message': 'The uploaded file appears to be empty or corrupted. Please try uploading a different file.'})
-                else:
-                    print("ERROR: Temp file was not created!")
-                    return jsonify({'success': False, 'message': 'Failed to save temporary PDF file'})
-                
-                # Extract text from PDF
-                print("DEBUG: Opening PDF with PyMuPDF...")
-                doc = fitz.open(temp_path)
-                print(f"DEBUG: PDF opened, pages: {len(doc)}")
-                
-                for page_num in range(len(doc)):
-                    page = doc[page_num]
-                    print(f"DEBUG: Processing page {page_num + 1}")
-                    
-                    # Try different text extraction methods
-                    page_text = page.get_text()
-                    print(f"DEBUG: Page {page_num + 1} text length: {len(page_text)}")
-                    print(f"DEBUG: Page {page_num + 1} text preview: {page_text[:100]}...")
-                    
-                    if len(page_text) == 0:
-                        print(f"DEBUG: Page {page_num + 1} returned empty text, trying alternative method...")
-                        # Try alternative text extraction
-                        page_text = page.get_text("text")
-                        print(f"DEBUG: Alternative method text length: {len(page_text)}")
-                    
-                    resume_text += page_text
-                
-                doc.close()
-                print(f"DEBUG: PDF closed")
-                
-                print(f"DEBUG: Total extracted text length: {len(resume_text)}")
-                print(f"DEBUG: Extracted text preview: {resume_text[:300]}...")
-                print(f"DEBUG: Extracted text end: ...{resume_text[-300:]}")
-                
-                # If still no text, try a different approach
-                if len(resume_text.strip()) == 0:
-                    print("WARNING: No text extracted from PDF, trying alternative methods...")
-                    
-                    # Try to read file directly
-                    try:
-                        with open(temp_path, 'rb') as f:
-                            file_content = f.read()
-                            print(f"DEBUG: File content size: {len(file_content)} bytes")
-                            print(f"DEBUG: File content preview: {file_content[:100]}...")
-                    except Exception as read_error:
-                        print(f"DEBUG: Error reading file directly: {read_error}")
-                    
-                    # Try alternative PDF parsing with different method
-                    try:
-                        print("DEBUG: Trying alternative PDF parsing method...")
-                        doc = fitz.open(temp_path)
-                        for page_num in range(len(doc)):
-                            page = doc[page_num]
-                            # Try different text extraction parameters
-                            page_text = page.get_text("text", sort=True)
-                            print(f"DEBUG: Alternative method page {page_num + 1} text length: {len(page_text)}")
-                            resume_text += page_text
-                        doc.close()
-                    except Exception as alt_error:
-                        print(f"DEBUG: Alternative PDF parsing also failed: {alt_error}")
-                    
-                    # If still no text, try using pdfplumber as fallback
-                    if len(resume_text.strip()) == 0:
-                        try:
-                            print("DEBUG: Trying pdfplumber as fallback...")
-                            import pdfplumber
-                            with pdfplumber.open(temp_path) as pdf:
-                                for page in pdf.pages:
-                                    page_text = page.extract_text()
-                                    if page_text:
-                                        resume_text += page_text
-                                        print(f"DEBUG: pdfplumber extracted text length: {len(page_text)}")
-                        except ImportError:
-                            print("DEBUG: pdfplumber not available")
-                        except Exception as pdfplumber_error:
-                            print(f"DEBUG: pdfplumber failed: {pdfplumber_error}")
-                    
-                    # If still no text, try OCR with Tesseract
-                    if len(resume_text.strip()) == 0:
-                        try:
-                            print("DEBUG: Trying OCR with Tesseract...")
-                            import pytesseract
-                            from PIL import Image
-                            
-                            # Convert PDF pages to images and extract text with OCR
-                            doc = fitz.open(temp_path)
-                            for page_num in range(len(doc)):
-                                page = doc[page_num]
-                                print(f"DEBUG: Converting page {page_num + 1} to image for OCR...")
-                                
-                                # Convert page to image
-                                mat = fitz.Matrix(2.0, 2.0)  # Higher resolution for better OCR
-                                pix = page.get_pixmap(matrix=mat)
-                                img_data = pix.tobytes("png")
-                                
-                                # Open image with PIL
-                                img = Image.open(io.BytesIO(img_data))
-                                
-                                # Extract text with Tesseract
-                                ocr_text = pytesseract.image_to_string(img, lang='eng')
-                                print(f"DEBUG: OCR extracted {len(ocr_text)} characters from page {page_num + 1}")
-                                print(f"DEBUG: OCR text preview: {ocr_text[:100]}...")
-                                
-                                resume_text += ocr_text
-                                
-                                # Clean up
-                                pix = None
-                                img.close()
-                            
-                            doc.close()
-                            print(f"DEBUG: OCR completed, total text length: {len(resume_text)}")
-                            
-                        except ImportError:
-                            print("DEBUG: pytesseract or PIL not available")
-                        except Exception as ocr_error:
-                            print(f"DEBUG: OCR failed: {ocr_error}")
-                            import traceback
-                            traceback.print_exc()
-                    
-                    print(f"DEBUG: After all methods, total text length: {len(resume_text)}")
-                
-                # Clean up temp file AFTER all processing is complete
-                try:
-                    if os.path.exists(temp_path):
-                        os.remove(temp_path)
-                        print(f"DEBUG: Temp file cleaned up: {temp_path}")
-                except Exception as cleanup_error:
-                    print(f"WARNING: Failed to clean up temp file: {cleanup_error}")
-                
-            except ImportError:
-                return jsonify({'success': False, 'message': 'PDF parsing not available. Please install PyMuPDF.'})
-            except Exception as e:
-                print(f"ERROR: PDF parsing failed: {str(e)}")
-                print(f"ERROR: Exception type: {type(e)}")
-                import traceback
-                traceback.print_exc()
-                
-                # Clean up temp file even if processing failed
-                try:
-                    if os.path.exists(temp_path):
-                        os.remove(temp_path)
-                        print(f"DEBUG: Temp file cleaned up after error: {temp_path}")
-                except Exception as cleanup_error:
-                    print(f"WARNING: Failed to clean up temp file after error: {cleanup_error}")
-                
-                return jsonify({'success': False, 'message': f'Error parsing PDF: {str(e)}'})
-                
-        elif file_ext in ['docx', 'doc']:
-            return jsonify({
-                'success': False, 
-                'message': 'Word documents not supported yet. Please convert to PDF format.'
-            })
-        else:
-            return jsonify({'success': False, 'message': 'Unsupported file format. Please upload PDF.'})
-        
         # Check if we actually extracted any text
         if len(resume_text.strip()) == 0:
             print("ERROR: No text extracted from resume file!")
-            return jsonify({
+            return {
                 'success': False, 
                 'message': 'Failed to extract text from the resume file. The file might be corrupted, password-protected, or in an unsupported format. Please try uploading a different PDF file.'
-            })
+            }
         
         print(f"DEBUG: Proceeding with AI parsing for text length: {len(resume_text)}")
         
         # Try AI parsing first, then fall back to regex
         ai_data = None
         try:
-            ai_data = parse_resume_with_ai(resume_text)
+            with timer.stage('ai'):
+                ai_data = parse_resume_with_ai(resume_text)
         except Exception as e:
             print(f"DEBUG: AI parsing failed: {e}")
             ai_data = None
@@ -1467,7 +1029,7 @@ def parse_resume():
             current_date = datetime.now().strftime('%Y%m%d')
             unique_id = str(uuid.uuid4())[:8].upper()
             reference_id = f'REF-{current_date}-{unique_id}'
-            
+        
             # Map AI response to frontend field names for 100% accuracy
             extracted_data = {
                 'name': ai_data.get('full_name', ''),
@@ -1478,7 +1040,7 @@ def parse_resume():
                 'experience': ai_data.get('experience', ''),
                 'reference_id': reference_id
             }
-            
+        
             # Verify extracted data against resume text
             print("DEBUG: Verifying extracted data against resume text...")
             verification_results = verify_extracted_data(extracted_data, resume_text)
@@ -1486,92 +1048,118 @@ def parse_resume():
                 print(f"WARNING: Data verification failed: {verification_results['issues']}")
                 # Try to correct the data
                 extracted_data = correct_extracted_data(extracted_data, resume_text)
-            
+        
             extracted_data['parsing_method'] = 'AI-Powered (GPT-3.5)'
             print(f"DEBUG: Final extracted data: {extracted_data}")
-            return jsonify({
+            return {
                 'success': True,
                 'message': 'Resume parsed successfully using AI',
                 'data': extracted_data,
                 'parsing_method': 'AI-Powered (GPT-3.5)'
-            })
-        
-        print("DEBUG: AI parsing failed, falling back to regex parsing")
-        
-        # Fallback to simple regex-based parsing
-        import re
-        
-        extracted_data = {
-            'name': '',
-            'email': '',
-            'phone': '',
-            'skills': [],
-            'education': '',
-            'experience': ''
-        }
-        
-        # Extract email
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, resume_text)
-        if emails:
-            extracted_data['email'] = emails[0]
+            }
         
-        # Extract phone number
-        phone_pattern = r'[\+]?[1-9]?[0-9]{7,15}'
-        phones = re.findall(phone_pattern, resume_text)
-        if phones:
-            extracted_data['phone'] = phones[0]
-        
-        # Better name extraction logic
-        lines = resume_text.split('\n')
-        for line in lines[:15]:  # Check first 15 lines
-            line = line.strip()
-            # Skip lines that are likely not names
-            if not line or len(line) < 2:
-                continue
-            if '@' in line or line.lower() in ['resume', 'cv', 'curriculum vitae']:
-                continue
-            if re.match(r'^\d+', line) or re.match(r'^phone', line.lower()):
-                continue
-            if re.match(r'^address', line.lower()) or re.match(r'^email', line.lower()):
-                continue
-            
-            # Check if line looks like a name (contains letters, reasonable length)
-            if any(c.isalpha() for c in line) and len(line.split()) <= 4 and len(line) <= 50:
-                # Additional checks for name-like patterns
-                words = line.split()
-                if len(words) >= 1 and all(word.replace('.', '').replace(',', '').isalpha() or len(word) <= 3 for word in words):
-                    extracted_data['name'] = line
-                    break
         
+        print("DEBUG: AI parsing failed, falling back to regex parsing")
+        with timer.stage('regex'):
+            extracted_data = extract_resume_fields_basic(resume_text)
         print(f"DEBUG: Fallback extracted data: {extracted_data}")
         
-        return jsonify({
+        return {
             'success': True,
             'message': 'Resume parsed successfully (basic extraction)',
             'data': extracted_data,
             'parsing_method': 'Basic Text Extraction'
-        })
+        }
+        
+    except Exception as e:
+        print(f"Error parsing resume: {str(e)}")
+        # Return basic fallback data even if everything fails
+        return dict(MANUAL_ENTRY_PAYLOAD)
+
+register_parser('recruiter', build_resume_payload)
+
+@recruiter_bp.route('/parse_resume', methods=['POST'])
+@recruiter_required  # Re-enabled with better error handling
+def parse_resume():
+    """Parse resume and extract candidate information"""
+    from resume_jobs import parse_upload, ResumeExtractionError
+    try:
+        print(f"DEBUG: parse_resume called with files: {list(request.files.keys())}")
+        
+        if 'resume' not in request.files:
+            print("DEBUG: No resume file in request.files")
+            return jsonify({'success': False, 'message': 'No resume file uploaded'})
+        
+        resume_file = request.files['resume']
+        if resume_file.filename == '':
+            print("DEBUG: Empty filename")
+            return jsonify({'success': False, 'message': 'No resume file selected'})
+        
+        format_error = _resume_format_error(resume_file.filename)
+        if format_error:
+            return jsonify({'success': False, 'message': format_error})
+        
+        data = resume_file.read()
+        if not data:
+            return jsonify({'success': False, 'message': 'The uploaded file appears to be empty or corrupted. Please try uploading a different file.'})
+        
+        # Extract and parse the resume (answered from the cache for files seen before)
+        try:
+            return jsonify(parse_upload('recruiter', data, 'pdf'))
+        except ResumeExtractionError as e:
+            return jsonify({'success': False, 'message': str(e)})
         
     except Exception as e:
         print(f"Error parsing resume: {str(e)}")
         # Return basic fallback data even if everything fails
+        return jsonify(MANUAL_ENTRY_PAYLOAD)
+
+@recruiter_bp.route('/parse_resume/jobs', methods=['POST'])
+@recruiter_required
+def submit_resume_job():
+    """Queue a resume for background parsing and return the job id immediately"""
+    from resume_jobs import get_queue
+    try:
+        resume_file = request.files.get('resume')
+        if not resume_file or resume_file.filename == '':
+            return jsonify({'success': False, 'message': 'No resume file uploaded'}), 400
+        
+        format_error = _resume_format_error(resume_file.filename)
+        if format_error:
+            return jsonify({'success': False, 'message': format_error}), 400
+        
+        data = resume_file.read()
+        if not data:
+            return jsonify({'success': False, 'message': 'The uploaded file appears to be empty or corrupted. Please try uploading a different file.'}), 400
+        
+        job_id = get_queue().submit('recruiter', current_user.email, secure_filename(resume_file.filename),
+                                    'pdf', data)
         return jsonify({
             'success': True,
-            'message': 'Resume uploaded successfully (manual entry required)',
-            'data': {
-                'name': '',
-                'email': '',
-                'phone': '',
-                'skills': '',
-                'education': '',
-                'experience': ''
-            },
-            'parsing_method': 'Manual Entry Required'
-        })
+            'job_id': str(job_id),
+            'status': 'queued',
+            'poll_url': url_for('recruiter.resume_job_status', job_id=str(job_id))
+        }), 202
+        
+    except Exception as e:
+        print(f"Error queueing resume: {e}")
+        return jsonify({'success': False, 'message': f'Error queueing resume: {str(e)}'}), 500
+
+@recruiter_bp.route('/parse_resume/jobs/<job_id>')
+@recruiter_required
+def resume_job_status(job_id):
+    """Poll a resume parsing job"""
+    from resume_jobs import get_queue, public_job
+    if not ObjectId.is_valid(job_id):
+        return jsonify({'success': False, 'message': 'Job not found'}), 404
+    job = get_queue().get(ObjectId(job_id), current_user.email)
+    if not job:
+        return jsonify({'success': False, 'message': 'Job not found'}), 404
+    return jsonify({'success': True, **public_job(job)})
 
 @recruiter_bp.route('/api/analytics')
 @recruiter_required  
+@cached_response('candidates', 'users', per_user=True)
 def api_analytics():
     """API endpoint for analytics data"""
     try:
@@ -1708,96 +1296,24 @@ def api_analytics():
 def view_candidate_requests():
     """Page to display all candidate requests from all managers"""
     try:
-        from models_mongo import candidate_requests_collection, users_collection
-        
-        # Get all active requests directly from collection
-        requests_data = list(candidate_requests_collection.find({'status': {'$ne': 'Completed'}}))
-        
-        # Process each request with enhanced data
-        enhanced_requests = []
-        for request in requests_data:
-            request['_id'] = str(request['_id'])
-            
-            # Add manager information
-            if request.get('manager_email'):
-                manager = users_collection.find_one({'email': request['manager_email']})
-                if manager:
-                    request['requester_name'] = f"{manager.get('first_name', '')} {manager.get('last_name', '')}"
-                    request['requester_email'] = request['manager_email']
-                else:
-                    request['requester_name'] = request.get('manager_email', 'Unknown')
-                    request['requester_email'] = request.get('manager_email', 'N/A')
-            
-            # Map correct field names for template
-            request['job_title'] = request.get('position_title', 'N/A')
-            request['open_positions'] = request.get('quantity_needed', 0)
-            
-            # Calculate remaining positions
-            assigned_count = request.get('assigned_count', 0)
-            onboarded_count = request.get('onboarded_count', 0)
-            request['remaining_positions'] = request['open_positions'] - onboarded_count
-            
-            # Calculate deadline status based on created_at
-            if request.get('created_at'):
-                try:
-                    if isinstance(request['created_at'], str):
-                        created_at_str = request['created_at']
-                        if 'T' in created_at_str:
-                            if created_at_str.endswith('Z'):
-                                created_at_str = created_at_str[:-1] + '+00:00'
-                            elif '+' not in created_at_str and 'Z' not in created_at_str:
-                                created_at_str += '+00:00'
-                            requested_date = datetime.fromisoformat(created_at_str)
-                        else:
-                            requested_date = datetime.fromisoformat(created_at_str)
-                    else:
-                        requested_date = request['created_at']
-                    
-                    # Calculate days since request
-                    days_since_request = (datetime.now() - requested_date.replace(tzinfo=None)).days
-                    
-                    # Set deadline status based on days since request
-                    if days_since_request > 15:
-                        request['deadline_status'] = 'overdue'
-                        request['deadline_color'] = 'red'
-                        request['urgency_level'] = 'Critical'
-                    elif days_since_request > 7:
-                        request['deadline_status'] = 'urgent'
-                        request['deadline_color'] = 'yellow'
-                        request['urgency_level'] = 'High'
-                    else:
-                        request['deadline_status'] = 'active'
-                        request['deadline_color'] = 'green'
-                        request['urgency_level'] = 'Normal'
-                    
-                    request['days_since_request'] = days_since_request
-                    request['requested_date_formatted'] = requested_date.strftime('%Y-%m-%d')
-                    
-                except Exception as e:
-                    print(f"Error processing created_at for request {request.get('_id')}: {e}")
-                    request['deadline_status'] = 'unknown'
-                    request['deadline_color'] = 'gray'
-                    request['days_since_request'] = 0
-                    request['urgency_level'] = 'Unknown'
-            
-            enhanced_requests.append(request)
+        from models_mongo import candidate_requests_collection
         
-        # Calculate totals
-        total_requested = sum(req['open_positions'] for req in enhanced_requests)
-        total_remaining = sum(req['remaining_positions'] for req in enhanced_requests)
-        total_assigned = sum(req.get('assigned_count', 0) for req in enhanced_requests)
-        total_onboarded = sum(req.get('onboarded_count', 0) for req in enhanced_requests)
+        # All active requests with manager names, deadline status and totals from one query
+        from candidate_requests import request_listing, URGENCY_BY_DEADLINE_STATUS
+        enhanced_requests, totals = request_listing(candidate_requests_collection, {'status': {'$ne': 'Completed'}})
         
-        # Get unique manager emails for filtering
-        manager_emails = list(set(req.get('manager_email', '') for req in enhanced_requests if req.get('manager_email')))
+        for request in enhanced_requests:
+            # Urgency follows the deadline status
+            if request.get('deadline_status'):
+                request['urgency_level'] = URGENCY_BY_DEADLINE_STATUS.get(request['deadline_status'], 'Normal')
         
         return render_template('recruiter/candidate_requests.html', 
                              requests=enhanced_requests,
-                             total_requested=total_requested,
-                             total_remaining=total_remaining,
-                             total_assigned=total_assigned,
-                             total_onboarded=total_onboarded,
-                             manager_emails=manager_emails)
+                             total_requested=totals['total_requested'],
+                             total_remaining=totals['total_remaining'],
+                             total_assigned=totals['total_assigned'],
+                             total_onboarded=totals['total_onboarded'],
+                             manager_emails=totals['manager_emails'])
                              
     except Exception as e:
         print(f"Error loading candidate requests: {str(e)}")
@@ -32,6 +32,10 @@ def main():
         print(f"⚠️  Could not initialize production database: {e}")
         print("The application will start, but admin features may not work.")
     
+    # Pick up resume jobs queued before the restart
+    import resume_jobs
+    resume_jobs.start_workers()
+    
     print("✅ Application ready")
     print("🌐 Starting server...")
     print("📱 Visit: http://localhost:5001")
@@ -0,0 +1,66 @@
+"""Tests for activity_log_archive.py"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from unittest.mock import MagicMock
+from datetime import datetime
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+from activity_log_archive import archive_activity_logs, build_log_query, export_log_rows
+
+
+def _logs_collection(batches):
+    collection = MagicMock()
+    collection.find.return_value.sort.return_value.limit.side_effect = batches
+    return collection
+
+
+def test_old_logs_are_moved_in_batches():
+    """Test entries are copied with their month and then deleted, batch by batch"""
+    first = [{'_id': ObjectId(), 'timestamp': datetime(2024, 1, 5), 'action': 'Login'},
+             {'_id': ObjectId(), 'timestamp': datetime(2024, 2, 1), 'action': 'Login'}]
+    second = [{'_id': ObjectId(), 'timestamp': datetime(2024, 3, 1), 'action': 'Logout'}]
+    logs, archive = _logs_collection([first, second, []]), MagicMock()
+
+    moved = archive_activity_logs(logs, archive, datetime(2024, 6, 1), batch_size=2)
+
+    assert moved == 3
+    assert logs.find.call_args[0][0] == {'timestamp': {'$lt': datetime(2024, 6, 1)}}
+    assert [doc['month'] for call in archive.insert_many.call_args_list for doc in call[0][0]] == ['2024-01', '2024-02', '2024-03']
+    deleted = [call[0][0]['_id']['$in'] for call in logs.delete_many.call_args_list]
+    assert deleted == [[doc['_id'] for doc in first], [second[0]['_id']]]
+
+
+def test_rerun_after_interruption_skips_already_archived_entries():
+    """Test duplicate-key errors from a previous partial run do not stop the move"""
+    batch = [{'_id': ObjectId(), 'timestamp': datetime(2024, 1, 5)}]
+    logs, archive = _logs_collection([batch, []]), MagicMock()
+    archive.insert_many.side_effect = BulkWriteError({'writeErrors': [{'index': 0, 'code': 11000}]})
+
+    assert archive_activity_logs(logs, archive, datetime(2024, 6, 1)) == 1
+    logs.delete_many.assert_called_once()
+
+
+def test_build_log_query_filters():
+    """Test user, action, inclusive date range and archive month filters"""
+    query = build_log_query(user=' hr@example.com ', action='bulk (moved', date_from='2025-01-01',
+                            date_to='2025-01-31', month='2025-01')
+    assert query['user_email'] == 'hr@example.com'
+    assert query['action'] == {'$regex': r'bulk\ \(moved', '$options': 'i'}
+    assert query['timestamp'] == {'$gte': datetime(2025, 1, 1), '$lt': datetime(2025, 2, 1)}
+    assert query['month'] == '2025-01'
+    assert build_log_query() == {}
+
+
+def test_export_rows_format_entries():
+    """Test export rows are projected and formatted for CSV"""
+    collection = MagicMock()
+    collection.find.return_value.sort.return_value = iter([
+        {'timestamp': datetime(2025, 1, 2, 3, 4, 5), 'user_email': 'a@example.com', 'action': 'Login'}
+    ])
+
+    rows = list(export_log_rows(collection, {'month': '2025-01'}))
+
+    assert rows == [['2025-01-02 03:04:05', 'a@example.com', 'Login', '', '']]
+    assert collection.find.call_args[0][1]['_id'] == 0
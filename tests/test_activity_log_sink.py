@@ -0,0 +1,92 @@
+"""Tests for activity_log_sink.py"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import time
+from unittest.mock import MagicMock
+from activity_log_sink import ActivityLogSink
+
+
+def _written(collection):
+    return [doc for call in collection.insert_many.call_args_list for doc in call[0][0]]
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_entries_are_written_in_batches():
+    """Test a burst of entries is written with a few insert_many calls, not one per entry"""
+    collection = MagicMock()
+    sink = ActivityLogSink(collection, batch_size=50, flush_seconds=0.2)
+
+    for i in range(120):
+        assert sink.log({'action': f'action {i}'})
+    assert _wait_for(lambda: len(_written(collection)) == 120)
+    sink.close()
+
+    assert collection.insert_many.call_count <= 4
+    assert [doc['action'] for doc in _written(collection)] == [f'action {i}' for i in range(120)]
+    assert sink.stats()['written'] == 120
+
+
+def test_partial_batch_is_flushed_after_interval():
+    """Test a single entry is written once the flush interval passes"""
+    collection = MagicMock()
+    sink = ActivityLogSink(collection, batch_size=100, flush_seconds=0.05)
+
+    sink.log({'action': 'login'})
+
+    assert _wait_for(lambda: collection.insert_many.called)
+    sink.close()
+
+
+def test_full_buffer_drops_after_backpressure_timeout():
+    """Test the bounded buffer rejects entries instead of growing when writes stall"""
+    collection = MagicMock()
+    sink = ActivityLogSink(collection, max_queue=2, block_seconds=0.01)
+    sink.start = lambda: None  # no background writer, so the buffer fills up
+
+    results = [sink.log({'action': str(i)}) for i in range(4)]
+
+    assert results == [True, True, False, False]
+    assert sink.stats()['dropped'] == 2
+    sink.close()
+    assert [doc['action'] for doc in _written(collection)] == ['0', '1']
+
+
+def test_failed_writes_are_retried_then_counted():
+    """Test a transient insert failure is retried and a persistent one is counted"""
+    collection = MagicMock()
+    collection.insert_many.side_effect = [Exception('down'), None]
+    sink = ActivityLogSink(collection)
+    sink.start = lambda: None
+    sink.log({'action': 'a'})
+    sink.flush()
+    assert sink.stats()['written'] == 1
+
+    collection.insert_many.side_effect = Exception('down')
+    sink.log({'action': 'b'})
+    sink.flush()
+    assert sink.stats()['failed'] == 1
+
+
+def test_activity_log_save_hands_document_to_sink():
+    """Test ActivityLog.save() buffers the entry with a client-side id instead of inserting it"""
+    from unittest.mock import patch
+    import activity_log_sink
+    from models_mongo import ActivityLog, activity_logs_collection
+
+    with patch.object(activity_log_sink, 'get_sink') as get_sink, \
+            patch.object(activity_logs_collection, 'insert_one') as insert_one:
+        log = ActivityLog('user@example.com', 'login')
+        log.save()
+
+    document = get_sink.return_value.log.call_args[0][0]
+    assert str(document['_id']) == log._id
+    assert document['action'] == 'login'
+    insert_one.assert_not_called()
@@ -0,0 +1,64 @@
+"""Tests for analytics_mongo.py"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from unittest.mock import MagicMock
+from analytics_mongo import build_candidate_analytics_pipeline, get_candidate_analytics
+
+
+def test_pipeline_is_single_facet():
+    """Test the pipeline ends in one $facet stage with every bucket"""
+    pipeline = build_candidate_analytics_pipeline()
+    assert '$facet' in pipeline[-1]
+    assert set(pipeline[-1]['$facet']) >= {'status', 'position', 'month', 'week', 'assigned_by'}
+
+
+def test_pipeline_with_match():
+    """Test an optional filter becomes the first stage"""
+    pipeline = build_candidate_analytics_pipeline({'recruiter_email': 'r@example.com'})
+    assert pipeline[0] == {'$match': {'recruiter_email': 'r@example.com'}}
+
+
+def test_get_candidate_analytics_shapes_result():
+    """Test facet output is turned into the endpoint payload"""
+    candidates = MagicMock()
+    candidates.aggregate.return_value = iter([{
+        'total': [{'count': 4}],
+        'status': [{'_id': 'Selected', 'count': 2}, {'_id': 'Pending', 'count': 2}],
+        'position': [{'_id': 'Developer', 'count': 4}],
+        'department': [{'_id': 'General', 'count': 4}],
+        'experience': [{'_id': 0, 'count': 1}, {'_id': 3, 'count': 3}],
+        'month': [{'_id': '2025-01', 'count': 4, 'selected': 2}],
+        'week': [{'_id': '2025-01-06', 'applications': 4, 'selections': 2}],
+        'assigned_by': [{'_id': 'hr@example.com', 'count': 3, 'selected': 2}],
+    }])
+    users = MagicMock()
+    users.find.return_value = [{'email': 'hr@example.com', 'name': 'HR One'},
+                               {'email': 'idle@example.com', 'name': 'Idle HR'}]
+
+    data = get_candidate_analytics(candidates, users)
+
+    assert candidates.aggregate.call_count == 1
+    assert data['total_candidates'] == 4
+    assert data['success_rate'] == 50.0
+    assert data['pending_count'] == 2
+    assert data['experience_levels'] == [1, 0, 0, 3]
+    assert data['monthly_stats'] == {'2025-01': 4}
+    assert data['monthly_success'] == {'2025-01': 50.0}
+    assert data['weekly_trends'] == {'2025-01-06': {'applications': 4, 'selections': 2}}
+    assert data['hr_performance'] == [
+        {'name': 'HR One', 'candidates_added': 3, 'successful_placements': 2},
+        {'name': 'Idle HR', 'candidates_added': 0, 'successful_placements': 0},
+    ]
+
+
+def test_get_candidate_analytics_empty_collection():
+    """Test an empty collection yields zeroed analytics"""
+    candidates = MagicMock()
+    candidates.aggregate.return_value = iter([{'total': [], 'status': []}])
+    users = MagicMock()
+    users.find.return_value = []
+    data = get_candidate_analytics(candidates, users)
+    assert data['total_candidates'] == 0
+    assert data['success_rate'] == 0
@@ -0,0 +1,75 @@
+"""Tests for the admin bulk invite helpers"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from unittest.mock import MagicMock
+from pymongo.errors import BulkWriteError
+from routes.admin_mongo import parse_invite_rows, bulk_add_users_and_send_invites
+
+
+def _collections(existing=()):
+    user_emails = MagicMock()
+    user_emails.find.return_value = [{'email': email} for email in existing]
+    return user_emails, MagicMock()
+
+
+def test_parse_invite_rows_csv_and_lists():
+    """Test CSV uploads with a header, per-row roles and comma separated lists"""
+    text = 'email,role\na@example.com,manager\nb@example.com\n\nc@example.com, d@example.com\n'
+    assert parse_invite_rows(text, 'hr') == [
+        ('a@example.com', 'manager'), ('b@example.com', 'hr'), ('c@example.com', 'hr'), ('d@example.com', 'hr')
+    ]
+
+
+def test_bulk_invite_batches_every_step():
+    """Test one $in lookup, one insert_many per collection and one outbox call for the whole list"""
+    user_emails, activity_logs = _collections(existing=['old@example.com'])
+    send_invites = MagicMock(return_value=True)
+    rows = [('new1@example.com', 'recruiter'), ('old@example.com', 'hr'), ('bad-email', 'hr'),
+            ('new2@example.com', 'Cluster Member'), ('new1@example.com', 'manager'), ('new3@example.com', 'ceo')]
+
+    results = bulk_add_users_and_send_invites(rows, 'admin@example.com', 'http://portal/', user_emails,
+                                              activity_logs, send_invites=send_invites)
+
+    assert [result['status'] for result in results] == ['invited', 'exists', 'invalid', 'invited', 'duplicate', 'invalid']
+    assert [result['row'] for result in results] == [1, 2, 3, 4, 5, 6]
+    assert user_emails.find.call_count == 1
+    assert set(user_emails.find.call_args[0][0]['email']['$in']) == {'new1@example.com', 'old@example.com', 'new2@example.com'}
+
+    saved = user_emails.insert_many.call_args[0][0]
+    assert [(doc['email'], doc['role'], doc['assigned_by']) for doc in saved] == [
+        ('new1@example.com', 'Recruiter', 'admin@example.com'), ('new2@example.com', 'Cluster Member', 'admin@example.com')
+    ]
+    invites = send_invites.call_args[0][0]
+    assert [(email, role) for email, role, _ in invites] == [('new1@example.com', 'Recruiter'), ('new2@example.com', 'Cluster Member')]
+    assert invites[0][2].startswith('http://portal/register?token=')
+    assert [log['target_email'] for log in activity_logs.insert_many.call_args[0][0]] == ['new1@example.com', 'new2@example.com']
+
+
+def test_bulk_invite_reports_failed_inserts():
+    """Test rows rejected by insert_many are reported and not invited"""
+    user_emails, activity_logs = _collections()
+    user_emails.insert_many.side_effect = BulkWriteError({'writeErrors': [{'index': 1, 'errmsg': 'duplicate key'}]})
+    send_invites = MagicMock(return_value=True)
+
+    results = bulk_add_users_and_send_invites([('a@example.com', 'hr'), ('b@example.com', 'hr')], 'admin@example.com',
+                                              'http://portal', user_emails, activity_logs, send_invites=send_invites)
+
+    assert [result['status'] for result in results] == ['invited', 'error']
+    assert results[1]['message'] == 'duplicate key'
+    assert [email for email, _, _ in send_invites.call_args[0][0]] == ['a@example.com']
+
+
+def test_bulk_invite_without_new_emails_writes_nothing():
+    """Test a list of already invited emails performs no inserts or sends"""
+    user_emails, activity_logs = _collections(existing=['a@example.com'])
+    send_invites = MagicMock()
+
+    results = bulk_add_users_and_send_invites([('a@example.com', 'hr')], 'admin@example.com', 'http://portal',
+                                              user_emails, activity_logs, send_invites=send_invites)
+
+    assert results[0]['status'] == 'exists'
+    user_emails.insert_many.assert_not_called()
+    activity_logs.insert_many.assert_not_called()
+    send_invites.assert_not_called()
@@ -0,0 +1,113 @@
+"""Tests for the atomic CandidateRequest counters
+
+The concurrency tests run against a real mongod (MONGODB_URI, default
+localhost) in a scratch database and are skipped when none is reachable.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, call, patch
+from bson import ObjectId
+from pymongo import MongoClient, ReturnDocument
+from pymongo.errors import PyMongoError
+import models_mongo
+from models_mongo import CandidateRequest
+
+TEST_DB = os.getenv('TEST_DB', 'invensis_test_counts')
+THREADS = 16
+
+
+@pytest.fixture
+def requests_collection():
+    """A scratch candidate_requests collection on a real mongod, patched into models_mongo"""
+    uri = os.getenv('MONGODB_URI', 'mongodb://localhost:27017')
+    if uri.startswith('mongodb+srv://'):
+        pytest.skip('MONGODB_URI points at a hosted cluster, not a scratch mongod')
+    client = MongoClient(uri, serverSelectionTimeoutMS=1000)
+    try:
+        client.admin.command('ping')
+    except PyMongoError as e:
+        client.close()
+        pytest.skip(f'no mongod reachable at {uri}: {e}')
+    collection = client[TEST_DB]['candidate_requests']
+    try:
+        with patch.object(models_mongo, 'candidate_requests_collection', collection), \
+                patch('response_cache.invalidate'), patch('builtins.print'):
+            yield collection
+    finally:
+        client.drop_database(TEST_DB)
+        client.close()
+
+
+def _request(**fields):
+    return {'_id': ObjectId(), 'manager_email': 'm@example.com', 'position_title': 'Dev',
+            'quantity_needed': 5, 'urgency_level': 'High', 'status': 'Active', **fields}
+
+
+def _hammer(request_id, count, **increments):
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        return list(pool.map(lambda _: CandidateRequest.increment_counts(request_id, **increments), range(count)))
+
+
+def test_concurrent_increments_are_not_lost(requests_collection):
+    """Test many threads assigning and onboarding against one request keep every increment"""
+    request_id = requests_collection.insert_one(_request(quantity_needed=150)).inserted_id
+
+    assigned = _hammer(str(request_id), 200, assigned=1)
+    onboarded = _hammer(str(request_id), 150, onboarded=1)
+
+    assert all(assigned) and all(onboarded)
+    stored = requests_collection.find_one({'_id': request_id})
+    assert (stored['assigned_count'], stored['onboarded_count']) == (200, 150)
+    assert stored['status'] == 'Completed'
+    # Exactly one write saw the last position filled, and every write before it saw an open request
+    assert sorted(request.onboarded_count for request in onboarded) == list(range(1, 151))
+    assert [request.onboarded_count for request in onboarded if request.status == 'Completed'] == [150]
+
+
+def test_request_completes_when_last_position_is_onboarded(requests_collection):
+    """Test the status flips to Completed in the same write that onboards the last candidate"""
+    request_id = requests_collection.insert_one(
+        _request(quantity_needed=2, onboarded_count=1, assigned_count=2)).inserted_id
+
+    with patch('response_cache.invalidate') as invalidate:
+        request = CandidateRequest.increment_counts(str(request_id), onboarded=1)
+
+    assert (request.onboarded_count, request.status, request.remaining_count) == (2, 'Completed', 0)
+    assert requests_collection.find_one({'_id': request_id})['status'] == 'Completed'
+    invalidate.assert_called_once_with('requests')
+
+
+def test_increment_is_one_server_side_pipeline_write():
+    """Test the counts are changed by a single find_one_and_update pipeline, never read-modify-write"""
+    collection = MagicMock()
+    collection.find_one_and_update.return_value = _request(assigned_count=1)
+    request_id = ObjectId()
+
+    with patch.object(models_mongo, 'candidate_requests_collection', collection), \
+            patch('response_cache.invalidate'):
+        CandidateRequest.increment_counts(str(request_id), assigned=1)
+
+    assert collection.mock_calls == [call.find_one_and_update(
+        {'_id': request_id}, CandidateRequest.counter_update(1, 0), return_document=ReturnDocument.AFTER
+    )]
+    pipeline = collection.find_one_and_update.call_args[0][1]
+    assert isinstance(pipeline, list)
+    assert pipeline[0]['$set']['assigned_count'] == {'$add': [{'$ifNull': ['$assigned_count', 0]}, 1]}
+    assert pipeline[1]['$set']['status'] == {
+        '$cond': [{'$gte': ['$onboarded_count', '$quantity_needed']}, 'Completed', '$status']}
+
+
+def test_missing_request_returns_none():
+    """Test an unknown request id changes nothing"""
+    collection = MagicMock()
+    collection.find_one_and_update.return_value = None
+
+    with patch.object(models_mongo, 'candidate_requests_collection', collection), \
+            patch('response_cache.invalidate') as invalidate:
+        assert CandidateRequest.increment_counts(str(ObjectId()), assigned=1) is None
+
+    invalidate.assert_not_called()
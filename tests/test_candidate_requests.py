@@ -0,0 +1,81 @@
+"""Tests for candidate_requests.py"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from unittest.mock import MagicMock
+from candidate_requests import list_candidate_requests, request_listing, deadline_stages, totals_stage, EMPTY_TOTALS
+
+
+def test_listing_is_one_aggregation_with_deadline_fields():
+    """Test the match, sort and deadline stages are sent as a single pipeline"""
+    collection = MagicMock()
+    collection.aggregate.return_value = [{'_id': 'abc', 'deadline_status': 'urgent'}]
+
+    rows = list_candidate_requests(collection, {'status': {'$ne': 'Completed'}}, sort={'created_at': -1})
+
+    assert rows == [{'_id': 'abc', 'deadline_status': 'urgent'}]
+    pipeline = collection.aggregate.call_args[0][0]
+    assert pipeline[0] == {'$match': {'status': {'$ne': 'Completed'}}}
+    assert pipeline[1] == {'$sort': {'created_at': -1}}
+    assert pipeline[-1] == {'$addFields': {'_id': {'$toString': '$_id'}}}
+
+
+def test_age_is_computed_with_date_diff_on_dates_and_legacy_strings():
+    """Test $dateDiff runs on created_at converted to a date (null if it is not one) and null results are removed"""
+    fields = deadline_stages()[0]['$addFields']
+    since = fields['days_since_request']['$ifNull']
+
+    assert since[1] == '$$REMOVE'
+    date_diff = since[0]['$dateDiff']
+    assert date_diff['endDate'] == '$$NOW' and date_diff['unit'] == 'day'
+    assert date_diff['startDate'] == {'$convert': {'input': '$created_at', 'to': 'date',
+                                                   'onError': None, 'onNull': None}}
+
+
+def test_deadline_rules_order():
+    """Test a legacy deadline wins over the request age and the thresholds match the dashboard"""
+    status = deadline_stages()[1]['$addFields']['deadline_status']['$switch']
+    color = deadline_stages()[1]['$addFields']['deadline_color']['$switch']
+
+    assert [branch['then'] for branch in status['branches']] == [
+        'overdue', 'urgent', 'warning', 'good', 'overdue', 'urgent', 'active']
+    assert [branch['then'] for branch in color['branches']] == [
+        'red', 'yellow', 'orange', 'green', 'red', 'yellow', 'green']
+    assert status['branches'][4]['case']['$and'][1] == {'$gt': ['$days_since_request', 15]}
+    assert status['default'] == '$$REMOVE'
+
+
+def test_manager_is_joined_with_one_lookup():
+    """Test requester names come from a $lookup on users.email instead of a query per request"""
+    collection = MagicMock()
+    collection.aggregate.return_value = []
+
+    list_candidate_requests(collection)
+
+    pipeline = collection.aggregate.call_args[0][0]
+    lookups = [stage['$lookup'] for stage in pipeline if '$lookup' in stage]
+    assert len(lookups) == 1
+    assert (lookups[0]['from'], lookups[0]['localField'], lookups[0]['foreignField']) == ('users', 'manager_email', 'email')
+
+
+def test_request_listing_returns_rows_and_grouped_totals():
+    """Test rows and totals come from one $facet and missing totals default to zero"""
+    collection = MagicMock()
+    collection.aggregate.return_value = iter([{
+        'requests': [{'_id': 'a', 'requester_name': 'Max Fox'}],
+        'totals': [{'_id': None, 'total_requested': 5, 'total_remaining': 3, 'total_assigned': 2,
+                    'total_onboarded': 2, 'active_requested': 5, 'active_remaining': 3,
+                    'manager_emails': ['m@x.com', None, '']}]
+    }])
+
+    rows, totals = request_listing(collection, {'status': {'$ne': 'Completed'}})
+
+    assert collection.aggregate.call_count == 1
+    facet = collection.aggregate.call_args[0][0][1]['$facet']
+    assert facet['totals'] == [totals_stage()]
+    assert rows == [{'_id': 'a', 'requester_name': 'Max Fox'}]
+    assert totals['total_requested'] == 5 and totals['manager_emails'] == ['m@x.com']
+
+    collection.aggregate.return_value = iter([{'requests': [], 'totals': []}])
+    assert request_listing(collection)[1] == EMPTY_TOTALS
@@ -0,0 +1,55 @@
+"""Tests for CandidateSummary list rows"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pytest
+from unittest.mock import patch
+from datetime import datetime
+from bson import ObjectId
+from models_mongo import Candidate, CandidateSummary, CANDIDATE_SUMMARY_PROJECTION
+
+
+def _document(**fields):
+    return {'_id': ObjectId(), 'first_name': 'Ada', 'last_name': 'Lovelace', 'email': 'ada@example.com',
+            'phone': '123', 'gender': 'F', 'education': 'BSc', 'experience': '5', 'status': 'Pending',
+            'overall_rating': None, 'created_at': datetime(2025, 1, 2), **fields}
+
+
+def test_summary_matches_candidate_for_list_fields():
+    """Test every field a list template reads has the value Candidate.from_dict would give it"""
+    data = _document(manager_feedback='Good', job_fit=4)
+    summary, candidate = CandidateSummary.from_dict(data), Candidate.from_dict(data)
+
+    for field in CandidateSummary.__slots__:
+        if field != 'reference_id':  # Candidate.from_dict invents one when it is missing
+            assert getattr(summary, field) == getattr(candidate, field), field
+    assert summary.reference_id is None
+
+
+def test_defaults_and_old_schema_name():
+    """Test missing status/ratings get the model defaults and an old `name` is split"""
+    summary = CandidateSummary.from_dict({'_id': ObjectId(), 'name': 'Grace Brewster Hopper'})
+
+    assert (summary.first_name, summary.last_name) == ('Grace', 'Brewster Hopper')
+    assert (summary.status, summary.onboarding_status, summary.overall_rating) == ('New', 'Not Onboarded', 0)
+
+
+def test_summary_is_slotted_and_read_only():
+    """Test rows carry no per-instance dict and cannot be modified"""
+    summary = CandidateSummary.from_dict(_document())
+
+    assert not hasattr(summary, '__dict__')
+    with pytest.raises(AttributeError):
+        summary.status = 'Selected'
+
+
+def test_projection_and_full_hydration():
+    """Test only the summary fields are read and full() loads the complete Candidate"""
+    assert set(CANDIDATE_SUMMARY_PROJECTION) == set(CandidateSummary.__slots__) | {'name'}
+    assert 'skills' not in CANDIDATE_SUMMARY_PROJECTION
+
+    summary = CandidateSummary.from_dict(_document())
+    with patch.object(Candidate, 'find_by_id', return_value='full candidate') as find_by_id:
+        assert summary.full() == 'full candidate'
+    find_by_id.assert_called_once_with(summary._id)
@@ -0,0 +1,92 @@
+"""Tests for db_indexes.py"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from unittest.mock import MagicMock
+from pymongo.errors import DuplicateKeyError, OperationFailure
+from db_indexes import INDEX_SPECS, SUPERSEDED_INDEXES, ensure_indexes, report_query_plans, _plan_stages
+
+
+def _database_with_plan(winning_plan):
+    database = MagicMock()
+    cursor = database.__getitem__.return_value.find.return_value
+    cursor.sort.return_value = cursor
+    cursor.limit.return_value = cursor
+    cursor.explain.return_value = {'queryPlanner': {'winningPlan': winning_plan}}
+    return database
+
+
+def test_ensure_indexes_creates_every_spec():
+    """Test ensure_indexes() calls create_index once per declared index"""
+    database = MagicMock()
+    ensured = ensure_indexes(database)
+    expected = sum(len(specs) for specs in INDEX_SPECS.values())
+    assert len(ensured) == expected
+    assert database.__getitem__.return_value.create_index.call_count == expected
+    assert 'users.email_unique' in ensured
+    assert 'candidates.status_created_at_id' in ensured
+
+
+def test_ensure_indexes_continues_after_failure():
+    """Test a duplicate key error on one index does not stop the others"""
+    database = MagicMock()
+    database.__getitem__.return_value.create_index.side_effect = [DuplicateKeyError('dup')] + [None] * 100
+    ensured = ensure_indexes(database)
+    expected = sum(len(specs) for specs in INDEX_SPECS.values())
+    assert len(ensured) == expected - 1
+
+
+def test_ensure_indexes_drops_superseded_indexes():
+    """Test the replaced manager indexes are dropped and an already dropped one is ignored"""
+    database = MagicMock()
+    collection = database.__getitem__.return_value
+    collection.drop_index.side_effect = [None, OperationFailure('index not found', code=27)]
+    ensure_indexes(database)
+    superseded = SUPERSEDED_INDEXES['candidates']
+    assert [call[0][0] for call in collection.drop_index.call_args_list] == list(superseded)
+    names = {options['name'] for specs in INDEX_SPECS.values() for _, options in specs}
+    assert set(superseded.values()) <= names
+    assert not names & set(superseded)
+
+
+def test_ensure_indexes_keeps_superseded_index_when_replacement_fails():
+    """Test an old index is not dropped if creating its replacement failed"""
+    database = MagicMock()
+    collection = database.__getitem__.return_value
+
+    def create_index(keys, name, **options):
+        if name == 'manager_email_status_updated_at_id':
+            raise OperationFailure('index build failed')
+    collection.create_index.side_effect = create_index
+
+    ensured = ensure_indexes(database)
+    assert 'candidates.manager_email_status_updated_at_id' not in ensured
+    assert [call[0][0] for call in collection.drop_index.call_args_list] == ['reassigned_by_manager_status']
+
+
+def test_plan_stages_walks_nested_plans():
+    """Test _plan_stages() flattens inputStage and inputStages"""
+    plan = {
+        'stage': 'FETCH',
+        'inputStage': {
+            'stage': 'SORT_MERGE',
+            'inputStages': [{'stage': 'IXSCAN'}, {'stage': 'IXSCAN'}]
+        }
+    }
+    assert _plan_stages(plan) == ['FETCH', 'SORT_MERGE', 'IXSCAN', 'IXSCAN']
+
+
+def test_report_query_plans_flags_collscan():
+    """Test report_query_plans() returns queries that do a COLLSCAN"""
+    database = _database_with_plan({'stage': 'SORT', 'inputStage': {'stage': 'COLLSCAN'}})
+    registry = [{'name': 'q1', 'collection': 'candidates', 'filter': {'status': 'Pending'},
+                 'sort': [('created_at', -1)]}]
+    assert report_query_plans(database, registry) == ['q1']
+
+
+def test_report_query_plans_passes_index_scan():
+    """Test report_query_plans() accepts index scans"""
+    database = _database_with_plan({'stage': 'FETCH', 'inputStage': {'stage': 'IXSCAN'}})
+    registry = [{'name': 'q1', 'collection': 'users', 'filter': {'email': 'a@b.com'}}]
+    assert report_query_plans(database, registry) == []
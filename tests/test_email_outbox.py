@@ -0,0 +1,104 @@
+"""Tests for email_outbox.py"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import smtplib
+from unittest.mock import MagicMock
+from datetime import datetime, timedelta
+from bson import ObjectId
+from email_outbox import (EmailOutbox, SmtpConnection, build_message, retry_delay, is_permanent_failure,
+                          MAX_ATTEMPTS, RETRY_MAX_SECONDS)
+
+SETTINGS = {'host': 'smtp.example.com', 'port': 587, 'default_sender': 'portal@example.com'}
+
+
+def _message(**fields):
+    doc = {'_id': ObjectId(), 'subject': 'Hello', 'recipients': ['a@example.com'], 'body': 'Hi',
+           'attempts': 1, 'created_at': datetime.utcnow() - timedelta(seconds=1)}
+    doc.update(fields)
+    return doc
+
+
+def _updates(collection):
+    return [call[0][1]['$set'] for call in collection.update_one.call_args_list]
+
+
+def test_batch_is_sent_over_one_connection():
+    """Test a batch of messages costs one SMTP login, not one per message"""
+    server = MagicMock()
+    connect = MagicMock(return_value=server)
+    outbox = EmailOutbox(MagicMock(), SETTINGS, connect=connect)
+
+    sent = outbox.deliver([_message() for _ in range(20)], SmtpConnection(SETTINGS, connect))
+
+    assert sent == 20
+    assert connect.call_count == 1
+    assert server.send_message.call_count == 20
+    assert outbox.connections_opened == 1
+    update = _updates(outbox.collection)[0]
+    assert update['status'] == 'sent'
+    assert update['latency_ms'] >= 1000
+    assert 'send_ms' in update
+
+
+def test_dropped_connection_is_reopened_once():
+    """Test a server disconnect between messages reconnects and resends"""
+    server = MagicMock()
+    server.send_message.side_effect = [smtplib.SMTPServerDisconnected('gone'), None]
+    connect = MagicMock(return_value=server)
+    connection = SmtpConnection(SETTINGS, connect)
+
+    connection.send(build_message(_message(), 'portal@example.com'))
+
+    assert connect.call_count == 2
+    assert server.send_message.call_count == 2
+
+
+def test_transient_failure_is_retried_with_backoff():
+    """Test a temporary SMTP error requeues the message for later"""
+    server = MagicMock()
+    server.send_message.side_effect = smtplib.SMTPResponseException(421, b'try later')
+    outbox = EmailOutbox(MagicMock(), SETTINGS, connect=MagicMock(return_value=server))
+
+    outbox.deliver([_message(attempts=2)], SmtpConnection(SETTINGS, outbox.connect))
+
+    update = _updates(outbox.collection)[0]
+    assert update['status'] == 'queued'
+    assert update['next_attempt_at'] > datetime.utcnow() + timedelta(seconds=retry_delay(2) - 5)
+    assert 'try later' in update['last_error']
+
+
+def test_permanent_failure_and_exhausted_attempts_are_failed():
+    """Test rejected recipients and the last attempt are not retried"""
+    rejected = smtplib.SMTPRecipientsRefused({'a@example.com': (550, b'no such user')})
+    assert is_permanent_failure(rejected)
+    assert not is_permanent_failure(smtplib.SMTPAuthenticationError(535, b'bad credentials'))
+
+    server = MagicMock()
+    server.send_message.side_effect = [rejected, smtplib.SMTPResponseException(421, b'busy')]
+    outbox = EmailOutbox(MagicMock(), SETTINGS, connect=MagicMock(return_value=server))
+
+    outbox.deliver([_message(), _message(attempts=MAX_ATTEMPTS)], SmtpConnection(SETTINGS, outbox.connect))
+
+    assert [update['status'] for update in _updates(outbox.collection)] == ['failed', 'failed']
+
+
+def test_retry_delay_grows_and_is_capped():
+    """Test backoff doubles per attempt up to the maximum"""
+    assert retry_delay(2) == 2 * retry_delay(1)
+    assert retry_delay(50) == RETRY_MAX_SECONDS
+
+
+def test_build_message_plain_and_html():
+    """Test plain, HTML-only and mixed messages"""
+    plain = build_message(_message(), 'portal@example.com')
+    assert plain['From'] == 'portal@example.com'
+    assert plain.get_content_type() == 'text/plain'
+
+    html = build_message(_message(body=None, html='<p>Hi</p>', recipients=['a@x.com', 'b@x.com']))
+    assert html.get_content_type() == 'text/html'
+    assert html['To'] == 'a@x.com, b@x.com'
+
+    mixed = build_message(_message(html='<p>Hi</p>'))
+    assert mixed.get_content_type() == 'multipart/alternative'
@@ -0,0 +1,70 @@
+"""Tests for exports.py"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import csv
+import io
+import pytest
+from unittest.mock import MagicMock
+from datetime import datetime
+from exports import iter_csv, write_xlsx, format_datetime
+
+
+def test_iter_csv_streams_in_chunks():
+    """Test CSV is produced in bounded chunks without consuming all rows up front"""
+    consumed = []
+
+    def rows():
+        for i in range(10000):
+            consumed.append(i)
+            yield [i, f'name {i}', 'a,b']
+
+    chunks = iter_csv(['id', 'name', 'tags'], rows(), chunk_bytes=1024)
+    first = next(chunks)
+    assert first.startswith(b'id,name,tags')
+    assert len(consumed) < 100
+
+    body = first + b''.join(chunks)
+    parsed = list(csv.reader(io.StringIO(body.decode('utf-8'))))
+    assert len(parsed) == 10001
+    assert parsed[-1] == ['9999', 'name 9999', 'a,b']
+
+
+def test_format_datetime():
+    """Test dates, strings and missing values"""
+    assert format_datetime(datetime(2025, 1, 2, 3, 4, 5)) == '2025-01-02 03:04:05'
+    assert format_datetime('2025-01-02') == '2025-01-02'
+    assert format_datetime(None) == ''
+
+
+def test_write_xlsx_round_trip():
+    """Test the write-only workbook contains the header and every row"""
+    openpyxl = pytest.importorskip('openpyxl')
+    spooled = write_xlsx(['A', 'B'], ([i, f'row {i}'] for i in range(500)), title='Sheet', column_widths=[10, 20])
+    wb = openpyxl.load_workbook(spooled, read_only=True)
+    rows = list(wb['Sheet'].iter_rows(values_only=True))
+    assert rows[0] == ('A', 'B')
+    assert len(rows) == 501
+    assert rows[-1] == (499, 'row 499')
+
+
+def test_cluster_export_rows_project_and_format():
+    """Test cluster export rows fetch only exported fields and flatten values"""
+    from routes.cluster_mongo import export_rows, EXPORT_FIELDS
+    collection = MagicMock()
+    collection.find.return_value = iter([{
+        'reference_id': 'REF-1', 'first_name': 'Jane', 'created_at': datetime(2025, 1, 2),
+        'skills': ['Python', 'SQL']
+    }])
+
+    rows = list(export_rows(collection, {'status': 'Selected'}))
+
+    query, projection = collection.find.call_args[0]
+    assert query == {'status': 'Selected'}
+    assert set(projection) == set(EXPORT_FIELDS) | {'_id'}
+    assert projection['_id'] == 0
+    assert rows[0][0] == 'REF-1'
+    assert rows[0][8] == '2025-01-02 00:00:00'
+    assert rows[0][9] == ''
+    assert rows[0][11] == 'Python, SQL'
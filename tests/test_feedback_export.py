@@ -0,0 +1,67 @@
+"""Tests for feedback_export.py"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pytest
+from unittest.mock import MagicMock
+from datetime import datetime
+from bson import ObjectId
+from feedback_export import iter_feedback_rows, write_feedback_pdf
+
+
+def make_collections(count):
+    candidate_ids = [ObjectId() for _ in range(count)]
+    feedbacks = [{
+        '_id': ObjectId(),
+        'candidate_id': str(candidate_id),
+        'status': 'Selected',
+        'feedback_text': f'Feedback {i}',
+        'created_at': datetime(2025, 1, 1)
+    } for i, candidate_id in enumerate(candidate_ids)]
+    candidates = {candidate_id: {'_id': candidate_id, 'first_name': f'Cand{i}', 'last_name': 'Doe',
+                                 'email': f'c{i}@example.com'}
+                  for i, candidate_id in enumerate(candidate_ids)}
+
+    feedback_collection = MagicMock()
+    feedback_collection.find.return_value = iter(feedbacks)
+    candidates_collection = MagicMock()
+    candidates_collection.find.side_effect = lambda query, projection: [
+        candidates[key] for key in query['_id']['$in'] if key in candidates
+    ]
+    return feedback_collection, candidates_collection, candidates
+
+
+def test_rows_are_joined_in_batches():
+    """Test candidates are fetched with one $in query per batch, not per feedback"""
+    feedback_collection, candidates_collection, _ = make_collections(25)
+
+    rows = list(iter_feedback_rows(feedback_collection, candidates_collection, 'm@example.com', batch_size=10))
+
+    assert len(rows) == 25
+    assert candidates_collection.find.call_count == 3
+    assert candidates_collection.find_one.call_count == 0
+    assert rows[0] == ['Cand0 Doe', 'c0@example.com', 'Selected', 'Feedback 0', '2025-01-01 00:00:00']
+    assert feedback_collection.find.call_args[0][0] == {'manager_email': 'm@example.com'}
+
+
+def test_feedback_for_missing_candidates_is_skipped():
+    """Test feedback whose candidate was deleted does not appear in the export"""
+    feedback_collection, candidates_collection, candidates = make_collections(3)
+    del candidates[next(iter(candidates))]
+
+    rows = list(iter_feedback_rows(feedback_collection, candidates_collection, 'm@example.com'))
+
+    assert [row[0] for row in rows] == ['Cand1 Doe', 'Cand2 Doe']
+
+
+def test_pdf_paginates_every_row():
+    """Test the PDF report continues onto further pages instead of truncating"""
+    pytest.importorskip('reportlab')
+    rows = [[f'Candidate {i}', f'c{i}@example.com', 'Selected', 'Good communication. ' * 20, '2025-01-01']
+            for i in range(200)]
+
+    pdf = write_feedback_pdf(rows, 'Manager', '2025-01-01').read()
+
+    assert pdf.startswith(b'%PDF')
+    assert pdf.count(b'/Type /Page\n') > 20
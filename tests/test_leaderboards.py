@@ -0,0 +1,84 @@
+"""Tests for leaderboards.py"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from unittest.mock import MagicMock, patch
+from datetime import datetime
+import response_cache
+from leaderboards import hr_leaderboard, manager_leaderboard, cached, format_day
+from response_cache import ResponseCache, LocalBackend
+
+
+def _collections(users, groups):
+    candidates, users_collection = MagicMock(), MagicMock()
+    users_collection.find.return_value = users
+    candidates.aggregate.return_value = groups
+    return candidates, users_collection
+
+
+def test_hr_leaderboard_is_one_aggregation_for_all_users():
+    """Test candidates are grouped once for every HR user instead of fetched per user"""
+    users = [{'email': 'a@x.com', 'first_name': 'Ann', 'last_name': 'Lee', 'cluster': 'North'},
+             {'email': 'b@x.com', 'first_name': 'Bob', 'last_name': 'Ray'}]
+    groups = [{'_id': 'a@x.com', 'total': 5, 'pending': 2, 'selected': 1, 'not_selected': 1,
+               'last_created_at': datetime(2025, 3, 4)}]
+    candidates, users_collection = _collections(users, groups)
+
+    rows = hr_leaderboard(candidates, users_collection)
+
+    assert candidates.aggregate.call_count == 1
+    candidates.find.assert_not_called()
+    match, group = candidates.aggregate.call_args[0][0]
+    assert match == {'$match': {'assigned_by': {'$in': ['a@x.com', 'b@x.com']}}}
+    assert group['$group']['_id'] == '$assigned_by'
+    assert rows[0] == {'name': 'Ann Lee', 'email': 'a@x.com', 'cluster': 'North', 'total_assigned': 5, 'pending': 2,
+                       'selected': 1, 'not_selected': 1, 'last_activity': '03/04/2025', 'avg_response_time': '2.5 hours'}
+    assert rows[1]['total_assigned'] == 0
+    assert rows[1]['last_activity'] == 'N/A'
+    assert rows[1]['cluster'] == 'General'
+
+
+def test_manager_leaderboard_groups_by_manager_and_reviewed_date():
+    """Test manager rows group on manager_email and only reviewed candidates set the last review"""
+    users = [{'email': 'm@x.com', 'first_name': 'Max', 'last_name': 'Fox'}]
+    groups = [{'_id': 'm@x.com', 'reviewed': 3, 'reassigned': 1, 'selected': 2, 'not_selected': 1,
+               'last_created_at': '2025-01-02T10:00:00Z'}]
+    candidates, users_collection = _collections(users, groups)
+
+    row = manager_leaderboard(candidates, users_collection)[0]
+
+    group = candidates.aggregate.call_args[0][0][1]['$group']
+    assert group['_id'] == '$manager_email'
+    assert '$cond' in group['last_created_at']['$max']
+    assert (row['total_reviewed'], row['pending_review'], row['last_review']) == (3, 1, '01/02/2025')
+
+
+def test_cache_is_reused_until_a_candidate_write():
+    """Test cached leaderboards are served until pipeline_stats records a write"""
+    response_cache._cache = ResponseCache(LocalBackend())
+    compute = MagicMock(side_effect=[['first'], ['second']])
+
+    assert cached('hr', compute) == ['first']
+    assert cached('hr', compute) == ['first']
+    with patch('pipeline_stats._collections', side_effect=RuntimeError('no database')):
+        from pipeline_stats import record_changes
+        record_changes([({'status': 'Pending'}, {'status': 'Selected'})])
+    assert cached('hr', compute) == ['second']
+    assert compute.call_count == 2
+
+
+def test_cache_expires_after_ttl():
+    """Test an expired entry is recomputed"""
+    response_cache._cache = ResponseCache(LocalBackend())
+    compute = MagicMock(side_effect=[1, 2])
+    assert cached('manager', compute, ttl=0) == 1
+    assert cached('manager', compute, ttl=0) == 2
+
+
+def test_format_day():
+    """Test datetimes, ISO strings, missing and unparseable values"""
+    assert format_day(datetime(2025, 12, 1)) == '12/01/2025'
+    assert format_day('2025-12-01T00:00:00') == '12/01/2025'
+    assert format_day(None) == 'N/A'
+    assert format_day('yesterday') == 'Recent'
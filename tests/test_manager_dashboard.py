@@ -0,0 +1,96 @@
+"""Tests for manager_dashboard.py"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import json
+import pytest
+from unittest.mock import MagicMock
+from datetime import datetime
+from bson import ObjectId
+from pagination import decode_cursor
+from manager_dashboard import (BUCKETS, NOT_SELECTED_STATUSES, bucket_query, dashboard_buckets, bucket_page,
+                               candidate_row)
+
+MANAGER = 'manager@example.com'
+
+
+def test_every_bucket_is_scoped_to_the_manager():
+    """Test no bucket (including not selected) scans other managers' candidates"""
+    for bucket in BUCKETS:
+        query, _ = bucket_query(bucket, MANAGER)
+        assert MANAGER in (query.get('manager_email'), query.get('reassigned_by_manager'))
+    assert bucket_query('not_selected', MANAGER)[0]['status'] == {'$in': NOT_SELECTED_STATUSES}
+    with pytest.raises(ValueError):
+        bucket_query('everything', MANAGER)
+
+
+def test_buckets_come_from_one_facet_with_limits_and_counts():
+    """Test one aggregation returns rows, totals and a next cursor only for truncated buckets"""
+    rows = [{'_id': ObjectId(), 'first_name': f'C{i}', 'updated_at': datetime(2025, 1, 10 - i)} for i in range(2)]
+    collection = MagicMock()
+    collection.aggregate.return_value = iter([{
+        'assigned': [], 'assigned_count': [],
+        'selected': rows[:1], 'selected_count': [{'count': 1}],
+        'not_selected': rows, 'not_selected_count': [{'count': 40}],
+        'reassigned': [], 'reassigned_count': [],
+    }])
+
+    buckets = dashboard_buckets(collection, MANAGER, limit=2)
+
+    collection.aggregate.assert_called_once()
+    pipeline = collection.aggregate.call_args[0][0]
+    assert pipeline[0] == {'$match': {'$or': [bucket_query(bucket, MANAGER)[0] for bucket in BUCKETS]}}
+    facet = pipeline[1]['$facet']
+    assert set(facet) == set(BUCKETS) | {f'{bucket}_count' for bucket in BUCKETS}
+    assert {'$limit': 2} in facet['not_selected']
+    assert {'$sort': {'created_at': -1, '_id': -1}} in facet['assigned']
+
+    assert buckets['assigned'] == {'candidates': [], 'count': 0, 'next_cursor': None}
+    assert buckets['selected']['next_cursor'] is None
+    assert buckets['not_selected']['count'] == 40
+    assert decode_cursor(buckets['not_selected']['next_cursor'], 'updated_at') == (rows[1]['updated_at'], rows[1]['_id'])
+
+
+def test_bucket_page_continues_with_keyset_pagination():
+    """Test load-more pages use the bucket query and the same (sort field, _id) order"""
+    collection = MagicMock()
+    cursor = collection.find.return_value
+    cursor.sort.return_value = cursor
+    cursor.limit.return_value = [{'_id': ObjectId(), 'updated_at': datetime(2025, 1, 1)}]
+
+    page = bucket_page(collection, MANAGER, 'reassigned', page_size=10)
+
+    query, projection = collection.find.call_args[0]
+    assert query == {'reassigned_by_manager': MANAGER, 'status': 'Pending'}
+    assert 'rejection_reasons' in projection
+    cursor.sort.assert_called_once_with([('updated_at', -1), ('_id', -1)])
+    cursor.limit.assert_called_once_with(11)
+    assert not page.has_more
+
+
+def test_load_more_after_dates_reaches_legacy_string_and_missing_updated_at():
+    """Test the page after the facet's last dated row also matches string, null and missing updated_at"""
+    rows = [{'_id': ObjectId(), 'updated_at': datetime(2025, 1, 10)}]
+    collection = MagicMock()
+    collection.aggregate.return_value = iter([{'not_selected': rows, 'not_selected_count': [{'count': 3}]}])
+    next_cursor = dashboard_buckets(collection, MANAGER, limit=1)['not_selected']['next_cursor']
+    cursor = collection.find.return_value
+    cursor.sort.return_value = cursor
+    cursor.limit.return_value = [{'_id': ObjectId(), 'updated_at': '2024-12-01T09:00:00Z'}, {'_id': ObjectId()}]
+
+    page = bucket_page(collection, MANAGER, 'not_selected', next_cursor)
+
+    after = collection.find.call_args[0][0]['$and'][1]['$or']
+    assert {'updated_at': {'$lt': rows[0]['updated_at']}} in after
+    assert {'updated_at': {'$type': 'string'}} in after and {'updated_at': None} in after
+    assert [candidate_row(row)['updated_at'] for row in page.items] == ['2024-12-01 09:00', None]
+
+
+def test_candidate_row_is_json_safe():
+    """Test rows for the API carry string ids and formatted dates"""
+    row = candidate_row({'_id': ObjectId(), 'first_name': 'Ada', 'created_at': datetime(2025, 3, 4, 5, 6),
+                         'rejection_reasons': None})
+    json.dumps(row)
+    assert row['created_at'] == '2025-03-04 05:06'
+    assert row['rejection_reasons'] == [] and row['reviewed_at'] is None
@@ -0,0 +1,125 @@
+"""Tests for migrations.py"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from unittest.mock import MagicMock, patch
+from pymongo.errors import DuplicateKeyError
+import migrations
+from migrations import (Migration, bulk_update, run_migration, run_pending, strip_static_prefix, backfill_name,
+                        convert_old_ratings, _claim)
+
+
+def _collection(documents):
+    collection = MagicMock()
+    collection.find.return_value.sort.return_value.batch_size.return_value = iter(documents)
+    collection.count_documents.return_value = len(documents)
+    collection.bulk_write.side_effect = lambda operations, ordered: MagicMock(modified_count=len(operations))
+    return collection
+
+
+def _upper(document):
+    return {'$set': {'name': document['name'].upper()}} if document['name'] else None
+
+
+def test_run_migration_writes_batches_unordered_and_saves_progress():
+    """Test each batch is one unordered bulk_write and the position is saved after it"""
+    migration = Migration(99, 'upper names', 'candidates', {'name': {'$exists': True}}, _upper)
+    collection = _collection([{'_id': 1, 'name': 'a'}, {'_id': 2, 'name': ''}, {'_id': 3, 'name': 'c'}])
+    state = MagicMock()
+    state.find_one_and_update.return_value = {'_id': 99, 'status': 'running'}
+
+    with patch('response_cache.invalidate') as invalidate:
+        counts = run_migration(migration, collection, state, batch_size=2, report=lambda message: None)
+
+    assert counts == {'processed': 3, 'modified': 2, 'errors': 0}
+    assert [call.kwargs['ordered'] for call in collection.bulk_write.call_args_list] == [False, False]
+    assert [op._doc for op in collection.bulk_write.call_args_list[0][0][0]] == [{'$set': {'name': 'A'}}]
+    progress = [call[0][1]['$set'] for call in state.update_one.call_args_list]
+    assert [(update.get('last_id'), update.get('processed')) for update in progress[:2]] == [(2, 2), (3, 3)]
+    assert all(update['rate'] > 0 for update in progress[:2])
+    collection.find.return_value.sort.return_value.batch_size.assert_called_once_with(2)
+    assert progress[-1]['status'] == 'done'
+    invalidate.assert_called_once_with('candidates')
+
+
+def test_run_migration_resumes_after_last_id():
+    """Test a migration interrupted earlier continues after the saved position with its counts"""
+    migration = Migration(99, 'upper names', 'candidates', {'name': {'$exists': True}}, _upper)
+    collection = _collection([{'_id': 7, 'name': 'g'}])
+    state = MagicMock()
+    state.find_one_and_update.return_value = {'_id': 99, 'last_id': 6, 'processed': 6, 'modified': 5, 'errors': 1}
+
+    with patch('response_cache.invalidate'):
+        counts = run_migration(migration, collection, state, report=lambda message: None)
+
+    assert collection.find.call_args[0][0] == {'$and': [{'name': {'$exists': True}}, {'_id': {'$gt': 6}}]}
+    assert counts == {'processed': 7, 'modified': 6, 'errors': 1}
+
+
+def test_bulk_update_streams_in_batches_and_counts_failures():
+    """Test any iterable is written in batches, a failing transform is counted and the rest still written"""
+    collection = MagicMock()
+    collection.bulk_write.side_effect = lambda operations, ordered: MagicMock(modified_count=len(operations))
+    seen = []
+
+    def transform(document):
+        if document['_id'] == 3:
+            raise ValueError('bad document')
+        return {'$set': {'n': document['_id']}}
+
+    documents = ({'_id': i} for i in range(5))
+    result = bulk_update(collection, documents, transform, batch_size=2,
+                         on_batch=lambda last, counts, rate: seen.append((last['_id'], counts['processed'])))
+
+    assert collection.bulk_write.call_count == 3
+    assert (result['processed'], result['modified'], result['errors']) == (5, 4, 1)
+    assert result['rate'] > 0
+    assert seen == [(1, 2), (3, 4), (4, 5)]
+
+
+def test_claim_held_elsewhere_skips_migration():
+    """Test a lease held by another process (upsert conflict) leaves the collection untouched"""
+    migration = Migration(99, 'upper names', 'candidates', {}, _upper)
+    state = MagicMock()
+    state.find_one_and_update.side_effect = DuplicateKeyError('taken')
+    collection = MagicMock()
+
+    assert _claim(state, migration) is None
+    assert run_migration(migration, collection, state, report=lambda message: None) is None
+    collection.find.assert_not_called()
+    collection.bulk_write.assert_not_called()
+
+
+def test_run_pending_dry_run_writes_nothing_and_skips_done():
+    """Test a dry run only counts and previews pending migrations"""
+    db = MagicMock()
+    db.__getitem__.return_value.count_documents.return_value = 4
+    db.__getitem__.return_value.find.return_value.limit.return_value = []
+    state = MagicMock()
+    state.find.return_value = [{'_id': 1}]
+
+    results = run_pending(db, state, dry_run=True, report=lambda message: None)
+
+    assert 1 not in results
+    assert set(results) == {m.version for m in migrations.MIGRATIONS} - {1}
+    assert all(result == {'matched': 4, 'modified': 0} for result in results.values())
+    db.__getitem__.return_value.bulk_write.assert_not_called()
+    state.find_one_and_update.assert_not_called()
+    state.update_one.assert_not_called()
+
+
+def test_transforms():
+    """Test the file path, name and rating migrations"""
+    assert strip_static_prefix({'resume_path': 'static/uploads/a.pdf', 'image_path': 'uploads/a.png'}) == \
+        {'$set': {'resume_path': 'uploads/a.pdf'}}
+    assert strip_static_prefix({'resume_path': 'uploads/a.pdf'}) is None
+    assert backfill_name({'first_name': 'Ada', 'last_name': None}) == {'$set': {'name': 'Ada'}}
+    assert backfill_name({'first_name': '', 'last_name': ''}) is None
+
+    update = convert_old_ratings({'hr_rating': 4, 'tech_rating': 3, 'hr_review': 'good'})
+    assert update['$set']['communication_skills'] == 4
+    assert update['$set']['job_fit'] == 3
+    assert update['$set']['overall_rating'] == 3.5
+    assert update['$set']['other_notes'] == 'good '
+    assert set(update['$unset']) == {'hr_rating', 'tech_rating', 'hr_review', 'tech_review'}
@@ -0,0 +1,87 @@
+"""Tests for normalize_dates.py"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from unittest.mock import MagicMock
+from datetime import datetime
+from normalize_dates import parse_timestamp, normalize_collection
+
+
+def test_parse_timestamp_formats():
+    """Test naive, UTC, offset and date-only strings; other text is rejected"""
+    assert parse_timestamp('2025-03-04T10:20:30.123456') == datetime(2025, 3, 4, 10, 20, 30, 123456)
+    assert parse_timestamp('2025-03-04T10:20:30Z') == datetime(2025, 3, 4, 10, 20, 30)
+    assert parse_timestamp('2025-03-04T10:20:30+05:30') == datetime(2025, 3, 4, 4, 50, 30)
+    assert parse_timestamp('2025-03-04') == datetime(2025, 3, 4)
+    assert parse_timestamp('last week') is None
+
+
+def test_normalize_collection_converts_only_strings_with_compare_and_set():
+    """Test string values are converted in one bulk_write guarded by the value that was read"""
+    collection = MagicMock()
+    collection.find.return_value = [
+        {'_id': 1, 'created_at': '2025-01-02T03:04:05', 'updated_at': datetime(2025, 1, 3)},
+        {'_id': 2, 'created_at': 'unknown', 'updated_at': '2025-01-05T00:00:00Z'},
+        {'_id': 3, 'created_at': 'n/a'},
+    ]
+    collection.bulk_write.return_value.modified_count = 2
+
+    updated, unparsed = normalize_collection(collection, ['created_at', 'updated_at'])
+
+    assert (updated, unparsed) == (2, 2)
+    assert collection.find.call_args[0][0] == {'$or': [{'created_at': {'$type': 'string'}},
+                                                       {'updated_at': {'$type': 'string'}}]}
+    operations = collection.bulk_write.call_args[0][0]
+    assert [(op._filter, op._doc) for op in operations] == [
+        ({'_id': 1, 'created_at': '2025-01-02T03:04:05'}, {'$set': {'created_at': datetime(2025, 1, 2, 3, 4, 5)}}),
+        ({'_id': 2, 'updated_at': '2025-01-05T00:00:00Z'}, {'$set': {'updated_at': datetime(2025, 1, 5)}}),
+    ]
+
+
+def test_normalize_collection_writes_in_batches():
+    """Test one bulk_write per batch and none when nothing is left to convert"""
+    collection = MagicMock()
+    collection.find.return_value = [{'_id': i, 'timestamp': '2025-01-01T00:00:00'} for i in range(5)]
+    collection.bulk_write.return_value.modified_count = 2
+
+    normalize_collection(collection, ['timestamp'], batch_size=2)
+    assert [len(call[0][0]) for call in collection.bulk_write.call_args_list] == [2, 2, 1]
+
+    collection = MagicMock()
+    collection.find.return_value = []
+    assert normalize_collection(collection, ['timestamp']) == (0, 0)
+    collection.bulk_write.assert_not_called()
+
+
+def test_parse_timestamp_reads_naive_values_as_local_time(monkeypatch):
+    """Test strings written by datetime.now() are converted from the server's time zone"""
+    import time
+    monkeypatch.setenv('TZ', 'Asia/Kolkata')
+    time.tzset()
+    try:
+        assert parse_timestamp('2025-03-04T10:20:30') == datetime(2025, 3, 4, 4, 50, 30)
+        assert parse_timestamp('2025-03-04T10:20:30Z') == datetime(2025, 3, 4, 10, 20, 30)
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+
+def test_date_migrations_are_registered_with_a_guarded_update():
+    """Test every DATE_FIELDS collection has a startup migration that only replaces unchanged strings"""
+    from migrations import MIGRATIONS, DATE_MIGRATIONS
+    from normalize_dates import DATE_FIELDS
+
+    registered = {m.version: m for m in MIGRATIONS}
+    assert sorted(DATE_MIGRATIONS.values()) == sorted(DATE_FIELDS)
+    requests = registered[6]
+    assert requests.collection == 'candidate_requests'
+    assert requests.query == {'$or': [{'created_at': {'$type': 'string'}}, {'updated_at': {'$type': 'string'}},
+                                      {'deadline': {'$type': 'string'}}]}
+
+    update = requests.transform({'_id': 1, 'created_at': '2025-01-02T03:04:05Z', 'updated_at': 'soon',
+                                 'deadline': datetime(2025, 2, 1)})
+    assert update == [{'$set': {'created_at': {'$cond': [
+        {'$eq': ['$created_at', {'$literal': '2025-01-02T03:04:05Z'}]}, datetime(2025, 1, 2, 3, 4, 5), '$created_at'
+    ]}}}]
+    assert requests.transform({'_id': 2, 'created_at': datetime(2025, 1, 1)}) is None
@@ -0,0 +1,182 @@
+"""Tests for pagination.py"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pytest
+from unittest.mock import MagicMock
+from datetime import datetime, timedelta
+from bson import ObjectId
+from werkzeug.datastructures import MultiDict
+from pagination import (
+    encode_cursor, decode_cursor, paginate, page_args, paginate_request, InvalidCursor, SORT_TYPE_ORDER
+)
+
+
+def _collection(documents):
+    collection = MagicMock()
+    cursor = MagicMock()
+    cursor.sort.return_value = cursor
+    cursor.limit.side_effect = lambda n: iter(documents[:n])
+    collection.find.return_value = cursor
+    return collection
+
+
+def _documents(count):
+    start = datetime(2025, 1, 1)
+    return [{'_id': ObjectId(), 'created_at': start - timedelta(minutes=i)} for i in range(count)]
+
+
+def test_cursor_round_trip():
+    """Test a cursor decodes to the sort value and _id it was built from"""
+    document = _documents(1)[0]
+    token = encode_cursor(document, 'created_at')
+    assert '=' not in token
+    value, last_id = decode_cursor(token, 'created_at')
+    assert value == document['created_at']
+    assert last_id == document['_id']
+
+
+def test_decode_cursor_rejects_garbage_and_wrong_sort():
+    """Test malformed cursors and cursors for another sort field are rejected"""
+    with pytest.raises(InvalidCursor):
+        decode_cursor('not-a-cursor', 'created_at')
+    token = encode_cursor(_documents(1)[0], 'created_at')
+    with pytest.raises(InvalidCursor):
+        decode_cursor(token, 'updated_at')
+
+
+def test_paginate_first_page_has_next_cursor():
+    """Test the first page fetches page_size + 1 rows and exposes a next cursor"""
+    documents = _documents(5)
+    collection = _collection(documents)
+    page = paginate(collection, {'status': 'Pending'}, page_size=3)
+
+    assert page.items == documents[:3]
+    assert page.has_more
+    collection.find.assert_called_once_with({'status': 'Pending'}, None)
+    collection.find.return_value.sort.assert_called_once_with([('created_at', -1), ('_id', -1)])
+    collection.find.return_value.limit.assert_called_once_with(4)
+    assert decode_cursor(page.next_cursor, 'created_at')[1] == documents[2]['_id']
+
+
+def test_paginate_last_page():
+    """Test a short page has no next cursor"""
+    page = paginate(_collection(_documents(2)), page_size=3)
+    assert len(page.items) == 2
+    assert page.next_cursor is None
+    assert page.to_dict()['has_more'] is False
+
+
+def test_paginate_with_cursor_adds_keyset_condition():
+    """Test a cursor turns into a (sort value, _id) range condition"""
+    documents = _documents(3)
+    collection = _collection([])
+    paginate(collection, {'status': 'Pending'}, cursor=encode_cursor(documents[1], 'created_at'))
+
+    query = collection.find.call_args[0][0]
+    assert query['$and'][0] == {'status': 'Pending'}
+    assert query['$and'][1] == {'$or': [
+        {'created_at': {'$lt': documents[1]['created_at']}},
+        {'created_at': documents[1]['created_at'], '_id': {'$lt': documents[1]['_id']}},
+        {'created_at': {'$type': 'bool'}},
+        {'created_at': {'$type': 'objectId'}},
+        {'created_at': {'$type': 'string'}},
+        {'created_at': {'$type': 'number'}},
+        {'created_at': None},
+    ]}
+
+
+def test_page_args_parses_request():
+    """Test page_args() reads sort, order, page size and filters"""
+    query, options = page_args(MultiDict({
+        'sort': 'updated_at', 'order': 'asc', 'page_size': '1000', 'status': 'Selected'
+    }))
+    assert query == {'status': 'Selected'}
+    assert options == {'cursor': None, 'page_size': 1000, 'sort_field': 'updated_at', 'direction': 1}
+
+    query, options = page_args(MultiDict({'sort': 'email', 'page_size': 'x', 'status': 'All Statuses'}))
+    assert query == {}
+    assert options['sort_field'] == 'created_at'
+    assert options['page_size'] == 50
+
+
+def test_paginate_request_recovers_from_bad_cursor():
+    """Test a tampered cursor falls back to the first page"""
+    collection = _collection(_documents(2))
+    page = paginate_request(collection, MultiDict({'cursor': 'garbage'}))
+    assert len(page.items) == 2
+    collection.find.assert_called_once_with({}, None)
+
+
+class MixedTypeCollection:
+    """Evaluates paginate()'s queries with MongoDB's type bracketing and cross-type sort order"""
+
+    def __init__(self, documents):
+        self.documents = documents
+
+    @staticmethod
+    def _type(value):
+        return {type(None): 'null', int: 'number', str: 'string', ObjectId: 'objectId', datetime: 'date'}[type(value)]
+
+    def _key(self, document, field):
+        value = document.get(field)
+        return SORT_TYPE_ORDER.index(self._type(value)), value if value is not None else 0
+
+    def _matches(self, document, query):
+        for field, condition in query.items():
+            if field == '$and':
+                matched = all(self._matches(document, part) for part in condition)
+            elif field == '$or':
+                matched = any(self._matches(document, part) for part in condition)
+            elif isinstance(condition, dict):
+                value = document.get(field)
+                (op, operand), = condition.items()
+                if op == '$type':
+                    matched = field in document and self._type(value) == operand
+                else:
+                    same_type = value is not None and self._type(value) == self._type(operand)
+                    matched = same_type and (value < operand if op == '$lt' else value > operand)
+            else:
+                value = document.get(field)
+                matched = value is None if condition is None else (
+                    value is not None and self._type(value) == self._type(condition) and value == condition)
+            if not matched:
+                return False
+        return True
+
+    def find(self, query, projection=None):
+        collection = self
+
+        class Cursor:
+            def sort(self, spec):
+                (field, direction), _ = spec
+                self.rows = sorted((d for d in collection.documents if collection._matches(d, query)),
+                                   key=lambda d: (collection._key(d, field), d['_id']), reverse=direction == -1)
+                return self
+
+            def limit(self, n):
+                return iter(self.rows[:n])
+
+        return Cursor()
+
+
+@pytest.mark.parametrize('direction', [-1, 1])
+def test_paginate_reaches_every_row_of_a_mixed_type_sort_field(direction):
+    """Test legacy string, null and missing sort values are still paged after the dates"""
+    start = datetime(2025, 1, 1)
+    documents = [{'_id': ObjectId(), 'created_at': start - timedelta(days=i)} for i in range(3)]
+    documents += [{'_id': ObjectId(), 'created_at': f'2024-12-0{i}T10:00:00'} for i in range(1, 4)]
+    documents += [{'_id': ObjectId(), 'created_at': None}, {'_id': ObjectId()}, {'_id': ObjectId(), 'created_at': 7}]
+    collection = MixedTypeCollection(documents)
+
+    seen, cursor = [], None
+    while True:
+        page = paginate(collection, cursor=cursor, page_size=2, direction=direction)
+        seen.extend(document['_id'] for document in page.items)
+        if not page.has_more:
+            break
+        cursor = page.next_cursor
+
+    expected = collection.find({}).sort([('created_at', direction), ('_id', direction)]).limit(len(documents))
+    assert seen == [document['_id'] for document in expected]
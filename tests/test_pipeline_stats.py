@@ -0,0 +1,145 @@
+"""Tests for pipeline_stats.py"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from unittest.mock import MagicMock, patch
+from datetime import datetime
+import pipeline_stats
+from pipeline_stats import compute_deltas, apply_deltas, record_bulk_update, scope_for_query, rebuild
+
+
+def _candidate(status='Pending', **fields):
+    candidate = {'status': status, 'assigned_by': 'hr@x.com', 'created_at': datetime(2025, 3, 4)}
+    candidate.update(fields)
+    return candidate
+
+
+def _patch_collections(stats=None, candidates=None, users=None):
+    users = users or MagicMock()
+    users.find.return_value = [{'email': 'hr@x.com', 'cluster': 'North'}]
+    return patch.object(pipeline_stats, '_collections',
+                        return_value=(stats or MagicMock(), candidates or MagicMock(), users))
+
+
+def test_compute_deltas_insert_counts_every_scope():
+    """Test an insert increments total and status in every scope it belongs to"""
+    deltas = compute_deltas([(None, _candidate())], {'hr@x.com': 'North'})
+    for scope in ('global', 'hr:hr@x.com', 'cluster:North', 'month:2025-03'):
+        assert deltas[(scope, 'total')] == 1
+        assert deltas[(scope, 'status.Pending')] == 1
+
+
+def test_compute_deltas_status_change_nets_out_total():
+    """Test a status change moves one count between statuses and leaves totals alone"""
+    before = _candidate('Assigned', manager_email='m@x.com')
+    after = _candidate('Selected', manager_email='m@x.com', onboarding_status='Onboarded')
+    deltas = compute_deltas([(before, after)], {})
+    assert ('global', 'total') not in deltas
+    assert deltas[('manager:m@x.com', 'status.Assigned')] == -1
+    assert deltas[('manager:m@x.com', 'status.Selected')] == 1
+    assert deltas[('global', 'selected_onboarded')] == 1
+
+
+def test_apply_deltas_one_upsert_per_scope():
+    """Test deltas are grouped into one $inc upsert per scope in a single bulk_write"""
+    stats = MagicMock()
+    written = apply_deltas({('global', 'total'): 2, ('global', 'status.Pending'): 2,
+                            ('hr:a', 'total'): 1}, stats)
+    assert written == 2
+    operations = stats.bulk_write.call_args[0][0]
+    assert {op._filter['_id'] for op in operations} == {'global', 'hr:a'}
+    assert all(op._upsert for op in operations)
+    assert apply_deltas({}, stats) == 0
+
+
+def test_record_bulk_update_applies_set_and_unset():
+    """Test bulk reassignment removes manager scope counts and adds the new status"""
+    stats = MagicMock()
+    with _patch_collections(stats=stats):
+        record_bulk_update([_candidate('Assigned', manager_email='m@x.com')] * 3,
+                           {'status': 'Pending'}, unset_fields=('manager_email',))
+    increments = {op._filter['_id']: op._doc['$inc'] for op in stats.bulk_write.call_args[0][0]}
+    assert increments['manager:m@x.com'] == {'total': -3, 'status.Assigned': -3}
+    assert increments['global'] == {'status.Assigned': -3, 'status.Pending': 3}
+
+
+def test_record_changes_never_raises():
+    """Test a failing counter write does not propagate to the candidate write"""
+    stats = MagicMock()
+    stats.bulk_write.side_effect = RuntimeError('down')
+    with _patch_collections(stats=stats):
+        assert pipeline_stats.record_change(None, _candidate()) == 0
+
+
+def test_scope_for_query():
+    """Test only queries a counter document answers exactly map to a scope"""
+    assert scope_for_query({}) == 'global'
+    assert scope_for_query({'assigned_by': 'a@x.com'}) == 'hr:a@x.com'
+    assert scope_for_query({'manager_email': 'm@x.com'}) == 'manager:m@x.com'
+    assert scope_for_query({'status': 'Pending'}) is None
+    assert scope_for_query({'assigned_by': {'$in': ['a']}}) is None
+
+
+def test_rebuild_reports_drift():
+    """Test rebuild(dry_run=True) reports counters that differ from the candidates"""
+    stats, candidates = MagicMock(), MagicMock()
+    candidates.aggregate.return_value = [
+        {'_id': {'status': 'Pending', 'assigned_by': 'hr@x.com', 'month': '2025-03'}, 'count': 4}
+    ]
+    stats.find.return_value = [{'_id': 'global', 'total': 5, 'status': {'Pending': 4}}]
+    with _patch_collections(stats=stats, candidates=candidates):
+        drift = rebuild(dry_run=True)
+    assert ('global', 'total', 5, 4) in drift
+    assert ('global', 'status.Pending', 4, 4) not in drift
+    assert ('cluster:North', 'total', 0, 4) in drift
+    stats.delete_many.assert_not_called()
+
+
+class FakeStats:
+    """Just enough of the pipeline_stats collection for apply_deltas/rebuild/get_stats"""
+
+    def __init__(self):
+        self.docs = {}
+
+    def find_one(self, query):
+        doc = self.docs.get(query['_id'])
+        return dict(doc, _id=query['_id']) if doc is not None else None
+
+    def find(self):
+        return [dict(doc, _id=_id) for _id, doc in self.docs.items()]
+
+    def bulk_write(self, operations, ordered=True):
+        for op in operations:
+            doc = self.docs.setdefault(op._filter['_id'], {})
+            for counter, value in op._doc['$inc'].items():
+                if counter.startswith('status.'):
+                    status = doc.setdefault('status', {})
+                    status[counter[7:]] = status.get(counter[7:], 0) + value
+                else:
+                    doc[counter] = doc.get(counter, 0) + value
+
+    def delete_many(self, query):
+        self.docs.clear()
+
+    def replace_one(self, query, replacement, upsert=False):
+        self.docs[query['_id']] = dict(replacement)
+
+
+def test_counters_unread_until_rebuilt():
+    """Test a write before the first rebuild is not served as partial counts"""
+    stats, candidates = FakeStats(), MagicMock()
+    candidates.aggregate.return_value = [
+        {'_id': {'status': 'Pending', 'assigned_by': 'hr@x.com', 'month': '2025-03'}, 'count': 4}
+    ]
+    with _patch_collections(stats=stats, candidates=candidates), \
+            patch.object(pipeline_stats, '_materialized', False):
+        # Moving one of the four existing candidates on, before any counters were seeded
+        pipeline_stats.record_change(_candidate('Pending'), _candidate('Assigned'))
+        assert stats.docs['global']['status'] == {'Pending': -1, 'Assigned': 1}
+        assert pipeline_stats.get_stats() is None
+        assert pipeline_stats.read_status_counts() is None
+
+        assert pipeline_stats.ensure_materialized() is True
+        assert pipeline_stats.read_status_counts() == ({'Pending': 4}, 4)
+        assert pipeline_stats.ensure_materialized() is False
@@ -0,0 +1,153 @@
+"""Tests for response_cache.py"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from flask import Flask, jsonify
+import response_cache
+from response_cache import ResponseCache, LocalBackend, RedisBackend, cached_response
+
+
+class FakeRedis:
+    """Just enough of a Redis client for RedisBackend"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value.encode('utf-8')
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1).encode('utf-8')
+
+
+def test_invalidating_a_tag_only_drops_dependent_entries():
+    """Test a write to one tag recomputes entries using it and keeps the others"""
+    cache = ResponseCache(LocalBackend())
+    compute = MagicMock(side_effect=['a1', 'b1', 'a2'])
+
+    assert cache.memoize('a', {}, compute, ('candidates', 'users')) == 'a1'
+    assert cache.memoize('b', {}, compute, ('requests',)) == 'b1'
+    cache.invalidate('candidates')
+
+    assert cache.memoize('a', {}, compute, ('candidates', 'users')) == 'a2'
+    assert cache.memoize('b', {}, compute, ('requests',)) == 'b1'
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['invalidations']) == (1, 3, 1)
+    assert stats['routes']['b']['hit_rate'] == 0.5
+
+
+def test_local_backend_is_bounded_and_expires():
+    """Test the least recently used entry is evicted and expired entries are misses"""
+    backend = LocalBackend(max_entries=2)
+    backend.set('a', 1, 60)
+    backend.set('b', 2, 60)
+    backend.get('a')
+    backend.set('c', 3, 60)
+
+    assert (backend.get('a'), backend.get('b'), backend.get('c')) == (1, None, 3)
+    assert backend.evictions == 1
+    backend.set('d', 4, 0)
+    assert backend.get('d') is None
+
+
+def test_redis_backend_shares_entries_and_tag_versions():
+    """Test two processes using the same server see each other's entries and invalidations"""
+    server = FakeRedis()
+    first, second = ResponseCache(RedisBackend(server)), ResponseCache(RedisBackend(server))
+    compute = MagicMock(side_effect=[{'total': 1}, {'total': 2}])
+
+    assert first.memoize('chart', {'status': 'Pending'}, compute, ('candidates',)) == {'total': 1}
+    assert second.memoize('chart', {'status': 'Pending'}, compute, ('candidates',)) == {'total': 1}
+    first.invalidate('candidates')
+    assert second.memoize('chart', {'status': 'Pending'}, compute, ('candidates',)) == {'total': 2}
+
+
+def test_unavailable_backend_is_bypassed():
+    """Test a failing server computes the value instead of failing the request"""
+    backend = MagicMock()
+    backend.versions.side_effect = ConnectionError('down')
+    cache = ResponseCache(backend)
+
+    assert cache.memoize('a', {}, lambda: 'fresh', ('users',)) == 'fresh'
+    assert cache.stats()['errors'] == 1
+
+
+def _app(calls):
+    app = Flask(__name__)
+
+    @app.route('/analytics/<tab_name>')
+    @cached_response('candidates')
+    def analytics(tab_name):
+        calls.append(tab_name)
+        if tab_name == 'bad':
+            return jsonify({'success': False}), 400
+        return jsonify({'success': True, 'tab': tab_name, 'calls': len(calls)})
+
+    @app.route('/mine')
+    @cached_response('candidates', per_user=True)
+    def mine():
+        calls.append('mine')
+        return jsonify({'calls': len(calls)})
+
+    return app
+
+
+def _get(client, url, role='hr', email='a@example.com'):
+    with patch('flask_login.current_user', SimpleNamespace(role=role, email=email)):
+        return client.get(url)
+
+
+def test_cached_response_keys_on_params_role_and_user():
+    """Test hits are scoped by URL arguments, query string, role and (per-user views) email"""
+    response_cache._cache = ResponseCache(LocalBackend())
+    calls = []
+    client = _app(calls).test_client()
+
+    first = _get(client, '/analytics/overview?range=7')
+    second = _get(client, '/analytics/overview?range=7')
+    assert second.headers['X-Cache'] == 'HIT'
+    assert second.get_json() == first.get_json()
+    assert _get(client, '/analytics/overview?range=30').headers['X-Cache'] == 'MISS'
+    assert _get(client, '/analytics/overview?range=7', role='manager').headers['X-Cache'] == 'MISS'
+
+    _get(client, '/mine')
+    assert _get(client, '/mine', email='b@example.com').headers['X-Cache'] == 'MISS'
+    assert _get(client, '/mine').headers['X-Cache'] == 'HIT'
+
+    response_cache.invalidate('candidates')
+    assert _get(client, '/analytics/overview?range=7').headers['X-Cache'] == 'MISS'
+
+
+def test_cached_response_skips_errors():
+    """Test non-200 responses are not cached"""
+    response_cache._cache = ResponseCache(LocalBackend())
+    calls = []
+    client = _app(calls).test_client()
+
+    assert _get(client, '/analytics/bad').status_code == 400
+    assert _get(client, '/analytics/bad').status_code == 400
+    assert calls == ['bad', 'bad']
+
+
+def test_model_writes_invalidate_their_tags():
+    """Test User.save and CandidateRequest.save drop cached users and requests"""
+    import models_mongo
+    from models_mongo import User, CandidateRequest
+
+    with patch('response_cache.invalidate') as invalidate, \
+            patch.object(models_mongo, 'users_collection'), \
+            patch.object(models_mongo, 'candidate_requests_collection'):
+        User(email='a@example.com', name='A', role='hr').save()
+        CandidateRequest(manager_email='m@example.com', position_title='Dev', quantity_needed=1,
+                         urgency_level='High').save()
+
+    assert [call[0] for call in invalidate.call_args_list] == [('users',), ('requests',)]
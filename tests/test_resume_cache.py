@@ -0,0 +1,120 @@
+"""Tests for resume_cache.py"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from unittest.mock import MagicMock
+from datetime import datetime
+import resume_jobs
+from resume_cache import ResumeCache, content_hash, FALLBACK_TTL_SECONDS
+from resume_jobs import parse_upload
+
+
+class FakeCollection:
+    """Just enough of a pymongo collection for ResumeCache"""
+
+    def __init__(self):
+        self.documents = {}
+
+    def find_one_and_update(self, query, update):
+        document = self.documents.get(query['_id'])
+        if not document or document['expires_at'] <= query['expires_at']['$gt']:
+            return None
+        document.update(update['$set'])
+        return dict(document)
+
+    def update_one(self, query, update, upsert=False):
+        self.documents.setdefault(query['_id'], {'_id': query['_id']}).update(update['$set'])
+
+    def estimated_document_count(self):
+        return len(self.documents)
+
+    def find(self, query, projection):
+        ordered = sorted(self.documents.values(), key=lambda d: d['last_used_at'])
+        cursor = MagicMock()
+        cursor.sort.return_value.limit.side_effect = lambda n: [{'_id': d['_id']} for d in ordered[:n]]
+        return cursor
+
+    def delete_many(self, query):
+        for key in query['_id']['$in']:
+            self.documents.pop(key, None)
+        return MagicMock(deleted_count=len(query['_id']['$in']))
+
+
+def _parser(calls):
+    def parse(text, timer):
+        calls.append(text)
+        return {'success': True, 'data': {'name': text}, 'parsing_method': 'AI-Powered (GPT-3.5)'}
+    return parse
+
+
+def test_content_hash_matches_for_bytes_and_text():
+    """Test text is hashed as its UTF-8 bytes"""
+    assert content_hash('résumé') == content_hash('résumé'.encode('utf-8'))
+    assert len(content_hash(b'')) == 64
+
+
+def test_repeat_upload_skips_extraction_and_parser():
+    """Test the second upload of the same bytes is served entirely from the cache"""
+    cache = ResumeCache(FakeCollection())
+    calls, extracted = [], []
+    resume_jobs.register_parser('cache-test', _parser(calls))
+    extract = lambda data, ext: extracted.append(data) or 'Jane Doe'
+
+    first = parse_upload('cache-test', b'%PDF-1', 'pdf', extract=extract, cache=cache)
+    second = parse_upload('cache-test', b'%PDF-1', 'pdf', extract=extract, cache=cache)
+
+    assert len(extracted) == 1 and len(calls) == 1
+    assert 'cached' not in first and second['cached'] is True
+    assert second['data'] == first['data']
+    stats = cache.stats()
+    assert stats['file_hits'] == 1 and stats['file_misses'] == 1
+    assert stats['text_hits'] == 1 and stats['text_misses'] == 1
+    assert stats['text_hit_rate'] == 0.5
+
+
+def test_different_file_same_text_skips_parser():
+    """Test a different upload with identical text reuses the parsed payload"""
+    cache = ResumeCache(FakeCollection())
+    calls = []
+    resume_jobs.register_parser('cache-test', _parser(calls))
+
+    parse_upload('cache-test', b'%PDF-1', 'pdf', extract=lambda d, e: 'Same text', cache=cache)
+    result = parse_upload('cache-test', b'%PDF-2', 'pdf', extract=lambda d, e: 'Same text', cache=cache)
+
+    assert len(calls) == 1
+    assert result['cached'] is True
+
+
+def test_regex_fallback_cached_briefly():
+    """Test non-AI results get the short fallback TTL"""
+    collection = FakeCollection()
+    cache = ResumeCache(collection)
+    resume_jobs.register_parser('cache-test', lambda text, timer: {'success': True, 'parsing_method': 'Regex'})
+
+    parse_upload('cache-test', b'%PDF', 'pdf', extract=lambda d, e: 'text', cache=cache)
+
+    entry = collection.documents[f"text:cache-test:{content_hash('text')}"]
+    ttl = (entry['expires_at'] - entry['created_at']).total_seconds()
+    assert ttl == FALLBACK_TTL_SECONDS
+
+
+def test_evict_trims_least_recently_used():
+    """Test evict() removes the oldest entries beyond max_entries"""
+    collection = FakeCollection()
+    cache = ResumeCache(collection, max_entries=2)
+    for key in ('a', 'b', 'c'):
+        cache.put_text(key, key)
+    cache.get_text('a')  # 'a' is now the most recently used
+
+    assert cache.evict() == 1
+    assert set(collection.documents) == {'file:a', 'file:c'}
+
+
+def test_expired_entries_miss():
+    """Test entries past expires_at are treated as misses"""
+    collection = FakeCollection()
+    cache = ResumeCache(collection)
+    cache.put_text('a', 'text')
+    collection.documents['file:a']['expires_at'] = datetime(2000, 1, 1)
+    assert cache.get_text('a') is None
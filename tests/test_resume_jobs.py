@@ -0,0 +1,151 @@
+"""Tests for resume_jobs.py"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pytest
+from unittest.mock import MagicMock
+from datetime import datetime, timedelta
+from bson import ObjectId
+import resume_jobs
+from resume_jobs import ResumeJobQueue, ResumeExtractionError, StageTimer, extract_resume_text
+
+
+def _job(**fields):
+    now = datetime.utcnow()
+    job = {'_id': ObjectId(), 'role': 'test', 'file_ext': 'pdf', 'file_data': b'%PDF',
+           'attempts': 1, 'created_at': now - timedelta(seconds=2), 'started_at': now}
+    job.update(fields)
+    return job
+
+
+def _cache():
+    cache = MagicMock()
+    cache.get_text.return_value = None
+    cache.get_payload.return_value = None
+    return cache
+
+
+def _queue(extract):
+    queue = ResumeJobQueue(MagicMock(), cache=_cache())
+    queue._extract = extract
+    return queue
+
+
+@pytest.fixture(autouse=True)
+def parser():
+    def parse(text, timer):
+        with timer.stage('ai'):
+            return {'success': True, 'data': {'name': text}}
+    resume_jobs.register_parser('test', parse)
+    yield parse
+    resume_jobs._parsers.pop('test', None)
+    resume_jobs.set_notifier(None)
+
+
+def test_stage_timer_records_milliseconds():
+    """Test StageTimer stores one *_ms entry per stage and accumulates repeats"""
+    timer = StageTimer()
+    with timer.stage('extract'):
+        pass
+    with timer.stage('extract'):
+        pass
+    assert set(timer.timings) == {'extract_ms'}
+    assert timer.timings['extract_ms'] >= 0
+
+
+def test_run_stores_result_and_timings():
+    """Test a finished job stores the parser payload, stage timings and drops the upload"""
+    notifier = MagicMock()
+    resume_jobs.set_notifier(notifier)
+    queue = _queue(lambda data, ext: 'Jane Doe')
+    job = _job()
+
+    assert queue.run(job) == 'done'
+    update = queue.jobs.update_one.call_args[0][1]
+    assert update['$set']['status'] == 'done'
+    assert update['$set']['result'] == {'success': True, 'data': {'name': 'Jane Doe'}}
+    assert {'queue_ms', 'extract_ms', 'ai_ms', 'total_ms'} <= set(update['$set']['timings'])
+    assert 'file_data' in update['$unset']
+    event, payload, room = notifier.call_args[0]
+    assert event == 'resume_job_finished'
+    assert payload['job_id'] == str(job['_id'])
+    assert room == f"resume_job_{job['_id']}"
+
+
+def test_run_extraction_error_fails_job():
+    """Test an unreadable file fails the job with a user-facing message"""
+    def extract(data, ext):
+        raise ResumeExtractionError('Error parsing PDF: broken')
+    queue = _queue(extract)
+
+    assert queue.run(_job()) == 'failed'
+    update = queue.jobs.update_one.call_args[0][1]
+    assert update['$set']['result'] == {'success': False, 'message': 'Error parsing PDF: broken'}
+
+
+def test_run_unexpected_error_requeues_until_max_attempts():
+    """Test a crashed stage is retried, then failed after MAX_ATTEMPTS"""
+    def extract(data, ext):
+        raise RuntimeError('process pool died')
+    queue = _queue(extract)
+
+    assert queue.run(_job(attempts=1)) is None
+    assert queue.jobs.update_one.call_args[0][1]['$set']['status'] == 'queued'
+
+    assert queue.run(_job(attempts=resume_jobs.MAX_ATTEMPTS)) == 'failed'
+    assert queue.jobs.update_one.call_args[0][1]['$set']['status'] == 'failed'
+
+
+def test_claim_takes_queued_or_expired_jobs_oldest_first():
+    """Test claim() atomically leases the oldest queued or abandoned job"""
+    queue = ResumeJobQueue(MagicMock())
+    queue.claim()
+    query, update = queue.jobs.find_one_and_update.call_args[0]
+    assert {'status': 'queued'} in query['$or']
+    assert update['$set']['status'] == 'running'
+    assert update['$inc'] == {'attempts': 1}
+    assert queue.jobs.find_one_and_update.call_args[1]['sort'] == [('created_at', 1)]
+
+
+def test_submit_stores_upload_and_wakes_workers():
+    """Test submit() inserts a queued job without waiting for it to be parsed"""
+    queue = ResumeJobQueue(MagicMock())
+    queue.start = MagicMock()
+    queue.submit('test', 'hr@x.com', 'cv.pdf', 'pdf', b'%PDF')
+    document = queue.jobs.insert_one.call_args[0][0]
+    assert document['status'] == 'queued'
+    assert document['file_data'] == b'%PDF'
+    queue.start.assert_called_once()
+    assert queue._wakeup.is_set()
+
+
+def test_polling_a_pending_job_starts_the_workers():
+    """Test a job queued before a restart gets claimed once its status is polled"""
+    queue = ResumeJobQueue(MagicMock())
+    queue.start = MagicMock()
+    queue.jobs.find_one.return_value = {'_id': ObjectId(), 'status': 'queued'}
+    assert queue.get(queue.jobs.find_one.return_value['_id'], 'hr@x.com')['status'] == 'queued'
+    queue.start.assert_called_once()
+
+    queue.start.reset_mock()
+    queue.jobs.find_one.return_value = {'_id': ObjectId(), 'status': 'done'}
+    queue.get(queue.jobs.find_one.return_value['_id'], 'hr@x.com')
+    queue.start.assert_not_called()
+
+
+def test_start_workers_starts_the_process_queue(monkeypatch):
+    """Test startup starts the shared queue and never raises"""
+    queue = MagicMock()
+    monkeypatch.setattr(resume_jobs, '_queue', queue)
+    resume_jobs.start_workers()
+    queue.start.assert_called_once()
+
+    queue.start.side_effect = RuntimeError('no processes')
+    resume_jobs.start_workers()
+
+
+def test_extract_rejects_unsupported_format():
+    """Test unsupported extensions raise ResumeExtractionError"""
+    with pytest.raises(ResumeExtractionError):
+        extract_resume_text(b'data', 'txt')
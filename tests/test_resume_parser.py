@@ -0,0 +1,71 @@
+"""Tests for resume_parser.py"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from resume_parser import parse_resume_text, find_skills, find_sections, clean_text
+
+RESUME = """Jane Doe
+Email: jane.doe@example.com
+Phone: +91 98765 43210
+DOB: 12/05/1994
+Gender: Female
+
+Skills & Abilities
+Python, SQL Server, Tailwind CSS, Project Management
+
+Education
+B.Tech Computer Science, Anna University, 2015
+
+Professional Experience
+6 years of experience building web applications
+"""
+
+
+def test_parse_resume_text_extracts_fields():
+    """Test the main fields of a well-formed resume"""
+    data = parse_resume_text(RESUME)
+    assert data['name'].startswith('Jane Doe')
+    assert data['email'] == 'jane.doe@example.com'
+    assert data['phone'] == '+919876543210'
+    assert data['dob'] == '12/05/1994'
+    assert data['gender'] == 'Female'
+    assert data['experience'] == '6 years of experience'
+    assert 'Python' in data['skills']
+    assert 'Anna University' in data['education']
+
+
+def test_find_skills_reports_overlapping_skills():
+    """Test skills inside longer skills are found too, and word boundaries are respected"""
+    found = find_skills('SQL Server, Tailwind CSS, JavaScript and Web Designing')
+    assert {'SQL Server', 'SQL', 'Tailwind CSS', 'CSS', 'JavaScript', 'Web Designing'} <= found
+    assert 'Java' not in found
+    assert 'Web Design' not in found
+
+
+def test_find_sections_prefers_first_usable_header():
+    """Test headers are found in one scan, including ones that start another header"""
+    sections = find_sections("Skills & Abilities\nPython\n\nEducational Background\nBSc 2010")
+    assert sections['skills_abilities'] == 'Python'
+    assert sections['skills'].startswith('&')
+    assert sections['educational_background'] == 'BSc 2010'
+    assert sections['education'].startswith('al Background')
+
+
+def test_find_sections_skips_header_followed_by_bullet():
+    """Test a header with no body falls through to its next occurrence"""
+    sections = find_sections("Education\n• \nEducation: MIT 1999")
+    assert sections['education'] == 'MIT 1999'
+
+
+def test_clean_text_drops_noise_words():
+    """Test noise words are removed as whole words only"""
+    assert clean_text('The Curriculum Vitae of\nThemba') == 'of Themba'
+
+
+def test_missing_sections_fall_back():
+    """Test resumes without sections still return every field"""
+    data = parse_resume_text('john.smith@example.com uses Docker daily')
+    assert data['name'] == 'John Smith'
+    assert data['skills'] == ['Docker']
+    assert data['education'] == 'Education information not found in resume'
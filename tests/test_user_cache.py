@@ -0,0 +1,87 @@
+"""Tests for user_cache.py"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from unittest.mock import MagicMock, patch
+import user_cache
+from user_cache import UserCache
+from models_mongo import User
+
+
+def _loader(*users):
+    by_id = {user._id: user for user in users}
+    return MagicMock(side_effect=lambda user_id: by_id.get(user_id))
+
+
+def test_hits_skip_the_loader_and_return_copies():
+    """Test a repeated lookup is served from the cache and mutating it does not change the cache"""
+    loader = _loader(User('a@example.com', 'A', 'hr', _id='1'))
+    cache = UserCache(loader, ttl=30, max_entries=10)
+
+    first = cache.get('1')
+    first.role = 'admin'
+    second = cache.get('1')
+
+    assert loader.call_count == 1
+    assert second.role == 'hr'
+    assert second is not first
+    assert cache.stats()['hit_rate'] == 0.5
+
+
+def test_entries_expire_and_least_recent_is_evicted():
+    """Test the TTL and the size bound"""
+    loader = _loader(*[User(f'{i}@example.com', str(i), 'hr', _id=str(i)) for i in range(3)])
+    cache = UserCache(loader, ttl=30, max_entries=2)
+
+    with patch('user_cache.time.monotonic', return_value=100):
+        cache.get('0'), cache.get('1'), cache.get('0'), cache.get('2')
+    assert set(cache._entries) == {'0', '2'}
+    assert cache.stats()['evictions'] == 1
+
+    with patch('user_cache.time.monotonic', return_value=131):
+        cache.get('0')
+    assert loader.call_count == 4
+
+
+def test_invalidate_by_id_and_email_and_unknown_ids_are_not_cached():
+    """Test invalidation and that a missing user is looked up again next time"""
+    loader = _loader(User('a@example.com', 'A', 'hr', _id='1'), User('b@example.com', 'B', 'hr', _id='2'))
+    cache = UserCache(loader, ttl=30, max_entries=10)
+    cache.get('1'), cache.get('2')
+
+    cache.invalidate('1')
+    cache.invalidate(email='b@example.com')
+    assert cache.stats()['entries'] == 0
+    assert cache.stats()['invalidations'] == 2
+
+    assert cache.get('missing') is None
+    assert cache.get('missing') is None
+    assert loader.call_count == 4
+
+
+def test_zero_ttl_disables_cache():
+    """Test USER_CACHE_TTL_SECONDS=0 always loads from the database"""
+    loader = _loader(User('a@example.com', 'A', 'hr', _id='1'))
+    cache = UserCache(loader, ttl=0)
+    cache.get('1'), cache.get('1')
+    assert loader.call_count == 2
+
+
+def test_user_and_role_writes_invalidate_cached_user():
+    """Test User.save and Role.save drop the cached user"""
+    import models_mongo
+    from models_mongo import Role
+    user_id = '64b7f0c2a1b2c3d4e5f60718'
+
+    loader = _loader(User('a@example.com', 'A', 'hr', _id=user_id))
+    with patch.object(user_cache, '_cache', UserCache(loader, ttl=30)), \
+            patch.object(models_mongo, 'users_collection'), patch.object(models_mongo, 'roles_collection'), \
+            patch('response_cache.invalidate'):
+        user_cache.load_user(user_id)
+        User('a@example.com', 'A', 'admin', _id=user_id).save()
+        user_cache.load_user(user_id)
+        Role('a@example.com', 'hr').save()
+        user_cache.load_user(user_id)
+
+    assert loader.call_count == 3
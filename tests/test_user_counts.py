@@ -0,0 +1,58 @@
+"""Tests for user_counts.py"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from unittest.mock import MagicMock
+import response_cache
+from response_cache import ResponseCache, LocalBackend
+from user_counts import count_users_by_role, user_counts, invited_emails
+
+
+def _users():
+    collection = MagicMock()
+    collection.aggregate.return_value = [{'_id': 'hr_role', 'count': 3}, {'_id': 'manager', 'count': 2},
+                                         {'_id': 'admin', 'count': 1}]
+    return collection
+
+
+def test_counts_every_role_in_one_group():
+    """Test one $group by role replaces a count per role"""
+    users = _users()
+
+    counts = count_users_by_role(users)
+
+    assert counts == {'hr_role': 3, 'manager': 2, 'admin': 1, 'total': 6}
+    users.aggregate.assert_called_once_with([{'$group': {'_id': '$role', 'count': {'$sum': 1}}}])
+    users.count_documents.assert_not_called()
+
+
+def test_counts_are_cached_until_a_user_is_saved():
+    """Test repeated page loads reuse the counts and a users invalidation refreshes them"""
+    response_cache._cache = ResponseCache(LocalBackend())
+    users = _users()
+
+    assert user_counts(users)['total'] == 6
+    assert user_counts(users)['hr_role'] == 3
+    assert users.aggregate.call_count == 1
+
+    response_cache.invalidate('users')
+    user_counts(users)
+    assert users.aggregate.call_count == 2
+
+
+def test_invited_emails_grouped_by_role():
+    """Test the user_emails listing is one aggregation keyed by role"""
+    user_emails = MagicMock()
+    user_emails.aggregate.return_value = [
+        {'_id': 'Recruiter', 'emails': [{'_id': 1, 'email': 'r@example.com', 'assigned_by': 'admin@example.com'}]},
+        {'_id': 'Manager', 'emails': [{'_id': 2, 'email': 'm@example.com'}, {'_id': 3, 'email': 'n@example.com'}]},
+    ]
+
+    emails = invited_emails(user_emails)
+
+    assert [e['email'] for e in emails['Manager']] == ['m@example.com', 'n@example.com']
+    assert emails.get('HR_Role', []) == []
+    group = user_emails.aggregate.call_args[0][0][0]['$group']
+    assert group['_id'] == '$role'
+    assert group['emails']['$push']['created_at'] == '$created_at'
@@ -0,0 +1,95 @@
+"""Tests for user_directory.py and the batched cluster candidate listing"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from unittest.mock import MagicMock
+from bson import ObjectId
+from user_directory import UserDirectory
+
+
+USERS = [
+    {'email': 'rec@example.com', 'name': 'Rec One', 'role': 'recruiter', 'cluster': 'Tech Cluster'},
+    {'email': 'hr@example.com', 'name': 'HR One', 'role': 'hr_role'},
+    {'email': 'mgr@example.com', 'name': 'Manager One', 'role': 'manager', 'cluster': 'Sales Cluster'},
+]
+
+
+def _users_collection():
+    users = MagicMock()
+    users.find.side_effect = lambda query, projection=None: [
+        u for u in USERS if u['email'] in query['email']['$in']
+    ]
+    return users
+
+
+def _candidates_collection(count):
+    docs = [{
+        '_id': ObjectId(),
+        'first_name': f'Candidate{i}',
+        'last_name': 'Test',
+        'assigned_by': ['rec@example.com', 'hr@example.com', 'ghost@example.com'][i % 3],
+        'manager_email': 'mgr@example.com' if i % 2 else None,
+        'status': 'Pending'
+    } for i in range(count)]
+    candidates = MagicMock()
+    cursor = MagicMock()
+    cursor.sort.return_value = cursor
+    cursor.skip.return_value = cursor
+    cursor.limit.side_effect = lambda n: iter(docs[:n])
+    candidates.find.return_value = cursor
+    candidates.aggregate.return_value = iter([{'_id': None, 'total_candidates': count}])
+    return candidates
+
+
+def test_directory_loads_with_one_query():
+    """Test UserDirectory resolves many emails with a single $in query"""
+    users = _users_collection()
+    directory = UserDirectory(users).load(['rec@example.com', 'mgr@example.com', 'rec@example.com', None])
+    assert users.find.call_count == 1
+    assert directory.name('rec@example.com') == 'Rec One'
+    assert directory.name('rec@example.com', roles=('manager',), default='Unknown') == 'Unknown'
+    assert directory.cluster('mgr@example.com') == 'Sales Cluster'
+    assert directory.get('nobody@example.com') is None
+
+
+def test_directory_does_not_requery_known_emails():
+    """Test emails already loaded (including misses) are not fetched again"""
+    users = _users_collection()
+    directory = UserDirectory(users)
+    directory.load(['rec@example.com', 'ghost@example.com'])
+    directory.load(['rec@example.com', 'ghost@example.com'])
+    assert users.find.call_count == 1
+
+
+def test_cluster_candidates_round_trips_constant():
+    """Test fetch_cluster_candidates issues the same number of queries for 5 or 500 candidates"""
+    from routes.cluster_mongo import fetch_cluster_candidates
+
+    round_trips = []
+    for count in (5, 500):
+        candidates = _candidates_collection(count)
+        users = _users_collection()
+        stats, page = fetch_cluster_candidates(candidates, users, {}, page=1, per_page=50)
+        round_trips.append(
+            candidates.aggregate.call_count + candidates.find.call_count +
+            users.find.call_count + users.find_one.call_count
+        )
+        assert users.find_one.call_count == 0
+        assert stats['total_candidates'] == count
+        assert len(page) == min(count, 50)
+    assert round_trips[0] == round_trips[1] == 3
+
+
+def test_cluster_candidates_enrichment():
+    """Test names and clusters are joined from the directory"""
+    from routes.cluster_mongo import fetch_cluster_candidates
+
+    _, page = fetch_cluster_candidates(_candidates_collection(4), _users_collection(), {})
+    assert page[0]['recruiter_name'] == 'Rec One'
+    assert page[0]['cluster_name'] == 'Tech Cluster'
+    assert page[0]['manager_name'] is None
+    assert page[1]['recruiter_name'] == 'HR One'
+    assert page[1]['manager_name'] == 'Manager One'
+    assert page[2]['recruiter_name'] == 'Unknown User'
+    assert isinstance(page[0]['_id'], str)
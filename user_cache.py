@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+In-process cache for the Flask-Login user loader.
+
+Flask-Login loads the current user from the session on every authenticated
+request, including each AJAX poll. `load_user(user_id)` answers from a
+per-process LRU (USER_CACHE_MAX_ENTRIES, USER_CACHE_TTL_SECONDS) and only
+falls back to `User.find_by_id` on a miss, so most requests cost a dict
+lookup instead of a MongoDB round-trip.
+
+Entries are dropped when the user is saved (User.save), when their role or
+invited email changes (Role.save, UserEmail.delete) and when they log out;
+changes made by another worker process show up within the TTL. Unknown ids
+are not cached, so a user registered in another process can log in at once.
+USER_CACHE_TTL_SECONDS=0 turns the cache off.
+"""
+
+import copy
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+
+USER_CACHE_TTL_SECONDS = int(os.getenv('USER_CACHE_TTL_SECONDS', '30'))
+USER_CACHE_MAX_ENTRIES = int(os.getenv('USER_CACHE_MAX_ENTRIES', '2048'))
+
+
+class UserCache:
+    def __init__(self, loader, ttl=USER_CACHE_TTL_SECONDS, max_entries=USER_CACHE_MAX_ENTRIES):
+        self.loader = loader
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = Counter()
+
+    @property
+    def enabled(self):
+        return self.ttl > 0 and self.max_entries > 0
+
+    def _cached(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(user_id)
+                self._counters['hits'] += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[user_id]
+            self._counters['misses'] += 1
+            return None
+
+    def get(self, user_id):
+        """The user with `user_id`, or None. Each caller gets its own copy."""
+        user_id = str(user_id)
+        if not self.enabled:
+            return self.loader(user_id)
+        user = self._cached(user_id)
+        if user is None:
+            user = self.loader(user_id)
+            if user is None:
+                return None
+            with self._lock:
+                self._entries[user_id] = (time.monotonic() + self.ttl, user)
+                self._entries.move_to_end(user_id)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._counters['evictions'] += 1
+        return copy.copy(user)
+
+    def invalidate(self, user_id=None, email=None):
+        """Drop the cached user with `user_id` and/or `email`."""
+        with self._lock:
+            keys = {str(user_id)} if user_id else set()
+            if email:
+                keys.update(key for key, (_, user) in self._entries.items() if user.email == email)
+            for key in keys:
+                if self._entries.pop(key, None) is not None:
+                    self._counters['invalidations'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            hits, misses = stats.setdefault('hits', 0), stats.setdefault('misses', 0)
+            stats['hit_rate'] = round(hits / (hits + misses), 3) if hits + misses else 0.0
+            stats['entries'] = len(self._entries)
+        stats['ttl_seconds'] = self.ttl
+        stats['max_entries'] = self.max_entries
+        return stats
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            from models_mongo import User
+            _cache = UserCache(User.find_by_id)
+        return _cache
+
+
+def load_user(user_id):
+    """Flask-Login user_loader"""
+    return get_cache().get(user_id)
+
+
+def invalidate_user(user_id=None, email=None):
+    """Forget a cached user (called by model write paths and on logout)."""
+    if _cache is not None:
+        _cache.invalidate(user_id, email)
@@ -0,0 +1,43 @@
+"""
+Per-role user counts and invited emails, one grouped query each.
+
+The landing page and the admin dashboard show how many users have each
+role. Instead of one `count_documents` per role, `user_counts()` groups the
+users collection by role in a single aggregation and caches the result in
+the shared response cache under the `users` tag (dropped by User.save,
+e.g. on registration), so anonymous visitors to the landing page normally
+cost no query at all. `invited_emails()` lists the user_emails collection
+grouped by role in one aggregation; it is not cached, so an invitation shows
+up on the admin dashboard immediately.
+"""
+
+USER_COUNTS_TTL_SECONDS = 60
+INVITED_EMAIL_FIELDS = ['_id', 'email', 'assigned_by', 'created_at']
+
+
+def count_users_by_role(users_collection):
+    """{role: number of users} plus 'total', from one $group."""
+    counts = {group['_id']: group['count'] for group in users_collection.aggregate([
+        {'$group': {'_id': '$role', 'count': {'$sum': 1}}}
+    ])}
+    counts['total'] = sum(counts.values())
+    return counts
+
+
+def user_counts(users_collection):
+    """count_users_by_role, cached for USER_COUNTS_TTL_SECONDS or until a user is saved."""
+    from response_cache import get_cache
+
+    counts = get_cache().memoize('user_counts', {}, lambda: count_users_by_role(users_collection),
+                                 ('users',), USER_COUNTS_TTL_SECONDS)
+    return dict(counts)
+
+
+def invited_emails(user_emails_collection):
+    """{role: [invited email documents]} from one $group over user_emails."""
+    return {group['_id']: group['emails'] for group in user_emails_collection.aggregate([
+        {'$group': {
+            '_id': '$role',
+            'emails': {'$push': {field: f'${field}' for field in INVITED_EMAIL_FIELDS}}
+        }}
+    ])}
@@ -0,0 +1,42 @@
+"""
+Request-scoped lookup of user names and clusters by email.
+
+Routes that render lists of candidates need the display name of the
+recruiter/HR who uploaded each one and of the assigned manager. Instead of
+one `users_collection.find_one` per candidate, collect the emails first and
+resolve them all with a single `$in` query.
+"""
+
+USER_FIELDS = {'email': 1, 'name': 1, 'role': 1, 'cluster': 1}
+
+
+class UserDirectory:
+    def __init__(self, users_collection):
+        self.users_collection = users_collection
+        self._users = {}
+
+    def load(self, emails):
+        """Fetch every not-yet-known email in one round-trip."""
+        missing = {email for email in emails if email and email not in self._users}
+        if not missing:
+            return self
+        for user in self.users_collection.find({'email': {'$in': list(missing)}}, USER_FIELDS):
+            self._users[user['email']] = user
+        # Remember misses too so they are not queried again
+        for email in missing:
+            self._users.setdefault(email, None)
+        return self
+
+    def get(self, email):
+        return self._users.get(email)
+
+    def name(self, email, roles=None, default=None):
+        """Name of the user with `email`, optionally only if their role is in `roles`."""
+        user = self.get(email)
+        if not user or (roles and user.get('role') not in roles):
+            return default
+        return user.get('name', default)
+
+    def cluster(self, email):
+        user = self.get(email)
+        return user.get('cluster') if user else None